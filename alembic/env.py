@@ -9,7 +9,14 @@ sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..'
 
 # Importa a Base dos seus modelos e os próprios modelos para que o Alembic os "veja"
 from app.infrastructure.database.database_session import Base, DATABASE_URL_SYNC
-from app.domain import memory_models
+from app.domain import (
+    analytics_models,
+    ingress_models,
+    memory_models,
+    outbox_models,
+    reminder_models,
+    usage_models,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -56,6 +63,14 @@ def include_name(name, type_, parent_names):
         # Se é uma tabela do LangGraph, ignora
         if name in langgraph_tables:
             return False
+
+        # Partições (ex: checkpoints_p0) e o arquivo frio são criados por
+        # migrações escritas à mão, não pelos modelos ORM
+        if name in ('checkpoint_archive', 'thread_activity'):
+            return False
+        base_name, _, suffix = name.rpartition('_p')
+        if base_name in langgraph_tables and suffix.isdigit():
+            return False
     
     # Para todas as outras tabelas, permite que o Alembic gerencie
     return True
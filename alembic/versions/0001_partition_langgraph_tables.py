@@ -0,0 +1,106 @@
+"""Particiona as tabelas do LangGraph por hash e cria o arquivo frio de threads
+
+Revision ID: 0001_partition_langgraph
+Revises:
+Create Date: 2025-07-01 00:00:00.000000
+
+As tabelas são criadas pelo ``setup()`` do LangGraph na inicialização da
+aplicação; esta migração deve rodar depois disso. Cada tabela é recriada
+como particionada por HASH (thread_id / prefix+key), os dados existentes
+são copiados e as migrações internas do LangGraph (``checkpoint_migrations``
+e ``store_migrations``) permanecem intactas.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_partition_langgraph"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Número de partições por tabela (modulus do HASH)
+HASH_PARTITIONS = 16
+
+# Tabela -> chave de particionamento (deve fazer parte da PRIMARY KEY)
+PARTITIONED_TABLES = {
+    "checkpoints": "thread_id",
+    "checkpoint_blobs": "thread_id",
+    "checkpoint_writes": "thread_id",
+    "store": "prefix, key",
+}
+
+
+def _relkind(table: str):
+    return op.get_bind().execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table},
+    ).scalar()
+
+
+def _partition_table(table: str, partition_key: str) -> None:
+    relkind = _relkind(table)
+    if relkind is None:
+        raise RuntimeError(
+            f"Tabela '{table}' não encontrada. Inicie a aplicação uma vez "
+            "(setup do LangGraph) antes de executar esta migração."
+        )
+    if relkind == "p":
+        # Já particionada
+        return
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING ALL) "
+        f"PARTITION BY HASH ({partition_key})"
+    )
+    for remainder in range(HASH_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE {table}_p{remainder} PARTITION OF {table} "
+            f"FOR VALUES WITH (MODULUS {HASH_PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+    # INCLUDING ALL já recria a PK e o índice por thread_id nas partições
+    op.execute(f"DROP TABLE {table}_unpartitioned")
+
+
+def _unpartition_table(table: str) -> None:
+    if _relkind(table) != "p":
+        return
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING ALL)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+    op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, partition_key in PARTITIONED_TABLES.items():
+        _partition_table(table, partition_key)
+
+    op.create_table(
+        "checkpoint_archive",
+        sa.Column("thread_id", sa.Text(), primary_key=True),
+        sa.Column("codec", sa.String(16), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("checkpoint_count", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.TIMESTAMP(timezone=True)),
+        sa.Column(
+            "archived_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("checkpoint_archive")
+
+    for table in PARTITIONED_TABLES:
+        _unpartition_table(table)
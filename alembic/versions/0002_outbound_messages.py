@@ -0,0 +1,49 @@
+"""Cria a tabela de outbox das mensagens enviadas ao gateway
+
+Revision ID: 0002_outbound_messages
+Revises: 0001_partition_langgraph
+Create Date: 2025-07-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_outbound_messages"
+down_revision: Union[str, Sequence[str], None] = "0001_partition_langgraph"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbound_messages",
+        sa.Column("outbound_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.String(length=255), nullable=True),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column("message", sa.TEXT(), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.TEXT(), nullable=True),
+        sa.Column("next_attempt_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("sent_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("outbound_id"),
+    )
+    op.create_index(
+        "ix_outbound_messages_status_next_attempt",
+        "outbound_messages",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbound_messages_status_next_attempt", table_name="outbound_messages")
+    op.drop_table("outbound_messages")
@@ -0,0 +1,56 @@
+"""Cria as tabelas de resumo do job de analytics das conversas
+
+Revision ID: 0003_analytics_tables
+Revises: 0002_outbound_messages
+Create Date: 2025-07-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_analytics_tables"
+down_revision: Union[str, Sequence[str], None] = "0002_outbound_messages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "analytics_runs",
+        sa.Column("run_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("checkpoints_scanned", sa.BigInteger(), nullable=False),
+        sa.Column("threads_scanned", sa.Integer(), nullable=False),
+        sa.Column("booked_threads", sa.Integer(), nullable=False),
+        sa.Column("summary", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+    op.create_table(
+        "analytics_metrics",
+        sa.Column("metric_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("metric", sa.String(length=50), nullable=False),
+        sa.Column("dimension", sa.String(length=255), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["analytics_runs.run_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("metric_id"),
+    )
+    op.create_index(
+        "ix_analytics_metrics_run_metric",
+        "analytics_metrics",
+        ["run_id", "metric"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_analytics_metrics_run_metric", table_name="analytics_metrics")
+    op.drop_table("analytics_metrics")
+    op.drop_table("analytics_runs")
@@ -0,0 +1,51 @@
+"""Cria a tabela de uso agregado do LLM
+
+Revision ID: 0004_llm_usage
+Revises: 0003_analytics_tables
+Create Date: 2025-07-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_llm_usage"
+down_revision: Union[str, Sequence[str], None] = "0003_analytics_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "llm_usage",
+        sa.Column("usage_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("window_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("window_end", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("cached_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("cost", sa.Float(), nullable=False),
+        sa.Column("latency_seconds", sa.Float(), nullable=False),
+        sa.Column("max_latency_seconds", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("usage_id"),
+    )
+    op.create_index(
+        "ix_llm_usage_dimension_key_window",
+        "llm_usage",
+        ["dimension", "key", "window_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_llm_usage_dimension_key_window", table_name="llm_usage")
+    op.drop_table("llm_usage")
@@ -0,0 +1,47 @@
+"""Cria a tabela de deduplicação das mensagens recebidas
+
+Revision ID: 0005_ingress_messages
+Revises: 0004_llm_usage
+Create Date: 2025-07-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_ingress_messages"
+down_revision: Union[str, Sequence[str], None] = "0004_llm_usage"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingress_messages",
+        sa.Column("instance_id", sa.String(length=255), server_default="", nullable=False),
+        sa.Column("message_id", sa.String(length=255), nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column(
+            "received_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("instance_id", "message_id"),
+    )
+    op.create_index(
+        "ix_ingress_messages_received_at",
+        "ingress_messages",
+        ["received_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingress_messages_received_at", table_name="ingress_messages")
+    op.drop_table("ingress_messages")
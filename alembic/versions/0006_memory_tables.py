@@ -0,0 +1,139 @@
+"""Cria as tabelas de memória (users, episodic_memory, agent_heuristics) e seus índices
+
+Revision ID: 0006_memory_tables
+Revises: 0005_ingress_messages
+Create Date: 2025-07-24 00:00:00.000000
+
+Em bancos onde as tabelas já existem (criadas fora do Alembic), só os
+índices são adicionados e ``episodic_memory.created_at`` passa a ser
+NOT NULL, pois a paginação por keyset depende dele. As tabelas criadas
+aqui levam um comentário que o downgrade usa para apagar só essas; nas
+que já existiam, ele remove os índices e desfaz o NOT NULL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_memory_tables"
+down_revision: Union[str, Sequence[str], None] = "0005_ingress_messages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Comentário das tabelas criadas por esta revisão
+CREATED_BY = f"created by alembic revision {revision}"
+
+
+def _has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _created_here(table: str) -> bool:
+    comment = sa.inspect(op.get_bind()).get_table_comment(table).get("text")
+    return comment == CREATED_BY
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("user_id", sa.UUID(), nullable=False),
+            sa.Column("phone_number", sa.String(length=20), nullable=False),
+            sa.Column("full_name", sa.String(length=255), nullable=True),
+            sa.Column("preferences", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=True),
+            sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("user_id"),
+            sa.UniqueConstraint("phone_number"),
+            comment=CREATED_BY,
+        )
+
+    if not _has_table("episodic_memory"):
+        op.create_table(
+            "episodic_memory",
+            sa.Column("episode_id", sa.UUID(), nullable=False),
+            sa.Column("user_id", sa.UUID(), nullable=True),
+            sa.Column("thread_id", sa.String(length=255), nullable=False),
+            sa.Column("summary", sa.TEXT(), nullable=True),
+            sa.Column("outcome", sa.String(length=50), nullable=True),
+            sa.Column("key_entities", sa.JSON(), nullable=True),
+            sa.Column("conversation_turns", sa.Integer(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.TIMESTAMP(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.ForeignKeyConstraint(["user_id"], ["users.user_id"]),
+            sa.PrimaryKeyConstraint("episode_id"),
+            comment=CREATED_BY,
+        )
+    else:
+        op.execute("UPDATE episodic_memory SET created_at = now() WHERE created_at IS NULL")
+        op.alter_column(
+            "episodic_memory",
+            "created_at",
+            existing_type=sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        )
+
+    if not _has_table("agent_heuristics"):
+        op.create_table(
+            "agent_heuristics",
+            sa.Column("heuristic_id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("rule_description", sa.TEXT(), nullable=False),
+            sa.Column("rule_type", sa.String(length=50), nullable=True),
+            sa.Column("actionable_knowledge", sa.JSON(), nullable=True),
+            sa.Column("is_active", sa.BOOLEAN(), nullable=True),
+            sa.Column("origin_analysis_date", sa.TIMESTAMP(timezone=True), nullable=True),
+            sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("heuristic_id"),
+            comment=CREATED_BY,
+        )
+
+    op.create_index(
+        "ix_episodic_memory_user_created",
+        "episodic_memory",
+        ["user_id", "created_at", "episode_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_episodic_memory_thread_created",
+        "episodic_memory",
+        ["thread_id", "created_at", "episode_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_agent_heuristics_active_rule_type",
+        "agent_heuristics",
+        ["rule_type", "heuristic_id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_agent_heuristics_active_rule_type", table_name="agent_heuristics")
+    op.drop_index("ix_episodic_memory_thread_created", table_name="episodic_memory")
+    op.drop_index("ix_episodic_memory_user_created", table_name="episodic_memory")
+
+    if _created_here("agent_heuristics"):
+        op.drop_table("agent_heuristics")
+    if _created_here("episodic_memory"):
+        op.drop_table("episodic_memory")
+    else:
+        op.alter_column(
+            "episodic_memory",
+            "created_at",
+            existing_type=sa.TIMESTAMP(timezone=True),
+            server_default=None,
+            nullable=True,
+        )
+    if _created_here("users"):
+        op.drop_table("users")
@@ -0,0 +1,57 @@
+"""Cria a tabela de lembretes de consulta e o índice de vencimento
+
+Revision ID: 0007_appointment_reminders
+Revises: 0006_memory_tables
+Create Date: 2025-07-27 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_appointment_reminders"
+down_revision: Union[str, Sequence[str], None] = "0006_memory_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "appointment_reminders",
+        sa.Column("reminder_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.String(length=255), server_default="", nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("appointment_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("due_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.TEXT(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("fired_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("reminder_id"),
+    )
+    op.create_index(
+        "ix_appointment_reminders_pending_due",
+        "appointment_reminders",
+        ["due_at", "reminder_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "uq_appointment_reminders_appointment",
+        "appointment_reminders",
+        ["instance_id", "phone_number", "kind", "appointment_at"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_appointment_reminders_appointment", table_name="appointment_reminders")
+    op.drop_index("ix_appointment_reminders_pending_due", table_name="appointment_reminders")
+    op.drop_table("appointment_reminders")
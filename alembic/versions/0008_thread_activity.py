@@ -0,0 +1,82 @@
+"""Cria thread_activity: última atividade por thread, mantida por trigger
+
+Revision ID: 0008_thread_activity
+Revises: 0007_appointment_reminders
+Create Date: 2025-07-28 00:00:00.000000
+
+A varredura do arquivo frio procurava as threads inativas com um
+``GROUP BY thread_id`` sobre todos os checkpoints a cada intervalo. Com
+esta tabela ela vira uma varredura de intervalo no índice de
+``last_activity_at``. O trigger em ``checkpoints`` atualiza a linha da
+thread no máximo uma vez por hora (a inatividade é contada em dias), para
+não regravar a mesma linha a cada passo do grafo.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_thread_activity"
+down_revision: Union[str, Sequence[str], None] = "0007_appointment_reminders"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "thread_activity",
+        sa.Column("thread_id", sa.Text(), primary_key=True),
+        sa.Column("last_activity_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_thread_activity_last_activity",
+        "thread_activity",
+        ["last_activity_at"],
+        unique=False,
+    )
+
+    # Carga inicial: a última varredura completa dos checkpoints
+    op.execute(
+        """
+        INSERT INTO thread_activity (thread_id, last_activity_at)
+        SELECT thread_id, max((checkpoint->>'ts')::timestamptz)
+        FROM checkpoints
+        WHERE checkpoint_ns = ''
+        GROUP BY thread_id
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION touch_thread_activity() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO thread_activity (thread_id, last_activity_at)
+            VALUES (NEW.thread_id, now())
+            ON CONFLICT (thread_id) DO UPDATE
+                SET last_activity_at = EXCLUDED.last_activity_at
+                WHERE thread_activity.last_activity_at
+                      < EXCLUDED.last_activity_at - interval '1 hour';
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER checkpoints_touch_thread_activity
+        AFTER INSERT ON checkpoints
+        FOR EACH ROW WHEN (NEW.checkpoint_ns = '')
+        EXECUTE FUNCTION touch_thread_activity()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS checkpoints_touch_thread_activity ON checkpoints")
+    op.execute("DROP FUNCTION IF EXISTS touch_thread_activity()")
+    op.drop_index("ix_thread_activity_last_activity", table_name="thread_activity")
+    op.drop_table("thread_activity")
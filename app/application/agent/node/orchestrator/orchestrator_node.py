@@ -1,14 +1,28 @@
 import logging
 from typing import Callable, Tuple
-from langchain_core.messages import AIMessage
-from app.application.agent.state.sheduling_agent_state import SchedulingAgentState
-from app.infrastructure.services.llm.llm_factory import LLMFactory
+from langchain_core.messages import AIMessage, ToolMessage
+from app.application.agent.state.sheduling_agent_state import (
+    SchedulingAgentState,
+    get_scheduling_data,
+)
+from app.application.agent.node.orchestrator.prompt_assembler import prompt_assembler
+from app.application.agent.tools.scheduling_details_tool import (
+    SCHEDULING_DETAILS_TOOL,
+    apply_scheduling_details,
+)
+from app.application.services.model_router import model_router
+from app.infrastructure.config.config import settings
+from app.infrastructure.tenancy.tenant_keys import tenant_store_namespace
+from app.infrastructure.tenancy.tenant_registry import tenant_registry
 from app.utils.get_last_message import get_last_message
 from app.infrastructure.pesistence.postgres_persistence import get_store
 from app.application.agent.registry.node_registry import register_node
 
 logger = logging.getLogger(__name__)
 
+# Chamadas ao LLM por turno: as de ferramenta mais a resposta final
+MAX_LLM_ROUNDS = 3
+
 @register_node(
         name="ORCHESTRATOR",
         enabled=True,
@@ -24,8 +38,10 @@ async def orchestrator_node(state: SchedulingAgentState) -> SchedulingAgentState
     """
     last_message = get_last_message(state)
     phone_number = state.get("phone_number")
+    instance_id = state.get("instance_id")
+    users_namespace = tenant_store_namespace("users", instance_id)
     
-    print("Executando nó orquestrador para o usuário: ", phone_number)
+    logger.debug("Executando nó orquestrador para o usuário: %s", phone_number)
     
     # Teste básico do BaseStore
     try:
@@ -33,7 +49,7 @@ async def orchestrator_node(state: SchedulingAgentState) -> SchedulingAgentState
         
         # Teste: salvar dados do usuário
         await store.put(
-            namespace=["users"], 
+            namespace=users_namespace,
             key=phone_number, 
             value={
                 "last_message": last_message,
@@ -43,21 +59,62 @@ async def orchestrator_node(state: SchedulingAgentState) -> SchedulingAgentState
         )
         
         # Teste: recuperar dados
-        user_data = await store.get(namespace=["users"], key=phone_number)
+        user_data = await store.get(namespace=users_namespace, key=phone_number)
         if user_data:
-            print(f"BaseStore funcionando! Dados do usuário: {user_data.value}")
+            logger.debug("BaseStore funcionando! Dados do usuário: %s", user_data.value)
         else:
-            print("Nenhum dado encontrado para o usuário")
+            logger.debug("Nenhum dado encontrado para o usuário")
             
     except Exception as e:
-        print(f"Erro no BaseStore: {e}")
-    
-    llm_service = LLMFactory.create_llm_service("openai")
-    llm_response = llm_service.orchestrator_prompt_template(last_message)
-    
-    ai_message = AIMessage(content=llm_response.content)
+        logger.warning("Erro no BaseStore: %s", e)
     
-    return {
-        **state,
-        "messages": [ai_message]
-    }
+    # Prompt e cota da clínica, criados uma vez por instância; o roteador
+    # escolhe o modelo (pequeno ou grande) pela complexidade do turno. Os
+    # segmentos dinâmicos (resumo, histórico, dados coletados) vêm depois
+    # dos estáticos, para o provedor reaproveitar o prefixo em cache
+    tenant = tenant_registry.get(instance_id)
+    scheduling_data = get_scheduling_data(state)
+    prompt_inputs = prompt_assembler.inputs(state)
+    # Camada escolhida uma vez por turno, com os dados do início do turno:
+    # as rodadas de ferramenta não trocam de modelo no meio
+    route = model_router.route_turn(last_message, scheduling_data)
+    scratchpad = []
+    for _ in range(MAX_LLM_ROUNDS):
+        llm_response = await model_router.invoke(
+            tenant,
+            last_message,
+            prompt_inputs={**prompt_inputs, "agent_scratchpad": scratchpad},
+            decision=route,
+        )
+        tool_calls = getattr(llm_response, "tool_calls", None) or []
+        if not tool_calls:
+            break
+        # Dados extraídos pelo modelo: registrados no estado e devolvidos a
+        # ele no scratchpad para que a próxima chamada produza a resposta
+        scratchpad = [*scratchpad, llm_response]
+        for call in tool_calls:
+            if call["name"] == SCHEDULING_DETAILS_TOOL:
+                scheduling_data = apply_scheduling_details(scheduling_data, call["args"])
+                result = "Dados registrados."
+            else:
+                result = f"Ferramenta desconhecida: {call['name']}"
+            scratchpad.append(ToolMessage(content=result, tool_call_id=call["id"]))
+
+    if getattr(llm_response, "tool_calls", None):
+        # Rodadas esgotadas só com chamadas de ferramenta: a resposta não tem texto
+        logger.warning(
+            "Orquestrador sem resposta final após %d chamadas ao LLM (%s).",
+            MAX_LLM_ROUNDS,
+            phone_number,
+        )
+        ai_message = AIMessage(content=settings.AGENT_ERROR_REPLY)
+    else:
+        ai_message = AIMessage(content=llm_response.content)
+
+    # Apenas o delta: os demais canais não mudaram neste node. Só a resposta
+    # final entra no histórico; o que foi coletado volta nos próximos turnos
+    # pelo segmento de dados coletados
+    update = {"messages": [ai_message]}
+    if scheduling_data != get_scheduling_data(state):
+        update["scheduling_data"] = scheduling_data
+    return update
@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Mapping
+
+from langchain_core.messages import BaseMessage, SystemMessage, ToolMessage
+
+from app.application.agent.state.sheduling_agent_state import get_scheduling_data
+from app.infrastructure.config.config import settings
+
+# Rótulos dos campos de ``SchedulingData`` no segmento de dados coletados,
+# na ordem do modelo (a ordem fixa mantém o texto igual entre turnos)
+_SCHEDULING_LABELS = {
+    "user_name": "nome do paciente",
+    "professional_name": "profissional",
+    "specialty": "especialidade",
+    "date_scheduled": "data",
+    "turn_scheduled": "turno",
+    "specific_time": "horário",
+    "confirmed": "confirmado pelo paciente",
+}
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "sim" if value else "não"
+    return str(value)
+
+
+class PromptAssembler:
+    """
+    Monta as entradas dinâmicas do prompt do orquestrador a partir do
+    estado: resumo da conversa, histórico e dados já coletados.
+
+    O histórico é a lista de mensagens do checkpoint, sem a do turno atual,
+    e só cresce no fim: o prefixo do turno anterior continua idêntico e o
+    provedor o reaproveita do cache. Acima de ``history_max_messages`` o
+    início da janela anda em blocos de ``history_trim_step`` mensagens, e
+    não uma a cada turno, para o prefixo mudar o menos possível. Os dados
+    coletados mudam ao longo da conversa e por isso vêm depois do
+    histórico, junto da mensagem do usuário.
+    """
+
+    def __init__(self, history_max_messages: int = 20, history_trim_step: int = 10):
+        self.history_max_messages = history_max_messages
+        self.history_trim_step = max(1, history_trim_step)
+        self._calls = 0
+        self._history_messages = 0
+        self._trimmed_calls = 0
+        self._context_calls = 0
+
+    def history(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Janela do histórico, com o início alinhado a ``history_trim_step``."""
+        if self.history_max_messages <= 0:
+            return []
+        excess = len(messages) - self.history_max_messages
+        if excess > 0:
+            step = self.history_trim_step
+            messages = messages[-(-excess // step) * step :]
+        # Resultado de ferramenta sem a chamada que o originou é rejeitado pelo provedor
+        start = 0
+        while start < len(messages) and isinstance(messages[start], ToolMessage):
+            start += 1
+        return messages[start:]
+
+    @staticmethod
+    def scheduling_context(state: Mapping) -> List[BaseMessage]:
+        data = get_scheduling_data(state)
+        lines = [
+            f"- {label}: {_format_value(getattr(data, field))}"
+            for field, label in _SCHEDULING_LABELS.items()
+            if getattr(data, field, None) is not None
+        ]
+        if not lines:
+            return []
+        return [SystemMessage(content="**DADOS JÁ COLETADOS:**\n" + "\n".join(lines))]
+
+    def inputs(self, state: Mapping) -> Dict[str, List[BaseMessage]]:
+        """Entradas do template (exceto ``message``) para o turno atual."""
+        messages = list(state.get("messages") or [])
+        # A última mensagem é a do turno atual, enviada no segmento do usuário
+        history = self.history(messages[:-1])
+        summary = state.get("conversation_context")
+        context = self.scheduling_context(state)
+
+        self._calls += 1
+        self._history_messages += len(history)
+        if len(history) < len(messages) - 1:
+            self._trimmed_calls += 1
+        if context:
+            self._context_calls += 1
+
+        return {
+            "summary": [SystemMessage(content=f"**RESUMO DA CONVERSA:**\n{summary.strip()}")]
+            if summary and summary.strip()
+            else [],
+            "chat_history": history,
+            "context": context,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "history_max_messages": self.history_max_messages,
+            "history_trim_step": self.history_trim_step,
+            "calls": self._calls,
+            "mean_history_messages": (
+                round(self._history_messages / self._calls, 2) if self._calls else 0.0
+            ),
+            "trimmed_calls": self._trimmed_calls,
+            "context_calls": self._context_calls,
+        }
+
+
+# Instância única (Singleton) do montador de prompt
+prompt_assembler = PromptAssembler(
+    history_max_messages=settings.PROMPT_HISTORY_MAX_MESSAGES,
+    history_trim_step=settings.PROMPT_HISTORY_TRIM_STEP,
+)
@@ -0,0 +1,89 @@
+import hashlib
+from typing import Optional
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+DEFAULT_CLINIC_NAME = "App Health"
+
+# Segmento estático: o mesmo texto, byte a byte, para todas as clínicas e
+# todos os turnos. Nada aqui pode depender da clínica ou da conversa, senão
+# o cache de prompt do provedor deixa de reaproveitar o prefixo.
+system_prompt_text = """
+Você é um assistente de agendamento virtual da clínica descrita na seção **CLÍNICA** abaixo. Você é o melhor do mundo em seu trabalho.
+
+Sua personalidade é: prestativo, extremamente eficiente, empático e proativo.
+
+Seu principal objetivo é guiar o usuário de forma amigável para marcar uma consulta, coletando todas as informações necessárias passo a passo.
+
+**SUAS REGRAS DE OURO:**
+
+1.  **NUNCA peça todas as informações de uma vez.** Comece pela mais geral (especialidade) e avance passo a passo. Seja conversacional, não um formulário.
+2.  **SEJA PROATIVO:** Se você já tem uma informação (ex: o usuário escolheu 'Cardiologia'), sua PRÓXIMA AÇÃO deve ser usar essa informação (ex: buscar os cardiologistas), e não perguntar novamente por ela.
+3.  **EXTRAIA INFORMAÇÕES:** Sua prioridade número um ao analisar a resposta do usuário é extrair entidades (nome, especialidade, data, hora). Se encontrar alguma, sua primeira ação deve ser chamar a ferramenta `atualizar_detalhes_agendamento` para registrar essa informação no estado.
+4.  **SEJA INTELIGENTE COM SINTOMAS:** Se o usuário descrever um sintoma (ex: 'dor no peito', 'joelho quebrado'), use seu conhecimento para sugerir a especialidade mais provável (ex: 'Cardiologia', 'Ortopedia') em vez de perguntar 'qual especialidade?'.
+5.  **CONFIRME ANTES DE FINALIZAR:** Apenas quando tiver TODAS as informações necessárias (especialidade, profissional, data e hora), você deve apresentar um resumo completo para o usuário e pedir uma confirmação final. Quando o usuário confirmar, chame `atualizar_detalhes_agendamento` com `confirmed` verdadeiro.
+"""
+
+
+def normalize_segment(text: str) -> str:
+    """Normaliza quebras de linha e espaços finais para manter o segmento estável."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def segment_fingerprint(*segments: str) -> str:
+    """Impressão digital (sha256 curto) de segmentos estáticos do prompt."""
+    digest = hashlib.sha256()
+    for segment in segments:
+        digest.update(segment.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:12]
+
+
+def tenant_prompt_text(
+    clinic_name: str = DEFAULT_CLINIC_NAME, instructions: Optional[str] = None
+) -> str:
+    """Segmento da clínica: nome e instruções extras, estáveis entre turnos."""
+    text = f"**CLÍNICA:** {normalize_segment(clinic_name)}"
+    if instructions and instructions.strip():
+        text += f"\n\n**INSTRUÇÕES DA CLÍNICA:**\n\n{normalize_segment(instructions)}"
+    return text
+
+
+SYSTEM_PROMPT = normalize_segment(system_prompt_text)
+
+# Muda só quando o texto estático muda (ex.: entre versões); exposto nas
+# métricas para explicar quedas na taxa de cache depois de um deploy
+SYSTEM_PROMPT_FINGERPRINT = segment_fingerprint(SYSTEM_PROMPT)
+
+
+def build_orchestrator_prompt(
+    clinic_name: str = DEFAULT_CLINIC_NAME, instructions: Optional[str] = None
+) -> ChatPromptTemplate:
+    """
+    Monta o prompt do orquestrador de uma clínica (instância do WhatsApp).
+
+    Os segmentos vão do mais estático ao mais dinâmico, para que o cache de
+    prompt do provedor reaproveite o maior prefixo possível: sistema (igual
+    para todas as clínicas), clínica (``instructions`` são regras extras),
+    resumo da conversa, histórico, dados já coletados, mensagem do usuário e
+    scratchpad. Os segmentos fixos são mensagens prontas, não templates:
+    nenhuma variável é interpolada neles.
+    """
+    return ChatPromptTemplate.from_messages(
+        [
+            SystemMessage(content=SYSTEM_PROMPT),
+            SystemMessage(content=tenant_prompt_text(clinic_name, instructions)),
+            MessagesPlaceholder(variable_name="summary", optional=True),
+            MessagesPlaceholder(variable_name="chat_history", optional=True),
+            MessagesPlaceholder(variable_name="context", optional=True),
+            ("human", "{message}"),
+            # O 'agent_scratchpad' é um placeholder especial que o LangGraph usa para
+            # passar os resultados das ferramentas de volta para o agente. Fica depois
+            # da mensagem: cresce dentro do turno e responde às chamadas do modelo.
+            MessagesPlaceholder(variable_name="agent_scratchpad", optional=True),
+        ]
+    )
+
+
+orchestrator_prompt_template = build_orchestrator_prompt()
@@ -1,17 +1,23 @@
 import logging
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Optional
 from functools import wraps
+from app.application.agent.state.sheduling_agent_state import scheduling_state_contract
+from app.application.agent.state.state_contract import StateContract
 
 logger = logging.getLogger(__name__)
 
 class NodeRegistry:
     """
     Registry centralizado para nodes do langgraph com controle explícito
+
+    Com um ``state_contract``, os nodes registrados passam a devolver
+    apenas os canais que mudaram (ver ``StateContract.delta``).
     """
 
-    def __init__(self):
+    def __init__(self, state_contract: Optional[StateContract] = None):
         self._nodes: Dict[str, Callable] = {}
         self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self.state_contract = state_contract
 
     def register_node(
             self,
@@ -32,7 +38,7 @@ class NodeRegistry:
             if name in self._nodes:
                 raise ValueError(f"Node {name} já registrado.")
             
-            self._nodes[name] = func
+            self._nodes[name] = self._enforce_delta(name, func)
             self._metadatas[name] = {
                 'timeout': timeout,
                 'priority': priority,
@@ -50,6 +56,28 @@ class NodeRegistry:
     
         return decorator
     
+    def _enforce_delta(self, name: str, func: Callable) -> Callable:
+        """
+        Envolve o node para que só os canais alterados cheguem ao grafo
+        (e, portanto, ao checkpoint).
+        """
+        if self.state_contract is None:
+            return func
+        contract = self.state_contract
+
+        @wraps(func)
+        async def delta_node(state, *args, **kwargs):
+            update = await func(state, *args, **kwargs)
+            delta = contract.delta(state, update)
+            if isinstance(update, dict) and len(delta) < len(update):
+                logger.debug(
+                    f"Node {name}: canais sem mudança descartados: "
+                    f"{sorted(set(update) - set(delta))}"
+                )
+            return delta
+
+        return delta_node
+
     def get_nodes(self) -> Dict[str, Callable]:
         """
         Retorna todos os nodes registrados e Ativos
@@ -71,7 +99,7 @@ class NodeRegistry:
         return self._metadatas.copy()
 
 # Instância global (Singleton)    
-node_registry = NodeRegistry()
+node_registry = NodeRegistry(state_contract=scheduling_state_contract)
 
 # Decorator para registrar nodes
 register_node = node_registry.register_node
@@ -4,6 +4,8 @@ from app.application.agent.loaders.node_loader import NodeLoader
 from app.application.agent.loaders.edge_loader import EdgeLoader
 from app.infrastructure.pesistence.postgres_persistence import get_checkpointer, get_store
 from app.application.agent.registry.node_registry import node_registry
+from app.infrastructure.observability.tracing import tracer
+import inspect
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,13 +27,13 @@ class SchedulingAgentBuilder:
         """
         Constrói e compila o agente de agendamento com checkpointer e store.
         """
-        print("Construindo o grafo do agente...")
+        logger.info("Construindo o grafo do agente...")
         self._add_nodes()
         self._add_edges()
 
         self.agent_graph.set_entry_point("ORCHESTRATOR")
 
-        print("Compilando o grafo...")
+        logger.info("Compilando o grafo...")
         # Obter checkpointer e store
         checkpointer = await get_checkpointer()
         store = await get_store()
@@ -50,6 +52,8 @@ class SchedulingAgentBuilder:
         logger.info(f"Adicionando {len(nodes)} nós ativos ao grafo...")
         
         for name, function in nodes.items():
+            if inspect.iscoroutinefunction(function):
+                function = tracer.traced(f"node.{name}")(function)
             self.agent_graph.add_node(name, function)
             metadata = node_registry.get_node_metadata(name)
             logger.info(f"  -> Nó '{name}' adicionado. (Prioridade: {metadata.get('priority', 0)}, Timeout: {metadata.get('timeout', 'N/A')})")
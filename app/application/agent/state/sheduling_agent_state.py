@@ -1,6 +1,7 @@
-from typing import Annotated, Optional, TypedDict
+from typing import Annotated, Mapping, Optional, TypedDict
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
+from app.application.agent.state.state_contract import StateContract
 from app.domain.scheduling_data import SchedulingData
 
 
@@ -16,6 +17,9 @@ class SchedulingAgentState(TypedDict):
     phone_number: str
     message_id: str
 
+    # Instância do WhatsApp (clínica) que recebeu a mensagem
+    instance_id: Optional[str]
+
     # Dados do agendamento
     scheduling_data: SchedulingData
 
@@ -24,3 +28,16 @@ class SchedulingAgentState(TypedDict):
 
     # Contexto da conversa
     conversation_context: Optional[str]
+
+
+# Contrato de atualização aplicado pelo registry a todos os nós
+scheduling_state_contract = StateContract(SchedulingAgentState)
+
+
+def get_scheduling_data(state: Mapping) -> SchedulingData:
+    """
+    Dados de agendamento do estado. O canal só existe depois que algum nó
+    o preenche; o serviço não envia mais um ``SchedulingData()`` vazio a
+    cada turno (isso apagava o progresso já salvo).
+    """
+    return state.get("scheduling_data") or SchedulingData()
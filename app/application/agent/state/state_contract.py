@@ -0,0 +1,52 @@
+from typing import Any, Dict, FrozenSet, Mapping, Optional, get_type_hints
+
+
+class StateContract:
+    """
+    Contrato de atualização do estado de um grafo.
+
+    Os nós devem devolver apenas os canais que mudaram (delta). Canais com
+    reducer (ex: ``messages`` com ``add_messages``) já recebem deltas por
+    definição; nos demais, um valor igual ao atual é descartado, para que o
+    canal não ganhe nova versão nem seja serializado de novo no checkpoint.
+    """
+
+    def __init__(self, schema: type):
+        hints = get_type_hints(schema, include_extras=True)
+        self.name = schema.__name__
+        self.channels: FrozenSet[str] = frozenset(hints)
+        self.reducer_channels: FrozenSet[str] = frozenset(
+            name
+            for name, hint in hints.items()
+            if any(callable(meta) for meta in getattr(hint, "__metadata__", ()))
+        )
+
+    def validate(self, update: Mapping[str, Any]):
+        unknown = set(update) - self.channels
+        if unknown:
+            raise ValueError(
+                f"Canais desconhecidos para {self.name}: {', '.join(sorted(unknown))}"
+            )
+
+    def delta(self, state: Mapping[str, Any], update: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Valida a atualização e remove os canais sem mudança em relação a ``state``."""
+        if not isinstance(update, dict):
+            # None (nada a gravar) ou comandos do LangGraph passam sem alteração
+            return update
+        self.validate(update)
+        return {
+            channel: value
+            for channel, value in update.items()
+            if channel in self.reducer_channels
+            or channel not in state
+            or not _same(state[channel], value)
+        }
+
+
+def _same(current: Any, new: Any) -> bool:
+    if current is new:
+        return True
+    try:
+        return bool(current == new)
+    except Exception:
+        return False
@@ -0,0 +1,73 @@
+import logging
+from typing import Any, Mapping, Optional
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field, ValidationError
+
+from app.domain.scheduling_data import SchedulingData
+
+logger = logging.getLogger(__name__)
+
+SCHEDULING_DETAILS_TOOL = "atualizar_detalhes_agendamento"
+
+
+class SchedulingDetailsUpdate(BaseModel):
+    """
+    Registra no estado da conversa os dados do agendamento informados pelo
+    paciente. Envie apenas os campos novos ou alterados.
+    """
+
+    user_name: Optional[str] = Field(default=None, description="Nome do paciente")
+    professional_name: Optional[str] = Field(
+        default=None, description="Nome do profissional escolhido"
+    )
+    specialty: Optional[str] = Field(default=None, description="Especialidade da consulta")
+    date_scheduled: Optional[str] = Field(
+        default=None, description="Data da consulta no formato AAAA-MM-DD"
+    )
+    turn_scheduled: Optional[str] = Field(
+        default=None, description="Turno preferido: manhã, tarde ou noite"
+    )
+    specific_time: Optional[str] = Field(
+        default=None, description="Horário da consulta no formato HH:MM (24h)"
+    )
+    confirmed: Optional[bool] = Field(
+        default=None,
+        description="true somente quando o paciente confirmar o resumo final da consulta",
+    )
+
+
+def _tool_schema() -> dict:
+    schema = convert_to_openai_tool(SchedulingDetailsUpdate)
+    schema["function"]["name"] = SCHEDULING_DETAILS_TOOL
+    return schema
+
+
+# Ferramenta citada na regra 3 do prompt do orquestrador. O esquema é fixo:
+# vai no prefixo da requisição e não atrapalha o cache de prompt
+SCHEDULING_DETAILS_TOOL_SCHEMA = _tool_schema()
+
+
+def apply_scheduling_details(
+    data: SchedulingData, arguments: Mapping[str, Any]
+) -> SchedulingData:
+    """
+    Aplica os argumentos de uma chamada da ferramenta sobre ``data``.
+    Campos ausentes ou nulos mantêm o valor atual. Alterar data, horário ou
+    profissional sem nova confirmação desfaz a confirmação anterior.
+    """
+    try:
+        update = SchedulingDetailsUpdate.model_validate(arguments)
+    except ValidationError as e:
+        logger.warning(f"Argumentos inválidos em {SCHEDULING_DETAILS_TOOL}: {e}")
+        return data
+
+    changes = update.model_dump(exclude_none=True)
+    current = data.model_dump()
+    rescheduled = any(
+        field in changes and changes[field] != current[field]
+        for field in ("professional_name", "date_scheduled", "specific_time")
+    )
+    if rescheduled and "confirmed" not in changes:
+        changes["confirmed"] = None
+    return data.model_copy(update=changes)
@@ -0,0 +1,60 @@
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredMessageQueue:
+    """
+    Fila em memória das mensagens recebidas enquanto o agente opera em
+    modo degradado (circuito do LLM ou do Postgres aberto).
+
+    Fica em memória de propósito: quando o Postgres é a dependência fora
+    do ar, não há onde gravar. As mensagens são reprocessadas quando os
+    circuitos voltam a fechar.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._items: Deque[Dict[str, str]] = deque()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def enqueue(
+        self,
+        phone_number: str,
+        message_text: str,
+        message_id: str,
+        instance_id: Optional[str] = None,
+    ) -> bool:
+        """Enfileira a mensagem. Retorna False se a fila estiver cheia."""
+        if len(self._items) >= self.max_size:
+            self._dropped += 1
+            logger.error(
+                f"Fila de mensagens adiadas cheia ({self.max_size}). "
+                f"Mensagem '{message_id}' de {phone_number} descartada."
+            )
+            return False
+        self._items.append(
+            {
+                "phone_number": phone_number,
+                "message_text": message_text,
+                "message_id": message_id,
+                "instance_id": instance_id,
+                "deferred_at": time.time(),
+            }
+        )
+        return True
+
+    def drain(self) -> List[Dict[str, str]]:
+        """Remove e retorna todas as mensagens, na ordem de chegada."""
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": len(self._items), "dropped": self._dropped}
@@ -0,0 +1,253 @@
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.database.database_session import AsyncSessionFactory
+from app.infrastructure.ingress.message_dedup import MessageDedupIndex
+from app.infrastructure.resilience.breakers import dedup_breaker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngressMessage:
+    """Campos do webhook usados pelos filtros de entrada."""
+
+    message_id: str
+    phone_number: str
+    text: str
+    instance_id: Optional[str] = None
+    from_me: bool = False
+    is_group: bool = False
+
+
+@dataclass
+class IngressDecision:
+    """Resultado do pipeline: aceita ou descartada por ``filter``."""
+
+    accepted: bool
+    filter: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class IngressFilter:
+    """
+    Filtro do pipeline de entrada. ``check`` retorna None para deixar a
+    mensagem seguir ou o motivo do descarte.
+    """
+
+    name: str = "filter"
+
+    async def check(self, message: IngressMessage) -> Optional[str]:
+        raise NotImplementedError
+
+
+class FromMeFilter(IngressFilter):
+    """Descarta os ecos das mensagens enviadas pela própria instância."""
+
+    name = "from_me"
+
+    async def check(self, message: IngressMessage) -> Optional[str]:
+        return "from_me" if message.from_me else None
+
+
+class GroupFilter(IngressFilter):
+    """Descarta mensagens de grupos: o agente só atende conversas individuais."""
+
+    name = "group"
+
+    async def check(self, message: IngressMessage) -> Optional[str]:
+        return "group" if message.is_group else None
+
+
+class DuplicateFilter(IngressFilter):
+    """Descarta retries do gateway com um message_id já recebido."""
+
+    name = "duplicate"
+
+    def __init__(self, index: MessageDedupIndex):
+        self.index = index
+
+    async def check(self, message: IngressMessage) -> Optional[str]:
+        registered = await self.index.register(
+            message.instance_id, message.message_id, message.phone_number
+        )
+        return None if registered else "duplicate_message_id"
+
+
+class _PhoneHistory:
+    __slots__ = ("timestamps", "last_text", "repeats")
+
+    def __init__(self):
+        self.timestamps: Deque[float] = deque()
+        self.last_text: Optional[str] = None
+        self.repeats = 0
+
+
+class FloodFilter(IngressFilter):
+    """
+    Descarta flood e spam por telefone: mais de ``max_messages`` mensagens
+    em ``window_seconds`` segundos, ou o mesmo texto repetido mais de
+    ``max_repeats`` vezes seguidas. Guarda no máximo ``max_tracked_phones``
+    telefones (LRU).
+    """
+
+    name = "flood"
+
+    def __init__(
+        self,
+        max_messages: int,
+        window_seconds: float,
+        max_repeats: int,
+        max_tracked_phones: int = 10000,
+    ):
+        self.max_messages = max_messages
+        self.window_seconds = window_seconds
+        self.max_repeats = max_repeats
+        self.max_tracked_phones = max_tracked_phones
+        # (instance_id, telefone) -> histórico recente
+        self._phones: "OrderedDict[Tuple[str, str], _PhoneHistory]" = OrderedDict()
+
+    def _history(self, key: Tuple[str, str]) -> _PhoneHistory:
+        history = self._phones.get(key)
+        if history is None:
+            history = self._phones[key] = _PhoneHistory()
+            if len(self._phones) > self.max_tracked_phones:
+                self._phones.popitem(last=False)
+        else:
+            self._phones.move_to_end(key)
+        return history
+
+    async def check(self, message: IngressMessage) -> Optional[str]:
+        now = time.monotonic()
+        history = self._history((message.instance_id or "", message.phone_number))
+        timestamps = history.timestamps
+        while timestamps and now - timestamps[0] > self.window_seconds:
+            timestamps.popleft()
+        timestamps.append(now)
+
+        text = message.text.strip().lower()
+        history.repeats = history.repeats + 1 if text == history.last_text else 1
+        history.last_text = text
+
+        if len(timestamps) > self.max_messages:
+            return "flood"
+        if history.repeats > self.max_repeats:
+            return "repeated_text"
+        return None
+
+
+class _FilterCounters:
+    __slots__ = ("evaluated", "dropped", "seconds", "reasons")
+
+    def __init__(self):
+        self.evaluated = 0
+        self.dropped = 0
+        self.seconds = 0.0
+        self.reasons: Dict[str, int] = {}
+
+
+class IngressPipeline:
+    """
+    Pipeline de filtros executado antes do ``SchedulingService``.
+
+    Os filtros rodam na ordem de registro e o primeiro que recusa encerra
+    a avaliação; por isso os mais baratos (checagens de campos) vêm antes
+    dos que fazem I/O. Cada filtro tem contadores de avaliações, descartes
+    por motivo e tempo gasto.
+    """
+
+    def __init__(self, filters: Optional[List[IngressFilter]] = None):
+        self.filters: List[IngressFilter] = []
+        self._counters: Dict[str, _FilterCounters] = {}
+        self._accepted = 0
+        for ingress_filter in filters or []:
+            self.add_filter(ingress_filter)
+
+    def add_filter(self, ingress_filter: IngressFilter):
+        self.filters.append(ingress_filter)
+        self._counters[ingress_filter.name] = _FilterCounters()
+
+    async def evaluate(self, message: IngressMessage) -> IngressDecision:
+        for ingress_filter in self.filters:
+            counters = self._counters[ingress_filter.name]
+            started = time.perf_counter()
+            reason = await ingress_filter.check(message)
+            counters.seconds += time.perf_counter() - started
+            counters.evaluated += 1
+            if reason is not None:
+                counters.dropped += 1
+                counters.reasons[reason] = counters.reasons.get(reason, 0) + 1
+                logger.debug(
+                    "Mensagem '%s' de '%s' descartada pelo filtro '%s' (%s).",
+                    message.message_id,
+                    message.phone_number,
+                    ingress_filter.name,
+                    reason,
+                )
+                return IngressDecision(accepted=False, filter=ingress_filter.name, reason=reason)
+        self._accepted += 1
+        return IngressDecision(accepted=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "accepted": self._accepted,
+            "filters": {
+                name: {
+                    "evaluated": c.evaluated,
+                    "dropped": c.dropped,
+                    "reasons": dict(c.reasons),
+                    "mean_microseconds": (
+                        round(c.seconds / c.evaluated * 1e6, 1) if c.evaluated else 0.0
+                    ),
+                }
+                for name, c in self._counters.items()
+            },
+        }
+
+
+def _build_pipeline() -> Tuple[IngressPipeline, Optional[MessageDedupIndex]]:
+    pipeline = IngressPipeline()
+    if settings.INGRESS_DROP_FROM_ME:
+        pipeline.add_filter(FromMeFilter())
+    if settings.INGRESS_DROP_GROUPS:
+        pipeline.add_filter(GroupFilter())
+
+    dedup_index = None
+    if settings.INGRESS_DEDUP_ENABLED:
+        dedup_index = MessageDedupIndex(
+            cache_size=settings.INGRESS_DEDUP_CACHE_SIZE,
+            retention_hours=settings.INGRESS_DEDUP_RETENTION_HOURS,
+            breaker=dedup_breaker,
+            # Backend embutido: deduplicação apenas em memória, sem Postgres
+            session_factory=(
+                None if settings.PERSISTENCE_BACKEND == "sqlite" else AsyncSessionFactory
+            ),
+        )
+        pipeline.add_filter(DuplicateFilter(dedup_index))
+
+    if settings.INGRESS_FLOOD_MAX_MESSAGES > 0:
+        pipeline.add_filter(
+            FloodFilter(
+                max_messages=settings.INGRESS_FLOOD_MAX_MESSAGES,
+                window_seconds=settings.INGRESS_FLOOD_WINDOW_SECONDS,
+                max_repeats=settings.INGRESS_FLOOD_MAX_REPEATS,
+            )
+        )
+    return pipeline, dedup_index
+
+
+# Instância única (Singleton) do pipeline de entrada e do índice de deduplicação
+ingress_pipeline, message_dedup_index = _build_pipeline()
+
+
+async def forget_message(instance_id: Optional[str], message_id: str):
+    """
+    Tira do índice de deduplicação uma mensagem aceita pelos filtros mas
+    não processada, para que o retry do gateway não seja descartado.
+    """
+    if message_dedup_index is not None:
+        await message_dedup_index.forget(instance_id, message_id)
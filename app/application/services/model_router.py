@@ -0,0 +1,327 @@
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+
+from app.domain.scheduling_data import SchedulingData
+from app.infrastructure.config.config import settings
+from app.infrastructure.observability.usage_accounting import UsageAccountant, usage_accountant
+from app.infrastructure.resilience.admission_control import LoadSheddingError
+from app.infrastructure.resilience.circuit_breaker import CircuitOpenError
+
+if TYPE_CHECKING:
+    # Só para anotações: o tenant_registry importa o pacote do agente, que
+    # importa este módulo (orchestrator_node -> model_router)
+    from app.infrastructure.tenancy.tenant_registry import TenantContext
+
+logger = logging.getLogger(__name__)
+
+SMALL_TIER = "small"
+LARGE_TIER = "large"
+
+# Respostas curtas que não pedem raciocínio (confirmações, agradecimentos)
+_ACKNOWLEDGEMENTS = frozenset(
+    {
+        "ok", "okay", "sim", "s", "não", "nao", "n", "obrigado", "obrigada", "obg",
+        "valeu", "blz", "beleza", "certo", "isso", "perfeito", "oi", "olá", "ola",
+        "bom dia", "boa tarde", "boa noite", "tudo bem", "pode ser", "confirmo",
+    }
+)
+
+# Entidades extraídas localmente (sem LLM): categoria -> padrão
+_ENTITY_PATTERNS = {
+    "date": re.compile(
+        r"\b(\d{1,2}/\d{1,2}(/\d{2,4})?|hoje|amanh[ãa]|segunda|ter[çc]a|quarta|quinta|sexta|s[áa]bado|domingo)\b"
+    ),
+    "time": re.compile(r"\b(\d{1,2}(:\d{2}|h\d{0,2})|manh[ãa]|tarde|noite)\b"),
+    "symptom": re.compile(
+        r"\b(dor(es)?|febre|tontura|enjoo|n[áa]usea|sangramento|falta de ar|"
+        r"sintomas?|exames?|rem[ée]dios?|medicamentos?|alergia|gr[áa]vida|gesta[çc][ãa]o)\b"
+    ),
+    "change": re.compile(r"\b(remarcar|reagendar|cancelar|desmarcar|trocar|mudar)\b"),
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+@dataclass
+class RouteDecision:
+    """Camada escolhida para o turno, com a pontuação e os motivos."""
+
+    tier: str
+    score: int
+    reasons: List[str] = field(default_factory=list)
+
+
+class TurnComplexityScorer:
+    """
+    Pontua a complexidade de um turno localmente, sem chamar o LLM.
+
+    Soma pontos pelo tamanho da mensagem, pelas categorias de entidades
+    encontradas (datas, horários, sintomas, pedidos de alteração), por
+    perguntas múltiplas e pela fase da conversa em ``scheduling_data``
+    (o primeiro turno define o contexto; na confirmação, com tudo
+    preenchido, basta o modelo pequeno). Confirmações curtas valem zero.
+    """
+
+    def __init__(self, long_message_words: int = 40):
+        self.long_message_words = long_message_words
+
+    @staticmethod
+    def phase(scheduling_data: Optional[SchedulingData]) -> str:
+        if scheduling_data is None:
+            return "start"
+        collected = scheduling_data.model_dump(exclude={"confirmed"})
+        filled = sum(value is not None for value in collected.values())
+        if filled == 0:
+            return "start"
+        if filled == len(collected):
+            return "confirming"
+        return "collecting"
+
+    def score(
+        self, text: str, scheduling_data: Optional[SchedulingData] = None
+    ) -> RouteDecision:
+        normalized = text.strip().lower()
+        if _PUNCTUATION.sub("", normalized).strip() in _ACKNOWLEDGEMENTS:
+            return RouteDecision(SMALL_TIER, 0, ["acknowledgement"])
+
+        score = 0
+        reasons: List[str] = []
+
+        words = len(normalized.split())
+        if words > self.long_message_words:
+            score += 2
+            reasons.append("long_message")
+        elif words > self.long_message_words // 4:
+            score += 1
+            reasons.append("medium_message")
+
+        for category, pattern in _ENTITY_PATTERNS.items():
+            if pattern.search(normalized):
+                # Sintomas e alterações de agenda pedem mais cuidado que datas
+                score += 2 if category in ("symptom", "change") else 1
+                reasons.append(category)
+
+        if normalized.count("?") > 1:
+            score += 1
+            reasons.append("multiple_questions")
+
+        phase = self.phase(scheduling_data)
+        if phase == "start":
+            score += 1
+            reasons.append("phase_start")
+        elif phase == "confirming":
+            score -= 1
+            reasons.append("phase_confirming")
+
+        return RouteDecision(SMALL_TIER, max(score, 0), reasons)
+
+
+class _TierStats:
+    __slots__ = (
+        "calls",
+        "errors",
+        "latency_seconds",
+        "max_latency_seconds",
+        "cost",
+        "input_tokens",
+        "cached_tokens",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self.cost = 0.0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+
+class ModelRouter:
+    """
+    Estágio de roteamento na frente do ``LLMFactory``: cada turno vai para
+    o modelo pequeno ou para o grande conforme a pontuação do
+    ``TurnComplexityScorer``.
+
+    Turnos com pontuação a partir de ``escalate_score`` vão direto para o
+    modelo grande. Com ``escalate_on_failure``, um erro ou uma resposta
+    vazia do modelo pequeno refaz o turno no grande; circuito aberto e
+    cota esgotada sobem como estão, pois valem para os dois modelos.
+    Latência, custo e taxa de escalonamento por camada ficam em ``stats``.
+    """
+
+    def __init__(
+        self,
+        scorer: TurnComplexityScorer,
+        small_model: str,
+        large_model: Optional[str] = None,
+        escalate_score: int = 4,
+        escalate_on_failure: bool = True,
+        enabled: bool = True,
+        accountant: UsageAccountant = usage_accountant,
+    ):
+        self.scorer = scorer
+        self.small_model = small_model
+        self.large_model = large_model
+        self.escalate_score = escalate_score
+        self.escalate_on_failure = escalate_on_failure
+        self.enabled = enabled
+        self.accountant = accountant
+        self._tiers: Dict[str, _TierStats] = {SMALL_TIER: _TierStats(), LARGE_TIER: _TierStats()}
+        self._turns = 0
+        self._routed_large = 0
+        self._fallback_escalations = 0
+        self._reasons: Dict[str, int] = {}
+
+    def route(
+        self, text: str, scheduling_data: Optional[SchedulingData] = None
+    ) -> RouteDecision:
+        if not self.enabled:
+            return RouteDecision(LARGE_TIER, 0, ["tiering_disabled"])
+        decision = self.scorer.score(text, scheduling_data)
+        if decision.score >= self.escalate_score:
+            decision.tier = LARGE_TIER
+        return decision
+
+    def model_for(self, tier: str, tenant: "TenantContext") -> Optional[str]:
+        """Modelo da camada; o modelo da instância, se configurado, é o grande."""
+        if tier == SMALL_TIER:
+            return self.small_model
+        return tenant.config.model_name or self.large_model
+
+    async def _call(
+        self,
+        tier: str,
+        tenant: "TenantContext",
+        text: str,
+        prompt_inputs: Optional[Mapping[str, Any]],
+    ):
+        model = self.model_for(tier, tenant)
+        stats = self._tiers[tier]
+        started = time.perf_counter()
+        try:
+            response = await tenant.llm_service_for(model).orchestrator_prompt_template(
+                text, prompt_inputs
+            )
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.latency_seconds += elapsed
+            stats.max_latency_seconds = max(stats.max_latency_seconds, elapsed)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        stats.input_tokens += input_tokens
+        stats.cached_tokens += cached_tokens
+        stats.cost += self.accountant.cost(
+            model or settings.OPENAI_MODEL_NAME,
+            input_tokens,
+            usage.get("output_tokens", 0),
+            cached_tokens,
+        )
+        return response
+
+    def route_turn(
+        self, text: str, scheduling_data: Optional[SchedulingData] = None
+    ) -> RouteDecision:
+        """Roteia um turno e o contabiliza em ``stats`` (uma vez por turno)."""
+        decision = self.route(text, scheduling_data)
+        self._turns += 1
+        for reason in decision.reasons:
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+        if decision.tier == LARGE_TIER:
+            self._routed_large += 1
+        return decision
+
+    async def invoke(
+        self,
+        tenant: "TenantContext",
+        text: str,
+        scheduling_data: Optional[SchedulingData] = None,
+        prompt_inputs: Optional[Mapping[str, Any]] = None,
+        decision: Optional[RouteDecision] = None,
+    ):
+        """
+        Chama o LLM da instância na camada escolhida.
+        ``prompt_inputs`` são os demais segmentos do prompt (ver ``PromptAssembler``).
+        Um turno com várias chamadas (ferramentas) roteia uma vez com
+        ``route_turn`` e passa a mesma ``decision`` a cada chamada; sem ela,
+        a chamada é roteada e contada como um turno.
+        """
+        if decision is None:
+            decision = self.route_turn(text, scheduling_data)
+        if decision.tier == LARGE_TIER:
+            return await self._call(LARGE_TIER, tenant, text, prompt_inputs)
+
+        try:
+            response = await self._call(SMALL_TIER, tenant, text, prompt_inputs)
+        except (CircuitOpenError, LoadSheddingError):
+            raise
+        except Exception as e:
+            if not self.escalate_on_failure:
+                raise
+            logger.warning(f"Modelo pequeno falhou ({e}); escalonando o turno para o grande.")
+            self._fallback_escalations += 1
+            return await self._call(LARGE_TIER, tenant, text, prompt_inputs)
+
+        # Chamada de ferramenta sem texto é uma resposta válida
+        empty = not str(getattr(response, "content", "")).strip() and not getattr(
+            response, "tool_calls", None
+        )
+        if self.escalate_on_failure and empty:
+            logger.warning("Resposta vazia do modelo pequeno; escalonando o turno para o grande.")
+            self._fallback_escalations += 1
+            return await self._call(LARGE_TIER, tenant, text, prompt_inputs)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        escalated = self._routed_large + self._fallback_escalations
+        return {
+            "enabled": self.enabled,
+            "escalate_score": self.escalate_score,
+            "turns": self._turns,
+            "routed_large": self._routed_large,
+            "fallback_escalations": self._fallback_escalations,
+            "escalation_rate": round(escalated / self._turns, 4) if self._turns else 0.0,
+            "reasons": dict(self._reasons),
+            "tiers": {
+                tier: {
+                    "model": (
+                        self.small_model
+                        if tier == SMALL_TIER
+                        else self.large_model or settings.OPENAI_MODEL_NAME
+                    ),
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "mean_latency_seconds": (
+                        round(s.latency_seconds / s.calls, 4) if s.calls else 0.0
+                    ),
+                    "max_latency_seconds": round(s.max_latency_seconds, 4),
+                    "cost": round(s.cost, 6),
+                    "input_tokens": s.input_tokens,
+                    "cached_input_tokens": s.cached_tokens,
+                    "cached_input_ratio": (
+                        round(s.cached_tokens / s.input_tokens, 4) if s.input_tokens else 0.0
+                    ),
+                }
+                for tier, s in self._tiers.items()
+            },
+        }
+
+
+# Instância única (Singleton) do roteador de modelos
+model_router = ModelRouter(
+    TurnComplexityScorer(long_message_words=settings.MODEL_TIER_LONG_MESSAGE_WORDS),
+    small_model=settings.MODEL_TIER_SMALL_MODEL or settings.OPENAI_MODEL_NAME,
+    large_model=settings.MODEL_TIER_LARGE_MODEL,
+    escalate_score=settings.MODEL_TIER_ESCALATE_SCORE,
+    escalate_on_failure=settings.MODEL_TIER_ESCALATE_ON_FAILURE,
+    enabled=settings.MODEL_TIERING_ENABLED,
+)
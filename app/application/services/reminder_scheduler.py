@@ -0,0 +1,408 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from langchain_core.messages import AIMessage
+
+from app.application.agent.scheduling_agent_builder import get_scheduling_agent
+from app.application.agent.state.sheduling_agent_state import get_scheduling_data
+from app.domain.reminder_models import AppointmentReminder
+from app.domain.scheduling_data import SchedulingData
+from app.infrastructure.config.config import settings
+from app.infrastructure.observability.tracing import tracer
+from app.infrastructure.outbound.delivery import get_outbound_dispatcher
+from app.infrastructure.reminders.reminder_repository import ReminderRepository
+from app.infrastructure.reminders.timer_wheel import HierarchicalTimerWheel
+from app.infrastructure.tenancy.fair_scheduler import tenant_scheduler
+from app.infrastructure.tenancy.tenant_keys import tenant_thread_id
+from app.infrastructure.tenancy.tenant_registry import tenant_registry
+
+logger = logging.getLogger(__name__)
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y")
+_DAY_MONTH = re.compile(r"^\s*(\d{1,2})/(\d{1,2})\s*$")
+_TIME = re.compile(r"^\s*(\d{1,2})\s*(?:[:h]\s*(\d{2})?)?\s*$", re.IGNORECASE)
+
+
+class _Fields(dict):
+    """Campos do texto do lembrete; campos desconhecidos ficam vazios."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _parse_date(value: str, today: date) -> Optional[date]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    match = _DAY_MONTH.match(value)
+    if match:
+        # Sem ano: a próxima ocorrência do dia/mês
+        try:
+            parsed = date(today.year, int(match.group(2)), int(match.group(1)))
+        except ValueError:
+            return None
+        if parsed < today:
+            parsed = parsed.replace(year=today.year + 1)
+        return parsed
+    return None
+
+
+def _parse_time(value: str) -> Optional[Tuple[int, int]]:
+    match = _TIME.match(value)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+class ReminderScheduler:
+    """
+    Lembretes e pedidos de confirmação das consultas marcadas.
+
+    Quando uma conversa termina o turno com ``date_scheduled`` e
+    ``specific_time`` preenchidos e ``confirmed`` (gravados pelo orquestrador
+    com a ferramenta ``atualizar_detalhes_agendamento``), os lembretes da
+    consulta (um por tipo em ``offsets_hours``) são gravados em ``appointment_reminders``, cujo
+    índice parcial de vencimento é a fonte da verdade. Em memória fica só
+    a janela dos próximos ``horizon_seconds``, em uma timer wheel
+    hierárquica: o loop dorme até o próximo vencimento da roda, em vez de
+    varrer a tabela ou manter um timer por consulta. Ao reiniciar, só essa
+    janela é lida de novo (uma varredura de intervalo no índice); os
+    vencidos durante a parada são reservados direto com ``SKIP LOCKED``.
+
+    Cada lembrete vencido é revalidado contra o estado da conversa (a
+    consulta pode ter sido remarcada), entra no histórico da thread pelo
+    grafo compilado (``aupdate_state`` como se fosse uma resposta do
+    orquestrador, para a resposta do paciente ter contexto) e vai para o
+    outbox. Os disparos acontecem em lotes de ``batch_size``, no máximo
+    ``max_concurrency`` ao mesmo tempo e dentro da vaga da instância.
+
+    Com vários workers, cada um reserva os vencidos de todos; a leitura
+    periódica (``poll_interval_seconds``) cobre lembretes agendados por
+    outro worker dentro de uma janela já carregada.
+    """
+
+    def __init__(
+        self,
+        repository: ReminderRepository,
+        offsets_hours: Dict[str, float],
+        messages: Dict[str, str],
+        timezone_name: str = "America/Sao_Paulo",
+        horizon_seconds: float = 3600.0,
+        batch_size: int = 100,
+        max_concurrency: int = 8,
+        max_attempts: int = 5,
+        lease_seconds: float = 120.0,
+        poll_interval_seconds: float = 60.0,
+        backoff_base_seconds: float = 30.0,
+        backoff_max_seconds: float = 1800.0,
+        max_tracked_threads: int = 10000,
+    ):
+        self.repository = repository
+        self.offsets_hours = offsets_hours
+        self.messages = messages
+        self.timezone = ZoneInfo(timezone_name)
+        self.horizon_seconds = horizon_seconds
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_tracked_threads = max_tracked_threads
+
+        self.wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(now=time.time())
+        self._loaded_until: Optional[float] = None
+        # Thread -> consulta já agendada: evita regravar a cada turno
+        self._scheduled: "OrderedDict[str, datetime]" = OrderedDict()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._agent = None
+        self._counters = {
+            "scheduled": 0,
+            "loaded": 0,
+            "wakeups": 0,
+            "claimed": 0,
+            "sent": 0,
+            "cancelled": 0,
+            "retried": 0,
+            "failed": 0,
+        }
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None
+
+    # --- Agendamento ---
+
+    def appointment_at(self, data: SchedulingData) -> Optional[datetime]:
+        """
+        Data e horário da consulta (UTC), ou None se ainda incompletos ou
+        não confirmados pelo paciente.
+        """
+        if not data.confirmed or not data.date_scheduled or not data.specific_time:
+            return None
+        today = datetime.now(self.timezone).date()
+        day = _parse_date(data.date_scheduled, today)
+        hour_minute = _parse_time(data.specific_time)
+        if day is None or hour_minute is None:
+            return None
+        local = datetime(day.year, day.month, day.day, *hour_minute, tzinfo=self.timezone)
+        return local.astimezone(timezone.utc)
+
+    async def schedule_appointment(
+        self, phone_number: str, instance_id: Optional[str], data: SchedulingData
+    ) -> int:
+        """
+        Agenda os lembretes da consulta em ``data``. Sem consulta (dados
+        incompletos ou apagados), cancela os que esta instância agendou
+        para a conversa. Retorna quantos lembretes foram criados.
+        """
+        thread_id = tenant_thread_id(phone_number, instance_id)
+        appointment = self.appointment_at(data)
+        if appointment is None:
+            if self._scheduled.pop(thread_id, None) is not None:
+                await self.repository.cancel(instance_id, phone_number)
+            return 0
+        if self._scheduled.get(thread_id) == appointment:
+            self._scheduled.move_to_end(thread_id)
+            return 0
+
+        now = datetime.now(timezone.utc)
+        due = {
+            kind: appointment - timedelta(hours=hours)
+            for kind, hours in self.offsets_hours.items()
+            if appointment - timedelta(hours=hours) > now
+        }
+        created = await self.repository.schedule(instance_id, phone_number, appointment, due)
+        self._scheduled[thread_id] = appointment
+        if len(self._scheduled) > self.max_tracked_threads:
+            self._scheduled.popitem(last=False)
+        for reminder_id, due_at in created:
+            self._track(reminder_id, due_at)
+        self._counters["scheduled"] += len(created)
+        return len(created)
+
+    def _track(self, reminder_id: int, due_at: datetime):
+        """Põe na roda o que vence dentro da janela já carregada; o resto vem no refill."""
+        due = due_at.timestamp()
+        if self._loaded_until is not None and due <= self._loaded_until:
+            self.wheel.schedule(reminder_id, due)
+            self._wake.set()
+
+    async def _refill(self, now: float):
+        """Carrega na roda os pendentes que vencem até ``now + horizon_seconds``."""
+        until = now + self.horizon_seconds
+        cursor = (
+            datetime.fromtimestamp(self._loaded_until or now, tz=timezone.utc),
+            0,
+        )
+        until_at = datetime.fromtimestamp(until, tz=timezone.utc)
+        while True:
+            rows = await self.repository.due_window(until_at, cursor, limit=1000)
+            for reminder_id, due_at in rows:
+                self.wheel.schedule(reminder_id, due_at.timestamp())
+            self._counters["loaded"] += len(rows)
+            if len(rows) < 1000:
+                break
+            last_id, last_due = rows[-1]
+            cursor = (last_due, last_id)
+        self._loaded_until = until
+
+    # --- Disparo ---
+
+    def render(self, kind: str, data: SchedulingData, appointment: datetime) -> Optional[str]:
+        template = self.messages.get(kind)
+        if not template:
+            return None
+        local = appointment.astimezone(self.timezone)
+        fields = _Fields(
+            date=local.strftime("%d/%m"),
+            time=local.strftime("%H:%M"),
+            specialty=f" de {data.specialty}" if data.specialty else "",
+            professional=f" com {data.professional_name}" if data.professional_name else "",
+            user_name=data.user_name or "",
+        )
+        return template.format_map(fields)
+
+    async def _fire(self, reminder: AppointmentReminder) -> Tuple[str, str]:
+        instance_id = reminder.instance_id or None
+        config = {
+            "configurable": {"thread_id": tenant_thread_id(reminder.phone_number, instance_id)}
+        }
+        snapshot = await self._agent.aget_state(config)
+        data = get_scheduling_data(snapshot.values)
+        if self.appointment_at(data) != reminder.appointment_at:
+            return "cancelled", "consulta alterada ou desmarcada"
+        text = self.render(reminder.kind, data, reminder.appointment_at)
+        if text is None:
+            return "cancelled", f"tipo de lembrete sem mensagem: {reminder.kind}"
+
+        tenant = tenant_registry.get(instance_id)
+        async with tenant_scheduler.slot(tenant.instance_id, tenant.config.max_concurrency):
+            messages = snapshot.values.get("messages") or []
+            # Uma nova tentativa não repete a mensagem no histórico
+            if not (
+                messages
+                and isinstance(messages[-1], AIMessage)
+                and messages[-1].content == text
+            ):
+                await self._agent.aupdate_state(
+                    config, {"messages": [AIMessage(content=text)]}, as_node="ORCHESTRATOR"
+                )
+        await get_outbound_dispatcher().enqueue(
+            reminder.phone_number, text, instance_id=instance_id, kind=reminder.kind
+        )
+        return "sent", ""
+
+    async def _fire_guarded(
+        self, semaphore: asyncio.Semaphore, reminder: AppointmentReminder
+    ) -> Tuple[str, str]:
+        async with semaphore:
+            with tracer.span("reminder.fire", kind=reminder.kind):
+                try:
+                    return await self._fire(reminder)
+                except Exception as e:
+                    return "error", str(e) or type(e).__name__
+
+    def _retry_at(self, attempts: int) -> datetime:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempts - 1))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def _fire_due(self) -> int:
+        """Reserva e dispara os vencidos, em lotes, até esgotar. Retorna quantos."""
+        fired = 0
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        while True:
+            reminders = await self.repository.claim_due(self.batch_size, self.lease_seconds)
+            if not reminders:
+                return fired
+            self._counters["claimed"] += len(reminders)
+            for reminder in reminders:
+                self.wheel.cancel(reminder.reminder_id)
+
+            outcomes = await asyncio.gather(
+                *(self._fire_guarded(semaphore, reminder) for reminder in reminders)
+            )
+            sent: List[int] = []
+            cancelled: Dict[str, List[int]] = {}
+            for reminder, (outcome, detail) in zip(reminders, outcomes):
+                if outcome == "sent":
+                    sent.append(reminder.reminder_id)
+                elif outcome == "cancelled":
+                    cancelled.setdefault(detail, []).append(reminder.reminder_id)
+                elif reminder.attempts < self.max_attempts:
+                    retry_at = self._retry_at(reminder.attempts)
+                    await self.repository.mark_failed([reminder.reminder_id], detail, retry_at)
+                    self._track(reminder.reminder_id, retry_at)
+                    self._counters["retried"] += 1
+                else:
+                    logger.warning(
+                        f"Lembrete {reminder.reminder_id} descartado após "
+                        f"{reminder.attempts} tentativas: {detail}"
+                    )
+                    await self.repository.mark_failed([reminder.reminder_id], detail, None)
+                    self._counters["failed"] += 1
+
+            await self.repository.mark_sent(sent)
+            for reason, ids in cancelled.items():
+                await self.repository.mark_cancelled(ids, reason)
+            self._counters["sent"] += len(sent)
+            self._counters["cancelled"] += sum(map(len, cancelled.values()))
+            fired += len(reminders)
+            if len(reminders) < self.batch_size:
+                return fired
+
+    # --- Loop ---
+
+    async def _run(self):
+        self._agent = await get_scheduling_agent()
+        next_poll = 0.0
+        while True:
+            self._wake.clear()
+            try:
+                now = time.time()
+                # Recarrega na metade da janela: a roda nunca fica sem os próximos vencimentos
+                if self._loaded_until is None or now >= self._loaded_until - self.horizon_seconds / 2:
+                    await self._refill(now)
+                due = self.wheel.advance(now)
+                if due or now >= next_poll:
+                    self._counters["wakeups"] += 1
+                    fired = await self._fire_due()
+                    if fired:
+                        logger.info(f"{fired} lembretes de consulta processados.")
+                    next_poll = (
+                        time.time() + self.poll_interval_seconds
+                        if self.poll_interval_seconds > 0
+                        else float("inf")
+                    )
+            except Exception as e:
+                logger.error(f"Erro no agendador de lembretes: {e}")
+                next_poll = time.time() + max(self.poll_interval_seconds, 5.0)
+
+            now = time.time()
+            deadlines = [next_poll, (self._loaded_until or now) - self.horizon_seconds / 2]
+            deadline = self.wheel.next_deadline()
+            if deadline is not None:
+                deadlines.append(deadline)
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(0.0, min(deadlines) - now))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Agendador de lembretes iniciado (janela de {self.horizon_seconds:.0f}s)."
+            )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "loaded_until": (
+                datetime.fromtimestamp(self._loaded_until, tz=timezone.utc).isoformat()
+                if self._loaded_until is not None
+                else None
+            ),
+            "wheel": self.wheel.stats(),
+            "tracked_threads": len(self._scheduled),
+            **self._counters,
+        }
+
+
+# Instância única (Singleton) do agendador de lembretes de consulta
+reminder_scheduler = ReminderScheduler(
+    ReminderRepository(),
+    offsets_hours=settings.REMINDER_OFFSETS_HOURS,
+    messages=settings.REMINDER_MESSAGES,
+    timezone_name=settings.REMINDER_TIMEZONE,
+    horizon_seconds=settings.REMINDER_HORIZON_SECONDS,
+    batch_size=settings.REMINDER_BATCH_SIZE,
+    max_concurrency=settings.REMINDER_MAX_CONCURRENCY,
+    max_attempts=settings.REMINDER_MAX_ATTEMPTS,
+    lease_seconds=settings.REMINDER_LEASE_SECONDS,
+    poll_interval_seconds=settings.REMINDER_POLL_INTERVAL_SECONDS,
+)
@@ -1,11 +1,49 @@
+import asyncio
 import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
 from langchain_core.messages import HumanMessage
 from fastapi import Depends
 from app.application.agent.scheduling_agent_builder import get_scheduling_agent
-from app.domain.scheduling_data import SchedulingData
+from app.application.agent.state.sheduling_agent_state import get_scheduling_data
+from app.application.services.deferred_messages import DeferredMessageQueue
+from app.application.services.reminder_scheduler import reminder_scheduler
+from app.infrastructure.config.config import settings
+from app.infrastructure.outbound.delivery import get_outbound_dispatcher
+from app.infrastructure.observability.tracing import tracer
+from app.infrastructure.observability.usage_accounting import usage_scope
+from app.infrastructure.observability.logging_config import (
+    log_event,
+    summarize_state,
+    truncate,
+)
+from app.infrastructure.resilience.admission_control import LoadSheddingError
+from app.infrastructure.resilience.breakers import any_breaker_open
+from app.infrastructure.resilience.circuit_breaker import CircuitOpenError
+from app.infrastructure.tenancy.fair_scheduler import tenant_scheduler
+from app.infrastructure.tenancy.tenant_keys import tenant_thread_id
+from app.infrastructure.tenancy.tenant_registry import tenant_registry
 
 logger = logging.getLogger(__name__)
 
+# Instância única (Singleton) das mensagens adiadas pelo modo degradado
+deferred_messages = DeferredMessageQueue(max_size=settings.DEFERRED_QUEUE_MAX_SIZE)
+
+
+def defer_message(
+    phone_number: str,
+    message_text: str,
+    message_id: str,
+    instance_id: Optional[str] = None,
+) -> bool:
+    """
+    Guarda a mensagem para reprocessamento. Sem OUTBOUND_ENABLED a resposta
+    do reprocessamento não teria como chegar ao paciente, então nada é
+    guardado e o chamador não deve prometer um retorno.
+    """
+    if not settings.OUTBOUND_ENABLED:
+        return False
+    return deferred_messages.enqueue(phone_number, message_text, message_id, instance_id)
+
 
 class SchedulingService:
     """
@@ -20,50 +58,288 @@ class SchedulingService:
         self.scheduling_agent = scheduling_agent
 
     async def handle_incoming_message(
-        self, phone_number: str, message_text: str, message_id: str
+        self,
+        phone_number: str,
+        message_text: str,
+        message_id: str,
+        instance_id: Optional[str] = None,
     ) -> dict:
         """
         Serviço de agendamento processando mensagem.
+
+        Com OUTBOUND_ENABLED, a resposta também é gravada no outbox para ser
+        entregue ao gateway do WhatsApp, independente desta requisição.
         """
-        logger.info(f"Serviço de agendamento processando mensagem de {phone_number}.")
-        logger.info(f"Conteúdo para análise: '{message_text}'")
-        logger.info(f"ID da mensagem: '{message_id}'")
+        with tracer.span(
+            "scheduling.handle_message",
+            message_id=message_id,
+            thread_id=tenant_thread_id(phone_number, instance_id),
+            instance_id=instance_id or "",
+        ) as span:
+            result = await self._handle_message(
+                phone_number, message_text, message_id, instance_id
+            )
+            if span is not None:
+                span.set_attributes(status=result["status"])
+            return result
+
+    async def _handle_message(
+        self,
+        phone_number: str,
+        message_text: str,
+        message_id: str,
+        instance_id: Optional[str],
+    ) -> dict:
+        log_event(
+            logger,
+            logging.INFO,
+            "scheduling.message_received",
+            phone_number=phone_number,
+            message_id=message_id,
+            instance_id=instance_id,
+            message_text=truncate(message_text),
+        )
+
+        # Caminho degradado: não chama o agente enquanto uma dependência está fora
+        if any_breaker_open():
+            return self._degraded_reply(phone_number, message_text, message_id, instance_id)
 
         try:
-            thread_id = phone_number
+            tenant = tenant_registry.get(instance_id)
+            thread_id = tenant_thread_id(phone_number, instance_id)
             config = {"configurable": {"thread_id": thread_id}}
 
+            # Somente os canais deste turno: scheduling_data fica como está
+            # no checkpoint (um SchedulingData() novo apagaria o progresso)
             initial_state = {
                 "phone_number": phone_number,
                 "message_id": message_id,
+                "instance_id": instance_id,
                 "messages": [HumanMessage(content=message_text)],
-                "scheduling_data": SchedulingData(),
             }
 
-            final_state = await self.scheduling_agent.ainvoke(
-                initial_state, config=config
-            )
+            # Vaga da instância: uma clínica com fila não atrasa as demais
+            async with tenant_scheduler.slot(
+                tenant.instance_id, tenant.config.max_concurrency
+            ):
+                with usage_scope(thread_id, instance_id), tracer.span("agent.ainvoke"):
+                    final_state = await self.scheduling_agent.ainvoke(
+                        initial_state, config=config
+                    )
 
-            logger.info(
-                f"Processamento do agente concluído. Estado final: {final_state}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                log_event(
+                    logger,
+                    logging.DEBUG,
+                    "scheduling.agent_completed",
+                    phone_number=phone_number,
+                    message_id=message_id,
+                    **summarize_state(final_state),
+                )
 
             messages = final_state.get("messages", [])
 
             last_message = messages[-1]
 
-            return {
+            result = {
                 "status": "success",
                 "message": last_message.content,
             }
+            if settings.OUTBOUND_ENABLED:
+                result["delivery"] = await self._enqueue_reply(
+                    phone_number, last_message.content, instance_id
+                )
+            if reminder_scheduler.active:
+                await self._schedule_reminders(phone_number, instance_id, final_state)
+            return result
+
+        except CircuitOpenError as e:
+            logger.warning("Circuito aberto durante o processamento: %s", e)
+            return self._degraded_reply(phone_number, message_text, message_id, instance_id)
+
+        except LoadSheddingError as e:
+            logger.warning(
+                "Instância '%s' acima da capacidade (%s).", instance_id or "default", e.reason
+            )
+            return self._throttled_reply(
+                phone_number, message_text, message_id, instance_id, e.reason
+            )
 
         except Exception as e:
-            logger.error(f"Erro ao processar mensagem com agente: {e}", exc_info=True)
+            logger.error("Erro ao processar mensagem com agente: %s", e, exc_info=True)
             return {
                 "status": "error",
-                "message": f"Erro ao processar mensagem com agente: {e}",
+                "message": settings.AGENT_ERROR_REPLY,
             }
 
+    async def _enqueue_reply(
+        self, phone_number: str, message: str, instance_id: Optional[str]
+    ) -> str:
+        """
+        Grava a resposta no outbox. Uma falha aqui não invalida o turno:
+        a resposta continua indo no corpo da requisição.
+        """
+        try:
+            with tracer.span("outbox.enqueue"):
+                await get_outbound_dispatcher().enqueue(
+                    phone_number, message, instance_id=instance_id
+                )
+            return "queued"
+        except Exception as e:
+            logger.error(f"Erro ao gravar a resposta no outbox: {e}")
+            return "failed"
+
+    async def _schedule_reminders(
+        self, phone_number: str, instance_id: Optional[str], final_state: dict
+    ):
+        """
+        Agenda (ou cancela) os lembretes da consulta do turno. Como o
+        outbox, uma falha aqui não invalida o turno.
+        """
+        try:
+            with tracer.span("reminders.schedule"):
+                await reminder_scheduler.schedule_appointment(
+                    phone_number, instance_id, get_scheduling_data(final_state)
+                )
+        except Exception as e:
+            logger.error(f"Erro ao agendar os lembretes da consulta: {e}")
+
+    def _degraded_reply(
+        self,
+        phone_number: str,
+        message_text: str,
+        message_id: str,
+        instance_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Resposta padrão do modo degradado. A mensagem é guardada para ser
+        reprocessada quando os circuitos fecharem; se não puder ser guardada,
+        o paciente é orientado a reenviar.
+        """
+        queued = defer_message(phone_number, message_text, message_id, instance_id)
+        return {
+            "status": "degraded",
+            "message": settings.DEGRADED_REPLY if queued else settings.DEGRADED_RETRY_REPLY,
+            "queued": queued,
+        }
+
+    def _throttled_reply(
+        self,
+        phone_number: str,
+        message_text: str,
+        message_id: str,
+        instance_id: Optional[str],
+        reason: str,
+    ) -> dict:
+        """
+        Resposta quando a instância excede sua fila ou sua cota do LLM.
+        Como no modo degradado, a mensagem é guardada para reprocessamento.
+        """
+        queued = defer_message(phone_number, message_text, message_id, instance_id)
+        return {
+            "status": "throttled",
+            "reason": reason,
+            "message": settings.TENANT_THROTTLED_REPLY if queued else settings.DEGRADED_RETRY_REPLY,
+            "queued": queued,
+        }
+
+    async def handle_incoming_batch(
+        self, messages: List[Dict[str, Any]], max_concurrency: int
+    ) -> AsyncIterator[dict]:
+        """
+        Processa um lote de mensagens, emitindo o resultado de cada uma
+        assim que fica pronto.
+
+        As mensagens são agrupadas por telefone (thread). Grupos distintos
+        rodam em paralelo, limitados por ``max_concurrency``; dentro de um
+        grupo a ordem de chegada é mantida, pois cada turno depende do
+        checkpoint gravado pelo anterior.
+
+        Args:
+            messages (list): Itens com ``index``, ``phone_number``,
+                ``message_text``, ``message_id`` e ``instance_id``.
+            max_concurrency (int): Número máximo de threads processadas ao mesmo tempo.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in messages:
+            groups.setdefault(item["phone_number"], []).append(item)
+
+        log_event(
+            logger,
+            logging.INFO,
+            "scheduling.batch_received",
+            messages=len(messages),
+            threads=len(groups),
+            max_concurrency=max_concurrency,
+        )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def process_group(items: List[Dict[str, Any]]):
+            async with semaphore:
+                for item in items:
+                    result = await self.handle_incoming_message(
+                        item["phone_number"],
+                        item["message_text"],
+                        item["message_id"],
+                        item.get("instance_id"),
+                    )
+                    await results.put(
+                        {
+                            "index": item["index"],
+                            "message_id": item["message_id"],
+                            "phone_number": item["phone_number"],
+                            **result,
+                        }
+                    )
+
+        tasks = [asyncio.create_task(process_group(items)) for items in groups.values()]
+        try:
+            for _ in range(len(messages)):
+                yield await results.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def replay_deferred_messages(interval_seconds: float):
+    """
+    Reprocessa periodicamente as mensagens adiadas assim que nenhum
+    circuito estiver aberto. Se um circuito reabrir no meio, as mensagens
+    restantes voltam para a fila pelo próprio caminho degradado. As
+    respostas chegam ao paciente pelo outbox (só há mensagens adiadas com
+    OUTBOUND_ENABLED).
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        if not len(deferred_messages) or any_breaker_open():
+            continue
+
+        items = deferred_messages.drain()
+        logger.info(f"Reprocessando {len(items)} mensagens adiadas.")
+        try:
+            service = SchedulingService(scheduling_agent=await get_scheduling_agent())
+        except Exception as e:
+            logger.error(f"Erro ao construir o agente para reprocessamento: {e}")
+            for item in items:
+                deferred_messages.enqueue(
+                    item["phone_number"],
+                    item["message_text"],
+                    item["message_id"],
+                    item["instance_id"],
+                )
+            continue
+
+        for item in items:
+            await service.handle_incoming_message(
+                item["phone_number"],
+                item["message_text"],
+                item["message_id"],
+                item["instance_id"],
+            )
+
 
 def get_scheduling_service(agent=Depends(get_scheduling_agent)) -> SchedulingService:
     """
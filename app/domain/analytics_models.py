@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, TIMESTAMP, BigInteger, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.database_session import Base
+
+
+class AnalyticsRun(Base):
+    __tablename__ = 'analytics_runs'
+
+    run_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
+    checkpoints_scanned: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    threads_scanned: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    booked_threads: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    summary: Mapped[Optional[dict]] = mapped_column(JSON)
+
+
+class AnalyticsMetric(Base):
+    """Métrica agregada em formato longo: (execução, métrica, dimensão) -> valor."""
+    __tablename__ = 'analytics_metrics'
+    __table_args__ = (
+        Index('ix_analytics_metrics_run_metric', 'run_id', 'metric'),
+    )
+
+    metric_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[int] = mapped_column(Integer, ForeignKey('analytics_runs.run_id', ondelete='CASCADE'), nullable=False)
+    metric: Mapped[str] = mapped_column(String(50), nullable=False)
+    dimension: Mapped[str] = mapped_column(String(255), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
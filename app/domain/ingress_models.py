@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.database_session import Base
+
+
+class IngressMessage(Base):
+    """message_id já recebido do webhook; a PK é a chave de deduplicação."""
+    __tablename__ = 'ingress_messages'
+    __table_args__ = (
+        Index('ix_ingress_messages_received_at', 'received_at'),
+    )
+
+    instance_id: Mapped[str] = mapped_column(String(255), primary_key=True, default='')
+    message_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    received_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, default=datetime.now)
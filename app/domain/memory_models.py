@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import JSON, TIMESTAMP, String, UUID, ForeignKey, Integer, TEXT, BOOLEAN
+from sqlalchemy import JSON, TIMESTAMP, String, UUID, ForeignKey, Index, Integer, TEXT, BOOLEAN, text
 # from sqlalchemy.dialects.postgresql import VECTOR  # Comentado temporariamente
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,6 +22,11 @@ class User(Base):
 
 class EpisodicMemory(Base):
     __tablename__ = 'episodic_memory'
+    __table_args__ = (
+        # Paginação por keyset: (created_at, episode_id) desempata os empates de created_at
+        Index('ix_episodic_memory_user_created', 'user_id', 'created_at', 'episode_id'),
+        Index('ix_episodic_memory_thread_created', 'thread_id', 'created_at', 'episode_id'),
+    )
     
     episode_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.user_id'))
@@ -31,12 +36,21 @@ class EpisodicMemory(Base):
     key_entities: Mapped[Optional[dict]] = mapped_column(JSON)
     conversation_turns: Mapped[Optional[int]] = mapped_column(Integer)
     # embedding: Mapped[Optional[list]] = mapped_column(VECTOR(1536))  # Comentado temporariamente
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, default=datetime.now)
 
     user: Mapped["User"] = relationship("User", back_populates="episodes")
 
 class AgentHeuristic(Base):
     __tablename__ = 'agent_heuristics'
+    __table_args__ = (
+        # Índice parcial: só as heurísticas ativas são consultadas pelo agente
+        Index(
+            'ix_agent_heuristics_active_rule_type',
+            'rule_type',
+            'heuristic_id',
+            postgresql_where=text('is_active'),
+        ),
+    )
     
     heuristic_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     rule_description: Mapped[str] = mapped_column(TEXT, nullable=False)
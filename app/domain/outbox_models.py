@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, BigInteger, Index, Integer, String, TEXT
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.database_session import Base
+
+
+class OutboundMessage(Base):
+    __tablename__ = 'outbound_messages'
+    __table_args__ = (
+        Index('ix_outbound_messages_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    outbound_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    instance_id: Mapped[Optional[str]] = mapped_column(String(255))
+    phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    message: Mapped[str] = mapped_column(TEXT, nullable=False)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False, default='reply')
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default='pending')
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(TEXT)
+    next_attempt_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), default=datetime.now)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
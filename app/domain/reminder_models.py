@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, BigInteger, Index, Integer, String, TEXT, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.database_session import Base
+
+
+class AppointmentReminder(Base):
+    """Lembrete (ou pedido de confirmação) de uma consulta, disparado em ``due_at``."""
+    __tablename__ = 'appointment_reminders'
+    __table_args__ = (
+        # Índice de vencimento: só os pendentes, na ordem em que vencem
+        Index(
+            'ix_appointment_reminders_pending_due',
+            'due_at',
+            'reminder_id',
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Agendar a mesma consulta de novo (a cada turno) não duplica lembretes
+        Index(
+            'uq_appointment_reminders_appointment',
+            'instance_id',
+            'phone_number',
+            'kind',
+            'appointment_at',
+            unique=True,
+        ),
+    )
+
+    reminder_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    instance_id: Mapped[str] = mapped_column(String(255), nullable=False, default='')
+    phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False, default='reminder')
+    appointment_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    due_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default='pending')
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(TEXT)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), default=datetime.now)
+    fired_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
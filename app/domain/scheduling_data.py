@@ -13,3 +13,5 @@ class SchedulingData(BaseModel):
     date_scheduled: Optional[str] = None
     turn_scheduled: Optional[str] = None
     specific_time: Optional[str] = None
+    # O paciente confirmou o resumo final: só então a consulta gera lembretes
+    confirmed: Optional[bool] = None
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.database_session import Base
+
+
+class LLMUsage(Base):
+    """Uso agregado do LLM em uma janela de tempo, por thread, instância ou modelo."""
+    __tablename__ = 'llm_usage'
+    __table_args__ = (
+        Index('ix_llm_usage_dimension_key_window', 'dimension', 'key', 'window_start'),
+    )
+
+    usage_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    window_start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    window_end: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    dimension: Mapped[str] = mapped_column(String(20), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    calls: Mapped[int] = mapped_column(Integer, nullable=False)
+    errors: Mapped[int] = mapped_column(Integer, nullable=False)
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cached_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cost: Mapped[float] = mapped_column(Float, nullable=False)
+    latency_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    max_latency_seconds: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,449 @@
+"""
+Job offline de analytics das conversas (funil de agendamento).
+
+Percorre ``checkpoints``, ``checkpoint_writes`` e ``episodic_memory`` com
+cursores do lado do servidor, em blocos de ``--chunk-size`` linhas, e
+agrega cada bloco com operações vetorizadas do NumPy. A memória usada
+depende do tamanho do bloco (e da maior thread), não do tamanho das tabelas.
+
+O resultado é gravado em ``analytics_runs`` / ``analytics_metrics``. Com
+``--propose-heuristics``, o job também grava sugestões em
+``agent_heuristics`` (inativas, para revisão).
+
+Uso:
+    python -m app.infrastructure.analytics.conversation_analytics --chunk-size 50000
+"""
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psycopg
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from sqlalchemy import insert
+
+from app.domain.analytics_models import AnalyticsMetric, AnalyticsRun
+from app.domain.memory_models import AgentHeuristic
+from app.infrastructure.database.database_session import AsyncSessionFactory
+from app.infrastructure.pesistence.compressed_serializer import CompressedSerializer
+from app.infrastructure.pesistence.postgres_persistence import postgres_uri
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional (extra "analytics")
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Etapas do funil, na ordem em que o agente coleta os dados do agendamento
+FUNNEL_STAGES = ("specialty", "professional", "date", "time")
+
+# Conversas com mais turnos que isto caem no último bucket do histograma
+MAX_TURNS_BUCKET = 30
+
+# Uma linha por checkpoint da raiz; apenas o último checkpoint de cada
+# thread carrega o blob de scheduling_data (o único decodificado em Python)
+_SELECT_CHECKPOINTS = """
+    SELECT
+        c.thread_id,
+        c.ts,
+        c.is_input,
+        (
+            SELECT array[bl.type::bytea, bl.blob]
+            FROM checkpoint_blobs bl
+            WHERE bl.thread_id = c.thread_id
+                AND bl.checkpoint_ns = ''
+                AND bl.channel = 'scheduling_data'
+                AND bl.version = c.scheduling_data_version
+        ) AS scheduling_data
+    FROM (
+        SELECT
+            thread_id,
+            checkpoint_id,
+            extract(epoch FROM (checkpoint->>'ts')::timestamptz)::float8 AS ts,
+            coalesce(metadata->>'source' = 'input', false) AS is_input,
+            CASE WHEN lead(checkpoint_id) OVER w IS NULL
+                THEN checkpoint->'channel_versions'->>'scheduling_data'
+            END AS scheduling_data_version
+        FROM checkpoints
+        WHERE checkpoint_ns = ''
+        WINDOW w AS (PARTITION BY thread_id ORDER BY checkpoint_id)
+    ) c
+    ORDER BY c.thread_id, c.checkpoint_id
+"""
+
+# Sugestões associadas às etapas do funil em que os pacientes desistem
+_DROPOFF_SUGGESTIONS = {
+    "specialty": "Perguntar a especialidade logo na primeira resposta, listando as opções.",
+    "professional": "Sugerir profissionais disponíveis para a especialidade em vez de pedir o nome.",
+    "date": "Oferecer as próximas datas livres em vez de pedir uma data em aberto.",
+    "time": "Apresentar os horários livres do dia escolhido como opções numeradas.",
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError(
+            "O job de analytics requer o NumPy. Instale com: uv sync --extra analytics"
+        )
+
+
+def _hist_percentile(hist: "np.ndarray", q: float) -> Optional[int]:
+    """Percentil (0-1) de um histograma de contagens por valor inteiro."""
+    total = int(hist.sum())
+    if total == 0:
+        return None
+    return int(np.searchsorted(np.cumsum(hist), q * total, side="left"))
+
+
+def _scheduling_fields(value: Any) -> Dict[str, Optional[str]]:
+    if value is None:
+        return {}
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    return value if isinstance(value, dict) else {}
+
+
+@dataclass
+class AnalyticsReport:
+    """Agregados de uma execução do job."""
+
+    started_at: datetime
+    checkpoints: int = 0
+    threads: int = 0
+    turns: int = 0
+    booked: int = 0
+    duration_seconds: float = 0.0
+    turns_to_booking: Any = None
+    dropoff: Any = None
+    specialty_requests: Counter = field(default_factory=Counter)
+    specialty_bookings: Counter = field(default_factory=Counter)
+    write_channels: Counter = field(default_factory=Counter)
+    episode_outcomes: Counter = field(default_factory=Counter)
+    episode_turns: Any = None
+
+    def __post_init__(self):
+        self.turns_to_booking = np.zeros(MAX_TURNS_BUCKET + 1, dtype=np.int64)
+        self.dropoff = np.zeros(len(FUNNEL_STAGES) + 1, dtype=np.int64)
+        self.episode_turns = np.zeros(MAX_TURNS_BUCKET + 1, dtype=np.int64)
+
+    @property
+    def conversion_rate(self) -> float:
+        return self.booked / self.threads if self.threads else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "conversion_rate": round(self.conversion_rate, 4),
+            "turns": self.turns,
+            "mean_turns_per_thread": round(self.turns / self.threads, 2) if self.threads else 0,
+            "mean_duration_seconds": (
+                round(self.duration_seconds / self.threads, 1) if self.threads else 0
+            ),
+            "median_turns_to_booking": _hist_percentile(self.turns_to_booking, 0.5),
+            "p90_turns_to_booking": _hist_percentile(self.turns_to_booking, 0.9),
+            "median_episode_turns": _hist_percentile(self.episode_turns, 0.5),
+        }
+
+    def metrics(self) -> List[Tuple[str, str, float]]:
+        """Linhas (métrica, dimensão, valor) para ``analytics_metrics``."""
+        rows: List[Tuple[str, str, float]] = []
+
+        def bucket(i: int) -> str:
+            return f"{i}+" if i == MAX_TURNS_BUCKET else str(i)
+
+        rows += [
+            ("turns_to_booking", bucket(i), float(n))
+            for i, n in enumerate(self.turns_to_booking)
+            if n
+        ]
+        rows += [
+            ("funnel_dropoff", stage, float(n))
+            for stage, n in zip(FUNNEL_STAGES, self.dropoff)
+        ]
+        rows += [("specialty_requests", k, float(n)) for k, n in self.specialty_requests.items()]
+        rows += [("specialty_bookings", k, float(n)) for k, n in self.specialty_bookings.items()]
+        rows += [("write_channel", k, float(n)) for k, n in self.write_channels.items()]
+        rows += [("episode_outcome", k, float(n)) for k, n in self.episode_outcomes.items()]
+        rows += [
+            ("episode_turns", bucket(i), float(n))
+            for i, n in enumerate(self.episode_turns)
+            if n
+        ]
+        return rows
+
+
+class ConversationAnalytics:
+    """
+    Calcula as métricas do funil de agendamento a partir dos checkpoints.
+
+    Cada thread é reduzida a: turnos (checkpoints de ``source=input``),
+    duração, e o ``scheduling_data`` do último checkpoint, que define até
+    que etapa do funil a conversa chegou. Um agendamento conta como
+    concluído quando data e horário (turno ou horário específico) estão
+    preenchidos.
+    """
+
+    def __init__(
+        self,
+        conninfo: str = postgres_uri,
+        serde: Optional[SerializerProtocol] = None,
+        chunk_size: int = 50_000,
+    ):
+        _require_numpy()
+        self.conninfo = conninfo
+        self.serde = serde or CompressedSerializer()
+        self.chunk_size = chunk_size
+
+    async def run(self) -> AnalyticsReport:
+        report = AnalyticsReport(started_at=datetime.now(timezone.utc))
+        async with await psycopg.AsyncConnection.connect(self.conninfo) as conn:
+            await conn.set_read_only(True)
+            await self._scan_checkpoints(conn, report)
+            await self._scan_writes(conn, report)
+            if await self._table_exists(conn, "episodic_memory"):
+                await self._scan_episodes(conn, report)
+        logger.info(
+            f"Analytics: {report.checkpoints} checkpoints, {report.threads} threads, "
+            f"{report.booked} agendamentos."
+        )
+        return report
+
+    @staticmethod
+    async def _table_exists(conn: psycopg.AsyncConnection, table: str) -> bool:
+        cursor = await conn.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+        return (await cursor.fetchone())[0]
+
+    async def _chunks(
+        self, conn: psycopg.AsyncConnection, name: str, query: str
+    ):
+        async with conn.cursor(name=name) as cursor:
+            cursor.itersize = self.chunk_size
+            await cursor.execute(query)
+            while rows := await cursor.fetchmany(self.chunk_size):
+                yield rows
+
+    # --- Checkpoints ---
+
+    async def _scan_checkpoints(self, conn: psycopg.AsyncConnection, report: AnalyticsReport):
+        # Linhas da última thread de cada bloco, que pode continuar no próximo
+        carry: List[tuple] = []
+        async for rows in self._chunks(conn, "analytics_checkpoints", _SELECT_CHECKPOINTS):
+            report.checkpoints += len(rows)
+            rows = carry + rows
+            last_thread = rows[-1][0]
+            cut = len(rows)
+            while cut > 0 and rows[cut - 1][0] == last_thread:
+                cut -= 1
+            carry = rows[cut:]
+            if cut:
+                self._reduce_threads(rows[:cut], report)
+        if carry:
+            self._reduce_threads(carry, report)
+
+    def _reduce_threads(self, rows: Sequence[tuple], report: AnalyticsReport):
+        """Reduz um bloco de threads completas (linhas ordenadas por thread)."""
+        thread_ids, ts, is_input, scheduling_data = zip(*rows)
+        ids = np.array(thread_ids, dtype=object)
+        ts = np.array(ts, dtype=np.float64)
+        is_input = np.array(is_input, dtype=np.int64)
+
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        ends = np.r_[starts[1:], len(ids)] - 1
+
+        turns = np.add.reduceat(is_input, starts)
+        duration = np.maximum.reduceat(ts, starts) - np.minimum.reduceat(ts, starts)
+
+        # Único passo por thread em Python: decodificar o último scheduling_data
+        filled = np.zeros((len(starts), len(FUNNEL_STAGES)), dtype=bool)
+        specialties: List[Optional[str]] = []
+        for i, end in enumerate(ends):
+            fields = self._decode_scheduling_data(scheduling_data[end])
+            filled[i] = (
+                bool(fields.get("specialty")),
+                bool(fields.get("professional_name")),
+                bool(fields.get("date_scheduled")),
+                bool(fields.get("turn_scheduled") or fields.get("specific_time")),
+            )
+            specialty = fields.get("specialty")
+            specialties.append(specialty.strip().lower() if specialty else None)
+
+        booked = filled[:, 2] & filled[:, 3]
+        # Etapa alcançada = quantas etapas consecutivas do funil foram preenchidas
+        stage = np.logical_and.accumulate(filled, axis=1).sum(axis=1)
+
+        report.threads += len(starts)
+        report.turns += int(turns.sum())
+        report.booked += int(booked.sum())
+        report.duration_seconds += float(duration.sum())
+        report.turns_to_booking += np.bincount(
+            np.minimum(turns[booked], MAX_TURNS_BUCKET), minlength=MAX_TURNS_BUCKET + 1
+        )
+        report.dropoff += np.bincount(stage[~booked], minlength=len(FUNNEL_STAGES) + 1)
+
+        for specialty, is_booked in zip(specialties, booked):
+            if specialty:
+                report.specialty_requests[specialty] += 1
+                if is_booked:
+                    report.specialty_bookings[specialty] += 1
+
+    def _decode_scheduling_data(self, blob: Optional[list]) -> Dict[str, Optional[str]]:
+        if not blob:
+            return {}
+        type_, data = blob
+        type_ = bytes(type_).decode()
+        if type_ == "empty":
+            return {}
+        try:
+            return _scheduling_fields(self.serde.loads_typed((type_, bytes(data))))
+        except Exception as e:
+            logger.warning(f"scheduling_data ilegível ignorado: {e}")
+            return {}
+
+    # --- Writes e memória episódica ---
+
+    async def _scan_writes(self, conn: psycopg.AsyncConnection, report: AnalyticsReport):
+        async for rows in self._chunks(
+            conn, "analytics_writes", "SELECT channel FROM checkpoint_writes"
+        ):
+            channels, counts = np.unique(
+                np.array([row[0] for row in rows], dtype=object), return_counts=True
+            )
+            report.write_channels.update(dict(zip(channels, counts.tolist())))
+
+    async def _scan_episodes(self, conn: psycopg.AsyncConnection, report: AnalyticsReport):
+        query = """
+            SELECT coalesce(outcome, 'unknown'), coalesce(conversation_turns, -1)
+            FROM episodic_memory
+        """
+        async for rows in self._chunks(conn, "analytics_episodes", query):
+            outcomes, turns = zip(*rows)
+            values, counts = np.unique(np.array(outcomes, dtype=object), return_counts=True)
+            report.episode_outcomes.update(dict(zip(values, counts.tolist())))
+
+            turns = np.array(turns, dtype=np.int64)
+            turns = np.minimum(turns[turns >= 0], MAX_TURNS_BUCKET)
+            report.episode_turns += np.bincount(turns, minlength=MAX_TURNS_BUCKET + 1)
+
+
+def propose_heuristics(
+    report: AnalyticsReport,
+    min_threads: int = 50,
+    dropoff_threshold: float = 0.3,
+    long_conversation_turns: int = 6,
+) -> List[AgentHeuristic]:
+    """
+    Sugere heurísticas para o agente a partir do relatório. As sugestões
+    são criadas inativas (``is_active=False``) e dependem de revisão.
+    """
+    heuristics: List[AgentHeuristic] = []
+
+    def heuristic(description: str, rule_type: str, knowledge: Dict[str, Any]):
+        heuristics.append(
+            AgentHeuristic(
+                rule_description=description,
+                rule_type=rule_type,
+                actionable_knowledge=knowledge,
+                is_active=False,
+                origin_analysis_date=report.started_at,
+            )
+        )
+
+    unbooked = report.threads - report.booked
+    if unbooked >= min_threads:
+        for stage, dropped in zip(FUNNEL_STAGES, report.dropoff.tolist()):
+            rate = dropped / unbooked
+            if rate >= dropoff_threshold:
+                heuristic(
+                    f"{rate:.0%} das conversas sem agendamento param antes de informar "
+                    f"'{stage}'. {_DROPOFF_SUGGESTIONS[stage]}",
+                    "funnel_dropoff",
+                    {"stage": stage, "dropoff_rate": round(rate, 4), "threads": dropped},
+                )
+
+    median_turns = _hist_percentile(report.turns_to_booking, 0.5)
+    if report.booked >= min_threads and median_turns and median_turns > long_conversation_turns:
+        heuristic(
+            f"Agendamentos levam {median_turns} turnos (mediana). Coletar mais de um "
+            "dado do agendamento por pergunta.",
+            "conversation_length",
+            {"median_turns_to_booking": median_turns, "target": long_conversation_turns},
+        )
+
+    overall = report.conversion_rate
+    for specialty, requests in report.specialty_requests.most_common():
+        if requests < min_threads:
+            break
+        conversion = report.specialty_bookings[specialty] / requests
+        if conversion < overall / 2:
+            heuristic(
+                f"A especialidade '{specialty}' converte {conversion:.0%} contra "
+                f"{overall:.0%} no geral. Verificar a disponibilidade de agenda.",
+                "specialty_conversion",
+                {
+                    "specialty": specialty,
+                    "conversion_rate": round(conversion, 4),
+                    "overall_conversion_rate": round(overall, 4),
+                    "requests": requests,
+                },
+            )
+
+    return heuristics
+
+
+async def save_report(
+    report: AnalyticsReport, heuristics: Sequence[AgentHeuristic] = ()
+) -> int:
+    """Grava a execução, suas métricas e as heurísticas sugeridas. Retorna o run_id."""
+    async with AsyncSessionFactory() as session:
+        async with session.begin():
+            run = AnalyticsRun(
+                started_at=report.started_at,
+                finished_at=datetime.now(timezone.utc),
+                checkpoints_scanned=report.checkpoints,
+                threads_scanned=report.threads,
+                booked_threads=report.booked,
+                summary=report.summary(),
+            )
+            session.add(run)
+            await session.flush()
+
+            metrics = [
+                {"run_id": run.run_id, "metric": metric, "dimension": dimension[:255], "value": value}
+                for metric, dimension, value in report.metrics()
+            ]
+            if metrics:
+                await session.execute(insert(AnalyticsMetric), metrics)
+            session.add_all(heuristics)
+        return run.run_id
+
+
+async def _main(args: argparse.Namespace):
+    analytics = ConversationAnalytics(chunk_size=args.chunk_size)
+    report = await analytics.run()
+    heuristics = propose_heuristics(report) if args.propose_heuristics else []
+    run_id = await save_report(report, heuristics)
+    logger.info(
+        f"Execução {run_id} gravada: {report.summary()} "
+        f"({len(heuristics)} heurísticas sugeridas)."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics offline das conversas")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--propose-heuristics",
+        action="store_true",
+        help="Grava sugestões (inativas) em agent_heuristics",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(message)s")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field, SecretStr
 
@@ -29,6 +31,470 @@ class Settings(BaseSettings):
     LANGSMITH_PROJECT: str = Field(..., description="Projeto do LangSmith")
     LANGSMITH_TRACING_V2: bool = Field(default=False, description="Tracagem do LangSmith")
 
+    # ==== Configurações do Backend de Persistência ====
+    PERSISTENCE_BACKEND: Literal["postgres", "sqlite"] = Field(
+        default="postgres",
+        description=(
+            "Backend do checkpointer e do BaseStore. 'sqlite' é embutido (um único nó, "
+            "testes); arquivo frio, exportação/expurgo e as tabelas do Alembic seguem no Postgres"
+        ),
+    )
+    SQLITE_PATH: str = Field(
+        default="data/langgraph.sqlite3", description="Arquivo do banco SQLite embutido"
+    )
+    SQLITE_COMMIT_INTERVAL_MS: float = Field(
+        default=10.0, description="Janela do group commit: um COMMIT (fsync) por intervalo"
+    )
+    SQLITE_COMMIT_MAX_WRITES: int = Field(
+        default=256, description="Escritas que forçam o COMMIT antes do fim da janela"
+    )
+    SQLITE_WAIT_FOR_COMMIT: bool = Field(
+        default=True,
+        description=(
+            "Cada escrita aguarda o fsync do seu grupo; desativado, uma queda pode "
+            "perder até uma janela de escritas"
+        ),
+    )
+    SQLITE_COMPACT_ON_STARTUP: bool = Field(
+        default=True, description="Compacta o banco (expirados, checkpoints antigos, WAL) ao iniciar"
+    )
+    SQLITE_KEEP_CHECKPOINTS: int = Field(
+        default=20, description="Checkpoints mantidos por thread na compactação; 0 mantém todos"
+    )
+
+    # ==== Configurações do Checkpointer ====
+    CHECKPOINT_COMPRESSION_THRESHOLD: int = Field(
+        default=1024,
+        description="Tamanho mínimo (bytes) para comprimir blobs do checkpoint com zstd; 0 desativa",
+    )
+    CHECKPOINT_COMPRESSION_LEVEL: int = Field(
+        default=3, description="Nível de compressão zstd dos checkpoints"
+    )
+
+    CHECKPOINT_CACHE_MAX_THREADS: int = Field(
+        default=1000, description="Threads mantidas no cache L1 de checkpoints; 0 desativa"
+    )
+    CHECKPOINT_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, description="Memória estimada máxima do cache L1"
+    )
+    CHECKPOINT_CACHE_VALIDATE: bool = Field(
+        default=True,
+        description=(
+            "Valida cada hit com uma consulta leve ao checkpoint mais recente; "
+            "desative apenas se um único processo escreve em cada thread"
+        ),
+    )
+
+    # ==== Configurações do Arquivo Frio ====
+    COLD_STORAGE_ARCHIVE_AFTER_DAYS: int = Field(
+        default=0,
+        description="Dias sem atividade para arquivar uma thread; 0 desativa o arquivamento",
+    )
+    COLD_STORAGE_SWEEP_INTERVAL_SECONDS: int = Field(
+        default=3600, description="Intervalo entre varreduras de threads inativas"
+    )
+    COLD_STORAGE_BATCH_SIZE: int = Field(
+        default=100, description="Threads arquivadas por varredura"
+    )
+
+    # ==== Configurações de TTL do BaseStore ====
+    STORE_TTL_POLICIES: Dict[str, float] = Field(
+        default_factory=lambda: {"users": 259200},
+        description=(
+            "TTL em minutos por namespace do BaseStore (labels separados por '.'), "
+            "ex: {\"users\": 259200}; namespaces fora da lista não expiram"
+        ),
+    )
+    STORE_TTL_REFRESH_ON_READ: bool = Field(
+        default=True, description="Renova o TTL do item a cada leitura (get/search)"
+    )
+    STORE_TTL_SWEEP_INTERVAL_SECONDS: int = Field(
+        default=300,
+        description="Intervalo entre varreduras de itens expirados; 0 desativa a varredura",
+    )
+    STORE_TTL_SWEEP_BATCH_SIZE: int = Field(
+        default=1000, description="Itens apagados por lote na varredura de TTL"
+    )
+    STORE_TTL_SWEEP_MAX_BATCHES: int = Field(
+        default=50, description="Máximo de lotes por varredura de TTL"
+    )
+
+    # ==== Configurações de Exportação e Expurgo ====
+    DATA_EXPORT_BATCH_SIZE: int = Field(
+        default=500, description="Linhas buscadas por vez pelo cursor de exportação"
+    )
+    DATA_PURGE_BATCH_SIZE: int = Field(
+        default=100, description="Threads apagadas por transação nos expurgos"
+    )
+
+    # ==== Configurações de Ingestão em Lote ====
+    BATCH_MAX_CONCURRENCY: int = Field(
+        default=8, description="Conversas processadas em paralelo por lote"
+    )
+    BATCH_MAX_ITEMS: int = Field(default=1000, description="Máximo de mensagens por lote")
+
+    # ==== Configurações dos Filtros de Entrada ====
+    INGRESS_DROP_FROM_ME: bool = Field(
+        default=True, description="Descarta os ecos das mensagens enviadas pela instância"
+    )
+    INGRESS_DROP_GROUPS: bool = Field(default=True, description="Descarta mensagens de grupos")
+    INGRESS_DEDUP_ENABLED: bool = Field(
+        default=True, description="Descarta mensagens com message_id já recebido"
+    )
+    INGRESS_DEDUP_CACHE_SIZE: int = Field(
+        default=100000, description="message_id mantidos no LRU em memória"
+    )
+    INGRESS_DEDUP_RETENTION_HOURS: float = Field(
+        default=72, description="Tempo que um message_id fica registrado no Postgres"
+    )
+    INGRESS_FLOOD_MAX_MESSAGES: int = Field(
+        default=20,
+        description="Mensagens por telefone na janela de flood; 0 desativa o filtro",
+    )
+    INGRESS_FLOOD_WINDOW_SECONDS: float = Field(
+        default=60.0, description="Janela da detecção de flood"
+    )
+    INGRESS_FLOOD_MAX_REPEATS: int = Field(
+        default=5, description="Repetições seguidas do mesmo texto antes de descartar"
+    )
+
+    # ==== Configurações do Controle de Admissão ====
+    ADMISSION_ENABLED: bool = Field(default=True, description="Ativa o controle de admissão")
+    ADMISSION_GLOBAL_RATE: float = Field(
+        default=50.0, description="Mensagens por segundo aceitas no total"
+    )
+    ADMISSION_GLOBAL_BURST: float = Field(default=100.0, description="Rajada global máxima")
+    ADMISSION_PHONE_RATE: float = Field(
+        default=0.5, description="Mensagens por segundo aceitas por telefone"
+    )
+    ADMISSION_PHONE_BURST: float = Field(default=5.0, description="Rajada máxima por telefone")
+    ADMISSION_INITIAL_CONCURRENCY: int = Field(
+        default=10, description="Limite inicial de mensagens processadas em paralelo"
+    )
+    ADMISSION_MIN_CONCURRENCY: int = Field(default=2, description="Limite mínimo (AIMD)")
+    ADMISSION_MAX_CONCURRENCY: int = Field(default=40, description="Limite máximo (AIMD)")
+    ADMISSION_TARGET_LATENCY_SECONDS: float = Field(
+        default=8.0, description="Latência alvo do agente usada pelo AIMD"
+    )
+    ADMISSION_SHED_MODE: Literal["reject", "reply"] = Field(
+        default="reject",
+        description=(
+            "reject: HTTP 429 com Retry-After; reply: guarda a mensagem na fila de "
+            "adiadas e responde com a mensagem de espera (429 com a fila cheia ou "
+            "sem OUTBOUND_ENABLED)"
+        ),
+    )
+    ADMISSION_SHED_REPLY: str = Field(
+        default=(
+            "Estamos com muitas mensagens no momento. "
+            "Já recebemos a sua e retornaremos em instantes!"
+        ),
+        description="Resposta enviada quando ADMISSION_SHED_MODE=reply",
+    )
+
+    # ==== Configurações de Multi-tenant (instâncias do WhatsApp) ====
+    TENANTS: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description=(
+            "Configuração por instance_id, ex: {\"inst-1\": {\"clinic_name\": \"Clínica X\", "
+            "\"max_concurrency\": 8, \"llm_tokens_per_minute\": 60000, \"model_name\": null, "
+            "\"instructions\": null}}"
+        ),
+    )
+    TENANT_THREAD_NAMESPACING: bool = Field(
+        default=False,
+        description=(
+            "Separa threads e BaseStore por instância ({instance_id}:{telefone}). "
+            "Ligar muda a chave das conversas existentes (thread=telefone, namespace "
+            "(\"users\",)): só ative em bases novas ou depois de migrar os dados"
+        ),
+    )
+    TENANT_DEFAULT_MAX_CONCURRENCY: int = Field(
+        default=4, description="Conversas simultâneas por instância sem configuração própria"
+    )
+    TENANT_DEFAULT_LLM_TOKENS_PER_MINUTE: int = Field(
+        default=0, description="Cota de tokens por minuto padrão por instância; 0 desativa"
+    )
+    TENANT_MAX_CONCURRENCY: int = Field(
+        default=32, description="Conversas simultâneas no total, divididas entre as instâncias"
+    )
+    TENANT_MAX_QUEUE: int = Field(
+        default=100, description="Mensagens esperando vaga por instância antes de rejeitar"
+    )
+    TENANT_CACHE_MAX: int = Field(
+        default=1000, description="Contextos de instância (prompt, LLM) mantidos em memória"
+    )
+    TENANT_THROTTLED_REPLY: str = Field(
+        default=(
+            "Recebemos sua mensagem! Estamos com alta demanda no momento "
+            "e vamos responder em instantes."
+        ),
+        description="Resposta enviada quando a instância excede sua fila ou cota do LLM",
+    )
+
+    # ==== Configurações dos Circuit Breakers ====
+    CIRCUIT_WINDOW_SECONDS: float = Field(
+        default=30.0, description="Janela deslizante de erros e latência"
+    )
+    CIRCUIT_MIN_CALLS: int = Field(
+        default=10, description="Chamadas mínimas na janela para avaliar o circuito"
+    )
+    CIRCUIT_FAILURE_RATE: float = Field(
+        default=0.5, description="Taxa de falhas que abre o circuito"
+    )
+    CIRCUIT_SLOW_CALL_RATE: float = Field(
+        default=0.8, description="Taxa de chamadas lentas que abre o circuito"
+    )
+    CIRCUIT_LLM_SLOW_CALL_SECONDS: float = Field(
+        default=20.0, description="Duração a partir da qual uma chamada ao LLM é lenta"
+    )
+    CIRCUIT_POSTGRES_SLOW_CALL_SECONDS: float = Field(
+        default=2.0, description="Duração a partir da qual uma operação no Postgres é lenta"
+    )
+    CIRCUIT_OPEN_SECONDS: float = Field(
+        default=20.0, description="Tempo com o circuito aberto antes do half-open"
+    )
+    CIRCUIT_HALF_OPEN_PROBES: int = Field(
+        default=3, description="Sondas bem-sucedidas necessárias para fechar o circuito"
+    )
+    DEGRADED_REPLY: str = Field(
+        default=(
+            "Recebemos sua mensagem! Nosso sistema está instável no momento, "
+            "mas vamos responder assim que possível."
+        ),
+        description="Resposta enviada enquanto algum circuito está aberto",
+    )
+    DEGRADED_RETRY_REPLY: str = Field(
+        default=(
+            "Recebemos sua mensagem, mas não conseguimos processá-la agora. "
+            "Por favor, envie novamente em alguns minutos."
+        ),
+        description=(
+            "Resposta do modo degradado ou da instância sobrecarregada quando a "
+            "mensagem não pode ser guardada (sem OUTBOUND_ENABLED ou fila cheia)"
+        ),
+    )
+    AGENT_ERROR_REPLY: str = Field(
+        default="Desculpe, não consegui processar sua mensagem. Pode tentar novamente?",
+        description="Resposta enviada em erros inesperados do agente",
+    )
+    DEFERRED_QUEUE_MAX_SIZE: int = Field(
+        default=1000, description="Mensagens guardadas durante o modo degradado"
+    )
+    DEFERRED_REPLAY_INTERVAL_SECONDS: float = Field(
+        default=5.0, description="Intervalo de reprocessamento das mensagens adiadas"
+    )
+
+    # ==== Configurações de Envio (Gateway do WhatsApp) ====
+    OUTBOUND_ENABLED: bool = Field(
+        default=False, description="Envia as respostas ao gateway pelo outbox"
+    )
+    GATEWAY_SEND_URL: str = Field(
+        default="https://api.z-api.io/instances/{instance_id}/token/{token}/send-text",
+        description="Template da URL de envio de texto do gateway",
+    )
+    GATEWAY_BATCH_URL: Optional[str] = Field(
+        default=None, description="Template da URL de envio em lote (se o gateway suportar)"
+    )
+    GATEWAY_MAX_BATCH_SIZE: int = Field(default=50, description="Mensagens por lote enviado")
+    GATEWAY_INSTANCE_TOKENS: Dict[str, str] = Field(
+        default_factory=dict, description="Token de cada instance_id do gateway"
+    )
+    GATEWAY_CLIENT_TOKEN: Optional[SecretStr] = Field(
+        default=None, description="Token de segurança da conta no gateway"
+    )
+    GATEWAY_DEFAULT_INSTANCE_ID: Optional[str] = Field(
+        default=None, description="Instância usada quando a mensagem não informa uma"
+    )
+    OUTBOUND_RATE_PER_INSTANCE: float = Field(
+        default=5.0, description="Mensagens por segundo enviadas por instância"
+    )
+    OUTBOUND_BURST_PER_INSTANCE: float = Field(
+        default=10.0, description="Rajada máxima de envio por instância"
+    )
+    OUTBOUND_MAX_ATTEMPTS: int = Field(default=8, description="Tentativas de envio por mensagem")
+    OUTBOUND_BACKOFF_BASE_SECONDS: float = Field(
+        default=2.0, description="Espera base do backoff exponencial"
+    )
+    OUTBOUND_BACKOFF_MAX_SECONDS: float = Field(
+        default=300.0, description="Espera máxima entre tentativas"
+    )
+    OUTBOUND_POLL_INTERVAL_SECONDS: float = Field(
+        default=2.0, description="Intervalo de leitura do outbox quando ocioso"
+    )
+
+    # ==== Configurações de Lembretes de Consulta ====
+    REMINDERS_ENABLED: bool = Field(
+        default=False,
+        description="Agenda lembretes das consultas marcadas (exige Postgres e OUTBOUND_ENABLED)",
+    )
+    REMINDER_TIMEZONE: str = Field(
+        default="America/Sao_Paulo", description="Fuso da data/horário informados na conversa"
+    )
+    REMINDER_OFFSETS_HOURS: Dict[str, float] = Field(
+        default_factory=lambda: {"confirmation": 24.0, "reminder": 2.0},
+        description="Tipo de lembrete -> horas antes da consulta em que é enviado",
+    )
+    REMINDER_MESSAGES: Dict[str, str] = Field(
+        default_factory=lambda: {
+            "confirmation": (
+                "Olá! Sua consulta{specialty}{professional} está marcada para {date} às "
+                "{time}. Você confirma sua presença?"
+            ),
+            "reminder": (
+                "Lembrete: sua consulta{specialty}{professional} é hoje às {time}. Até já!"
+            ),
+        },
+        description=(
+            "Texto de cada tipo de lembrete; campos: {date}, {time}, {specialty}, "
+            "{professional} e {user_name}"
+        ),
+    )
+    REMINDER_HORIZON_SECONDS: float = Field(
+        default=3600.0,
+        description="Janela de vencimentos carregada do banco para a timer wheel em memória",
+    )
+    REMINDER_BATCH_SIZE: int = Field(
+        default=100, description="Lembretes reservados por leitura do banco"
+    )
+    REMINDER_MAX_CONCURRENCY: int = Field(
+        default=8, description="Lembretes disparados ao mesmo tempo pelo grafo"
+    )
+    REMINDER_MAX_ATTEMPTS: int = Field(default=5, description="Tentativas de disparo por lembrete")
+    REMINDER_LEASE_SECONDS: float = Field(
+        default=120.0, description="Reserva de um lembrete em disparo antes de voltar à fila"
+    )
+    REMINDER_POLL_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        description="Leitura de segurança dos vencidos (lembretes agendados por outros workers)",
+    )
+
+    # ==== Configurações de Sharding ====
+    SHARD_ROLE: Literal["standalone", "ingress", "worker"] = Field(
+        default="standalone",
+        description="Papel do processo: standalone, ingress (roteia) ou worker (processa)",
+    )
+    SHARD_WORKERS: List[str] = Field(
+        default_factory=list, description="URLs dos workers conhecidos pela ingress"
+    )
+    SHARD_VIRTUAL_NODES: int = Field(
+        default=64, description="Nós virtuais por worker no hash consistente"
+    )
+    SHARD_HEALTH_INTERVAL_SECONDS: float = Field(
+        default=5.0, description="Intervalo do health check dos workers"
+    )
+    SHARD_FORWARD_TIMEOUT_SECONDS: float = Field(
+        default=120.0, description="Timeout do encaminhamento de mensagens para um worker"
+    )
+    SHARD_INGRESS_URL: Optional[str] = Field(
+        default=None,
+        description="URL da ingress onde o worker se registra ao iniciar (com o mesmo ADMIN_TOKEN da ingress)",
+    )
+    SHARD_WORKER_URL: Optional[str] = Field(
+        default=None, description="URL pela qual a ingress alcança este worker"
+    )
+
+    # ==== Configurações de Contabilidade do LLM ====
+    LLM_PRICING: Dict[str, Dict[str, float]] = Field(
+        default_factory=lambda: {
+            "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+            "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+        },
+        description="Preço (USD por milhão de tokens) por modelo: input, cached_input e output",
+    )
+    LLM_USAGE_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=30.0, description="Intervalo de gravação dos agregados de uso do LLM"
+    )
+    LLM_USAGE_TOP_THREADS: int = Field(
+        default=20, description="Threads mais caras exibidas no endpoint de métricas"
+    )
+    LLM_USAGE_MAX_WINDOW_THREADS: int = Field(
+        default=10000,
+        description=(
+            "Threads mantidas na janela de uso; acima disso ficam só as mais caras "
+            "(limita a memória sem Postgres ou com a gravação falhando)"
+        ),
+    )
+
+    # ==== Configurações de Roteamento de Modelos ====
+    MODEL_TIERING_ENABLED: bool = Field(
+        default=False,
+        description="Roteia turnos simples para o modelo pequeno; desativado, usa sempre o grande",
+    )
+    MODEL_TIER_SMALL_MODEL: Optional[str] = Field(
+        default=None,
+        description="Modelo rápido/barato para turnos simples; None usa OPENAI_MODEL_NAME",
+    )
+    MODEL_TIER_LARGE_MODEL: Optional[str] = Field(
+        default=None,
+        description="Modelo para turnos complexos; None usa OPENAI_MODEL_NAME (ou o da instância)",
+    )
+    MODEL_TIER_ESCALATE_SCORE: int = Field(
+        default=4, description="Pontuação de complexidade a partir da qual o turno vai ao grande"
+    )
+    MODEL_TIER_LONG_MESSAGE_WORDS: int = Field(
+        default=40, description="Palavras a partir das quais a mensagem conta como longa"
+    )
+    MODEL_TIER_ESCALATE_ON_FAILURE: bool = Field(
+        default=True,
+        description="Refaz no modelo grande o turno em que o pequeno falhou ou respondeu vazio",
+    )
+
+    # ==== Configurações de Montagem do Prompt ====
+    PROMPT_HISTORY_MAX_MESSAGES: int = Field(
+        default=20, description="Mensagens anteriores enviadas ao LLM; 0 não envia histórico"
+    )
+    PROMPT_HISTORY_TRIM_STEP: int = Field(
+        default=10,
+        description="Acima do máximo, o histórico é cortado em blocos deste tamanho (prefixo estável)",
+    )
+
+    # ==== Configurações de Tracing ====
+    TRACE_SAMPLE_RATE: float = Field(
+        default=0.0, description="Fração das requisições rastreadas (0.0 desativa a amostragem)"
+    )
+    TRACE_ALLOW_FORCE: bool = Field(
+        default=True, description="Permite forçar o trace de uma requisição com 'X-Trace: 1'"
+    )
+    TRACE_KEEP_RECENT: int = Field(
+        default=100, description="Traces mantidos em memória para o endpoint de debug"
+    )
+    TRACE_EXPORT_FILE: Optional[str] = Field(
+        default=None, description="Arquivo OTLP/JSON (uma requisição de export por linha)"
+    )
+    TRACE_OTLP_ENDPOINT: Optional[str] = Field(
+        default=None, description="Coletor OTLP/HTTP, ex: http://localhost:4318"
+    )
+    TRACE_SERVICE_NAME: str = Field(
+        default="agendamento-api", description="service.name dos traces exportados"
+    )
+
+    # ==== Configurações do Profiler ====
+    ADMIN_TOKEN: Optional[SecretStr] = Field(
+        default=None,
+        description="Token (cabeçalho X-Admin-Token) das rotas protegidas; sem ele o profiler fica desativado",
+    )
+    PROFILER_INTERVAL_MS: float = Field(
+        default=5.0, description="Intervalo entre amostras do profiler"
+    )
+    PROFILER_MAX_SECONDS: float = Field(
+        default=60.0, description="Duração máxima de um profiling do event loop"
+    )
+    PROFILER_KEEP_RECENT: int = Field(
+        default=20, description="Perfis por requisição mantidos em memória"
+    )
+
+    # ==== Configurações de Logging ====
+    LOG_LEVEL: str = Field(default="INFO", description="Nível mínimo de log")
+    LOG_JSON: bool = Field(default=False, description="Emite logs estruturados em JSON")
+    LOG_MAX_FIELD_CHARS: int = Field(
+        default=500, description="Tamanho máximo de cada campo estruturado no log"
+    )
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Taxa de amostragem (0.0 a 1.0) por logger, ex: {\"app.application\": 0.1}",
+    )
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
@@ -63,3 +529,44 @@ if __name__ == "__main__":
     print(f"LANGSMITH_API_KEY: {mask_sensitive_data(settings.LANGSMITH_API_KEY)}")
     print(f"LANGSMITH_PROJECT: {settings.LANGSMITH_PROJECT}")
     print(f"LANGSMITH_TRACING_V2: {settings.LANGSMITH_TRACING_V2}")
+    print(f"PERSISTENCE_BACKEND: {settings.PERSISTENCE_BACKEND}")
+    print(f"SQLITE_PATH: {settings.SQLITE_PATH}")
+    print(f"CHECKPOINT_COMPRESSION_THRESHOLD: {settings.CHECKPOINT_COMPRESSION_THRESHOLD}")
+    print(f"CHECKPOINT_COMPRESSION_LEVEL: {settings.CHECKPOINT_COMPRESSION_LEVEL}")
+    print(f"CHECKPOINT_CACHE_MAX_THREADS: {settings.CHECKPOINT_CACHE_MAX_THREADS}")
+    print(f"CHECKPOINT_CACHE_VALIDATE: {settings.CHECKPOINT_CACHE_VALIDATE}")
+    print(f"COLD_STORAGE_ARCHIVE_AFTER_DAYS: {settings.COLD_STORAGE_ARCHIVE_AFTER_DAYS}")
+    print(f"STORE_TTL_POLICIES: {settings.STORE_TTL_POLICIES}")
+    print(f"STORE_TTL_SWEEP_INTERVAL_SECONDS: {settings.STORE_TTL_SWEEP_INTERVAL_SECONDS}")
+    print(f"DATA_EXPORT_BATCH_SIZE: {settings.DATA_EXPORT_BATCH_SIZE}")
+    print(f"DATA_PURGE_BATCH_SIZE: {settings.DATA_PURGE_BATCH_SIZE}")
+    print(f"BATCH_MAX_CONCURRENCY: {settings.BATCH_MAX_CONCURRENCY}")
+    print(f"BATCH_MAX_ITEMS: {settings.BATCH_MAX_ITEMS}")
+    print(f"INGRESS_DEDUP_ENABLED: {settings.INGRESS_DEDUP_ENABLED}")
+    print(f"INGRESS_FLOOD_MAX_MESSAGES: {settings.INGRESS_FLOOD_MAX_MESSAGES}")
+    print(f"ADMISSION_ENABLED: {settings.ADMISSION_ENABLED}")
+    print(f"ADMISSION_SHED_MODE: {settings.ADMISSION_SHED_MODE}")
+    print(f"TENANTS: {list(settings.TENANTS)}")
+    print(f"TENANT_MAX_CONCURRENCY: {settings.TENANT_MAX_CONCURRENCY}")
+    print(f"CIRCUIT_OPEN_SECONDS: {settings.CIRCUIT_OPEN_SECONDS}")
+    print(f"OUTBOUND_ENABLED: {settings.OUTBOUND_ENABLED}")
+    print(f"GATEWAY_SEND_URL: {settings.GATEWAY_SEND_URL}")
+    print(f"REMINDERS_ENABLED: {settings.REMINDERS_ENABLED}")
+    print(f"REMINDER_OFFSETS_HOURS: {settings.REMINDER_OFFSETS_HOURS}")
+    print(f"REMINDER_HORIZON_SECONDS: {settings.REMINDER_HORIZON_SECONDS}")
+    print(f"SHARD_ROLE: {settings.SHARD_ROLE}")
+    print(f"SHARD_WORKERS: {settings.SHARD_WORKERS}")
+    print(f"LLM_USAGE_FLUSH_INTERVAL_SECONDS: {settings.LLM_USAGE_FLUSH_INTERVAL_SECONDS}")
+    print(f"MODEL_TIERING_ENABLED: {settings.MODEL_TIERING_ENABLED}")
+    print(f"MODEL_TIER_SMALL_MODEL: {settings.MODEL_TIER_SMALL_MODEL}")
+    print(f"MODEL_TIER_ESCALATE_SCORE: {settings.MODEL_TIER_ESCALATE_SCORE}")
+    print(f"PROMPT_HISTORY_MAX_MESSAGES: {settings.PROMPT_HISTORY_MAX_MESSAGES}")
+    print(f"PROMPT_HISTORY_TRIM_STEP: {settings.PROMPT_HISTORY_TRIM_STEP}")
+    print(f"TRACE_SAMPLE_RATE: {settings.TRACE_SAMPLE_RATE}")
+    print(f"TRACE_EXPORT_FILE: {settings.TRACE_EXPORT_FILE}")
+    print(f"TRACE_OTLP_ENDPOINT: {settings.TRACE_OTLP_ENDPOINT}")
+    print(f"ADMIN_TOKEN: {mask_sensitive_data(settings.ADMIN_TOKEN.get_secret_value() if settings.ADMIN_TOKEN else None)}")
+    print(f"PROFILER_INTERVAL_MS: {settings.PROFILER_INTERVAL_MS}")
+    print(f"LOG_LEVEL: {settings.LOG_LEVEL}")
+    print(f"LOG_JSON: {settings.LOG_JSON}")
+    print(f"LOG_SAMPLE_RATES: {settings.LOG_SAMPLE_RATES}")
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.ingress_models import IngressMessage
+from app.infrastructure.database.database_session import AsyncSessionFactory
+from app.infrastructure.resilience.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# (instance_id, message_id)
+DedupKey = Tuple[str, str]
+
+
+class MessageDedupIndex:
+    """
+    Índice dos message_id já recebidos do webhook.
+
+    Um LRU em memória responde às repetições recentes (os retries do
+    gateway chegam em segundos) sem I/O. Fora do LRU, a fonte da verdade é
+    a PK de ``ingress_messages``: o INSERT ... ON CONFLICT DO NOTHING
+    registra e verifica em uma única ida ao banco, e vale entre workers e
+    reinícios. Com o Postgres indisponível, a mensagem é aceita (fail-open).
+    Sem ``session_factory`` (backend embutido), vale apenas o LRU.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 100_000,
+        retention_hours: float = 72,
+        breaker: Optional[CircuitBreaker] = None,
+        session_factory: Optional[async_sessionmaker] = AsyncSessionFactory,
+    ):
+        self.cache_size = cache_size
+        self.retention_hours = retention_hours
+        self.breaker = breaker
+        self.session_factory = session_factory
+        self._seen: "OrderedDict[DedupKey, None]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._cache_hits = 0
+        self._db_hits = 0
+        self._db_errors = 0
+        self._forgotten = 0
+
+    def _remember(self, key: DedupKey):
+        self._seen[key] = None
+        if len(self._seen) > self.cache_size:
+            self._seen.popitem(last=False)
+
+    def seen_recently(self, instance_id: Optional[str], message_id: str) -> bool:
+        """Consulta apenas o LRU em memória."""
+        key = (instance_id or "", message_id)
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            self._cache_hits += 1
+            return True
+        return False
+
+    async def register(
+        self, instance_id: Optional[str], message_id: str, phone_number: str
+    ) -> bool:
+        """Registra o message_id. Retorna False se ele já havia sido recebido."""
+        if self.seen_recently(instance_id, message_id):
+            return False
+        key = (instance_id or "", message_id)
+        if self.session_factory is None:
+            self._remember(key)
+            return True
+
+        try:
+            with self.breaker.guard() if self.breaker else nullcontext():
+                async with self.session_factory() as session:
+                    async with session.begin():
+                        result = await session.execute(
+                            insert(IngressMessage)
+                            .values(
+                                instance_id=key[0],
+                                message_id=message_id,
+                                phone_number=phone_number,
+                                received_at=datetime.now(timezone.utc),
+                            )
+                            .on_conflict_do_nothing()
+                            .returning(IngressMessage.message_id)
+                        )
+                        inserted = result.first() is not None
+        except Exception as e:
+            self._db_errors += 1
+            logger.warning(f"Deduplicação sem o Postgres para '{message_id}': {e}")
+            inserted = True
+
+        self._remember(key)
+        if not inserted:
+            self._db_hits += 1
+        return inserted
+
+    async def forget(self, instance_id: Optional[str], message_id: str):
+        """
+        Remove o message_id do índice. Usado quando a mensagem registrada
+        não chegou a ser processada (rejeitada pela admissão ou com erro no
+        agente): o retry do gateway precisa ser aceito, e não descartado
+        como duplicata.
+        """
+        key = (instance_id or "", message_id)
+        self._seen.pop(key, None)
+        self._forgotten += 1
+        if self.session_factory is None:
+            return
+
+        try:
+            with self.breaker.guard() if self.breaker else nullcontext():
+                async with self.session_factory() as session:
+                    async with session.begin():
+                        await session.execute(
+                            delete(IngressMessage).where(
+                                IngressMessage.instance_id == key[0],
+                                IngressMessage.message_id == message_id,
+                            )
+                        )
+        except Exception as e:
+            self._db_errors += 1
+            logger.warning(f"Não foi possível remover '{message_id}' da deduplicação: {e}")
+
+    async def purge_expired(self, batch_size: int = 5000) -> int:
+        """Apaga os registros mais antigos que ``retention_hours``, em lotes."""
+        if self.session_factory is None:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        expired = (
+            select(IngressMessage.instance_id, IngressMessage.message_id)
+            .where(IngressMessage.received_at < cutoff)
+            .limit(batch_size)
+        )
+        deleted = 0
+        while True:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        delete(IngressMessage).where(
+                            tuple_(IngressMessage.instance_id, IngressMessage.message_id).in_(
+                                expired
+                            )
+                        )
+                    )
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_ids": len(self._seen),
+            "cache_hits": self._cache_hits,
+            "db_hits": self._db_hits,
+            "db_errors": self._db_errors,
+            "forgotten": self._forgotten,
+        }
+
+    async def _run_periodically(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                deleted = await self.purge_expired()
+                if deleted:
+                    logger.info(f"{deleted} registros de deduplicação expirados removidos.")
+            except Exception as e:
+                logger.error(f"Erro ao expurgar a deduplicação de mensagens: {e}")
+
+    def start(self, interval_seconds: float = 3600):
+        """Inicia o expurgo periódico dos registros expirados."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically(interval_seconds))
+
+    async def stop(self):
+        """Interrompe o expurgo periódico."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
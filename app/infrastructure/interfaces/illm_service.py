@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, Mapping, Optional
 
 
 class ILLMService(ABC):
@@ -7,8 +8,11 @@ class ILLMService(ABC):
     """
 
     @abstractmethod
-    def orchestrator_prompt_template(self):
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
         """
-        Retorna o prompt do agente orquestrador.
+        Chama o agente orquestrador com a mensagem do usuário (sem bloquear o event loop).
+        ``prompt_inputs`` são os demais segmentos do prompt (histórico, resumo...).
         """
         pass
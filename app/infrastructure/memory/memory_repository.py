@@ -0,0 +1,210 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Mapping, Optional, Sequence, TypeVar
+
+from sqlalchemy import select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from app.domain.memory_models import AgentHeuristic, EpisodicMemory, User
+from app.infrastructure.database.database_session import AsyncSessionFactory
+
+T = TypeVar("T")
+C = TypeVar("C")
+
+
+@dataclass(frozen=True)
+class EpisodeCursor:
+    """Posição na paginação dos episódios: o último (created_at, episode_id) lido."""
+
+    created_at: datetime
+    episode_id: uuid.UUID
+
+
+@dataclass
+class Page(Generic[T, C]):
+    """Página de resultados. ``next_cursor`` é None na última página."""
+
+    items: List[T]
+    next_cursor: Optional[C] = None
+
+
+class MemoryRepository:
+    """
+    Acesso às tabelas de memória: ``users``, ``episodic_memory`` e
+    ``agent_heuristics``.
+
+    As listagens usam paginação por keyset em vez de OFFSET: cada página
+    continua a partir do cursor da anterior, com custo constante em
+    qualquer profundidade. As consultas seguem a ordem dos índices da
+    migração ``0006_memory_tables`` (episódios por usuário e por thread em
+    ``(created_at, episode_id)`` decrescente; heurísticas ativas por
+    ``rule_type`` no índice parcial).
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionFactory):
+        self.session_factory = session_factory
+
+    # ==== Usuários ====
+
+    async def get_user_by_phone(self, phone_number: str) -> Optional[User]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(User).where(User.phone_number == phone_number)
+            )
+            return result.scalar_one_or_none()
+
+    async def ensure_users(self, phone_numbers: Sequence[str]) -> Dict[str, uuid.UUID]:
+        """
+        Garante um usuário por telefone, em lote. Retorna telefone -> user_id,
+        criando os que faltam com INSERT ... ON CONFLICT DO NOTHING.
+        """
+        phones = list(dict.fromkeys(phone_numbers))
+        if not phones:
+            return {}
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    insert(User)
+                    .values([{"user_id": uuid.uuid4(), "phone_number": phone} for phone in phones])
+                    .on_conflict_do_nothing(index_elements=[User.phone_number])
+                )
+                result = await session.execute(
+                    select(User.phone_number, User.user_id).where(User.phone_number.in_(phones))
+                )
+                return {phone: user_id for phone, user_id in result.all()}
+
+    # ==== Episódios ====
+
+    async def add_episodes(self, episodes: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Grava episódios em lote (um único executemany). Cada item tem os
+        campos de ``EpisodicMemory``; ``episode_id`` e ``created_at`` são
+        preenchidos quando ausentes.
+        """
+        if not episodes:
+            return 0
+        now = datetime.now().astimezone()
+        rows = [
+            {"episode_id": uuid.uuid4(), "created_at": now, **episode} for episode in episodes
+        ]
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(insert(EpisodicMemory), rows)
+        return len(rows)
+
+    async def _episodes_page(
+        self, where, limit: int, before: Optional[EpisodeCursor]
+    ) -> Page[EpisodicMemory, EpisodeCursor]:
+        statement = select(EpisodicMemory).where(where)
+        if before is not None:
+            statement = statement.where(
+                tuple_(EpisodicMemory.created_at, EpisodicMemory.episode_id)
+                < tuple_(before.created_at, before.episode_id)
+            )
+        statement = statement.order_by(
+            EpisodicMemory.created_at.desc(), EpisodicMemory.episode_id.desc()
+        ).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            items = list(result.scalars().all())
+
+        # Uma linha a mais indica se existe a próxima página, sem COUNT
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = EpisodeCursor(last.created_at, last.episode_id)
+        return Page(items, next_cursor)
+
+    async def list_user_episodes(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 20,
+        before: Optional[EpisodeCursor] = None,
+    ) -> Page[EpisodicMemory, EpisodeCursor]:
+        """Episódios do usuário, do mais recente para o mais antigo."""
+        return await self._episodes_page(EpisodicMemory.user_id == user_id, limit, before)
+
+    async def list_thread_episodes(
+        self,
+        thread_id: str,
+        limit: int = 20,
+        before: Optional[EpisodeCursor] = None,
+    ) -> Page[EpisodicMemory, EpisodeCursor]:
+        """Episódios da thread, do mais recente para o mais antigo."""
+        return await self._episodes_page(EpisodicMemory.thread_id == thread_id, limit, before)
+
+    async def latest_episodes_for_users(
+        self, user_ids: Sequence[uuid.UUID], per_user: int = 3
+    ) -> Dict[uuid.UUID, List[EpisodicMemory]]:
+        """
+        Os ``per_user`` episódios mais recentes de vários usuários em uma
+        consulta: um LATERAL por usuário, cada um resolvido no índice
+        ``(user_id, created_at, episode_id)``.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+        users = select(User.user_id).where(User.user_id.in_(ids)).subquery()
+        latest = (
+            select(EpisodicMemory)
+            .where(EpisodicMemory.user_id == users.c.user_id)
+            .order_by(EpisodicMemory.created_at.desc(), EpisodicMemory.episode_id.desc())
+            .limit(per_user)
+            .lateral()
+        )
+        episode = aliased(EpisodicMemory, latest)
+        statement = select(episode).select_from(users).join(latest, true())
+
+        grouped: Dict[uuid.UUID, List[EpisodicMemory]] = {user_id: [] for user_id in ids}
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            for item in result.scalars().all():
+                grouped[item.user_id].append(item)
+        return grouped
+
+    # ==== Heurísticas ====
+
+    async def list_active_heuristics(
+        self,
+        rule_type: Optional[str] = None,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+    ) -> Page[AgentHeuristic, int]:
+        """
+        Heurísticas ativas, em ordem de ``heuristic_id``. Com ``rule_type``
+        a consulta fica inteira no índice parcial (apenas ``is_active``).
+        """
+        statement = select(AgentHeuristic).where(AgentHeuristic.is_active)
+        if rule_type is not None:
+            statement = statement.where(AgentHeuristic.rule_type == rule_type)
+        if after_id is not None:
+            statement = statement.where(AgentHeuristic.heuristic_id > after_id)
+        statement = statement.order_by(AgentHeuristic.heuristic_id).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = items[-1].heuristic_id
+        return Page(items, next_cursor)
+
+    async def set_heuristics_active(self, heuristic_ids: Sequence[int], active: bool) -> int:
+        """Ativa ou desativa heurísticas em lote (ex.: após a revisão das sugestões)."""
+        if not heuristic_ids:
+            return 0
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(AgentHeuristic)
+                    .where(AgentHeuristic.heuristic_id.in_(list(heuristic_ids)))
+                    .values(is_active=active)
+                )
+        return result.rowcount
@@ -0,0 +1,217 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Tamanho máximo (em caracteres) de cada campo estruturado enviado ao log
+DEFAULT_MAX_FIELD_CHARS = 500
+
+# Atributos padrão do LogRecord que não devem ser tratados como campos extras
+_RESERVED_RECORD_ATTRS = set(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+) | {"message", "asctime", "event", "fields"}
+
+_listener: Optional[QueueListener] = None
+
+
+def truncate(value: Any, max_chars: int = DEFAULT_MAX_FIELD_CHARS) -> Any:
+    """
+    Limita o tamanho de um valor antes de enviá-lo ao log.
+
+    Tipos primitivos curtos são mantidos como estão; qualquer outro valor é
+    convertido para string e cortado em ``max_chars`` caracteres.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+
+
+def summarize_state(state: Dict[str, Any], max_chars: int = DEFAULT_MAX_FIELD_CHARS) -> Dict[str, Any]:
+    """
+    Gera um resumo de tamanho limitado do estado do agente para fins de log.
+
+    Em vez de serializar todas as mensagens da thread, registra apenas a
+    quantidade de mensagens, a última mensagem (truncada) e os dados de agendamento.
+    """
+    messages = state.get("messages") or []
+    last_content = getattr(messages[-1], "content", None) if messages else None
+    scheduling_data = state.get("scheduling_data")
+    if hasattr(scheduling_data, "model_dump"):
+        scheduling_data = scheduling_data.model_dump(exclude_none=True)
+
+    return {
+        "message_count": len(messages),
+        "last_message": truncate(last_content, max_chars),
+        "scheduling_data": truncate(scheduling_data, max_chars),
+        "next_step": state.get("next_step"),
+    }
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """
+    Registra um evento estruturado de forma preguiçosa.
+
+    Nada é formatado se o nível estiver desabilitado para o logger; a
+    serialização em JSON acontece na thread do ``QueueListener``, fora do event loop.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, event, extra={"event": event, "fields": fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formata os registros de log como uma linha JSON por evento.
+    """
+
+    def __init__(self, max_field_chars: int = DEFAULT_MAX_FIELD_CHARS):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+
+        fields = dict(getattr(record, "fields", None) or {})
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith("_"):
+                fields.setdefault(key, value)
+        for key, value in fields.items():
+            payload[key] = truncate(value, self.max_field_chars)
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Formato de texto legível, anexando os campos estruturados ao final da linha.
+    """
+
+    def __init__(self, max_field_chars: int = DEFAULT_MAX_FIELD_CHARS):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            rendered = " ".join(
+                f"{key}={truncate(value, self.max_field_chars)}" for key, value in fields.items()
+            )
+            line = f"{line} | {rendered}"
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem por logger: descarta uma fração dos registros abaixo de WARNING.
+
+    As taxas são resolvidas pelo prefixo mais específico do nome do logger
+    (ex: ``app.application`` vale para ``app.application.services``).
+    WARNING e níveis acima nunca são descartados.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = dict(sample_rates)
+        self._cache: Dict[str, float] = {}
+
+    def _rate_for(self, logger_name: str) -> float:
+        rate = self._cache.get(logger_name)
+        if rate is None:
+            rate = 1.0
+            name = logger_name
+            while name:
+                if name in self.sample_rates:
+                    rate = self.sample_rates[name]
+                    break
+                name = name.rpartition(".")[0]
+            self._cache[logger_name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonFormattingQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread do chamador.
+
+    O ``QueueHandler`` padrão chama ``format()`` em ``prepare()``, o que
+    traria de volta ao event loop o custo de formatação. Como a fila é
+    em memória (mesmo processo), o registro pode ser enviado intacto.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    level: str = "INFO",
+    json_format: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    max_field_chars: int = DEFAULT_MAX_FIELD_CHARS,
+    stream=None,
+) -> QueueListener:
+    """
+    Configura o logging da aplicação com escrita fora do event loop.
+
+    Os handlers do logger raiz são substituídos por um ``QueueHandler``;
+    um ``QueueListener`` em thread dedicada formata e grava os registros.
+    """
+    global _listener
+
+    if _listener is not None:
+        stop_logging()
+    else:
+        atexit.register(stop_logging)
+
+    formatter = (
+        JsonFormatter(max_field_chars) if json_format else TextFormatter(max_field_chars)
+    )
+    stream_handler = logging.StreamHandler(stream or sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = NonFormattingQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Esvazia a fila e encerra a thread do ``QueueListener``.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,248 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.infrastructure.config.config import settings
+
+# Sessão de profiling da requisição atual; herdada pelas tasks filhas
+# (nós do LangGraph), o que permite atribuir cada amostra à requisição
+_profile_session: ContextVar[Optional["StackSampler"]] = ContextVar(
+    "profile_session", default=None
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileResult:
+    """Contagem de amostras por pilha (da raiz para a folha)."""
+
+    def __init__(self, stacks: Counter, samples: int, duration_seconds: float, interval_seconds: float):
+        self.stacks = stacks
+        self.samples = samples
+        self.duration_seconds = duration_seconds
+        self.interval_seconds = interval_seconds
+
+    def collapsed(self) -> str:
+        """Formato "collapsed stacks" (flamegraph.pl, inferno, speedscope)."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def speedscope(self, name: str = "profile") -> Dict[str, Any]:
+        """Perfil no formato JSON do speedscope (https://www.speedscope.app)."""
+        frames: List[Dict[str, str]] = []
+        index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.stacks.items():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(count * self.interval_seconds * 1000)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "interval_ms": self.interval_seconds * 1000,
+            "distinct_stacks": len(self.stacks),
+        }
+
+
+class StackSampler:
+    """
+    Profiler por amostragem da thread do event loop.
+
+    Uma thread dedicada lê a pilha da thread alvo (``sys._current_frames``)
+    a cada ``interval_seconds``; o código amostrado não é instrumentado.
+    Com ``only_current_session``, só conta as amostras em que a task em
+    execução no loop pertence a esta sessão (profiling de uma requisição).
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval_seconds: float = 0.005,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        only_current_session: bool = False,
+    ):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.loop = loop
+        self.only_current_session = only_current_session
+
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def _in_session(self) -> bool:
+        task = asyncio.current_task(self.loop)
+        return task is not None and task.get_context().get(_profile_session) is self
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        if self.only_current_session and not self._in_session():
+            return
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        self._stacks[tuple(stack)] += 1
+        self._samples += 1
+
+    def _run(self):
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample()
+            next_sample += self.interval_seconds
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_sample = time.perf_counter()
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return ProfileResult(
+            self._stacks,
+            self._samples,
+            time.perf_counter() - self._started,
+            self.interval_seconds,
+        )
+
+
+class ProfilerRegistry:
+    """
+    Controla os profilings sob demanda: no máximo um profiling global por
+    vez e os ``keep_recent`` perfis por requisição mais recentes.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005, keep_recent: int = 20):
+        self.interval_seconds = interval_seconds
+        self.keep_recent = keep_recent
+        self._busy = False
+        self._recent: "OrderedDict[str, ProfileResult]" = OrderedDict()
+
+    async def profile_loop(self, seconds: float, interval_seconds: Optional[float] = None) -> ProfileResult:
+        """Amostra a thread do event loop durante ``seconds`` segundos."""
+        if self._busy:
+            raise RuntimeError("Já existe um profiling global em andamento.")
+        self._busy = True
+        sampler = StackSampler(
+            threading.get_ident(), interval_seconds or self.interval_seconds
+        )
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = sampler.stop()
+            self._busy = False
+        return result
+
+    def start_request_profile(self) -> Tuple[StackSampler, Any]:
+        sampler = StackSampler(
+            threading.get_ident(),
+            self.interval_seconds,
+            loop=asyncio.get_running_loop(),
+            only_current_session=True,
+        )
+        token = _profile_session.set(sampler)
+        sampler.start()
+        return sampler, token
+
+    def finish_request_profile(self, profile_id: str, sampler: StackSampler, token: Any):
+        _profile_session.reset(token)
+        self._recent[profile_id] = sampler.stop()
+        while len(self._recent) > self.keep_recent:
+            self._recent.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ProfileResult]:
+        return self._recent.get(profile_id)
+
+    def recent(self) -> Dict[str, Dict[str, Any]]:
+        return {profile_id: result.summary() for profile_id, result in reversed(self._recent.items())}
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI do profiling por requisição.
+
+    Uma requisição com ``X-Profile: 1`` (e um token de admin aceito por
+    ``authorize``) é amostrada enquanto é processada; a resposta recebe o
+    cabeçalho ``X-Profile-Id`` para buscar o perfil nas rotas de debug.
+    """
+
+    def __init__(self, app, registry: ProfilerRegistry, authorize: Callable[[Optional[str]], bool]):
+        self.app = app
+        self.registry = registry
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (b"x-profile", b"1") not in scope["headers"]:
+            return await self.app(scope, receive, send)
+
+        token = dict(scope["headers"]).get(b"x-admin-token")
+        if not self.authorize(token.decode() if token else None):
+            return await self.app(scope, receive, send)
+
+        profile_id = os.urandom(8).hex()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())],
+                }
+            await send(message)
+
+        sampler, context_token = self.registry.start_request_profile()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.finish_request_profile(profile_id, sampler, context_token)
+
+
+# Instância única (Singleton) dos profilings sob demanda
+profiler_registry = ProfilerRegistry(
+    interval_seconds=settings.PROFILER_INTERVAL_MS / 1000,
+    keep_recent=settings.PROFILER_KEEP_RECENT,
+)
@@ -0,0 +1,414 @@
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Span ativo na task atual; as tasks criadas pelo asyncio (e pelo LangGraph)
+# herdam o contexto, então os spans filhos encontram o pai sem parâmetros
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """Um trecho cronometrado de um trace. Tempos em nanossegundos (epoch)."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attributes(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+
+class _Trace:
+    """Spans de uma requisição. É exportado quando o span raiz termina."""
+
+    __slots__ = ("trace_id", "spans", "finished")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.finished = False
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.span.end_ns = time.time_ns()
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self.token)
+        self.tracer._finish(self.span)
+
+
+class _NoopSpanContext:
+    """Usado quando não há trace amostrado: custo de um ``ContextVar.get``."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpanContext()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: Sequence[Span], service_name: str) -> Dict[str, Any]:
+    """Converte os spans para uma ``ExportTraceServiceRequest`` OTLP/JSON."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                "parentSpanId": span.parent_id or "",
+                                "name": span.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": [
+                                    {"key": key, "value": _otlp_value(value)}
+                                    for key, value in span.attributes.items()
+                                ],
+                                "status": (
+                                    {"code": 2, "message": span.error}
+                                    if span.error
+                                    else {"code": 1}
+                                ),
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def to_chrome_trace(spans: Sequence[Span]) -> Dict[str, Any]:
+    """
+    Converte os spans para o formato Trace Event do Chrome, que o Perfetto
+    (ui.perfetto.dev) e o speedscope exibem como flame chart.
+    """
+    if not spans:
+        return {"traceEvents": []}
+    origin = min(span.start_ns for span in spans)
+    return {
+        "traceEvents": [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": 1,
+                "tid": 1,
+                "args": {**span.attributes, **({"error": span.error} if span.error else {})},
+            }
+            for span in sorted(spans, key=lambda span: span.start_ns)
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+class OtlpJsonFileExporter:
+    """
+    Grava uma ``ExportTraceServiceRequest`` OTLP/JSON por linha, o formato
+    lido pelo receiver ``otlpjsonfile`` do OpenTelemetry Collector.
+    """
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: Sequence[Span]):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(to_otlp_json(spans, self.service_name), default=str) + "\n")
+
+    def close(self):
+        pass
+
+
+class OtlpHttpExporter:
+    """Envia os traces a um coletor OTLP/HTTP (``POST {endpoint}/v1/traces``, JSON)."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout_seconds: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=timeout_seconds)
+
+    def export(self, spans: Sequence[Span]):
+        self._client.post(self.url, json=to_otlp_json(spans, self.service_name)).raise_for_status()
+
+    def close(self):
+        self._client.close()
+
+
+class Tracer:
+    """
+    Tracing por requisição, sem dependências externas.
+
+    ``start_trace`` abre o span raiz (se a requisição for amostrada) e
+    ``span`` abre spans filhos do span ativo. Sem trace amostrado, ``span``
+    devolve um context manager vazio. Os traces concluídos ficam em memória
+    (os ``keep_recent`` mais recentes) e são entregues aos exporters por uma
+    thread dedicada, fora do event loop.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        exporters: Sequence[Any] = (),
+        keep_recent: int = 100,
+    ):
+        self.sample_rate = sample_rate
+        self.exporters = list(exporters)
+        self.keep_recent = keep_recent
+
+        self._recent: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._queue: "queue.SimpleQueue[Optional[List[Span]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._late_spans = 0
+        self._export_errors = 0
+
+    def should_sample(self, force: bool = False) -> bool:
+        return force or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def start_trace(self, name: str, sampled: bool, **attributes: Any):
+        """Abre o span raiz de um novo trace (ou um no-op, se não amostrado)."""
+        if not sampled:
+            return _NOOP
+        trace = _Trace()
+        return _SpanContext(self, Span(trace, name, None, attributes))
+
+    def span(self, name: str, **attributes: Any):
+        """Abre um span filho do span ativo; no-op fora de um trace amostrado."""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return _SpanContext(self, Span(parent.trace, name, parent.span_id, attributes))
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def traced(self, name: str) -> Callable:
+        """Decorador que envolve uma função assíncrona em um span."""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _finish(self, span: Span):
+        trace = span.trace
+        if trace.finished:
+            # Span que terminou depois da raiz (ex: task em background)
+            self._late_spans += 1
+            return
+        trace.spans.append(span)
+        if span.parent_id is None:
+            trace.finished = True
+            self._recent[trace.trace_id] = trace.spans
+            while len(self._recent) > self.keep_recent:
+                self._recent.popitem(last=False)
+            if self.exporters:
+                self._queue.put(trace.spans)
+
+    # --- Consulta ---
+
+    def recent_traces(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for trace_id, spans in reversed(self._recent.items()):
+            root = next(span for span in spans if span.parent_id is None)
+            summaries.append(
+                {
+                    "trace_id": trace_id,
+                    "name": root.name,
+                    "duration_ms": round(root.duration_ms, 3),
+                    "spans": len(spans),
+                    "attributes": root.attributes,
+                    "error": any(span.error for span in spans),
+                }
+            )
+        return summaries
+
+    def get_trace(self, trace_id: str) -> Optional[List[Span]]:
+        return self._recent.get(trace_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "recent_traces": len(self._recent),
+            "late_spans": self._late_spans,
+            "export_errors": self._export_errors,
+            "exporters": [type(exporter).__name__ for exporter in self.exporters],
+        }
+
+    # --- Exportação em background ---
+
+    def _export_loop(self):
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            for exporter in self.exporters:
+                try:
+                    exporter.export(spans)
+                except Exception as e:
+                    self._export_errors += 1
+                    logger.warning(f"Falha ao exportar trace ({type(exporter).__name__}): {e}")
+
+    def start(self):
+        if self.exporters and self._thread is None:
+            self._thread = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI que abre o span raiz de cada requisição amostrada.
+
+    É um middleware ASGI puro (e não ``BaseHTTPMiddleware``) para que o
+    endpoint rode na mesma task e o span raiz cubra também o corpo de
+    respostas em streaming. O cabeçalho ``X-Trace: 1`` força a amostragem.
+    """
+
+    def __init__(
+        self,
+        app,
+        tracer: "Tracer",
+        allow_force: bool = True,
+        exclude_prefixes: Sequence[str] = ("/docs", "/redoc", "/openapi.json"),
+    ):
+        self.app = app
+        self.tracer = tracer
+        self.allow_force = allow_force
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            return await self.app(scope, receive, send)
+
+        force = self.allow_force and (b"x-trace", b"1") in scope["headers"]
+        if not self.tracer.should_sample(force):
+            return await self.app(scope, receive, send)
+
+        status_code = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code["value"] = message["status"]
+            await send(message)
+
+        with self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}", sampled=True
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                span.set_attributes(
+                    **{"http.status_code": status_code.get("value", 500)}
+                )
+
+
+def _build_tracer() -> Tracer:
+    exporters = []
+    if settings.TRACE_EXPORT_FILE:
+        exporters.append(
+            OtlpJsonFileExporter(settings.TRACE_EXPORT_FILE, settings.TRACE_SERVICE_NAME)
+        )
+    if settings.TRACE_OTLP_ENDPOINT:
+        exporters.append(
+            OtlpHttpExporter(settings.TRACE_OTLP_ENDPOINT, settings.TRACE_SERVICE_NAME)
+        )
+    return Tracer(
+        sample_rate=settings.TRACE_SAMPLE_RATE,
+        exporters=exporters,
+        keep_recent=settings.TRACE_KEEP_RECENT,
+    )
+
+
+# Instância única (Singleton) do tracer
+tracer = _build_tracer()
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.domain.usage_models import LLMUsage
+from app.infrastructure.config.config import settings
+from app.infrastructure.database.database_session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+# (thread_id, instance_id) da mensagem em processamento; propagado às
+# tasks do LangGraph porque asyncio copia o contexto ao criar cada task
+_usage_context: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar(
+    "llm_usage_context", default=(None, None)
+)
+
+
+@contextmanager
+def usage_scope(thread_id: Optional[str], instance_id: Optional[str] = None) -> Iterator[None]:
+    """Atribui as chamadas ao LLM feitas dentro do bloco à thread/instância."""
+    token = _usage_context.set((thread_id, instance_id))
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+@dataclass
+class UsageCounters:
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    def add(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int,
+        cost: float,
+        latency: float,
+        error: bool,
+    ):
+        self.calls += 1
+        self.errors += int(error)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_tokens += cached_tokens
+        self.cost += cost
+        self.latency_seconds += latency
+        self.max_latency_seconds = max(self.max_latency_seconds, latency)
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["cost"] = round(self.cost, 6)
+        data["mean_latency_seconds"] = (
+            round(self.latency_seconds / self.calls, 4) if self.calls else 0.0
+        )
+        # Fração da entrada servida pelo cache de prompt do provedor
+        data["cached_input_ratio"] = (
+            round(self.cached_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0
+        )
+        return data
+
+
+# Chave de agregação: (dimensão, valor), ex: ("thread", "5511999999999")
+UsageKey = Tuple[str, str]
+
+
+class UsageAccountant:
+    """
+    Contabilidade de tokens, custo e latência das chamadas ao LLM.
+
+    ``record`` apenas atualiza contadores em memória (por thread, por
+    ``instance_id`` e por modelo); nada é gravado por chamada. Um loop em
+    background grava os agregados da janela em ``llm_usage`` a cada
+    ``flush_interval_seconds``, em um único INSERT em lote.
+
+    ``pricing`` é o preço por milhão de tokens por modelo, com as chaves
+    ``input``, ``cached_input`` e ``output``.
+
+    A janela guarda no máximo ``max_window_threads`` threads: sem gravação
+    (backend embutido) ou com o Postgres fora do ar ela nunca é esvaziada,
+    então as threads mais baratas são descartadas ao passar do limite.
+    """
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        flush_interval_seconds: float = 30.0,
+        max_window_threads: int = 10000,
+    ):
+        self.pricing = pricing or {}
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_window_threads = max_window_threads
+
+        # Janela atual (ainda não gravada) e totais do processo. Os totais
+        # não guardam threads, cuja cardinalidade cresce sem limite
+        self._window: Dict[UsageKey, UsageCounters] = {}
+        self._window_started_at = datetime.now(timezone.utc)
+        self._totals: Dict[UsageKey, UsageCounters] = {}
+        self._window_threads = 0
+        self._threads_dropped = 0
+        self._task: Optional[asyncio.Task] = None
+        self._flushes = 0
+        self._flush_errors = 0
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> float:
+        prices = self.pricing.get(model)
+        if not prices:
+            return 0.0
+        input_price = prices.get("input", 0.0)
+        cached_price = prices.get("cached_input", input_price)
+        return (
+            (prompt_tokens - cached_tokens) * input_price
+            + cached_tokens * cached_price
+            + completion_tokens * prices.get("output", 0.0)
+        ) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency: float = 0.0,
+        error: bool = False,
+    ):
+        """Registra uma chamada ao LLM no contexto atual (ver ``usage_scope``)."""
+        thread_id, instance_id = _usage_context.get()
+        cost = self.cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        values = (prompt_tokens, completion_tokens, cached_tokens, cost, latency, error)
+
+        keys: List[UsageKey] = [("model", model), ("instance", instance_id or "")]
+        for key in keys:
+            self._counters(self._totals, key).add(*values)
+        if thread_id:
+            keys.append(("thread", thread_id))
+            if ("thread", thread_id) not in self._window:
+                self._window_threads += 1
+        for key in keys:
+            self._counters(self._window, key).add(*values)
+        if self._window_threads > self.max_window_threads:
+            self._trim_threads()
+
+    def _trim_threads(self):
+        """
+        Mantém na janela as threads mais caras. Corta até 90% do limite para
+        que a ordenação não se repita a cada nova thread.
+        """
+        threads = sorted(
+            (key for key in self._window if key[0] == "thread"),
+            key=lambda key: self._window[key].cost,
+        )
+        excess = len(threads) - int(self.max_window_threads * 0.9)
+        for key in threads[: max(excess, 0)]:
+            del self._window[key]
+        self._window_threads = len(threads) - max(excess, 0)
+        self._threads_dropped += max(excess, 0)
+
+    @staticmethod
+    def _counters(table: Dict[UsageKey, UsageCounters], key: UsageKey) -> UsageCounters:
+        counters = table.get(key)
+        if counters is None:
+            counters = table[key] = UsageCounters()
+        return counters
+
+    def stats(self, top_threads: int = 20) -> Dict[str, object]:
+        """Totais do processo por modelo e instância, e as threads mais caras da janela."""
+        threads = sorted(
+            ((key[1], counters) for key, counters in self._window.items() if key[0] == "thread"),
+            key=lambda item: (item[1].cost, item[1].prompt_tokens + item[1].completion_tokens),
+            reverse=True,
+        )[:top_threads]
+        return {
+            "models": {k[1]: c.as_dict() for k, c in self._totals.items() if k[0] == "model"},
+            "instances": {
+                k[1]: c.as_dict() for k, c in self._totals.items() if k[0] == "instance"
+            },
+            "window_started_at": self._window_started_at.isoformat(),
+            "window_top_threads": {thread_id: c.as_dict() for thread_id, c in threads},
+            "window_threads": self._window_threads,
+            "window_threads_dropped": self._threads_dropped,
+            "flushes": self._flushes,
+            "flush_errors": self._flush_errors,
+        }
+
+    async def flush(self) -> int:
+        """Grava a janela atual em ``llm_usage``. Retorna o número de linhas."""
+        window, self._window = self._window, {}
+        self._window_threads = 0
+        started_at, self._window_started_at = (
+            self._window_started_at,
+            datetime.now(timezone.utc),
+        )
+        if not window:
+            return 0
+
+        rows = [
+            {
+                "window_start": started_at,
+                "window_end": self._window_started_at,
+                "dimension": dimension,
+                "key": key[:255],
+                "calls": c.calls,
+                "errors": c.errors,
+                "prompt_tokens": c.prompt_tokens,
+                "completion_tokens": c.completion_tokens,
+                "cached_tokens": c.cached_tokens,
+                "cost": c.cost,
+                "latency_seconds": c.latency_seconds,
+                "max_latency_seconds": c.max_latency_seconds,
+            }
+            for (dimension, key), c in window.items()
+        ]
+        try:
+            async with AsyncSessionFactory() as session:
+                async with session.begin():
+                    await session.execute(insert(LLMUsage), rows)
+        except Exception:
+            self._flush_errors += 1
+            self._merge_back(window, started_at)
+            raise
+        self._flushes += 1
+        return len(rows)
+
+    def _merge_back(self, window: Dict[UsageKey, UsageCounters], started_at: datetime):
+        """Devolve uma janela não gravada para a próxima tentativa."""
+        for key, counters in window.items():
+            current = self._window.get(key)
+            if current is None:
+                self._window[key] = counters
+                self._window_threads += key[0] == "thread"
+                continue
+            current.calls += counters.calls
+            current.errors += counters.errors
+            current.prompt_tokens += counters.prompt_tokens
+            current.completion_tokens += counters.completion_tokens
+            current.cached_tokens += counters.cached_tokens
+            current.cost += counters.cost
+            current.latency_seconds += counters.latency_seconds
+            current.max_latency_seconds = max(
+                current.max_latency_seconds, counters.max_latency_seconds
+            )
+        self._window_started_at = started_at
+        if self._window_threads > self.max_window_threads:
+            self._trim_threads()
+
+    async def _run_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Erro ao gravar o uso do LLM: {e}")
+
+    def start(self):
+        """Inicia a gravação periódica em background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self):
+        """Interrompe a gravação periódica e grava a janela pendente."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Erro ao gravar o uso do LLM no encerramento: {e}")
+
+
+
+# Instância única (Singleton) da contabilidade de uso do LLM
+usage_accountant = UsageAccountant(
+    pricing=settings.LLM_PRICING,
+    flush_interval_seconds=settings.LLM_USAGE_FLUSH_INTERVAL_SECONDS,
+    max_window_threads=settings.LLM_USAGE_MAX_WINDOW_THREADS,
+)
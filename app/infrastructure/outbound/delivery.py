@@ -0,0 +1,41 @@
+from typing import Optional
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.outbound.gateway_client import WhatsAppGatewayClient
+from app.infrastructure.outbound.outbound_dispatcher import OutboundDispatcher
+from app.infrastructure.outbound.outbox_repository import OutboxRepository
+
+_dispatcher: Optional[OutboundDispatcher] = None
+
+
+def get_outbound_dispatcher() -> OutboundDispatcher:
+    """
+    Retorna a instância única do dispatcher de mensagens de saída,
+    criando-a na primeira chamada a partir das configurações.
+    """
+    global _dispatcher
+
+    if _dispatcher is None:
+        client = WhatsAppGatewayClient(
+            send_url_template=settings.GATEWAY_SEND_URL,
+            batch_url_template=settings.GATEWAY_BATCH_URL,
+            instance_tokens=settings.GATEWAY_INSTANCE_TOKENS,
+            client_token=(
+                settings.GATEWAY_CLIENT_TOKEN.get_secret_value()
+                if settings.GATEWAY_CLIENT_TOKEN
+                else None
+            ),
+            default_instance_id=settings.GATEWAY_DEFAULT_INSTANCE_ID,
+        )
+        _dispatcher = OutboundDispatcher(
+            OutboxRepository(),
+            client,
+            rate_per_instance=settings.OUTBOUND_RATE_PER_INSTANCE,
+            burst_per_instance=settings.OUTBOUND_BURST_PER_INSTANCE,
+            max_batch_size=settings.GATEWAY_MAX_BATCH_SIZE,
+            max_attempts=settings.OUTBOUND_MAX_ATTEMPTS,
+            backoff_base_seconds=settings.OUTBOUND_BACKOFF_BASE_SECONDS,
+            backoff_max_seconds=settings.OUTBOUND_BACKOFF_MAX_SECONDS,
+            poll_interval_seconds=settings.OUTBOUND_POLL_INTERVAL_SECONDS,
+        )
+    return _dispatcher
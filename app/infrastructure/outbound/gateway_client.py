@@ -0,0 +1,87 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayError(Exception):
+    """Falha ao entregar uma mensagem ao gateway do WhatsApp."""
+
+    def __init__(self, message: str, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class WhatsAppGatewayClient:
+    """
+    Cliente HTTP do gateway do WhatsApp, com conexões persistentes.
+
+    As URLs são templates com ``{instance_id}`` e ``{token}`` (ex: Z-API:
+    ``https://api.z-api.io/instances/{instance_id}/token/{token}/send-text``).
+    Se ``batch_url_template`` estiver definido, o gateway aceita uma lista
+    de mensagens por requisição.
+    """
+
+    def __init__(
+        self,
+        send_url_template: str,
+        batch_url_template: Optional[str] = None,
+        instance_tokens: Optional[Dict[str, str]] = None,
+        client_token: Optional[str] = None,
+        default_instance_id: Optional[str] = None,
+        timeout_seconds: float = 10.0,
+        max_connections: int = 100,
+    ):
+        self.send_url_template = send_url_template
+        self.batch_url_template = batch_url_template
+        self.instance_tokens = instance_tokens or {}
+        self.default_instance_id = default_instance_id
+        self._client = httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            headers={"Client-Token": client_token} if client_token else None,
+        )
+
+    @property
+    def supports_batch(self) -> bool:
+        return bool(self.batch_url_template)
+
+    def _url(self, template: str, instance_id: Optional[str]) -> str:
+        instance_id = instance_id or self.default_instance_id
+        if not instance_id:
+            raise GatewayError("Mensagem sem instance_id e sem instância padrão.", retryable=False)
+        return template.format(
+            instance_id=instance_id, token=self.instance_tokens.get(instance_id, "")
+        )
+
+    async def _post(self, url: str, body) -> None:
+        try:
+            response = await self._client.post(url, json=body)
+        except httpx.HTTPError as e:
+            raise GatewayError(f"Erro de rede no gateway: {e}", retryable=True)
+
+        if response.status_code >= 400:
+            retryable = response.status_code == 429 or response.status_code >= 500
+            raise GatewayError(
+                f"Gateway respondeu {response.status_code}: {response.text[:500]}",
+                retryable=retryable,
+            )
+
+    async def send(self, instance_id: Optional[str], phone_number: str, message: str):
+        await self._post(
+            self._url(self.send_url_template, instance_id),
+            {"phone": phone_number, "message": message},
+        )
+
+    async def send_batch(self, instance_id: Optional[str], items: List[Tuple[str, str]]):
+        await self._post(
+            self._url(self.batch_url_template, instance_id),
+            [{"phone": phone_number, "message": message} for phone_number, message in items],
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.domain.outbox_models import OutboundMessage
+from app.infrastructure.outbound.gateway_client import GatewayError, WhatsAppGatewayClient
+from app.infrastructure.outbound.outbox_repository import OutboxRepository
+from app.infrastructure.resilience.admission_control import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundDispatcher:
+    """
+    Entrega as mensagens do outbox ao gateway do WhatsApp.
+
+    Um loop em background reserva as mensagens vencidas, agrupa por
+    ``instance_id`` e envia respeitando um token bucket por instância (em
+    lotes, se o gateway aceitar). Falhas temporárias voltam ao outbox com
+    backoff exponencial e jitter; após ``max_attempts`` a mensagem é
+    marcada como ``failed``.
+    """
+
+    def __init__(
+        self,
+        repository: OutboxRepository,
+        client: WhatsAppGatewayClient,
+        rate_per_instance: float = 5.0,
+        burst_per_instance: float = 10.0,
+        max_batch_size: int = 50,
+        claim_batch_size: int = 100,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 8,
+        backoff_base_seconds: float = 2.0,
+        backoff_max_seconds: float = 300.0,
+        poll_interval_seconds: float = 2.0,
+    ):
+        self.repository = repository
+        self.client = client
+        self.rate_per_instance = rate_per_instance
+        self.burst_per_instance = burst_per_instance
+        self.max_batch_size = max_batch_size
+        self.claim_batch_size = claim_batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._buckets: Dict[Optional[str], TokenBucket] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+
+    async def enqueue(
+        self,
+        phone_number: str,
+        message: str,
+        instance_id: Optional[str] = None,
+        kind: str = "reply",
+        send_at: Optional[datetime] = None,
+    ) -> int:
+        """Grava a mensagem no outbox e acorda o loop de envio."""
+        outbound_id = await self.repository.enqueue(
+            phone_number, message, instance_id=instance_id, kind=kind, send_at=send_at
+        )
+        self._wake.set()
+        return outbound_id
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self._sent, "failed": self._failed, "retried": self._retried}
+
+    async def _run(self):
+        while True:
+            try:
+                messages = await self.repository.claim_due(
+                    self.claim_batch_size, self.lease_seconds
+                )
+            except Exception as e:
+                logger.error(f"Erro ao ler o outbox: {e}")
+                messages = []
+
+            if not messages:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            by_instance: Dict[Optional[str], List[OutboundMessage]] = {}
+            for outbound in messages:
+                by_instance.setdefault(outbound.instance_id, []).append(outbound)
+
+            outcomes = await asyncio.gather(
+                *(
+                    self._deliver_instance(instance_id, outbounds)
+                    for instance_id, outbounds in by_instance.items()
+                ),
+                return_exceptions=True,
+            )
+            # Erro ao gravar o resultado (ex: conexão perdida) não derruba o
+            # loop: as mensagens reservadas voltam a vencer quando o lease expira
+            for instance_id, outcome in zip(by_instance, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        f"Erro ao entregar as mensagens da instância '{instance_id}': {outcome}"
+                    )
+
+    async def _acquire(self, instance_id: Optional[str], tokens: int):
+        bucket = self._buckets.get(instance_id)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_instance, self.burst_per_instance)
+            self._buckets[instance_id] = bucket
+        for _ in range(tokens):
+            while True:
+                wait = bucket.try_acquire()
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+
+    async def _deliver_instance(self, instance_id: Optional[str], outbounds: List[OutboundMessage]):
+        if self.client.supports_batch:
+            chunk_size = max(1, min(self.max_batch_size, int(self.burst_per_instance)))
+            chunks = [
+                outbounds[i : i + chunk_size] for i in range(0, len(outbounds), chunk_size)
+            ]
+        else:
+            chunks = [[outbound] for outbound in outbounds]
+
+        for chunk in chunks:
+            await self._acquire(instance_id, len(chunk))
+            try:
+                if len(chunk) > 1:
+                    await self.client.send_batch(
+                        instance_id, [(o.phone_number, o.message) for o in chunk]
+                    )
+                else:
+                    await self.client.send(instance_id, chunk[0].phone_number, chunk[0].message)
+            except GatewayError as e:
+                await self._handle_failure(chunk, e)
+            except Exception as e:
+                await self._handle_failure(chunk, GatewayError(str(e), retryable=True))
+            else:
+                await self.repository.mark_sent([o.outbound_id for o in chunk])
+                self._sent += len(chunk)
+
+    def _retry_at(self, attempts: int) -> datetime:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempts - 1))
+        # "Equal jitter": metade fixa, metade aleatória, para espalhar as novas tentativas
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def _handle_failure(self, chunk: List[OutboundMessage], error: GatewayError):
+        retry_ids: Dict[datetime, List[int]] = {}
+        final_ids: List[int] = []
+        for outbound in chunk:
+            if error.retryable and outbound.attempts < self.max_attempts:
+                retry_ids.setdefault(self._retry_at(outbound.attempts), []).append(
+                    outbound.outbound_id
+                )
+            else:
+                final_ids.append(outbound.outbound_id)
+
+        logger.warning(
+            f"Falha ao enviar {len(chunk)} mensagens ao gateway: {error} "
+            f"({sum(map(len, retry_ids.values()))} serão reenviadas)."
+        )
+        for retry_at, ids in retry_ids.items():
+            await self.repository.mark_failed(ids, str(error), retry_at)
+            self._retried += len(ids)
+        if final_ids:
+            await self.repository.mark_failed(final_ids, str(error), None)
+            self._failed += len(final_ids)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.outbox_models import OutboundMessage
+from app.infrastructure.database.database_session import AsyncSessionFactory
+
+
+class OutboxRepository:
+    """
+    Acesso à tabela ``outbound_messages`` (outbox durável das mensagens de saída).
+
+    As mensagens são "reservadas" empurrando ``next_attempt_at`` para o
+    futuro (lease) em vez de mudar de status; se o processo morrer no meio
+    do envio, a mensagem volta a ficar disponível quando o lease expira.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionFactory):
+        self.session_factory = session_factory
+
+    async def enqueue(
+        self,
+        phone_number: str,
+        message: str,
+        instance_id: Optional[str] = None,
+        kind: str = "reply",
+        send_at: Optional[datetime] = None,
+    ) -> int:
+        """Grava uma mensagem pendente e retorna seu id."""
+        async with self.session_factory() as session:
+            async with session.begin():
+                outbound = OutboundMessage(
+                    instance_id=instance_id,
+                    phone_number=phone_number,
+                    message=message,
+                    kind=kind,
+                    status="pending",
+                    attempts=0,
+                    next_attempt_at=send_at or datetime.now(timezone.utc),
+                )
+                session.add(outbound)
+            return outbound.outbound_id
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[OutboundMessage]:
+        """
+        Reserva até ``limit`` mensagens vencidas. ``SKIP LOCKED`` permite
+        vários dispatchers (workers) consumindo a mesma tabela.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(OutboundMessage)
+                    .where(
+                        OutboundMessage.status == "pending",
+                        OutboundMessage.next_attempt_at <= now,
+                    )
+                    .order_by(OutboundMessage.next_attempt_at)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+                messages = list(result.scalars().all())
+                for outbound in messages:
+                    outbound.attempts += 1
+                    outbound.next_attempt_at = now + timedelta(seconds=lease_seconds)
+            return messages
+
+    async def mark_sent(self, outbound_ids: Sequence[int]):
+        if not outbound_ids:
+            return
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    update(OutboundMessage)
+                    .where(OutboundMessage.outbound_id.in_(list(outbound_ids)))
+                    .values(status="sent", sent_at=datetime.now(timezone.utc), last_error=None)
+                )
+
+    async def mark_failed(
+        self, outbound_ids: Sequence[int], error: str, retry_at: Optional[datetime]
+    ):
+        """
+        Registra a falha. Com ``retry_at`` a mensagem volta para a fila
+        nesse horário; sem ele, fica como ``failed`` definitivamente.
+        """
+        if not outbound_ids:
+            return
+        values = {"last_error": error[:2000]}
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values["next_attempt_at"] = retry_at
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    update(OutboundMessage)
+                    .where(OutboundMessage.outbound_id.in_(list(outbound_ids)))
+                    .values(**values)
+                )
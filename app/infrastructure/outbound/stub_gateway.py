@@ -0,0 +1,64 @@
+"""
+Gateway do WhatsApp falso, para testar a entrega de mensagens localmente.
+
+Implementa os endpoints de envio no formato da Z-API, guarda em memória
+tudo o que recebe e pode simular falhas e latência.
+
+Uso:
+    STUB_FAILURE_RATE=0.2 STUB_LATENCY_SECONDS=0.05 \\
+        uvicorn app.infrastructure.outbound.stub_gateway:app --port 9100
+
+    # .env da aplicação
+    OUTBOUND_ENABLED=true
+    GATEWAY_SEND_URL=http://localhost:9100/instances/{instance_id}/token/{token}/send-text
+    GATEWAY_BATCH_URL=http://localhost:9100/instances/{instance_id}/token/{token}/send-text-batch
+"""
+import asyncio
+import os
+import random
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException, Request
+
+FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0"))
+LATENCY_SECONDS = float(os.getenv("STUB_LATENCY_SECONDS", "0"))
+
+app = FastAPI(title="Stub do gateway do WhatsApp")
+
+sent_messages: List[Dict[str, Any]] = []
+
+
+async def _simulate():
+    if LATENCY_SECONDS:
+        await asyncio.sleep(LATENCY_SECONDS)
+    if random.random() < FAILURE_RATE:
+        raise HTTPException(status_code=503, detail="Falha simulada do gateway")
+
+
+@app.post("/instances/{instance_id}/token/{token}/send-text")
+async def send_text(instance_id: str, token: str, request: Request):
+    await _simulate()
+    body = await request.json()
+    sent_messages.append({"instance_id": instance_id, **body})
+    return {"messageId": f"stub-{len(sent_messages)}"}
+
+
+@app.post("/instances/{instance_id}/token/{token}/send-text-batch")
+async def send_text_batch(instance_id: str, token: str, request: Request):
+    await _simulate()
+    items = await request.json()
+    for item in items:
+        sent_messages.append({"instance_id": instance_id, **item})
+    return [{"messageId": f"stub-{len(sent_messages) - len(items) + i + 1}"} for i in range(len(items))]
+
+
+@app.get("/_sent")
+async def list_sent():
+    """Mensagens recebidas pelo stub, na ordem de chegada."""
+    return {"count": len(sent_messages), "messages": sent_messages}
+
+
+@app.delete("/_sent")
+async def clear_sent():
+    sent_messages.clear()
+    return {"count": 0}
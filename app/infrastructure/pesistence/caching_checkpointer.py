@@ -0,0 +1,260 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_id,
+)
+from langgraph.constants import TASKS
+
+from app.infrastructure.pesistence.delegating_checkpointer import DelegatingCheckpointSaver
+
+logger = logging.getLogger(__name__)
+
+# Função que retorna o checkpoint_id mais recente gravado para (thread_id, checkpoint_ns)
+LatestCheckpointIdFn = Callable[[str, str], Awaitable[Optional[str]]]
+
+# Custo fixo estimado (bytes) de cada entrada do cache e de cada item de canal
+_ENTRY_OVERHEAD = 1024
+_ITEM_OVERHEAD = 256
+
+
+def _estimate_size(checkpoint: Checkpoint) -> int:
+    """
+    Estimativa barata do tamanho de um checkpoint em memória.
+
+    Não serializa nada: soma o tamanho dos textos (ex: conteúdo das
+    mensagens) e um custo fixo por item, o suficiente para aplicar o
+    limite de memória do cache.
+    """
+    size = _ENTRY_OVERHEAD
+    for value in checkpoint.get("channel_values", {}).values():
+        items = value if isinstance(value, (list, tuple)) else (value,)
+        for item in items:
+            content = getattr(item, "content", item)
+            size += _ITEM_OVERHEAD + (len(content) if isinstance(content, str) else 0)
+    return size
+
+
+class CachingCheckpointSaver(DelegatingCheckpointSaver):
+    """
+    Cache L1 em processo (write-through) na frente de um checkpointer.
+
+    Mantém o checkpoint mais recente de cada thread ativa em um LRU
+    limitado por número de threads e por memória estimada. ``aget_tuple``
+    do checkpoint mais recente é servido da memória; qualquer outra leitura,
+    um miss ou uma divergência de versão cai no checkpointer de origem.
+
+    Se ``latest_checkpoint_id`` for informado, cada hit é validado com uma
+    consulta leve ao id mais recente da thread, protegendo contra escritas
+    de outros processos. Sem ele, o cache assume que este processo é o
+    único escritor da thread.
+    """
+
+    def __init__(
+        self,
+        saver: BaseCheckpointSaver,
+        max_threads: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        latest_checkpoint_id: Optional[LatestCheckpointIdFn] = None,
+    ):
+        super().__init__(saver)
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.latest_checkpoint_id = latest_checkpoint_id
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[CheckpointTuple, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        # Checkpoints que receberam writes no canal de TASKS (Send); o
+        # checkpoint filho precisa ser lido do banco para carregar pending_sends
+        self._tasks_written: Set[Tuple[str, str, str]] = set()
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _key(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    def _remember(self, key: Tuple[str, str], checkpoint_tuple: CheckpointTuple):
+        self._forget(key)
+        size = _estimate_size(checkpoint_tuple.checkpoint)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (checkpoint_tuple, size)
+        self._bytes += size
+        while self._entries and (
+            len(self._entries) > self.max_threads or self._bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._evictions += 1
+
+    def _forget(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas do cache (hit rate, ocupação, evicções)."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "threads": len(self._entries),
+            "estimated_bytes": self._bytes,
+            "max_threads": self.max_threads,
+            "max_bytes": self.max_bytes,
+        }
+
+    async def _lookup(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = self._key(config)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        checkpoint_tuple = entry[0]
+        cached_id = checkpoint_tuple.config["configurable"]["checkpoint_id"]
+        requested_id = get_checkpoint_id(config)
+
+        if requested_id is not None:
+            return checkpoint_tuple if requested_id == cached_id else None
+
+        if self.latest_checkpoint_id is not None:
+            latest_id = await self.latest_checkpoint_id(*key)
+            if latest_id != cached_id:
+                self._stale += 1
+                self._forget(key)
+                return None
+
+        self._entries.move_to_end(key)
+        return checkpoint_tuple
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = await self._lookup(config)
+        if checkpoint_tuple is not None:
+            self._hits += 1
+            return checkpoint_tuple
+
+        self._misses += 1
+        checkpoint_tuple = await self.saver.aget_tuple(config)
+        if checkpoint_tuple is not None and get_checkpoint_id(config) is None:
+            self._remember(self._key(config), checkpoint_tuple)
+        return checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = await self.saver.aput(config, checkpoint, metadata, new_versions)
+
+        key = self._key(config)
+        parent_id = config["configurable"].get("checkpoint_id")
+        if parent_id and (*key, parent_id) in self._tasks_written:
+            # pending_sends do novo checkpoint só existem no banco
+            self._tasks_written.discard((*key, parent_id))
+            self._forget(key)
+            return next_config
+
+        parent_config = (
+            {
+                "configurable": {
+                    "thread_id": key[0],
+                    "checkpoint_ns": key[1],
+                    "checkpoint_id": parent_id,
+                }
+            }
+            if parent_id
+            else None
+        )
+        # Cópia: o dict do chamador continua sendo alterado pelo loop do grafo
+        self._remember(
+            key,
+            CheckpointTuple(
+                config=next_config,
+                checkpoint=copy_checkpoint(checkpoint),
+                metadata=dict(metadata),
+                parent_config=parent_config,
+                pending_writes=[],
+            ),
+        )
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self.saver.aput_writes(config, writes, task_id, task_path)
+
+        key = self._key(config)
+        checkpoint_id = config["configurable"].get("checkpoint_id")
+        if any(channel == TASKS for channel, _ in writes):
+            self._tasks_written.add((*key, checkpoint_id))
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0].config["configurable"]["checkpoint_id"] == checkpoint_id:
+            # O checkpoint em cache passou a ter pending_writes; a próxima leitura vai ao banco
+            self._forget(key)
+
+    def invalidate_thread(self, thread_id: str):
+        """Descarta do cache todos os namespaces da thread."""
+        for key in [key for key in self._entries if key[0] == str(thread_id)]:
+            self._forget(key)
+
+    def clear(self):
+        """Descarta todo o cache."""
+        self._entries.clear()
+        self._tasks_written.clear()
+        self._bytes = 0
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.saver.adelete_thread(thread_id)
+        self.invalidate_thread(thread_id)
+
+    # Métodos síncronos: sem cache, apenas invalidam a thread nas escritas
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self._forget(self._key(config))
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._forget(self._key(config))
+        return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.invalidate_thread(thread_id)
+        return super().delete_thread(thread_id)
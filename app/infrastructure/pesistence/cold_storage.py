@@ -0,0 +1,284 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import CheckpointTuple
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg_pool import AsyncConnectionPool
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Tabelas do checkpointer copiadas para o arquivo frio, na ordem de restauração
+CHECKPOINT_TABLES = ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+
+# Varredura de intervalo no índice de thread_activity.last_activity_at,
+# mantida por trigger em checkpoints (migração 0008_thread_activity)
+_SELECT_COLD_THREADS = """
+    SELECT thread_id
+    FROM thread_activity
+    WHERE last_activity_at < now() - make_interval(days => %s)
+    ORDER BY last_activity_at
+    LIMIT %s
+"""
+
+_SELECT_THREAD_SNAPSHOT = """
+    SELECT
+        jsonb_build_object(
+            'checkpoints', (SELECT coalesce(jsonb_agg(to_jsonb(t)), '[]'::jsonb)
+                            FROM checkpoints t WHERE t.thread_id = %(thread_id)s),
+            'checkpoint_blobs', (SELECT coalesce(jsonb_agg(to_jsonb(t)), '[]'::jsonb)
+                                 FROM checkpoint_blobs t WHERE t.thread_id = %(thread_id)s),
+            'checkpoint_writes', (SELECT coalesce(jsonb_agg(to_jsonb(t)), '[]'::jsonb)
+                                  FROM checkpoint_writes t WHERE t.thread_id = %(thread_id)s)
+        )::text AS payload,
+        (SELECT count(*) FROM checkpoints WHERE thread_id = %(thread_id)s) AS checkpoint_count,
+        (SELECT max((checkpoint->>'ts')::timestamptz)
+         FROM checkpoints WHERE thread_id = %(thread_id)s) AS last_activity_at,
+        (SELECT max((checkpoint->>'ts')::timestamptz)
+         FROM checkpoints WHERE thread_id = %(thread_id)s)
+            < now() - make_interval(days => %(days)s) AS is_cold
+"""
+
+
+class ColdStorageManager:
+    """
+    Move threads inativas das partições quentes para ``checkpoint_archive``
+    e as restaura quando o paciente volta a conversar.
+
+    Cada thread arquivada vira uma única linha comprimida (zstd, quando
+    disponível) com o conteúdo de ``checkpoints``, ``checkpoint_blobs`` e
+    ``checkpoint_writes``. Um advisory lock por thread serializa o
+    arquivamento e a reidratação da mesma conversa.
+
+    As candidatas vêm de ``thread_activity`` (uma linha por thread, com
+    índice na última atividade), e não de uma agregação sobre todos os
+    checkpoints; a inatividade é confirmada nos checkpoints da própria
+    thread dentro da transação do arquivamento.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        archive_after_days: int,
+        batch_size: int = 100,
+        compression_level: int = 3,
+    ):
+        self.pool = pool
+        self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.compression_level = compression_level
+        self._task: Optional[asyncio.Task] = None
+
+    def _compress(self, data: bytes) -> tuple[str, bytes]:
+        if zstandard is None:
+            return "none", data
+        return "zstd", zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes) -> bytes:
+        if codec == "none":
+            return data
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError(
+                    "Thread arquivada com zstd, mas o pacote 'zstandard' não está instalado."
+                )
+            return zstandard.ZstdDecompressor().decompress(data)
+        raise ValueError(f"Codec de arquivo desconhecido: {codec}")
+
+    async def archive_cold_threads(self) -> int:
+        """
+        Arquiva até ``batch_size`` threads sem atividade há mais de
+        ``archive_after_days`` dias. Retorna o número de threads arquivadas.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    _SELECT_COLD_THREADS, (self.archive_after_days, self.batch_size)
+                )
+                thread_ids = [row["thread_id"] for row in await cursor.fetchall()]
+
+        archived = 0
+        for thread_id in thread_ids:
+            try:
+                if await self.archive_thread(thread_id):
+                    archived += 1
+            except Exception as e:
+                logger.error(f"Erro ao arquivar a thread '{thread_id}': {e}")
+
+        if archived:
+            logger.info(f"{archived} threads inativas movidas para o arquivo frio.")
+        return archived
+
+    async def archive_thread(self, thread_id: str) -> bool:
+        """
+        Copia a thread para ``checkpoint_archive`` e a remove das partições quentes.
+        A inatividade é verificada novamente dentro da transação.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT pg_advisory_xact_lock(hashtext(%s))", (thread_id,)
+                    )
+                    await cursor.execute(
+                        _SELECT_THREAD_SNAPSHOT,
+                        {"thread_id": thread_id, "days": self.archive_after_days},
+                    )
+                    snapshot = await cursor.fetchone()
+                    if not snapshot or not snapshot["checkpoint_count"]:
+                        # Thread apagada sem passar pelo arquivo (expurgo, TRUNCATE)
+                        await cursor.execute(
+                            "DELETE FROM thread_activity WHERE thread_id = %s", (thread_id,)
+                        )
+                        return False
+                    if not snapshot["is_cold"]:
+                        await cursor.execute(
+                            """
+                            UPDATE thread_activity SET last_activity_at = %s
+                            WHERE thread_id = %s AND last_activity_at < %s
+                            """,
+                            (
+                                snapshot["last_activity_at"],
+                                thread_id,
+                                snapshot["last_activity_at"],
+                            ),
+                        )
+                        return False
+
+                    codec, payload = self._compress(snapshot["payload"].encode("utf-8"))
+                    await cursor.execute(
+                        """
+                        INSERT INTO checkpoint_archive
+                            (thread_id, codec, payload, checkpoint_count, last_activity_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (thread_id) DO UPDATE SET
+                            codec = EXCLUDED.codec,
+                            payload = EXCLUDED.payload,
+                            checkpoint_count = EXCLUDED.checkpoint_count,
+                            last_activity_at = EXCLUDED.last_activity_at,
+                            archived_at = now()
+                        """,
+                        (
+                            thread_id,
+                            codec,
+                            payload,
+                            snapshot["checkpoint_count"],
+                            snapshot["last_activity_at"],
+                        ),
+                    )
+                    for table in CHECKPOINT_TABLES:
+                        await cursor.execute(
+                            f"DELETE FROM {table} WHERE thread_id = %s", (thread_id,)
+                        )
+                    await cursor.execute(
+                        "DELETE FROM thread_activity WHERE thread_id = %s", (thread_id,)
+                    )
+        return True
+
+    async def is_archived(self, thread_id: str) -> bool:
+        """
+        Consulta pela PK do arquivo, sem transação nem advisory lock. Quase
+        toda leitura sem checkpoint quente é o primeiro turno de uma thread
+        nova, que nunca esteve no arquivo.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT 1 FROM checkpoint_archive WHERE thread_id = %s", (thread_id,)
+                )
+                return await cursor.fetchone() is not None
+
+    async def rehydrate_thread(self, thread_id: str) -> bool:
+        """
+        Restaura uma thread arquivada para as partições quentes.
+        Retorna False se a thread não estiver no arquivo.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT pg_advisory_xact_lock(hashtext(%s))", (thread_id,)
+                    )
+                    await cursor.execute(
+                        "SELECT codec, payload FROM checkpoint_archive WHERE thread_id = %s",
+                        (thread_id,),
+                    )
+                    archived = await cursor.fetchone()
+                    if not archived:
+                        return False
+
+                    payload = self._decompress(archived["codec"], archived["payload"])
+                    for table in CHECKPOINT_TABLES:
+                        await cursor.execute(
+                            f"""
+                            INSERT INTO {table}
+                            SELECT * FROM jsonb_populate_recordset(
+                                NULL::{table}, (%s::jsonb) -> %s::text
+                            )
+                            ON CONFLICT DO NOTHING
+                            """,
+                            (payload.decode("utf-8"), table),
+                        )
+                    await cursor.execute(
+                        "DELETE FROM checkpoint_archive WHERE thread_id = %s", (thread_id,)
+                    )
+
+        logger.info(f"Thread '{thread_id}' reidratada a partir do arquivo frio.")
+        return True
+
+    async def _run_periodically(self, interval_seconds: float):
+        while True:
+            try:
+                while await self.archive_cold_threads() >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"Erro no arquivamento de threads inativas: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float):
+        """Inicia o arquivamento periódico em background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically(interval_seconds))
+
+    async def stop(self):
+        """Interrompe o arquivamento periódico."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class ArchivingPostgresSaver(AsyncPostgresSaver):
+    """
+    ``AsyncPostgresSaver`` que reidrata threads arquivadas de forma transparente.
+
+    Quando não há checkpoint quente para a thread, consulta o arquivo frio
+    (uma leitura pela PK) e, só se a thread estiver lá, restaura com o
+    advisory lock e repete a leitura.
+    """
+
+    def __init__(self, *args: Any, cold_storage: Optional[ColdStorageManager] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.cold_storage = cold_storage
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is not None or self.cold_storage is None:
+            return checkpoint_tuple
+
+        thread_id = str(config["configurable"]["thread_id"])
+        if not await self.cold_storage.is_archived(thread_id):
+            return None
+        if await self.cold_storage.rehydrate_thread(thread_id):
+            checkpoint_tuple = await super().aget_tuple(config)
+        return checkpoint_tuple
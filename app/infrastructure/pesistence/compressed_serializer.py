@@ -0,0 +1,77 @@
+import logging
+from typing import Any, Optional, Tuple
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Prefixo gravado na coluna "type" dos blobs comprimidos (ex: "zstd+msgpack")
+ZSTD_TYPE_PREFIX = "zstd+"
+
+
+class CompressedSerializer(SerializerProtocol):
+    """
+    Serializer compacto para o checkpointer do LangGraph.
+
+    Usa o ``JsonPlusSerializer`` (codificação binária msgpack) e comprime com
+    zstd os valores acima de ``threshold`` bytes. O tipo original é preservado
+    com o prefixo ``zstd+``, de modo que linhas gravadas com o serializer
+    padrão continuam legíveis sem migração.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[SerializerProtocol] = None,
+        threshold: int = 1024,
+        level: int = 3,
+    ):
+        self.inner = inner or JsonPlusSerializer()
+        self.threshold = threshold
+        self.level = level
+
+        if zstandard is None:
+            if threshold > 0:
+                logger.warning(
+                    "Pacote 'zstandard' não encontrado. Checkpoints serão gravados sem compressão."
+                )
+            self._compressor = None
+            self._decompressor = None
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.inner.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.inner.loads(data)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.inner.dumps_typed(obj)
+
+        if self._compressor is None or self.threshold <= 0 or len(data) < self.threshold:
+            return type_, data
+
+        compressed = self._compressor.compress(data)
+        if len(compressed) >= len(data):
+            return type_, data
+        return f"{ZSTD_TYPE_PREFIX}{type_}", compressed
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+
+        if type_.startswith(ZSTD_TYPE_PREFIX):
+            if self._decompressor is None:
+                raise RuntimeError(
+                    "Checkpoint comprimido com zstd, mas o pacote 'zstandard' não está instalado."
+                )
+            type_ = type_[len(ZSTD_TYPE_PREFIX):]
+            payload = self._decompressor.decompress(payload)
+
+        return self.inner.loads_typed((type_, payload))
@@ -0,0 +1,262 @@
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from psycopg_pool import AsyncConnectionPool
+from pydantic import BaseModel
+
+from app.infrastructure.pesistence.cold_storage import CHECKPOINT_TABLES
+from app.infrastructure.tenancy.tenant_keys import split_thread_id, tenant_store_namespace
+
+logger = logging.getLogger(__name__)
+
+# Mesma junção de blobs usada pelo AsyncPostgresSaver, sem pending writes
+_SELECT_CHECKPOINTS = """
+    SELECT
+        thread_id,
+        checkpoint_ns,
+        checkpoint_id,
+        parent_checkpoint_id,
+        checkpoint,
+        metadata,
+        (
+            SELECT array_agg(array[bl.channel::bytea, bl.type::bytea, bl.blob])
+            FROM jsonb_each_text(checkpoint -> 'channel_versions')
+            INNER JOIN checkpoint_blobs bl
+                ON bl.thread_id = checkpoints.thread_id
+                AND bl.checkpoint_ns = checkpoints.checkpoint_ns
+                AND bl.channel = jsonb_each_text.key
+                AND bl.version = jsonb_each_text.value
+        ) AS channel_values
+    FROM checkpoints
+    {where}
+    ORDER BY thread_id, checkpoint_ns, checkpoint_id
+"""
+
+_SELECT_STALE_THREADS = """
+    SELECT thread_id
+    FROM checkpoints
+    WHERE checkpoint_ns = '' {only_threads}
+    GROUP BY thread_id
+    HAVING max((checkpoint->>'ts')::timestamptz) < now() - make_interval(days => %(days)s)
+    LIMIT %(limit)s
+"""
+
+
+def _jsonable(value: Any) -> Any:
+    """Converte valores dos canais (mensagens LangChain, modelos pydantic) para JSON."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class ConversationDataManager:
+    """
+    Exportação e expurgo dos dados de conversa (checkpoints do LangGraph).
+
+    A exportação usa cursores do lado do servidor: as linhas chegam em
+    lotes de ``export_batch_size`` e são entregues uma a uma, com memória
+    constante independente do volume. Os expurgos apagam em lotes de
+    ``purge_batch_size`` threads, uma transação por lote, com o mesmo
+    advisory lock por thread do arquivo frio.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        serde: SerializerProtocol,
+        export_batch_size: int = 500,
+        purge_batch_size: int = 100,
+        invalidate_thread: Optional[Callable[[str], None]] = None,
+    ):
+        self.pool = pool
+        self.serde = serde
+        self.export_batch_size = export_batch_size
+        self.purge_batch_size = purge_batch_size
+        # Chamado após o expurgo de cada thread (ex: descartar o cache L1)
+        self.invalidate_thread = invalidate_thread
+
+    # --- Exportação ---
+
+    def _decode_checkpoint(self, row: Dict[str, Any], include_values: bool) -> Dict[str, Any]:
+        checkpoint = row["checkpoint"]
+        record = {
+            "type": "checkpoint",
+            "thread_id": row["thread_id"],
+            "checkpoint_ns": row["checkpoint_ns"],
+            "checkpoint_id": row["checkpoint_id"],
+            "parent_checkpoint_id": row["parent_checkpoint_id"],
+            "ts": checkpoint.get("ts"),
+            "metadata": row["metadata"],
+        }
+        if include_values:
+            values = dict(checkpoint.get("channel_values") or {})
+            for channel, type_, blob in row["channel_values"] or []:
+                if type_.decode() == "empty":
+                    continue
+                values[channel.decode()] = self.serde.loads_typed((type_.decode(), blob))
+            record["channel_values"] = _jsonable(values)
+        return record
+
+    async def export_checkpoints(
+        self, thread_id: Optional[str] = None, include_values: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Percorre o histórico de checkpoints de uma thread (ou de todas),
+        em ordem de thread e de checkpoint. Threads no arquivo frio aparecem
+        como um registro ``archived_thread``, sem o conteúdo comprimido.
+        """
+        where, params = ("WHERE thread_id = %s", (thread_id,)) if thread_id else ("", ())
+
+        async with self.pool.connection() as conn:
+            # Cursores nomeados (DECLARE) só existem dentro de uma transação
+            async with conn.transaction():
+                async with conn.cursor(name="export_checkpoints") as cursor:
+                    cursor.itersize = self.export_batch_size
+                    await cursor.execute(_SELECT_CHECKPOINTS.format(where=where), params)
+                    async for row in cursor:
+                        yield self._decode_checkpoint(row, include_values)
+
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT to_regclass('checkpoint_archive') IS NOT NULL AS exists"
+                    )
+                    has_archive = (await cursor.fetchone())["exists"]
+                if not has_archive:
+                    return
+
+                async with conn.cursor(name="export_archive") as cursor:
+                    cursor.itersize = self.export_batch_size
+                    await cursor.execute(
+                        f"""
+                        SELECT thread_id, checkpoint_count, last_activity_at, archived_at
+                        FROM checkpoint_archive
+                        {where}
+                        ORDER BY thread_id
+                        """,
+                        params,
+                    )
+                    async for row in cursor:
+                        yield {"type": "archived_thread", **row}
+
+    # --- Expurgo ---
+
+    async def _delete_threads(self, cursor, thread_ids: List[str], include_store: bool):
+        await cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(t)) FROM unnest(%s::text[]) AS t",
+            (thread_ids,),
+        )
+        for table in CHECKPOINT_TABLES:
+            await cursor.execute(
+                f"DELETE FROM {table} WHERE thread_id = ANY(%s)", (thread_ids,)
+            )
+        await cursor.execute("SELECT to_regclass('checkpoint_archive') IS NOT NULL AS exists")
+        if (await cursor.fetchone())["exists"]:
+            await cursor.execute(
+                "DELETE FROM checkpoint_archive WHERE thread_id = ANY(%s)", (thread_ids,)
+            )
+        if include_store:
+            # O orquestrador guarda o cadastro do paciente em ("users", telefone)
+            # ou, com instância, em ("users", instance_id) / telefone
+            prefixes, keys = [], []
+            for thread_id in thread_ids:
+                instance_id, phone_number = split_thread_id(thread_id)
+                prefixes.append(".".join(tenant_store_namespace("users", instance_id)))
+                keys.append(phone_number)
+            await cursor.execute(
+                """
+                DELETE FROM store
+                WHERE (prefix, key) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+                """,
+                (prefixes, keys),
+            )
+
+    def _invalidate(self, thread_ids: List[str]):
+        if self.invalidate_thread is not None:
+            for thread_id in thread_ids:
+                self.invalidate_thread(thread_id)
+
+    async def purge_thread(self, thread_id: str, include_store: bool = False) -> bool:
+        """
+        Apaga todos os checkpoints de uma thread, inclusive do arquivo frio.
+        Com ``include_store``, apaga também o cadastro do paciente no BaseStore.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await self._delete_threads(cursor, [thread_id], include_store)
+        self._invalidate([thread_id])
+        logger.info(f"Thread '{thread_id}' expurgada.")
+        return True
+
+    async def purge_older_than(self, days: int) -> int:
+        """
+        Apaga as threads sem atividade há mais de ``days`` dias, em lotes.
+        A inatividade é verificada novamente dentro da transação de cada lote.
+        Retorna o número de threads apagadas.
+        """
+        purged = 0
+        while True:
+            async with self.pool.connection() as conn:
+                async with conn.transaction():
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(
+                            _SELECT_STALE_THREADS.format(only_threads=""),
+                            {"days": days, "limit": self.purge_batch_size},
+                        )
+                        candidates = [row["thread_id"] for row in await cursor.fetchall()]
+                        if not candidates:
+                            break
+
+                        await cursor.execute(
+                            "SELECT pg_advisory_xact_lock(hashtext(t)) FROM unnest(%s::text[]) AS t",
+                            (candidates,),
+                        )
+                        await cursor.execute(
+                            _SELECT_STALE_THREADS.format(
+                                only_threads="AND thread_id = ANY(%(threads)s)"
+                            ),
+                            {"days": days, "limit": len(candidates), "threads": candidates},
+                        )
+                        thread_ids = [row["thread_id"] for row in await cursor.fetchall()]
+                        if thread_ids:
+                            await self._delete_threads(cursor, thread_ids, include_store=False)
+
+            self._invalidate(thread_ids)
+            purged += len(thread_ids)
+            if len(candidates) < self.purge_batch_size:
+                break
+
+        purged += await self._purge_archive_older_than(days)
+        logger.info(f"{purged} threads com mais de {days} dias expurgadas.")
+        return purged
+
+    async def _purge_archive_older_than(self, days: int) -> int:
+        purged = 0
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT to_regclass('checkpoint_archive') IS NOT NULL AS exists"
+                )
+                if not (await cursor.fetchone())["exists"]:
+                    return 0
+                while True:
+                    # Em autocommit, cada DELETE é a sua própria transação
+                    await cursor.execute(
+                        """
+                        DELETE FROM checkpoint_archive
+                        WHERE thread_id IN (
+                            SELECT thread_id FROM checkpoint_archive
+                            WHERE last_activity_at < now() - make_interval(days => %s)
+                            LIMIT %s
+                        )
+                        """,
+                        (days, self.purge_batch_size),
+                    )
+                    purged += cursor.rowcount
+                    if cursor.rowcount < self.purge_batch_size:
+                        return purged
@@ -0,0 +1,69 @@
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.store.base import BaseStore, Op, Result
+
+from app.infrastructure.pesistence.delegating_checkpointer import DelegatingCheckpointSaver
+from app.infrastructure.resilience.circuit_breaker import CircuitBreaker
+
+
+class CircuitBreakerCheckpointSaver(DelegatingCheckpointSaver):
+    """
+    Protege as leituras e escritas do checkpointer com um ``CircuitBreaker``.
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver, breaker: CircuitBreaker):
+        super().__init__(saver)
+        self.breaker = breaker
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self.breaker.guard():
+            return await self.saver.aget_tuple(config)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self.breaker.guard():
+            return await self.saver.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self.breaker.guard():
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+
+
+class CircuitBreakerStore(BaseStore):
+    """
+    Protege o BaseStore com um ``CircuitBreaker``.
+    Todas as operações do BaseStore passam por ``batch``/``abatch``.
+    """
+
+    def __init__(self, store: BaseStore, breaker: CircuitBreaker):
+        self.store = store
+        self.breaker = breaker
+        self.supports_ttl = getattr(store, "supports_ttl", False)
+        self.ttl_config = getattr(store, "ttl_config", None)
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        with self.breaker.guard():
+            return self.store.batch(ops)
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        with self.breaker.guard():
+            return await self.store.abatch(ops)
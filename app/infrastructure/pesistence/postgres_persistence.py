@@ -1,9 +1,40 @@
 import logging
+from typing import Optional, Union
 from psycopg_pool import AsyncConnectionPool
 from psycopg.rows import dict_row
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.store.base import BaseStore, TTLConfig
 from langgraph.store.postgres import AsyncPostgresStore
 from app.infrastructure.config.config import settings
+from app.infrastructure.pesistence.caching_checkpointer import CachingCheckpointSaver
+from app.infrastructure.pesistence.cold_storage import (
+    ArchivingPostgresSaver,
+    ColdStorageManager,
+)
+from app.infrastructure.pesistence.compressed_serializer import CompressedSerializer
+from app.infrastructure.pesistence.conversation_data import ConversationDataManager
+from app.infrastructure.pesistence.guarded_persistence import (
+    CircuitBreakerCheckpointSaver,
+    CircuitBreakerStore,
+)
+from app.infrastructure.pesistence.sqlite_persistence import (
+    SQLiteCheckpointSaver,
+    SQLiteDatabase,
+    SQLiteStore,
+    SQLiteTTLSweeper,
+)
+from app.infrastructure.pesistence.store_ttl import (
+    StoreTTLSweeper,
+    TTLPolicyStore,
+    parse_ttl_policies,
+)
+from app.infrastructure.pesistence.traced_persistence import (
+    TracingCheckpointSaver,
+    TracingStore,
+)
+from app.infrastructure.observability.tracing import tracer
+from app.infrastructure.resilience.breakers import postgres_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +49,23 @@ class DatabaseManager:
     """
     Gerencia a conexão e a inicialização do banco de dados PostgreSQL,
     incluindo checkpointer e BaseStore do LangGraph.
+
+    Com PERSISTENCE_BACKEND=sqlite, checkpointer e BaseStore usam o SQLite
+    embutido (``SQLiteDatabase``) e nenhuma conexão com o Postgres é aberta.
     """
     _pool: AsyncConnectionPool = None
-    _checkpointer: AsyncPostgresSaver = None
-    _store: AsyncPostgresStore = None
+    _checkpointer: BaseCheckpointSaver = None
+    _checkpoint_cache: Optional[CachingCheckpointSaver] = None
+    _store: BaseStore = None
+    _cold_storage: ColdStorageManager = None
+    _conversation_data: ConversationDataManager = None
+    _store_ttl_sweeper: Union[StoreTTLSweeper, SQLiteTTLSweeper] = None
+    _sqlite: Optional[SQLiteDatabase] = None
+    _sqlite_store: Optional[SQLiteStore] = None
+
+    @property
+    def embedded(self) -> bool:
+        return settings.PERSISTENCE_BACKEND == "sqlite"
 
     async def get_pool(self) -> AsyncConnectionPool:
         """Retorna o pool de conexões. Cria um se não existir."""
@@ -43,10 +87,35 @@ class DatabaseManager:
             
         return self._pool
 
+    async def get_sqlite(self) -> SQLiteDatabase:
+        """Retorna o banco SQLite embutido, aberto (e compactado) na primeira chamada."""
+        if self._sqlite is None:
+            database = SQLiteDatabase(
+                settings.SQLITE_PATH,
+                commit_interval_ms=settings.SQLITE_COMMIT_INTERVAL_MS,
+                commit_max_writes=settings.SQLITE_COMMIT_MAX_WRITES,
+                wait_for_commit=settings.SQLITE_WAIT_FOR_COMMIT,
+            )
+            await database.open()
+            if settings.SQLITE_COMPACT_ON_STARTUP:
+                await database.compact(keep_checkpoints=settings.SQLITE_KEEP_CHECKPOINTS)
+            self._sqlite = database
+        return self._sqlite
+
+    async def close(self):
+        """Confirma as escritas pendentes e fecha o SQLite embutido."""
+        if self._sqlite is not None:
+            await self._sqlite.close()
+            self._sqlite = None
+
     async def initialize_database(self):
         """
         Orquestra a criação das tabelas do LangGraph (checkpoints + store).
         """
+        if self.embedded:
+            await self.get_sqlite()
+            logger.info("✅ SQLite embutido pronto para o LangGraph.")
+            return
         logger.info("Iniciando a inicialização do banco de dados para o LangGraph...")
         await self._setup_langgraph_tables()
         await self._setup_store_tables()
@@ -87,32 +156,181 @@ class DatabaseManager:
             logger.error(f"❌ Erro no setup das tabelas do BaseStore: {e}")
             raise
 
-    async def get_checkpointer(self) -> AsyncPostgresSaver:
+    async def get_checkpointer(self) -> BaseCheckpointSaver:
         """
         Retorna a instância do checkpointer do LangGraph.
+
+        O ``AsyncPostgresSaver`` é protegido pelo circuit breaker do Postgres
+        e fica atrás de um cache L1 em processo (``CachingCheckpointSaver``),
+        a menos que CHECKPOINT_CACHE_MAX_THREADS seja 0.
         """
+        if self._checkpointer is None and self.embedded:
+            logger.info("Instanciando o SQLiteCheckpointSaver para o checkpointer.")
+            serde = CompressedSerializer(
+                threshold=settings.CHECKPOINT_COMPRESSION_THRESHOLD,
+                level=settings.CHECKPOINT_COMPRESSION_LEVEL,
+            )
+            # Leituras locais são baratas: sem cache L1 nem circuit breaker
+            self._checkpointer = TracingCheckpointSaver(
+                SQLiteCheckpointSaver(await self.get_sqlite(), serde=serde), tracer
+            )
         if self._checkpointer is None:
             logger.info("Instanciando o AsyncPostgresSaver para o checkpointer.")
             pool = await self.get_pool()
-            self._checkpointer = AsyncPostgresSaver(pool)
+            serde = CompressedSerializer(
+                threshold=settings.CHECKPOINT_COMPRESSION_THRESHOLD,
+                level=settings.CHECKPOINT_COMPRESSION_LEVEL,
+            )
+            # A reidratação exige a tabela checkpoint_archive (migração do Alembic)
+            cold_storage = (
+                await self.get_cold_storage()
+                if settings.COLD_STORAGE_ARCHIVE_AFTER_DAYS > 0
+                else None
+            )
+            checkpointer = CircuitBreakerCheckpointSaver(
+                ArchivingPostgresSaver(pool, serde=serde, cold_storage=cold_storage),
+                postgres_breaker,
+            )
+
+            if settings.CHECKPOINT_CACHE_MAX_THREADS > 0:
+                logger.info("Ativando o cache L1 de checkpoints em processo.")
+                checkpointer = self._checkpoint_cache = CachingCheckpointSaver(
+                    checkpointer,
+                    max_threads=settings.CHECKPOINT_CACHE_MAX_THREADS,
+                    max_bytes=settings.CHECKPOINT_CACHE_MAX_BYTES,
+                    latest_checkpoint_id=(
+                        self._latest_checkpoint_id
+                        if settings.CHECKPOINT_CACHE_VALIDATE
+                        else None
+                    ),
+                )
+            # Mais externo: os spans mostram também os acertos do cache
+            self._checkpointer = TracingCheckpointSaver(checkpointer, tracer)
         return self._checkpointer
 
-    async def get_store(self) -> AsyncPostgresStore:
+    async def get_checkpoint_cache(self) -> Optional[CachingCheckpointSaver]:
+        """Retorna o cache L1 de checkpoints, ou None se estiver desativado."""
+        await self.get_checkpointer()
+        return self._checkpoint_cache
+
+    async def _latest_checkpoint_id(
+        self, thread_id: str, checkpoint_ns: str
+    ) -> Optional[str]:
+        """
+        Consulta leve (apenas a PK) do checkpoint mais recente de uma thread.
+        """
+        pool = await self.get_pool()
+        with postgres_breaker.guard():
+            async with pool.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        """
+                        SELECT checkpoint_id FROM checkpoints
+                        WHERE thread_id = %s AND checkpoint_ns = %s
+                        ORDER BY checkpoint_id DESC
+                        LIMIT 1
+                        """,
+                        (thread_id, checkpoint_ns),
+                    )
+                    row = await cursor.fetchone()
+        return row["checkpoint_id"] if row else None
+
+    async def get_cold_storage(self) -> ColdStorageManager:
+        """
+        Retorna o gerenciador do arquivo frio de threads inativas.
+        """
+        if self._cold_storage is None:
+            pool = await self.get_pool()
+            self._cold_storage = ColdStorageManager(
+                pool,
+                archive_after_days=settings.COLD_STORAGE_ARCHIVE_AFTER_DAYS,
+                batch_size=settings.COLD_STORAGE_BATCH_SIZE,
+                compression_level=settings.CHECKPOINT_COMPRESSION_LEVEL,
+            )
+        return self._cold_storage
+
+    async def get_conversation_data(self) -> ConversationDataManager:
+        """
+        Retorna o gerenciador de exportação e expurgo das conversas.
+        Os expurgos descartam a thread do cache L1 de checkpoints.
+        """
+        if self._conversation_data is None:
+            pool = await self.get_pool()
+            checkpointer = await self.get_checkpointer()
+            cache = await self.get_checkpoint_cache()
+            self._conversation_data = ConversationDataManager(
+                pool,
+                serde=checkpointer.serde,
+                export_batch_size=settings.DATA_EXPORT_BATCH_SIZE,
+                purge_batch_size=settings.DATA_PURGE_BATCH_SIZE,
+                invalidate_thread=cache.invalidate_thread if cache else None,
+            )
+        return self._conversation_data
+
+    async def get_store(self) -> BaseStore:
         """
         Retorna a instância do BaseStore do LangGraph.
+
+        As escritas recebem o TTL da política do namespace (STORE_TTL_POLICIES)
+        e as leituras renovam o TTL, se STORE_TTL_REFRESH_ON_READ.
         """
+        if self._store is None and self.embedded:
+            logger.info("Instanciando o SQLiteStore para o BaseStore.")
+            self._sqlite_store = SQLiteStore(
+                await self.get_sqlite(),
+                ttl=TTLConfig(refresh_on_read=settings.STORE_TTL_REFRESH_ON_READ),
+            )
+            self._store = TracingStore(
+                TTLPolicyStore(
+                    self._sqlite_store, parse_ttl_policies(settings.STORE_TTL_POLICIES)
+                ),
+                tracer,
+            )
         if self._store is None:
             logger.info("Instanciando o AsyncPostgresStore para o BaseStore.")
             pool = await self.get_pool()
-            self._store = AsyncPostgresStore(pool)
+            store = AsyncPostgresStore(
+                pool, ttl=TTLConfig(refresh_on_read=settings.STORE_TTL_REFRESH_ON_READ)
+            )
+            self._store = TracingStore(
+                TTLPolicyStore(
+                    CircuitBreakerStore(store, postgres_breaker),
+                    parse_ttl_policies(settings.STORE_TTL_POLICIES),
+                ),
+                tracer,
+            )
         return self._store
 
+    async def get_store_ttl_sweeper(self) -> Union[StoreTTLSweeper, SQLiteTTLSweeper]:
+        """
+        Retorna o varredor dos itens expirados do BaseStore.
+        """
+        if self._store_ttl_sweeper is None and self.embedded:
+            await self.get_store()
+            self._store_ttl_sweeper = SQLiteTTLSweeper(
+                self._sqlite_store,
+                batch_size=settings.STORE_TTL_SWEEP_BATCH_SIZE,
+                max_batches=settings.STORE_TTL_SWEEP_MAX_BATCHES,
+            )
+        if self._store_ttl_sweeper is None:
+            pool = await self.get_pool()
+            self._store_ttl_sweeper = StoreTTLSweeper(
+                pool,
+                parse_ttl_policies(settings.STORE_TTL_POLICIES),
+                batch_size=settings.STORE_TTL_SWEEP_BATCH_SIZE,
+                max_batches=settings.STORE_TTL_SWEEP_MAX_BATCHES,
+            )
+        return self._store_ttl_sweeper
+
 # Instância única (Singleton)
 db_manager = DatabaseManager()
 
 # Funções de fachada
-async def get_checkpointer() -> AsyncPostgresSaver:
+async def get_checkpointer() -> BaseCheckpointSaver:
     return await db_manager.get_checkpointer()
 
-async def get_store() -> AsyncPostgresStore:
-    return await db_manager.get_store()
\ No newline at end of file
+async def get_store() -> BaseStore:
+    return await db_manager.get_store()
+
+async def get_conversation_data() -> ConversationDataManager:
+    return await db_manager.get_conversation_data()
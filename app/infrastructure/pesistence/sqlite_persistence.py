@@ -0,0 +1,918 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS
+from langgraph.store.base import (
+    BaseStore,
+    GetOp,
+    Item,
+    ListNamespacesOp,
+    Op,
+    PutOp,
+    Result,
+    SearchItem,
+    SearchOp,
+    TTLConfig,
+)
+from langgraph.store.memory import _compare_values, _does_match
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    channel_versions TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS store (
+    prefix TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL,
+    ttl_minutes REAL,
+    PRIMARY KEY (prefix, key)
+);
+CREATE INDEX IF NOT EXISTS ix_store_expires_at ON store (expires_at)
+    WHERE expires_at IS NOT NULL;
+"""
+
+
+def _to_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class SQLiteDatabase:
+    """
+    Banco SQLite embutido (modo WAL) para implantações de um único nó e
+    testes de desempenho, sem Postgres.
+
+    Uma única conexão vive em uma thread dedicada, que serializa leituras
+    e escritas. As escritas entram em uma transação aberta e são
+    confirmadas em grupo (group commit): um COMMIT, e portanto um fsync,
+    a cada ``commit_interval_ms`` ou a cada ``commit_max_writes`` escritas.
+    Com ``wait_for_commit``, cada escrita só retorna depois do fsync do
+    seu grupo; sem ele, retorna antes e uma queda pode perder até um
+    intervalo de escritas. As leituras usam a mesma conexão e enxergam as
+    escritas ainda não confirmadas.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        commit_interval_ms: float = 10.0,
+        commit_max_writes: int = 256,
+        wait_for_commit: bool = True,
+    ):
+        self.path = path
+        self.commit_interval = commit_interval_ms / 1000
+        self.commit_max_writes = commit_max_writes
+        self.wait_for_commit = wait_for_commit
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._batch: Optional[asyncio.Future] = None
+        self._batch_writes = 0
+        self._dirty = asyncio.Event()
+        self._commit_task: Optional[asyncio.Task] = None
+        self._commits = 0
+        self._writes = 0
+        self._commit_seconds = 0.0
+        self._commit_errors = 0
+
+    # --- Ciclo de vida ---
+
+    def _open_sync(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: as transações são abertas explicitamente
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # FULL no modo WAL: fsync do WAL a cada COMMIT (um por grupo)
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+
+    async def open(self):
+        if self._conn is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        await self._run(self._open_sync)
+        self._commit_task = asyncio.create_task(self._commit_loop())
+        logger.info(f"SQLite embutido aberto em '{self.path}' (WAL).")
+
+    async def close(self):
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            try:
+                await self._commit_task
+            except asyncio.CancelledError:
+                pass
+            self._commit_task = None
+        await self.flush()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    # --- Execução na thread da conexão ---
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Executa ``fn(conn, *args)`` na thread da conexão."""
+        return await self._run(fn, self._conn, *args)
+
+    def _apply(self, fn: Callable[..., T], args: Tuple[Any, ...]) -> T:
+        conn = self._conn
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        # Uma escrita que falha é desfeita sem afetar as demais do grupo
+        conn.execute("SAVEPOINT write")
+        try:
+            result = fn(conn, *args)
+        except Exception:
+            conn.execute("ROLLBACK TO write")
+            conn.execute("RELEASE write")
+            raise
+        conn.execute("RELEASE write")
+        return result
+
+    async def write(self, fn: Callable[..., T], *args: Any, wait: Optional[bool] = None) -> T:
+        """
+        Executa ``fn(conn, *args)`` dentro da transação do grupo atual.
+        Com ``wait_for_commit`` (ou ``wait``), aguarda o COMMIT (fsync) do grupo.
+        """
+        try:
+            result = await self._run(self._apply, fn, args)
+        finally:
+            # Mesmo com erro a transação do grupo ficou aberta: agenda o COMMIT
+            if self._batch is None:
+                self._batch = asyncio.get_running_loop().create_future()
+                self._batch_writes = 0
+                self._dirty.set()
+        self._writes += 1
+        batch = self._batch
+        self._batch_writes += 1
+        if self._batch_writes >= self.commit_max_writes:
+            await self.flush()
+        if self.wait_for_commit if wait is None else wait:
+            await asyncio.shield(batch)
+        return result
+
+    def _commit_sync(self):
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.commit()
+
+    async def flush(self):
+        """Confirma (COMMIT + fsync) as escritas pendentes."""
+        batch, self._batch = self._batch, None
+        self._dirty.clear()
+        if batch is None:
+            return
+        started = time.perf_counter()
+        try:
+            await self._run(self._commit_sync)
+        except Exception as e:
+            self._commit_errors += 1
+            logger.error(f"Erro no COMMIT do SQLite embutido: {e}")
+            try:
+                await self._run(self._conn.rollback)
+            except Exception:
+                pass
+            batch.set_exception(e)
+            # Marca a exceção como lida: escritas sem espera não aguardam o grupo
+            batch.exception()
+            return
+        self._commits += 1
+        self._commit_seconds += time.perf_counter() - started
+        batch.set_result(None)
+
+    async def _commit_loop(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.commit_interval)
+            await self.flush()
+
+    # --- Compactação ---
+
+    def _compact_sync(self, keep_checkpoints: int, vacuum_ratio: float) -> Dict[str, int]:
+        conn = self._conn
+        stats: Dict[str, int] = {}
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN")
+        stats["expired_store_items"] = conn.execute(
+            "DELETE FROM store WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        ).rowcount
+        if keep_checkpoints > 0:
+            stats["checkpoints"] = conn.execute(
+                """
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id, checkpoint_ns
+                            ORDER BY checkpoint_id DESC
+                        ) AS position
+                        FROM checkpoints
+                    ) WHERE position > ?
+                )
+                """,
+                (keep_checkpoints,),
+            ).rowcount
+            stats["writes"] = conn.execute(
+                """
+                DELETE FROM checkpoint_writes WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = checkpoint_writes.thread_id
+                      AND c.checkpoint_ns = checkpoint_writes.checkpoint_ns
+                      AND c.checkpoint_id = checkpoint_writes.checkpoint_id
+                )
+                """
+            ).rowcount
+            # Blobs de versões que nenhum checkpoint restante referencia
+            stats["blobs"] = conn.execute(
+                """
+                DELETE FROM checkpoint_blobs WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c, json_each(c.channel_versions) v
+                    WHERE c.thread_id = checkpoint_blobs.thread_id
+                      AND c.checkpoint_ns = checkpoint_blobs.checkpoint_ns
+                      AND v.key = checkpoint_blobs.channel
+                      AND CAST(v.value AS TEXT) = checkpoint_blobs.version
+                )
+                """
+            ).rowcount
+        conn.commit()
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        total_pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        stats["vacuumed"] = 0
+        if total_pages and free_pages / total_pages >= vacuum_ratio:
+            conn.execute("VACUUM")
+            stats["vacuumed"] = 1
+        conn.execute("PRAGMA optimize")
+        return stats
+
+    async def compact(self, keep_checkpoints: int = 0, vacuum_ratio: float = 0.25) -> Dict[str, int]:
+        """
+        Compactação na inicialização: remove itens expirados do store, os
+        checkpoints além dos ``keep_checkpoints`` mais recentes de cada
+        thread (0 mantém todos) com seus writes e blobs órfãos, trunca o
+        WAL e executa VACUUM se as páginas livres passarem de ``vacuum_ratio``.
+        """
+        await self.flush()
+        started = time.perf_counter()
+        stats = await self._run(self._compact_sync, keep_checkpoints, vacuum_ratio)
+        logger.info(
+            f"SQLite embutido compactado em {time.perf_counter() - started:.2f}s: {stats}"
+        )
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "writes": self._writes,
+            "commits": self._commits,
+            "writes_per_commit": round(self._writes / self._commits, 2) if self._commits else 0.0,
+            "mean_commit_ms": (
+                round(self._commit_seconds / self._commits * 1000, 3) if self._commits else 0.0
+            ),
+            "commit_errors": self._commit_errors,
+            "wait_for_commit": self.wait_for_commit,
+        }
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpointer do LangGraph sobre o ``SQLiteDatabase``.
+
+    Segue o layout do ``AsyncPostgresSaver``: o checkpoint é gravado sem
+    ``channel_values`` e cada canal vira um blob por versão, gravado só
+    quando a versão muda (``new_versions``). ``channel_versions`` fica
+    também em JSON para a compactação achar os blobs órfãos.
+    """
+
+    def __init__(self, db: SQLiteDatabase, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.db = db
+
+    # --- Leitura (na thread da conexão) ---
+
+    def _load_tuple(self, conn: sqlite3.Connection, row: sqlite3.Row) -> CheckpointTuple:
+        (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_checkpoint_id,
+            type_,
+            checkpoint_blob,
+            metadata_type,
+            metadata_blob,
+        ) = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, checkpoint_blob))
+
+        channel_values: Dict[str, Any] = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob_row = conn.execute(
+                "SELECT type, blob FROM checkpoint_blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if blob_row and blob_row[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed(blob_row)
+
+        writes = conn.execute(
+            "SELECT task_id, channel, type, blob FROM checkpoint_writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        sends = []
+        if parent_checkpoint_id:
+            sends = conn.execute(
+                "SELECT type, blob FROM checkpoint_writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND channel = ? "
+                "ORDER BY task_path, task_id, idx",
+                (thread_id, checkpoint_ns, parent_checkpoint_id, TASKS),
+            ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": channel_values,
+                "pending_sends": [self.serde.loads_typed(send) for send in sends],
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, blob)))
+                for task_id, channel, type_, blob in writes
+            ],
+        )
+
+    _COLUMNS = (
+        "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+        "type, checkpoint, metadata_type, metadata"
+    )
+
+    def _get_tuple_sync(
+        self, conn: sqlite3.Connection, config: RunnableConfig
+    ) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        if checkpoint_id := get_checkpoint_id(config):
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchone()
+        else:
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+        return self._load_tuple(conn, row) if row else None
+
+    def _list_sync(
+        self,
+        conn: sqlite3.Connection,
+        config: Optional[RunnableConfig],
+        filter: Optional[Dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> List[CheckpointTuple]:
+        where, params = [], []
+        if config:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        query = f"SELECT {self._COLUMNS} FROM checkpoints"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+
+        results: List[CheckpointTuple] = []
+        for row in conn.execute(query, params).fetchall():
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            results.append(self._load_tuple(conn, row))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    # --- Escrita (na transação do grupo) ---
+
+    def _put_sync(
+        self,
+        conn: sqlite3.Connection,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ):
+        copy = checkpoint.copy()
+        copy.pop("pending_sends", None)
+        values: Dict[str, Any] = copy.pop("channel_values")
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+        blobs = [
+            (
+                thread_id,
+                checkpoint_ns,
+                channel,
+                str(version),
+                *(
+                    self.serde.dumps_typed(values[channel])
+                    if channel in values
+                    else ("empty", None)
+                ),
+            )
+            for channel, version in new_versions.items()
+        ]
+        if blobs:
+            conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_blobs "
+                "(thread_id, checkpoint_ns, channel, version, type, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints "
+            "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata, channel_versions) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                config["configurable"].get("checkpoint_id"),
+                *self.serde.dumps_typed(copy),
+                *self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+                json.dumps({k: str(v) for k, v in copy["channel_versions"].items()}),
+            ),
+        )
+
+    def _put_writes_sync(
+        self,
+        conn: sqlite3.Connection,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = [
+            (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Writes especiais (índice negativo) substituem; os normais não
+        # sobrescrevem um write já gravado para o mesmo task/índice
+        verb = (
+            "INSERT OR REPLACE"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE"
+        )
+        conn.executemany(
+            f"{verb} INTO checkpoint_writes "
+            "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob, task_path) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    @staticmethod
+    def _delete_thread_sync(conn: sqlite3.Connection, thread_id: str):
+        for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+            conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    # --- Assíncronos ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self.db.read(self._get_tuple_sync, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint_tuple in await self.db.read(
+            self._list_sync, config, filter, before, limit
+        ):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        await self.db.write(self._put_sync, config, checkpoint, metadata, new_versions)
+        return {
+            "configurable": {
+                "thread_id": config["configurable"]["thread_id"],
+                "checkpoint_ns": config["configurable"]["checkpoint_ns"],
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self.db.write(self._put_writes_sync, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.db.write(self._delete_thread_sync, thread_id)
+
+    # --- Síncronos (fora do event loop, como no AsyncPostgresSaver) ---
+
+    def _run_sync(self, coro):
+        try:
+            if asyncio.get_running_loop() is self.db.loop:
+                coro.close()
+                raise asyncio.InvalidStateError(
+                    "Use os métodos assíncronos do SQLiteCheckpointSaver no event loop."
+                )
+        except RuntimeError:
+            pass
+        return asyncio.run_coroutine_threadsafe(coro, self.db.loop).result()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._run_sync(self.aget_tuple(config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        yield from self._run_sync(
+            self.db.read(self._list_sync, config, filter, before, limit)
+        )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self._run_sync(self.aput(config, checkpoint, metadata, new_versions))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._run_sync(self.aput_writes(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._run_sync(self.adelete_thread(thread_id))
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+class SQLiteStore(BaseStore):
+    """
+    ``BaseStore`` sobre o ``SQLiteDatabase``, com TTL.
+
+    O namespace vira o ``prefix`` separado por pontos, como no
+    ``AsyncPostgresStore``. Os filtros de ``search`` são aplicados em
+    Python sobre o prefixo; busca semântica (``query``) não é suportada e
+    os itens voltam sem score, ordenados por ``updated_at``.
+    """
+
+    supports_ttl: bool = True
+
+    def __init__(self, db: SQLiteDatabase, ttl: Optional[TTLConfig] = None):
+        self.db = db
+        self.ttl_config = ttl
+
+    @staticmethod
+    def _prefix_range(namespace: Tuple[str, ...]) -> Tuple[str, str, str]:
+        prefix = ".".join(namespace)
+        # Filhos: tudo entre "prefixo." e "prefixo/" ("/" sucede "." em ASCII)
+        return prefix, prefix + ".", prefix + "/"
+
+    @staticmethod
+    def _item(row: Sequence[Any], search: bool = False) -> Item:
+        prefix, key, value, created_at, updated_at = row[:5]
+        cls = SearchItem if search else Item
+        return cls(
+            namespace=tuple(prefix.split(".")) if prefix else (),
+            key=key,
+            value=json.loads(value),
+            created_at=_to_datetime(created_at),
+            updated_at=_to_datetime(updated_at),
+        )
+
+    def _refresh(self, conn: sqlite3.Connection, keys: List[Tuple[str, str]], now: float):
+        if keys:
+            conn.executemany(
+                "UPDATE store SET expires_at = ? + ttl_minutes * 60 "
+                "WHERE prefix = ? AND key = ? AND ttl_minutes IS NOT NULL",
+                [(now, prefix, key) for prefix, key in keys],
+            )
+
+    def _batch_sync(self, conn: sqlite3.Connection, ops: List[Op]) -> List[Result]:
+        now = time.time()
+        results: List[Result] = []
+        refresh: List[Tuple[str, str]] = []
+        live = "(expires_at IS NULL OR expires_at >= ?)"
+
+        for op in ops:
+            if isinstance(op, GetOp):
+                prefix = ".".join(op.namespace)
+                row = conn.execute(
+                    "SELECT prefix, key, value, created_at, updated_at FROM store "
+                    f"WHERE prefix = ? AND key = ? AND {live}",
+                    (prefix, op.key, now),
+                ).fetchone()
+                if row and op.refresh_ttl:
+                    refresh.append((prefix, op.key))
+                results.append(self._item(row) if row else None)
+
+            elif isinstance(op, SearchOp):
+                prefix, low, high = self._prefix_range(op.namespace_prefix)
+                query = (
+                    "SELECT prefix, key, value, created_at, updated_at FROM store "
+                    f"WHERE (prefix = ? OR (prefix > ? AND prefix < ?)) AND {live} "
+                    "ORDER BY updated_at DESC"
+                )
+                params: List[Any] = [prefix, low, high, now]
+                if not op.filter:
+                    query += " LIMIT ? OFFSET ?"
+                    params += [op.limit, op.offset]
+                rows = conn.execute(query, params).fetchall()
+                if op.filter:
+                    rows = [
+                        row
+                        for row in rows
+                        if all(
+                            _compare_values(json.loads(row[2]).get(key), value)
+                            for key, value in op.filter.items()
+                        )
+                    ][op.offset : op.offset + op.limit]
+                if op.refresh_ttl:
+                    refresh.extend((row[0], row[1]) for row in rows)
+                results.append([self._item(row, search=True) for row in rows])
+
+            elif isinstance(op, ListNamespacesOp):
+                namespaces = [
+                    tuple(row[0].split("."))
+                    for row in conn.execute(
+                        f"SELECT DISTINCT prefix FROM store WHERE {live}", (now,)
+                    )
+                ]
+                if op.match_conditions:
+                    namespaces = [
+                        namespace
+                        for namespace in namespaces
+                        if all(_does_match(c, namespace) for c in op.match_conditions)
+                    ]
+                # A profundidade é aplicada depois do filtro, como no InMemoryStore
+                namespaces = sorted({namespace[: op.max_depth] for namespace in namespaces})
+                results.append(namespaces[op.offset : op.offset + op.limit])
+
+            elif isinstance(op, PutOp):
+                prefix = ".".join(op.namespace)
+                if op.value is None:
+                    conn.execute("DELETE FROM store WHERE prefix = ? AND key = ?", (prefix, op.key))
+                else:
+                    conn.execute(
+                        "INSERT INTO store "
+                        "(prefix, key, value, created_at, updated_at, expires_at, ttl_minutes) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (prefix, key) DO UPDATE SET value = excluded.value, "
+                        "updated_at = excluded.updated_at, expires_at = excluded.expires_at, "
+                        "ttl_minutes = excluded.ttl_minutes",
+                        (
+                            prefix,
+                            op.key,
+                            json.dumps(op.value),
+                            now,
+                            now,
+                            now + op.ttl * 60 if op.ttl is not None else None,
+                            op.ttl,
+                        ),
+                    )
+                results.append(None)
+
+            else:
+                raise ValueError(f"Operação desconhecida: {type(op)}")
+
+        self._refresh(conn, refresh, now)
+        return results
+
+    async def abatch(self, ops: Iterable[Op]) -> List[Result]:
+        ops = list(ops)
+        if any(isinstance(op, PutOp) for op in ops):
+            return await self.db.write(self._batch_sync, ops)
+        if any(getattr(op, "refresh_ttl", False) for op in ops):
+            # Renovar o TTL numa leitura não precisa esperar o fsync do grupo
+            return await self.db.write(self._batch_sync, ops, wait=False)
+        return await self.db.read(self._batch_sync, ops)
+
+    def batch(self, ops: Iterable[Op]) -> List[Result]:
+        return asyncio.run_coroutine_threadsafe(self.abatch(ops), self.db.loop).result()
+
+    def _sweep_sync(self, conn: sqlite3.Connection, batch_size: int) -> int:
+        return conn.execute(
+            "DELETE FROM store WHERE rowid IN ("
+            "SELECT rowid FROM store WHERE expires_at IS NOT NULL AND expires_at < ? "
+            "ORDER BY expires_at LIMIT ?)",
+            (time.time(), batch_size),
+        ).rowcount
+
+    async def sweep_expired(self, batch_size: int = 1000, max_batches: int = 50) -> int:
+        """Remove itens expirados em lotes limitados."""
+        deleted = 0
+        for _ in range(max_batches):
+            count = await self.db.write(self._sweep_sync, batch_size)
+            deleted += count
+            if count < batch_size:
+                break
+        return deleted
+
+
+class SQLiteTTLSweeper:
+    """
+    Varredura periódica dos itens expirados do ``SQLiteStore``, com a
+    mesma interface do ``StoreTTLSweeper`` do Postgres.
+    """
+
+    def __init__(self, store: SQLiteStore, batch_size: int = 1000, max_batches: int = 50):
+        self.store = store
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._deleted = 0
+        self._last_run_seconds = 0.0
+
+    async def sweep(self) -> int:
+        started = time.perf_counter()
+        deleted = await self.store.sweep_expired(self.batch_size, self.max_batches)
+        self._runs += 1
+        self._deleted += deleted
+        self._last_run_seconds = time.perf_counter() - started
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            "runs": self._runs,
+            "deleted": self._deleted,
+            "last_run_seconds": round(self._last_run_seconds, 4),
+            "database": self.store.db.stats(),
+        }
+
+    async def _run_periodically(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                deleted = await self.sweep()
+                if deleted:
+                    logger.info(f"{deleted} itens expirados removidos do store (SQLite).")
+            except Exception as e:
+                logger.error(f"Erro na varredura de TTL do store (SQLite): {e}")
+
+    def start(self, interval_seconds: float):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically(interval_seconds))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
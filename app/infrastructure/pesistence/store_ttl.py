@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langgraph.store.base import BaseStore, Op, PutOp, Result
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Apaga um lote de itens expirados; usa o índice parcial idx_store_expires_at
+# criado pelo setup do AsyncPostgresStore. SKIP LOCKED evita disputar linhas
+# com outro worker varrendo ao mesmo tempo
+_DELETE_EXPIRED = """
+    DELETE FROM store
+    WHERE (prefix, key) IN (
+        SELECT prefix, key FROM store
+        WHERE expires_at < now()
+        ORDER BY expires_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+# Aplica a política a itens gravados antes dela existir (sem expires_at)
+_BACKFILL_TTL = """
+    UPDATE store
+    SET ttl_minutes = %(ttl_minutes)s,
+        expires_at = updated_at + %(ttl)s * interval '1 minute'
+    WHERE (prefix, key) IN (
+        SELECT prefix, key FROM store
+        WHERE expires_at IS NULL
+          AND (prefix = %(prefix)s OR left(prefix, %(child_len)s) = %(child_prefix)s)
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+
+def parse_ttl_policies(policies: Dict[str, float]) -> Dict[Tuple[str, ...], float]:
+    """Converte ``{"users": 43200}`` em ``{("users",): 43200}`` (labels separados por '.')."""
+    return {tuple(prefix.split(".")): float(ttl) for prefix, ttl in policies.items() if ttl}
+
+
+class TTLPolicyStore(BaseStore):
+    """
+    Aplica o TTL por namespace às escritas do BaseStore.
+
+    Um ``put`` sem TTL explícito recebe o TTL da política do namespace (o
+    prefixo mais longo que casar); namespaces sem política não expiram.
+    A renovação na leitura fica a cargo do ``ttl_config`` do store
+    envolvido (``refresh_on_read``).
+    """
+
+    def __init__(self, store: BaseStore, policies: Dict[Tuple[str, ...], float]):
+        self.store = store
+        self.policies = policies
+        self.supports_ttl = getattr(store, "supports_ttl", False)
+        self.ttl_config = getattr(store, "ttl_config", None)
+
+    def ttl_for(self, namespace: Tuple[str, ...]) -> Optional[float]:
+        for size in range(len(namespace), 0, -1):
+            ttl = self.policies.get(namespace[:size])
+            if ttl is not None:
+                return ttl
+        return None
+
+    def _apply(self, ops: Iterable[Op]) -> List[Op]:
+        applied = []
+        for op in ops:
+            if isinstance(op, PutOp) and op.value is not None and op.ttl is None:
+                ttl = self.ttl_for(op.namespace)
+                if ttl is not None:
+                    op = op._replace(ttl=ttl)
+            applied.append(op)
+        return applied
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        return self.store.batch(self._apply(ops))
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        return await self.store.abatch(self._apply(ops))
+
+
+class StoreTTLSweeper:
+    """
+    Remove em background os itens expirados da tabela ``store``.
+
+    Cada varredura apaga lotes de até ``batch_size`` itens, no máximo
+    ``max_batches`` lotes, para não segurar conexões nem gerar um DELETE
+    gigante. Antes, aplica as políticas de TTL aos itens antigos que ainda
+    não têm ``expires_at``, também em lotes.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        policies: Dict[Tuple[str, ...], float],
+        batch_size: int = 1000,
+        max_batches: int = 50,
+    ):
+        self.pool = pool
+        self.policies = policies
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task: Optional[asyncio.Task] = None
+        # Namespaces cujos itens antigos já receberam expires_at
+        self._backfilled: set = set()
+
+        self._runs = 0
+        self._errors = 0
+        self._deleted_total = 0
+        self._backfilled_total = 0
+        self._last_run: Dict[str, Any] = {}
+
+    async def _execute(self, query: str, params: Any) -> int:
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                return cursor.rowcount
+
+    async def backfill(self) -> int:
+        """Aplica as políticas a até ``max_batches`` lotes de itens sem TTL."""
+        updated = 0
+        batches = 0
+        for namespace, ttl in self.policies.items():
+            if namespace in self._backfilled:
+                continue
+            prefix = ".".join(namespace)
+            params = {
+                "ttl_minutes": round(ttl),
+                "ttl": ttl,
+                "prefix": prefix,
+                "child_len": len(prefix) + 1,
+                "child_prefix": prefix + ".",
+                "limit": self.batch_size,
+            }
+            while batches < self.max_batches:
+                count = await self._execute(_BACKFILL_TTL, params)
+                batches += 1
+                updated += count
+                if count < self.batch_size:
+                    self._backfilled.add(namespace)
+                    break
+        self._backfilled_total += updated
+        return updated
+
+    async def sweep(self) -> int:
+        """
+        Apaga até ``max_batches`` lotes de itens expirados.
+        Retorna o número de itens removidos.
+        """
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        backfilled = await self.backfill()
+
+        deleted = 0
+        batches = 0
+        exhausted = False
+        while not exhausted and batches < self.max_batches:
+            count = await self._execute(_DELETE_EXPIRED, (self.batch_size,))
+            batches += 1
+            deleted += count
+            exhausted = count < self.batch_size
+
+        duration = time.perf_counter() - start
+        self._runs += 1
+        self._deleted_total += deleted
+        self._last_run = {
+            "started_at": started_at.isoformat(),
+            "deleted": deleted,
+            "backfilled": backfilled,
+            "batches": batches,
+            "duration_seconds": round(duration, 3),
+            "items_per_second": round(deleted / duration, 1) if duration > 0 else 0.0,
+            # False: restaram itens expirados para a próxima varredura
+            "exhausted": exhausted,
+        }
+        if deleted:
+            logger.info(
+                f"{deleted} itens expirados removidos do BaseStore em {duration:.2f}s "
+                f"({batches} lotes)."
+            )
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policies": {".".join(ns): ttl for ns, ttl in self.policies.items()},
+            "runs": self._runs,
+            "errors": self._errors,
+            "deleted_total": self._deleted_total,
+            "backfilled_total": self._backfilled_total,
+            "last_run": self._last_run,
+        }
+
+    async def _run_periodically(self, interval_seconds: float):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Erro na varredura de TTL do BaseStore: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float):
+        """Inicia a varredura periódica em background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically(interval_seconds))
+
+    async def stop(self):
+        """Interrompe a varredura periódica."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
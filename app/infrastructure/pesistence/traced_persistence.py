@@ -0,0 +1,70 @@
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.store.base import BaseStore, Op, Result
+
+from app.infrastructure.observability.tracing import Tracer
+from app.infrastructure.pesistence.delegating_checkpointer import DelegatingCheckpointSaver
+
+
+class TracingCheckpointSaver(DelegatingCheckpointSaver):
+    """
+    Abre um span para cada leitura e escrita do checkpointer.
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver, tracer: Tracer):
+        super().__init__(saver)
+        self.tracer = tracer
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self.tracer.span("checkpoint.aget_tuple"):
+            return await self.saver.aget_tuple(config)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self.tracer.span("checkpoint.aput", channels=len(new_versions)):
+            return await self.saver.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self.tracer.span("checkpoint.aput_writes", writes=len(writes)):
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+
+
+class TracingStore(BaseStore):
+    """
+    Abre um span para cada lote de operações do BaseStore.
+    """
+
+    def __init__(self, store: BaseStore, tracer: Tracer):
+        self.store = store
+        self.tracer = tracer
+        self.supports_ttl = getattr(store, "supports_ttl", False)
+        self.ttl_config = getattr(store, "ttl_config", None)
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        return self.store.batch(ops)
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        with self.tracer.span(
+            "store.abatch", ops=",".join(sorted({type(op).__name__ for op in ops}))
+        ):
+            return await self.store.abatch(ops)
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.reminder_models import AppointmentReminder
+from app.infrastructure.database.database_session import AsyncSessionFactory
+
+
+class ReminderRepository:
+    """
+    Acesso à tabela ``appointment_reminders``.
+
+    Todas as leituras de pendentes passam pelo índice parcial
+    ``(due_at, reminder_id) WHERE status = 'pending'``: a janela dos
+    próximos vencimentos é uma varredura de intervalo, paginada por keyset,
+    e nunca um scan da tabela. Como no outbox, o lembrete é reservado
+    empurrando ``due_at`` para o futuro (lease) com ``SKIP LOCKED``; se o
+    processo morrer no meio do disparo, ele volta a vencer quando o lease
+    expira.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionFactory):
+        self.session_factory = session_factory
+
+    async def schedule(
+        self,
+        instance_id: Optional[str],
+        phone_number: str,
+        appointment_at: datetime,
+        due: Dict[str, datetime],
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Agenda os lembretes (``kind`` -> vencimento) de uma consulta e
+        cancela os pendentes de outra data da mesma conversa (remarcação).
+        Repetir a chamada não duplica nada. Retorna ``(id, due_at)`` dos
+        lembretes criados.
+        """
+        instance_id = instance_id or ""
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    update(AppointmentReminder)
+                    .where(
+                        AppointmentReminder.instance_id == instance_id,
+                        AppointmentReminder.phone_number == phone_number,
+                        AppointmentReminder.status == "pending",
+                        AppointmentReminder.appointment_at != appointment_at,
+                    )
+                    .values(status="cancelled")
+                )
+                if not due:
+                    return []
+                result = await session.execute(
+                    insert(AppointmentReminder)
+                    .values(
+                        [
+                            {
+                                "instance_id": instance_id,
+                                "phone_number": phone_number,
+                                "kind": kind,
+                                "appointment_at": appointment_at,
+                                "due_at": due_at,
+                                "status": "pending",
+                                "attempts": 0,
+                                "created_at": datetime.now(timezone.utc),
+                            }
+                            for kind, due_at in due.items()
+                        ]
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=["instance_id", "phone_number", "kind", "appointment_at"]
+                    )
+                    .returning(AppointmentReminder.reminder_id, AppointmentReminder.due_at)
+                )
+                return [tuple(row) for row in result.all()]
+
+    async def cancel(self, instance_id: Optional[str], phone_number: str) -> int:
+        """Cancela os lembretes pendentes da conversa (ex.: consulta desmarcada)."""
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(AppointmentReminder)
+                    .where(
+                        AppointmentReminder.instance_id == (instance_id or ""),
+                        AppointmentReminder.phone_number == phone_number,
+                        AppointmentReminder.status == "pending",
+                    )
+                    .values(status="cancelled")
+                )
+        return result.rowcount
+
+    async def due_window(
+        self,
+        until: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 1000,
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Próxima página ``(id, due_at)`` dos pendentes que vencem até
+        ``until``, em ordem de vencimento, a partir do cursor ``after``.
+        """
+        statement = select(AppointmentReminder.reminder_id, AppointmentReminder.due_at).where(
+            AppointmentReminder.status == "pending", AppointmentReminder.due_at <= until
+        )
+        if after is not None:
+            statement = statement.where(
+                tuple_(AppointmentReminder.due_at, AppointmentReminder.reminder_id)
+                > tuple_(*after)
+            )
+        statement = statement.order_by(
+            AppointmentReminder.due_at, AppointmentReminder.reminder_id
+        ).limit(limit)
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            return [tuple(row) for row in result.all()]
+
+    async def next_due_at(self) -> Optional[datetime]:
+        """Vencimento pendente mais próximo (uma leitura no início do índice)."""
+        async with self.session_factory() as session:
+            return await session.scalar(
+                select(func.min(AppointmentReminder.due_at)).where(
+                    AppointmentReminder.status == "pending"
+                )
+            )
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[AppointmentReminder]:
+        """
+        Reserva até ``limit`` lembretes vencidos. ``SKIP LOCKED`` permite
+        vários workers disparando a partir da mesma tabela.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(AppointmentReminder)
+                    .where(
+                        AppointmentReminder.status == "pending",
+                        AppointmentReminder.due_at <= now,
+                    )
+                    .order_by(AppointmentReminder.due_at, AppointmentReminder.reminder_id)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+                reminders = list(result.scalars().all())
+                for reminder in reminders:
+                    reminder.attempts += 1
+                    reminder.due_at = now + timedelta(seconds=lease_seconds)
+            return reminders
+
+    async def _set(self, reminder_ids: Sequence[int], **values):
+        if not reminder_ids:
+            return
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    update(AppointmentReminder)
+                    .where(AppointmentReminder.reminder_id.in_(list(reminder_ids)))
+                    .values(**values)
+                )
+
+    async def mark_sent(self, reminder_ids: Sequence[int]):
+        await self._set(
+            reminder_ids, status="sent", fired_at=datetime.now(timezone.utc), last_error=None
+        )
+
+    async def mark_cancelled(self, reminder_ids: Sequence[int], reason: str):
+        await self._set(reminder_ids, status="cancelled", last_error=reason[:2000])
+
+    async def mark_failed(
+        self, reminder_ids: Sequence[int], error: str, retry_at: Optional[datetime]
+    ):
+        """
+        Registra a falha. Com ``retry_at`` o lembrete volta a vencer nesse
+        horário; sem ele, fica como ``failed`` definitivamente.
+        """
+        values = {"last_error": error[:2000]}
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values["due_at"] = retry_at
+        await self._set(reminder_ids, **values)
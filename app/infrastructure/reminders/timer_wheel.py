@@ -0,0 +1,154 @@
+import math
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class HierarchicalTimerWheel(Generic[K]):
+    """
+    Timer wheel hierárquica (Varghese & Lauck) para muitos vencimentos.
+
+    Cada nível tem ``slots`` posições; um tick do nível ``L`` vale
+    ``slots ** L`` ticks do nível 0. Agendar e cancelar são O(1): a chave
+    vai para o nível cuja faixa cobre o tempo até o vencimento. Quando o
+    nível inferior dá a volta, a posição correspondente do nível de cima é
+    redistribuída ("cascade"). Vencimentos além da faixa da roda ficam em
+    ``overflow`` até caberem.
+
+    O relógio é externo (``advance(now)``, em segundos): a roda não tem
+    thread nem tarefa própria, e ``next_deadline`` diz até quando o dono
+    pode dormir sem perder nenhum vencimento.
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = 1.0,
+        slots: int = 64,
+        levels: int = 4,
+        now: float = 0.0,
+    ):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self._current = self._to_tick(now)
+        self._wheels: List[List[Dict[K, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[K, Tuple[int, int]] = {}
+        self._ready: Dict[K, int] = {}
+        self._overflow: Dict[K, int] = {}
+        self._span = slots**levels
+
+    def __len__(self) -> int:
+        return len(self._where) + len(self._ready) + len(self._overflow)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._where or key in self._ready or key in self._overflow
+
+    def _to_tick(self, seconds: float) -> int:
+        return math.ceil(seconds / self.tick_seconds)
+
+    def _place(self, key: K, due_tick: int):
+        delta = due_tick - self._current
+        if delta <= 0:
+            self._ready[key] = due_tick
+            return
+        if delta >= self._span:
+            self._overflow[key] = due_tick
+            return
+        level = 0
+        while delta >= self.slots ** (level + 1):
+            level += 1
+        slot = (due_tick // self.slots**level) % self.slots
+        self._wheels[level][slot][key] = due_tick
+        self._where[key] = (level, slot)
+
+    def schedule(self, key: K, due: float):
+        """Agenda (ou reagenda) ``key`` para o instante ``due`` (segundos)."""
+        self.cancel(key)
+        self._place(key, self._to_tick(due))
+
+    def cancel(self, key: K) -> bool:
+        position = self._where.pop(key, None)
+        if position is not None:
+            level, slot = position
+            del self._wheels[level][slot][key]
+            return True
+        return (
+            self._ready.pop(key, None) is not None
+            or self._overflow.pop(key, None) is not None
+        )
+
+    def _cascade(self, level: int):
+        slot = (self._current // self.slots**level) % self.slots
+        entries, self._wheels[level][slot] = self._wheels[level][slot], {}
+        for key, due_tick in entries.items():
+            del self._where[key]
+            self._place(key, due_tick)
+
+    def _next_tick(self) -> Optional[int]:
+        """Próximo tick com trabalho (vencimento no nível 0 ou redistribuição)."""
+        best: Optional[int] = None
+        for level in range(self.levels):
+            unit = self.slots**level
+            block = self._current // unit
+            for step in range(1, self.slots + 1):
+                if self._wheels[level][(block + step) % self.slots]:
+                    tick = (block + step) * unit
+                    best = tick if best is None else min(best, tick)
+                    break
+        if self._overflow:
+            unit = self.slots ** (self.levels - 1)
+            tick = (self._current // unit + 1) * unit
+            best = tick if best is None else min(best, tick)
+        return best
+
+    def advance(self, now: float) -> List[K]:
+        """Avança o relógio até ``now`` e retorna as chaves vencidas."""
+        target = math.floor(now / self.tick_seconds)
+        while self._current < target:
+            # Salta direto para o próximo tick com trabalho: posições vazias
+            # não custam nada, por mais longo que seja o intervalo
+            tick = self._next_tick()
+            if tick is None or tick > target:
+                self._current = target
+                break
+            self._current = tick
+            for level in range(self.levels - 1, 0, -1):
+                if self._current % self.slots**level == 0:
+                    if level == self.levels - 1 and self._overflow:
+                        overflow, self._overflow = self._overflow, {}
+                        for key, due_tick in overflow.items():
+                            self._place(key, due_tick)
+                    self._cascade(level)
+            slot = self._wheels[0][self._current % self.slots]
+            if slot:
+                for key, due_tick in slot.items():
+                    del self._where[key]
+                    self._ready[key] = due_tick
+                slot.clear()
+
+        expired, self._ready = list(self._ready), {}
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Próximo instante (segundos) em que ``advance`` tem trabalho: um
+        vencimento no nível 0 ou uma redistribuição de nível superior.
+        None com a roda vazia.
+        """
+        if self._ready:
+            return self._current * self.tick_seconds
+        tick = self._next_tick()
+        return None if tick is None else tick * self.tick_seconds
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "scheduled": len(self),
+            "ready": len(self._ready),
+            "overflow": len(self._overflow),
+            **{
+                f"level_{level}": sum(len(slot) for slot in wheel)
+                for level, wheel in enumerate(self._wheels)
+            },
+        }
@@ -0,0 +1,206 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket clássico: ``rate`` tokens por segundo, até ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Consome um token. Retorna 0 em caso de sucesso ou, se não houver
+        token disponível, quantos segundos faltam para o próximo.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def wait_time(self) -> float:
+        """Segundos até haver ao menos um token (0 se já houver)."""
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """Debita ``amount`` tokens; o saldo pode ficar negativo (dívida)."""
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Limite de concorrência AIMD guiado pela latência observada do agente.
+
+    Cada requisição concluída abaixo de ``target_latency`` aumenta o limite
+    em ``1/limit`` (≈ +1 a cada "rodada"); uma requisição lenta ou com
+    falha multiplica o limite por ``backoff``, no máximo uma vez por
+    ``target_latency`` segundos para não punir várias vezes a mesma rajada.
+    Com ``success=None`` a vaga é devolvida sem ajustar o limite.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency: float,
+        backoff: float = 0.7,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.limit = float(initial)
+        self.inflight = 0
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.inflight >= int(self.limit):
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self, latency: float, success: Optional[bool] = True):
+        self.inflight -= 1
+        if success is None:
+            return
+        now = time.monotonic()
+        if success and latency <= self.target_latency:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        elif now - self._last_decrease >= self.target_latency:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            self._last_decrease = now
+            logger.warning(
+                f"Latência do agente {latency:.2f}s acima do alvo. "
+                f"Limite de concorrência reduzido para {int(self.limit)}."
+            )
+
+
+class LoadSheddingError(Exception):
+    """
+    Mensagem rejeitada pelo controle de admissão. ``queued`` indica que ela
+    foi guardada na fila de adiadas e será respondida depois.
+    """
+
+    def __init__(self, reason: str, retry_after: float, queued: bool = False):
+        super().__init__(f"Mensagem rejeitada por sobrecarga ({reason}).")
+        self.reason = reason
+        self.retry_after = retry_after
+        self.queued = queued
+
+
+@dataclass
+class AdmissionDecision:
+    """Resultado da admissão de uma mensagem."""
+
+    admitted: bool
+    reason: Optional[str] = None
+    retry_after: float = 0.0
+    started_at: float = 0.0
+
+
+class AdmissionController:
+    """
+    Controle de admissão das mensagens do webhook.
+
+    Uma mensagem só entra se houver token no bucket global, no bucket do
+    telefone e vaga no limite adaptativo de concorrência. Caso contrário é
+    rejeitada na hora, com um ``retry_after`` sugerido, em vez de ficar
+    esperando o LLM e o pool de conexões junto com todas as outras.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        global_burst: float,
+        phone_rate: float,
+        phone_burst: float,
+        concurrency: AdaptiveConcurrencyLimit,
+        max_tracked_phones: int = 10000,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.phone_rate = phone_rate
+        self.phone_burst = phone_burst
+        self.concurrency = concurrency
+        self.max_tracked_phones = max_tracked_phones
+        self._phone_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._admitted = 0
+        self._rejected: Dict[str, int] = {}
+
+    def _phone_bucket(self, phone_number: str) -> TokenBucket:
+        bucket = self._phone_buckets.get(phone_number)
+        if bucket is None:
+            bucket = TokenBucket(self.phone_rate, self.phone_burst)
+            self._phone_buckets[phone_number] = bucket
+            if len(self._phone_buckets) > self.max_tracked_phones:
+                self._phone_buckets.popitem(last=False)
+        else:
+            self._phone_buckets.move_to_end(phone_number)
+        return bucket
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionDecision:
+        self._rejected[reason] = self._rejected.get(reason, 0) + 1
+        return AdmissionDecision(admitted=False, reason=reason, retry_after=retry_after)
+
+    def try_admit(self, phone_number: str) -> AdmissionDecision:
+        phone_bucket = self._phone_bucket(phone_number)
+        wait = phone_bucket.try_acquire()
+        if wait:
+            return self._reject("phone_rate", wait)
+
+        wait = self.global_bucket.try_acquire()
+        if wait:
+            phone_bucket.refund()
+            return self._reject("global_rate", wait)
+
+        if not self.concurrency.try_acquire():
+            phone_bucket.refund()
+            self.global_bucket.refund()
+            return self._reject("concurrency", 1.0)
+
+        self._admitted += 1
+        return AdmissionDecision(admitted=True, started_at=time.monotonic())
+
+    def release(self, decision: AdmissionDecision, success: Optional[bool] = True):
+        """
+        Devolve a vaga de concorrência e alimenta o AIMD com a latência
+        observada. ``success=None`` é neutro: não mede a capacidade do agente.
+        """
+        if decision.admitted:
+            self.concurrency.release(time.monotonic() - decision.started_at, success)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "concurrency_limit": int(self.concurrency.limit),
+            "inflight": self.concurrency.inflight,
+            "tracked_phones": len(self._phone_buckets),
+        }
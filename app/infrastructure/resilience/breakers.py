@@ -0,0 +1,39 @@
+from typing import Any, Dict
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.resilience.circuit_breaker import CircuitBreaker
+
+
+def _build_breaker(name: str, slow_call_seconds: float) -> CircuitBreaker:
+    return CircuitBreaker(
+        name=name,
+        window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+        min_calls=settings.CIRCUIT_MIN_CALLS,
+        failure_rate=settings.CIRCUIT_FAILURE_RATE,
+        slow_call_seconds=slow_call_seconds,
+        slow_call_rate=settings.CIRCUIT_SLOW_CALL_RATE,
+        open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+        half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+    )
+
+
+# Instâncias únicas (Singleton) por dependência externa
+llm_breaker = _build_breaker("llm", settings.CIRCUIT_LLM_SLOW_CALL_SECONDS)
+postgres_breaker = _build_breaker("postgres", settings.CIRCUIT_POSTGRES_SLOW_CALL_SECONDS)
+# A deduplicação de entrada é fail-open: seus erros (ex: tabela
+# ingress_messages ausente) abrem só este circuito, que não põe o agente
+# no modo degradado
+dedup_breaker = _build_breaker("dedup", settings.CIRCUIT_POSTGRES_SLOW_CALL_SECONDS)
+
+
+def any_breaker_open() -> bool:
+    """Verdadeiro se alguma dependência do agente está com o circuito aberto."""
+    return llm_breaker.is_open or postgres_breaker.is_open
+
+
+def breakers_stats() -> Dict[str, Any]:
+    return {
+        llm_breaker.name: llm_breaker.stats(),
+        postgres_breaker.name: postgres_breaker.stats(),
+        dedup_breaker.name: dedup_breaker.stats(),
+    }
@@ -0,0 +1,187 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Chamada recusada porque o circuito da dependência está aberto."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuito '{name}' aberto. Nova tentativa em {retry_after:.1f}s.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker com janela deslizante de erros e de latência.
+
+    O circuito abre quando, nos últimos ``window_seconds`` e com pelo menos
+    ``min_calls`` chamadas, a taxa de falhas passa de ``failure_rate`` ou a
+    taxa de chamadas lentas (acima de ``slow_call_seconds``) passa de
+    ``slow_call_rate``. Aberto, recusa chamadas imediatamente com
+    ``CircuitOpenError``; após ``open_seconds`` entra em half-open e deixa
+    passar até ``half_open_probes`` chamadas de teste. Se todas tiverem
+    sucesso o circuito fecha; qualquer falha o reabre.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 30.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 20.0,
+        half_open_probes: int = 3,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_inflight = 0
+        self._probe_successes = 0
+
+        # (timestamp, falhou, lenta) de cada chamada dentro da janela
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+
+    # --- Janela deslizante ---
+
+    def _trim(self, now: float):
+        limit = now - self.window_seconds
+        while self._calls and self._calls[0][0] < limit:
+            _, failed, slow = self._calls.popleft()
+            self._failures -= failed
+            self._slow -= slow
+
+    def _reset_window(self):
+        self._calls.clear()
+        self._failures = 0
+        self._slow = 0
+
+    # --- Transições ---
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes_inflight = 0
+        self._probe_successes = 0
+        logger.error(f"Circuito '{self.name}' ABERTO: {reason}.")
+
+    def _close(self):
+        self.state = CLOSED
+        self._reset_window()
+        logger.info(f"Circuito '{self.name}' fechado. Dependência recuperada.")
+
+    @property
+    def is_open(self) -> bool:
+        """Verdadeiro enquanto chamadas normais seriam recusadas."""
+        if self.state != OPEN:
+            return False
+        return time.monotonic() - self._opened_at < self.open_seconds
+
+    def allow_request(self) -> bool:
+        """
+        Reserva a passagem de uma chamada. Retorna True se a chamada é uma
+        sonda de half-open. Lança ``CircuitOpenError`` se estiver aberto.
+        """
+        if self.state == CLOSED:
+            return False
+
+        now = time.monotonic()
+        if self.state == OPEN:
+            remaining = self.open_seconds - (now - self._opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(self.name, remaining)
+            self.state = HALF_OPEN
+            self._probes_inflight = 0
+            self._probe_successes = 0
+            logger.info(f"Circuito '{self.name}' em half-open. Enviando sondas.")
+
+        if self._probes_inflight >= self.half_open_probes:
+            raise CircuitOpenError(self.name, self.open_seconds)
+        self._probes_inflight += 1
+        return True
+
+    def record(self, duration: float, failed: bool, probe: bool = False):
+        """Registra o resultado de uma chamada e avalia as transições."""
+        now = time.monotonic()
+        slow = duration >= self.slow_call_seconds
+
+        if probe:
+            self._probes_inflight = max(0, self._probes_inflight - 1)
+            if self.state != HALF_OPEN:
+                return
+            if failed or slow:
+                self._open(now, "sonda de half-open falhou")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._close()
+            return
+
+        if self.state != CLOSED:
+            return
+
+        self._calls.append((now, failed, slow))
+        self._failures += failed
+        self._slow += slow
+        self._trim(now)
+
+        total = len(self._calls)
+        if total < self.min_calls:
+            return
+        if self._failures / total >= self.failure_rate:
+            self._open(now, f"{self._failures}/{total} falhas em {self.window_seconds:.0f}s")
+        elif self._slow / total >= self.slow_call_rate:
+            self._open(now, f"{self._slow}/{total} chamadas lentas em {self.window_seconds:.0f}s")
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Protege um bloco (síncrono ou com ``await``) pelo circuito.
+
+        Uso:
+            with breaker.guard():
+                await dependency_call()
+        """
+        probe = self.allow_request()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(time.monotonic() - started, failed=True, probe=probe)
+            raise
+        except BaseException:
+            # Cancelamento não diz nada sobre a saúde da dependência
+            if probe:
+                self._probes_inflight = max(0, self._probes_inflight - 1)
+            raise
+        self.record(time.monotonic() - started, failed=False, probe=probe)
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {
+            "state": OPEN if self.is_open else (HALF_OPEN if self.state == OPEN else self.state),
+            "calls_in_window": len(self._calls),
+            "failures_in_window": self._failures,
+            "slow_in_window": self._slow,
+        }
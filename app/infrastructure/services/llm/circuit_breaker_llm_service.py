@@ -0,0 +1,21 @@
+from typing import Any, Mapping, Optional
+
+from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.resilience.circuit_breaker import CircuitBreaker
+
+
+class CircuitBreakerLLMService(ILLMService):
+    """
+    Decorador de ``ILLMService`` que protege as chamadas com um ``CircuitBreaker``.
+    Com o circuito aberto, falha imediatamente com ``CircuitOpenError``.
+    """
+
+    def __init__(self, service: ILLMService, breaker: CircuitBreaker):
+        self.service = service
+        self.breaker = breaker
+
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
+        with self.breaker.guard():
+            return await self.service.orchestrator_prompt_template(user_query, prompt_inputs)
@@ -1,11 +1,52 @@
+from typing import Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
 from app.infrastructure.services.llm.openai_service import OpenAIService
+from app.infrastructure.services.llm.circuit_breaker_llm_service import (
+    CircuitBreakerLLMService,
+)
+from app.infrastructure.services.llm.tenant_quota_llm_service import TenantQuotaLLMService
+from app.infrastructure.services.llm.tracing_llm_service import TracingLLMService
+from app.infrastructure.services.llm.usage_accounting_llm_service import (
+    UsageAccountingLLMService,
+)
+from app.infrastructure.config.config import settings
 from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.observability.tracing import tracer
+from app.infrastructure.observability.usage_accounting import usage_accountant
+from app.infrastructure.resilience.admission_control import TokenBucket
+from app.infrastructure.resilience.breakers import llm_breaker
 
 
 class LLMFactory:
     @staticmethod
-    def create_llm_service(provider: str) -> ILLMService:
+    def create_llm_service(
+        provider: str,
+        model_name: Optional[str] = None,
+        prompt_template: Optional[ChatPromptTemplate] = None,
+        quota: Optional[TokenBucket] = None,
+        instance_id: str = "",
+    ) -> ILLMService:
+        """
+        Monta a cadeia de decoradores do LLM. ``model_name`` e
+        ``prompt_template`` permitem configurações por instância; ``quota``
+        aplica a cota de tokens por minuto da instância.
+        """
         if provider == "openai":
-            return OpenAIService()
+            model_name = model_name or settings.OPENAI_MODEL_NAME
+            # A contabilidade fica dentro do breaker: só registra chamadas reais
+            service = CircuitBreakerLLMService(
+                UsageAccountingLLMService(
+                    OpenAIService(model_name=model_name, prompt_template=prompt_template),
+                    usage_accountant,
+                    model_name,
+                ),
+                llm_breaker,
+            )
+            # A cota fica fora do breaker: estourar a cota não é falha do provedor
+            if quota is not None:
+                service = TenantQuotaLLMService(service, quota, instance_id)
+            return TracingLLMService(service, tracer)
         else:
             raise ValueError(f"Provider {provider} not supported")
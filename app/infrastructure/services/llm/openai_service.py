@@ -1,28 +1,39 @@
 import logging
+from typing import Any, Mapping, Optional
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from app.infrastructure.config.config import settings
-from app.application.agent.node.orchestrator.orchestrator_prompt import (
+from app.application.agent.prompts.orchestrator_prompt import (
     orchestrator_prompt_template as ORCHESTRATOR_PROMPT_TEMPLATE,
 )
+from app.application.agent.tools.scheduling_details_tool import SCHEDULING_DETAILS_TOOL_SCHEMA
 
 logger = logging.getLogger(__name__)
 
 
 class OpenAIService:
-    def __init__(self):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        prompt_template: Optional[ChatPromptTemplate] = None,
+    ):
         self.llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL_NAME,
+            model=model_name or settings.OPENAI_MODEL_NAME,
             temperature=settings.OPENAI_TEMPERATURE,
             api_key=settings.OPENAI_API_KEY,
-        )
+        ).bind_tools([SCHEDULING_DETAILS_TOOL_SCHEMA])
+        self.prompt_template = prompt_template or ORCHESTRATOR_PROMPT_TEMPLATE
 
-    def orchestrator_prompt_template(self, user_query: str):
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
         """
-        Prepara o prompt do agente orquestrador.
+        Prepara o prompt do agente orquestrador. Usa o cliente assíncrono:
+        a espera pela API não bloqueia o event loop dos demais turnos.
         """
-        chain = ORCHESTRATOR_PROMPT_TEMPLATE | self.llm
+        chain = self.prompt_template | self.llm
         try:
-            llm_response = chain.invoke({"message": user_query, "chat_history": [], "agent_scratchpad": []})
+            llm_response = await chain.ainvoke({**(prompt_inputs or {}), "message": user_query})
             return llm_response
         except Exception as e:
             logger.error(f"Erro ao gerar resposta do agente orquestrador: {e}")
@@ -0,0 +1,38 @@
+from typing import Any, Mapping, Optional
+
+from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.resilience.admission_control import LoadSheddingError, TokenBucket
+
+
+class TenantQuotaExceededError(LoadSheddingError):
+    """A instância (clínica) esgotou sua cota de tokens do LLM."""
+
+    def __init__(self, instance_id: str, retry_after: float):
+        super().__init__("tenant_llm_quota", retry_after)
+        self.instance_id = instance_id
+
+
+class TenantQuotaLLMService(ILLMService):
+    """
+    Decorador de ``ILLMService`` que aplica a cota de tokens por minuto da
+    instância. A chamada só é feita com saldo positivo no bucket; os tokens
+    efetivamente consumidos (prompt + completion) são debitados depois,
+    então uma resposta grande deixa o bucket em dívida até recarregar.
+    """
+
+    def __init__(self, service: ILLMService, bucket: TokenBucket, instance_id: str):
+        self.service = service
+        self.bucket = bucket
+        self.instance_id = instance_id
+
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
+        wait = self.bucket.wait_time()
+        if wait:
+            raise TenantQuotaExceededError(self.instance_id, wait)
+
+        response = await self.service.orchestrator_prompt_template(user_query, prompt_inputs)
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.bucket.consume(usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+        return response
@@ -0,0 +1,32 @@
+from typing import Any, Mapping, Optional
+
+from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.observability.tracing import Tracer
+
+
+class TracingLLMService(ILLMService):
+    """
+    Decorador de ``ILLMService`` que abre um span para cada chamada ao LLM,
+    com o consumo de tokens como atributos (entrada em cache e fora dele).
+    """
+
+    def __init__(self, service: ILLMService, tracer: Tracer):
+        self.service = service
+        self.tracer = tracer
+
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
+        with self.tracer.span("llm.orchestrator") as span:
+            response = await self.service.orchestrator_prompt_template(user_query, prompt_inputs)
+            if span is not None:
+                usage = getattr(response, "usage_metadata", None) or {}
+                input_tokens = usage.get("input_tokens", 0)
+                cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                span.set_attributes(
+                    input_tokens=input_tokens,
+                    cached_input_tokens=cached_tokens,
+                    uncached_input_tokens=input_tokens - cached_tokens,
+                    output_tokens=usage.get("output_tokens", 0),
+                )
+            return response
@@ -0,0 +1,58 @@
+import logging
+import time
+from typing import Any, Mapping, Optional
+
+from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.observability.usage_accounting import UsageAccountant
+
+logger = logging.getLogger(__name__)
+
+
+class UsageAccountingLLMService(ILLMService):
+    """
+    Decorador de ``ILLMService`` que registra tokens (prompt, completion e
+    cache), custo e latência de cada chamada no ``UsageAccountant``.
+    """
+
+    def __init__(self, service: ILLMService, accountant: UsageAccountant, model: str):
+        self.service = service
+        self.accountant = accountant
+        self.model = model
+
+    async def orchestrator_prompt_template(
+        self, user_query: str, prompt_inputs: Optional[Mapping[str, Any]] = None
+    ):
+        started = time.perf_counter()
+        try:
+            response = await self.service.orchestrator_prompt_template(user_query, prompt_inputs)
+        except Exception:
+            self.accountant.record(
+                self.model, latency=time.perf_counter() - started, error=True
+            )
+            raise
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        model = (getattr(response, "response_metadata", None) or {}).get("model_name")
+        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        self.accountant.record(
+            # A OpenAI responde com a versão datada (ex: gpt-4o-mini-2024-07-18)
+            self._pricing_model(model) if model else self.model,
+            prompt_tokens=input_tokens,
+            completion_tokens=usage.get("output_tokens", 0),
+            cached_tokens=cached_tokens,
+            latency=time.perf_counter() - started,
+        )
+        logger.debug(
+            "LLM %s: %d tokens de entrada (%d em cache, %d fora do cache)",
+            model or self.model,
+            input_tokens,
+            cached_tokens,
+            input_tokens - cached_tokens,
+        )
+        return response
+
+    def _pricing_model(self, model: str) -> str:
+        """Nome com preço configurado mais específico que prefixa ``model``."""
+        candidates = [name for name in self.accountant.pricing if model.startswith(name)]
+        return max(candidates, key=len) if candidates else model
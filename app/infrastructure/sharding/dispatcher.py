@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from app.infrastructure.sharding.hash_ring import HashRing
+
+logger = logging.getLogger(__name__)
+
+
+class NoWorkersAvailableError(RuntimeError):
+    """Nenhum worker saudável no anel para receber a mensagem."""
+
+
+class ShardDispatcher:
+    """
+    Encaminha cada conversa sempre para o mesmo worker, pelo telefone.
+
+    O telefone é posicionado em um ``HashRing`` com os workers saudáveis.
+    Um health check periódico remove workers que param de responder e os
+    devolve ao anel quando voltam; como o hash é consistente, só as
+    conversas do worker afetado mudam de processo.
+    """
+
+    def __init__(
+        self,
+        workers: Iterable[str] = (),
+        virtual_nodes: int = 64,
+        health_interval_seconds: float = 5.0,
+        forward_timeout_seconds: float = 120.0,
+    ):
+        self.ring = HashRing(virtual_nodes=virtual_nodes)
+        self.health_interval_seconds = health_interval_seconds
+        self.forward_timeout_seconds = forward_timeout_seconds
+        self._workers: Set[str] = set()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._health_task: Optional[asyncio.Task] = None
+        for worker in workers:
+            self.add_worker(worker)
+
+    # --- Membros do anel ---
+
+    @staticmethod
+    def _normalize(url: str) -> str:
+        return url.rstrip("/")
+
+    def add_worker(self, url: str):
+        """Registra um worker e o coloca no anel."""
+        url = self._normalize(url)
+        if url not in self._workers:
+            logger.info(f"Worker '{url}' adicionado ao anel de sharding.")
+        self._workers.add(url)
+        self.ring.add_node(url)
+
+    def remove_worker(self, url: str):
+        """Remove definitivamente um worker (saída planejada)."""
+        url = self._normalize(url)
+        self._workers.discard(url)
+        self.ring.remove_node(url)
+        logger.info(f"Worker '{url}' removido do anel de sharding.")
+
+    def _mark_unhealthy(self, url: str):
+        if url in self.ring.nodes:
+            logger.warning(f"Worker '{url}' indisponível. Rebalanceando suas conversas.")
+            self.ring.remove_node(url)
+
+    def _mark_healthy(self, url: str):
+        if url in self._workers and url not in self.ring.nodes:
+            logger.info(f"Worker '{url}' voltou a responder. Reintegrando ao anel.")
+            self.ring.add_node(url)
+
+    def status(self) -> Dict[str, Any]:
+        healthy = self.ring.nodes
+        return {
+            "workers": sorted(self._workers),
+            "healthy": healthy,
+            "unhealthy": sorted(self._workers - set(healthy)),
+        }
+
+    def owner(self, phone_number: str) -> str:
+        worker = self.ring.get_node(phone_number)
+        if worker is None:
+            raise NoWorkersAvailableError("Nenhum worker disponível para processar a mensagem.")
+        return worker
+
+    # --- Ciclo de vida ---
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.forward_timeout_seconds, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            )
+        return self._client
+
+    async def start(self):
+        """Inicia o health check periódico dos workers."""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _check(self, url: str):
+        try:
+            response = await self.client.get(f"{url}/", timeout=2.0)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self._mark_unhealthy(url)
+        else:
+            self._mark_healthy(url)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.gather(*(self._check(url) for url in list(self._workers)))
+            await asyncio.sleep(self.health_interval_seconds)
+
+    # --- Encaminhamento ---
+
+    async def forward_message(self, phone_number: str, payload: Dict[str, Any]) -> Any:
+        """
+        Encaminha um payload do webhook para o worker dono do telefone.
+        Em falha de conexão, tira o worker do anel e tenta o novo dono uma vez.
+        """
+        for attempt in range(2):
+            worker = self.owner(phone_number)
+            try:
+                response = await self.client.post(f"{worker}/message/", json=payload)
+                response.raise_for_status()
+                return response.json()
+            except (httpx.ConnectError, httpx.RemoteProtocolError):
+                self._mark_unhealthy(worker)
+                if attempt == 1:
+                    raise
+        raise NoWorkersAvailableError("Nenhum worker disponível para processar a mensagem.")
+
+    async def forward_batch(
+        self, items: List[Tuple[int, str, Dict[str, Any]]]
+    ) -> AsyncIterator[dict]:
+        """
+        Divide um lote entre os workers donos de cada telefone e repassa os
+        resultados (NDJSON) à medida que chegam, com o índice do lote original.
+
+        Args:
+            items (list): Tuplas ``(index, phone_number, payload)``.
+        """
+        by_worker: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, phone_number, payload in items:
+            by_worker.setdefault(self.owner(phone_number), []).append((index, payload))
+
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def forward(worker: str, sub_batch: List[Tuple[int, Dict[str, Any]]]):
+            original_indexes = [index for index, _ in sub_batch]
+            pending = set(original_indexes)
+            error = "Falha no worker: resposta incompleta"
+            try:
+                async with self.client.stream(
+                    "POST",
+                    f"{worker}/message/batch",
+                    json=[payload for _, payload in sub_batch],
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        result = json.loads(line)
+                        result["index"] = original_indexes[result["index"]]
+                        if result["index"] not in pending:
+                            continue
+                        pending.discard(result["index"])
+                        await results.put(result)
+            except Exception as e:
+                # Linha malformada (JSON, índice ausente ou fora do lote) também
+                # encerra o sub-lote: sem isso o consumidor esperaria para sempre
+                if isinstance(e, httpx.ConnectError):
+                    self._mark_unhealthy(worker)
+                logger.warning(f"Falha ao encaminhar o lote para {worker}: {e!r}")
+                error = f"Falha no worker: {e}"
+            # Todo índice do sub-lote recebe exatamente um resultado
+            for index in sorted(pending):
+                await results.put({"index": index, "status": "error", "message": error})
+
+        tasks = [
+            asyncio.create_task(forward(worker, sub_batch))
+            for worker, sub_batch in by_worker.items()
+        ]
+        try:
+            for _ in range(len(items)):
+                yield await results.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def announce_worker(
+    ingress_url: str,
+    worker_url: str,
+    joining: bool = True,
+    admin_token: Optional[str] = None,
+):
+    """
+    Registra (ou remove) este worker no anel da ingress.
+    Usado pelos workers no startup/shutdown para rebalancear o anel. A
+    ingress exige o mesmo ``ADMIN_TOKEN`` no cabeçalho ``X-Admin-Token``.
+    """
+    method = "POST" if joining else "DELETE"
+    headers = {"X-Admin-Token": admin_token} if admin_token else None
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.request(
+                method,
+                f"{ingress_url.rstrip('/')}/shard/workers",
+                json={"url": worker_url},
+                headers=headers,
+            )
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Não foi possível anunciar o worker '{worker_url}' à ingress: {e}")
@@ -0,0 +1,52 @@
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Hash consistente com nós virtuais.
+
+    Cada worker ocupa ``virtual_nodes`` posições no anel; uma chave
+    (o telefone) pertence ao primeiro worker no sentido horário. Quando um
+    worker entra ou sai, apenas as chaves dos seus segmentos mudam de dono.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = 64):
+        self.virtual_nodes = virtual_nodes
+        self._ring: Dict[int, str] = {}
+        self._sorted_keys: List[int] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(set(self._ring.values()))
+
+    def add_node(self, node: str):
+        """Adiciona um worker ao anel (idempotente)."""
+        for replica in range(self.virtual_nodes):
+            key = _hash(f"{node}#{replica}")
+            if key not in self._ring:
+                self._ring[key] = node
+                bisect.insort(self._sorted_keys, key)
+
+    def remove_node(self, node: str):
+        """Remove um worker do anel (idempotente)."""
+        for replica in range(self.virtual_nodes):
+            key = _hash(f"{node}#{replica}")
+            if self._ring.get(key) == node:
+                del self._ring[key]
+                index = bisect.bisect_left(self._sorted_keys, key)
+                del self._sorted_keys[index]
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Retorna o worker responsável pela chave, ou None se o anel estiver vazio."""
+        if not self._sorted_keys:
+            return None
+        index = bisect.bisect(self._sorted_keys, _hash(key)) % len(self._sorted_keys)
+        return self._ring[self._sorted_keys[index]]
@@ -0,0 +1,99 @@
+"""
+Dispatcher local multi-processo para um único host.
+
+Sobe N workers (``SHARD_ROLE=worker``) em portas consecutivas e uma ingress
+(``SHARD_ROLE=ingress``) na porta pública, que distribui as conversas pelos
+workers por hash consistente do telefone. Workers que morrem são
+reiniciados; enquanto estão fora, o health check da ingress rebalanceia
+as conversas deles.
+
+Uso:
+    python -m app.infrastructure.sharding.launcher --workers 4 --port 8000
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _spawn(role: str, port: int, extra_env: Dict[str, str], host: str) -> subprocess.Popen:
+    env = {**os.environ, "SHARD_ROLE": role, **extra_env}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--host",
+            host,
+            "--port",
+            str(port),
+        ],
+        env=env,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa a API em modo shardeado")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000, help="Porta da ingress")
+    parser.add_argument(
+        "--worker-base-port", type=int, default=9000, help="Porta do primeiro worker"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(message)s")
+
+    worker_ports = [args.worker_base_port + i for i in range(args.workers)]
+    worker_urls: List[str] = [f"http://127.0.0.1:{port}" for port in worker_ports]
+
+    workers: Dict[int, subprocess.Popen] = {
+        port: _spawn("worker", port, {}, "127.0.0.1") for port in worker_ports
+    }
+    ingress = _spawn(
+        "ingress", args.port, {"SHARD_WORKERS": json.dumps(worker_urls)}, args.host
+    )
+    logger.info(f"Ingress na porta {args.port} com {args.workers} workers: {worker_urls}")
+
+    stopping = False
+
+    def shutdown(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    try:
+        while not stopping:
+            for port, process in list(workers.items()):
+                if process.poll() is not None:
+                    logger.warning(
+                        f"Worker da porta {port} saiu (código {process.returncode}). Reiniciando..."
+                    )
+                    workers[port] = _spawn("worker", port, {}, "127.0.0.1")
+            if ingress.poll() is not None:
+                logger.error("A ingress saiu. Encerrando os workers.")
+                break
+            time.sleep(1)
+    finally:
+        for process in [ingress, *workers.values()]:
+            if process.poll() is None:
+                process.terminate()
+        for process in [ingress, *workers.values()]:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()
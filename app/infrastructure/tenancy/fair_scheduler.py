@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.resilience.admission_control import LoadSheddingError
+
+
+class TenantLatencyStats:
+    """Contadores e janela das latências recentes de uma instância."""
+
+    def __init__(self, window: int = 512):
+        self.completed = 0
+        self.errors = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float, latency: float, success: bool):
+        self.completed += 1
+        self.errors += int(not success)
+        self.wait_seconds += wait
+        self.max_latency_seconds = max(self.max_latency_seconds, latency)
+        self._latencies.append(latency)
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "mean_wait_seconds": (
+                round(self.wait_seconds / self.completed, 4) if self.completed else 0.0
+            ),
+            "p50_latency_seconds": percentile(0.50),
+            "p95_latency_seconds": percentile(0.95),
+            "max_latency_seconds": round(self.max_latency_seconds, 4),
+        }
+
+
+class _TenantSlots:
+    __slots__ = ("limit", "inflight", "waiters", "stats")
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.inflight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.stats = TenantLatencyStats()
+
+
+class FairTenantScheduler:
+    """
+    Divide a concorrência do agente entre as instâncias (clínicas).
+
+    Cada instância tem seu limite de conversas simultâneas e todas dividem
+    ``max_concurrency`` vagas globais. Quando falta vaga, a mensagem espera
+    na fila da sua instância; cada vaga liberada vai para a próxima
+    instância com fila, em rodízio (round-robin), então uma clínica com
+    centenas de mensagens na fila não atrasa a mensagem única de outra.
+    Filas acima de ``max_queue`` rejeitam com ``LoadSheddingError``.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 100):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.inflight = 0
+        self._tenants: Dict[str, _TenantSlots] = {}
+        # Instâncias com fila, na ordem do rodízio
+        self._ring: "OrderedDict[str, None]" = OrderedDict()
+
+    def _slots(self, tenant: str, limit: int) -> _TenantSlots:
+        slots = self._tenants.get(tenant)
+        if slots is None:
+            slots = self._tenants[tenant] = _TenantSlots(limit)
+        return slots
+
+    def _can_run(self, slots: _TenantSlots) -> bool:
+        return self.inflight < self.max_concurrency and slots.inflight < slots.limit
+
+    def _acquire(self, slots: _TenantSlots):
+        self.inflight += 1
+        slots.inflight += 1
+
+    def _release(self, slots: _TenantSlots):
+        self.inflight -= 1
+        slots.inflight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Entrega as vagas livres às filas, uma instância por vez."""
+        while self.inflight < self.max_concurrency and self._ring:
+            for tenant in self._ring:
+                slots = self._tenants[tenant]
+                if slots.inflight < slots.limit:
+                    break
+            else:
+                return
+
+            future = slots.waiters.popleft()
+            if slots.waiters:
+                self._ring.move_to_end(tenant)
+            else:
+                del self._ring[tenant]
+            if future.done():
+                # Mensagem cancelada enquanto esperava
+                continue
+            self._acquire(slots)
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, tenant: str, limit: int) -> AsyncIterator[None]:
+        """Reserva uma vaga para ``tenant`` (esperando na fila, se preciso)."""
+        slots = self._slots(tenant, limit)
+        slots.limit = max(1, limit)
+        queued_at = time.monotonic()
+
+        if slots.waiters or not self._can_run(slots):
+            if len(slots.waiters) >= self.max_queue:
+                slots.stats.rejected += 1
+                raise LoadSheddingError("tenant_queue", 1.0)
+            future = asyncio.get_running_loop().create_future()
+            slots.waiters.append(future)
+            self._ring[tenant] = None
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # A vaga chegou junto com o cancelamento: devolve
+                    self._release(slots)
+                elif future in slots.waiters:
+                    slots.waiters.remove(future)
+                    if not slots.waiters:
+                        self._ring.pop(tenant, None)
+                raise
+        else:
+            self._acquire(slots)
+
+        started = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            slots.stats.record(started - queued_at, time.monotonic() - started, success)
+            self._release(slots)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "inflight": self.inflight,
+            "tenants": {
+                (tenant or "default"): {
+                    "limit": slots.limit,
+                    "inflight": slots.inflight,
+                    "queued": len(slots.waiters),
+                    **slots.stats.as_dict(),
+                }
+                for tenant, slots in self._tenants.items()
+            },
+        }
+
+
+# Instância única (Singleton) do escalonamento entre instâncias
+tenant_scheduler = FairTenantScheduler(
+    max_concurrency=settings.TENANT_MAX_CONCURRENCY,
+    max_queue=settings.TENANT_MAX_QUEUE,
+)
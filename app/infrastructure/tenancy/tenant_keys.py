@@ -0,0 +1,30 @@
+from typing import Optional, Tuple
+
+from app.infrastructure.config.config import settings
+
+# Chave da instância para mensagens sem instance_id
+DEFAULT_TENANT = ""
+
+
+def tenant_thread_id(phone_number: str, instance_id: Optional[str]) -> str:
+    """
+    Thread do LangGraph da conversa: ``{instance_id}:{telefone}``, para que o
+    mesmo paciente em duas clínicas tenha conversas separadas. Sem
+    instance_id (ou com TENANT_THREAD_NAMESPACING desligado), é o telefone.
+    """
+    if instance_id and settings.TENANT_THREAD_NAMESPACING:
+        return f"{instance_id}:{phone_number}"
+    return phone_number
+
+
+def split_thread_id(thread_id: str) -> Tuple[Optional[str], str]:
+    """Inverso de ``tenant_thread_id``: ``(instance_id, telefone)``."""
+    instance_id, _, phone_number = thread_id.rpartition(":")
+    return instance_id or None, phone_number
+
+
+def tenant_store_namespace(namespace: str, instance_id: Optional[str]) -> Tuple[str, ...]:
+    """Namespace do BaseStore da instância, ex: ``("users", "inst-1")``."""
+    if instance_id and settings.TENANT_THREAD_NAMESPACING:
+        return (namespace, instance_id)
+    return (namespace,)
@@ -0,0 +1,156 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
+
+from app.application.agent.prompts.orchestrator_prompt import (
+    DEFAULT_CLINIC_NAME,
+    SYSTEM_PROMPT,
+    build_orchestrator_prompt,
+    segment_fingerprint,
+    tenant_prompt_text,
+)
+from app.infrastructure.config.config import settings
+from app.infrastructure.interfaces.illm_service import ILLMService
+from app.infrastructure.resilience.admission_control import TokenBucket
+from app.infrastructure.services.llm.llm_factory import LLMFactory
+from app.infrastructure.tenancy.tenant_keys import DEFAULT_TENANT
+
+logger = logging.getLogger(__name__)
+
+
+class TenantConfig(BaseModel):
+    """Configuração de uma clínica (instância do WhatsApp)."""
+
+    instance_id: str = Field(default=DEFAULT_TENANT, description="ID da instância")
+    clinic_name: str = Field(default=DEFAULT_CLINIC_NAME, description="Nome usado no prompt")
+    instructions: Optional[str] = Field(
+        default=None, description="Regras extras anexadas ao prompt de sistema"
+    )
+    model_name: Optional[str] = Field(
+        default=None, description="Modelo do LLM; None usa OPENAI_MODEL_NAME"
+    )
+    max_concurrency: int = Field(
+        default=4, description="Conversas da instância processadas ao mesmo tempo"
+    )
+    llm_tokens_per_minute: int = Field(
+        default=0, description="Cota de tokens do LLM por minuto; 0 desativa a cota"
+    )
+
+
+class TenantContext:
+    """
+    Configuração e recursos de uma instância, criados uma única vez:
+    prompt e serviços de LLM (um por modelo, com a cota da instância).
+    """
+
+    def __init__(self, config: TenantConfig):
+        self.config = config
+        self.prompt: ChatPromptTemplate = build_orchestrator_prompt(
+            config.clinic_name, config.instructions
+        )
+        # Prefixo estático (sistema + clínica) que o provedor pode manter em cache
+        self.prompt_fingerprint = segment_fingerprint(
+            SYSTEM_PROMPT, tenant_prompt_text(config.clinic_name, config.instructions)
+        )
+        self.llm_quota: Optional[TokenBucket] = (
+            TokenBucket(config.llm_tokens_per_minute / 60, config.llm_tokens_per_minute)
+            if config.llm_tokens_per_minute > 0
+            else None
+        )
+        # Modelo -> serviço de LLM (o roteador de modelos usa mais de um)
+        self._llm_services: Dict[str, ILLMService] = {}
+
+    @property
+    def instance_id(self) -> str:
+        return self.config.instance_id
+
+    @property
+    def llm_service(self) -> ILLMService:
+        return self.llm_service_for(None)
+
+    def llm_service_for(self, model_name: Optional[str]) -> ILLMService:
+        """
+        Serviço de LLM da instância para ``model_name`` (None usa o modelo
+        da instância). Todos os modelos dividem a mesma cota de tokens.
+        """
+        model_name = model_name or self.config.model_name or settings.OPENAI_MODEL_NAME
+        service = self._llm_services.get(model_name)
+        if service is None:
+            service = self._llm_services[model_name] = LLMFactory.create_llm_service(
+                "openai",
+                model_name=model_name,
+                prompt_template=self.prompt,
+                quota=self.llm_quota,
+                instance_id=self.instance_id,
+            )
+        return service
+
+
+class TenantRegistry:
+    """
+    Cache dos ``TenantContext`` por instance_id.
+
+    As instâncias configuradas em TENANTS usam os próprios valores (com os
+    padrões TENANT_DEFAULT_* para o que faltar); instâncias desconhecidas
+    recebem a configuração padrão, cada uma com seu próprio contexto. O
+    cache é um LRU limitado a ``max_tenants``.
+    """
+
+    def __init__(
+        self,
+        tenants: Dict[str, Dict[str, Any]],
+        defaults: Dict[str, Any],
+        max_tenants: int = 1000,
+    ):
+        self.defaults = defaults
+        self.max_tenants = max_tenants
+        self.configs: Dict[str, TenantConfig] = {
+            instance_id: TenantConfig(**{**defaults, **raw, "instance_id": instance_id})
+            for instance_id, raw in tenants.items()
+        }
+        self._contexts: "OrderedDict[str, TenantContext]" = OrderedDict()
+
+    def get(self, instance_id: Optional[str]) -> TenantContext:
+        key = instance_id or DEFAULT_TENANT
+        context = self._contexts.get(key)
+        if context is not None:
+            self._contexts.move_to_end(key)
+            return context
+
+        config = self.configs.get(key) or TenantConfig(**{**self.defaults, "instance_id": key})
+        context = self._contexts[key] = TenantContext(config)
+        if len(self._contexts) > self.max_tenants:
+            self._contexts.popitem(last=False)
+        logger.info(f"Contexto da instância '{key or 'default'}' carregado.")
+        return context
+
+    def prompt_fingerprints(self) -> Dict[str, str]:
+        return {
+            (key or "default"): context.prompt_fingerprint
+            for key, context in self._contexts.items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "configured": sorted(self.configs),
+            "loaded": len(self._contexts),
+            "quotas": {
+                (key or "default"): round(context.llm_quota.tokens)
+                for key, context in self._contexts.items()
+                if context.llm_quota is not None
+            },
+        }
+
+
+# Instância única (Singleton) das configurações por instância
+tenant_registry = TenantRegistry(
+    tenants=settings.TENANTS,
+    defaults={
+        "max_concurrency": settings.TENANT_DEFAULT_MAX_CONCURRENCY,
+        "llm_tokens_per_minute": settings.TENANT_DEFAULT_LLM_TOKENS_PER_MINUTE,
+    },
+    max_tenants=settings.TENANT_CACHE_MAX,
+)
@@ -0,0 +1,61 @@
+import json
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.infrastructure.pesistence.postgres_persistence import get_conversation_data
+from app.presentation.security import require_admin
+
+logger = logging.getLogger(__name__)
+
+# Exporta e apaga conversas de pacientes: todas as rotas exigem X-Admin-Token
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/conversations/export")
+async def export_conversations(
+    thread_id: Optional[str] = None,
+    include_values: bool = True,
+):
+    """
+    📤 Exporta o histórico de checkpoints (de uma thread ou de todas) em NDJSON.
+
+    As linhas são lidas com um cursor do lado do servidor e enviadas à
+    medida que chegam; a memória usada não depende do volume exportado.
+    """
+    conversation_data = await get_conversation_data()
+
+    async def stream_records():
+        try:
+            async for record in conversation_data.export_checkpoints(thread_id, include_values):
+                yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            # O status 200 já foi enviado; o erro vai como última linha
+            logger.error(f"❌ Erro na exportação das conversas: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_records(), media_type="application/x-ndjson")
+
+
+@router.delete("/conversations/{thread_id}")
+async def purge_conversation(thread_id: str, include_store: bool = False):
+    """🗑️ Apaga os checkpoints de uma thread (e, opcionalmente, o cadastro no BaseStore)"""
+    try:
+        conversation_data = await get_conversation_data()
+        await conversation_data.purge_thread(thread_id, include_store=include_store)
+        return {"status": "success", "thread_id": thread_id}
+    except Exception as e:
+        logger.error(f"❌ Erro ao expurgar a thread '{thread_id}': {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/conversations")
+async def purge_old_conversations(older_than_days: int = Query(..., ge=1)):
+    """🗑️ Apaga, em lotes, as threads sem atividade há mais de N dias"""
+    try:
+        conversation_data = await get_conversation_data()
+        purged = await conversation_data.purge_older_than(older_than_days)
+        return {"status": "success", "purged_threads": purged}
+    except Exception as e:
+        logger.error(f"❌ Erro no expurgo por idade: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
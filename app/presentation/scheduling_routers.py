@@ -1,77 +1,488 @@
+import json
 import logging
-from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, status, Depends
+import math
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Literal, Optional
+from pydantic import BaseModel, ValidationError
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from app.presentation.dto.message_request_payload import WebhookPayload
+from app.presentation.security import require_admin
+from app.application.services.ingress_pipeline import (
+    IngressDecision,
+    IngressMessage,
+    forget_message,
+    ingress_pipeline,
+    message_dedup_index,
+)
+from app.application.agent.prompts.orchestrator_prompt import SYSTEM_PROMPT_FINGERPRINT
+from app.application.agent.node.orchestrator.prompt_assembler import prompt_assembler
+from app.application.services.model_router import model_router
+from app.application.services.reminder_scheduler import reminder_scheduler
 from app.application.services.scheduling_service import (
+    defer_message,
+    deferred_messages,
     get_scheduling_service,
     SchedulingService,
 )
 from app.infrastructure.config.config import settings
-from psycopg_pool import AsyncConnectionPool
-from psycopg.rows import dict_row
+from app.infrastructure.resilience.breakers import breakers_stats
+from app.infrastructure.resilience.admission_control import (
+    AdaptiveConcurrencyLimit,
+    AdmissionController,
+    AdmissionDecision,
+    LoadSheddingError,
+)
+from app.infrastructure.observability.profiler import ProfileResult, profiler_registry
+from app.infrastructure.observability.tracing import to_chrome_trace, to_otlp_json, tracer
+from app.infrastructure.observability.usage_accounting import usage_accountant
+from app.infrastructure.outbound.delivery import get_outbound_dispatcher
+from app.infrastructure.pesistence.postgres_persistence import db_manager
+from app.infrastructure.tenancy.fair_scheduler import tenant_scheduler
+from app.infrastructure.tenancy.tenant_keys import tenant_thread_id
+from app.infrastructure.tenancy.tenant_registry import tenant_registry
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+# Instância única (Singleton) do controle de admissão do webhook
+admission_controller = AdmissionController(
+    global_rate=settings.ADMISSION_GLOBAL_RATE,
+    global_burst=settings.ADMISSION_GLOBAL_BURST,
+    phone_rate=settings.ADMISSION_PHONE_RATE,
+    phone_burst=settings.ADMISSION_PHONE_BURST,
+    concurrency=AdaptiveConcurrencyLimit(
+        initial=settings.ADMISSION_INITIAL_CONCURRENCY,
+        minimum=settings.ADMISSION_MIN_CONCURRENCY,
+        maximum=settings.ADMISSION_MAX_CONCURRENCY,
+        target_latency=settings.ADMISSION_TARGET_LATENCY_SECONDS,
+    ),
+)
+
+
 class MessageRequest(BaseModel):
     message: str
 
 
+def to_ingress_message(payload: WebhookPayload) -> IngressMessage:
+    return IngressMessage(
+        message_id=payload.message_id,
+        phone_number=payload.phone_number,
+        text=payload.message,
+        instance_id=payload.instance_id,
+        from_me=payload.from_me,
+        is_group=payload.is_group,
+    )
+
+
+async def filter_message(payload: WebhookPayload) -> IngressDecision:
+    """
+    Dependência dos filtros de entrada (ecos, grupos, retries e flood).
+    Roda antes da admissão: uma mensagem descartada não consome tokens.
+    """
+    return await ingress_pipeline.evaluate(to_ingress_message(payload))
+
+
+def is_processed(result: Optional[dict]) -> bool:
+    """
+    Se o turno consumiu a mensagem: respondida pelo agente ou guardada na
+    fila de adiadas. Erro do agente (ou fila cheia) não conta, e o
+    message_id deve sair da deduplicação para o retry do gateway passar.
+    """
+    if not result:
+        return False
+    if result.get("status") in ("degraded", "throttled"):
+        return bool(result.get("queued"))
+    return result.get("status") == "success"
+
+
+def admission_outcome(result: Optional[dict]) -> Optional[bool]:
+    """
+    Sinal do turno para o limite adaptativo. Respostas do modo degradado e
+    da instância sobrecarregada são neutras: saem em microssegundos ou
+    refletem a cota de uma só clínica, e não devem reduzir o limite global.
+    """
+    if result and result.get("status") in ("degraded", "throttled"):
+        return None
+    return bool(result) and result.get("status") == "success"
+
+
+@dataclass
+class AdmittedMessage:
+    """Vaga de admissão do turno. O endpoint registra o resultado em ``result``."""
+
+    decision: AdmissionDecision
+    result: Optional[dict] = None
+
+
+async def admit_message(
+    payload: WebhookPayload, ingress: IngressDecision = Depends(filter_message)
+) -> AsyncIterator[AdmittedMessage]:
+    """
+    Dependência de admissão. Declarada antes do serviço para que uma
+    mensagem rejeitada não chegue a construir o agente.
+
+    A vaga é devolvida no ``finally`` da própria dependência: vale também
+    quando o serviço falha ao ser construído ou a requisição é cancelada.
+    A mensagem rejeitada já passou pela deduplicação; com
+    ADMISSION_SHED_MODE=reply ela vai para a fila de adiadas, senão sai da
+    deduplicação antes do 429 para o retry do gateway ser aceito.
+    """
+    if not ingress.accepted:
+        yield AdmittedMessage(AdmissionDecision(admitted=False, reason="filtered"))
+        return
+
+    if settings.ADMISSION_ENABLED:
+        decision = admission_controller.try_admit(payload.phone_number)
+    else:
+        decision = AdmissionDecision(admitted=False, reason="disabled")
+    if settings.ADMISSION_ENABLED and not decision.admitted:
+        logger.warning(
+            "Mensagem de '%s' rejeitada pelo controle de admissão (%s).",
+            payload.phone_number,
+            decision.reason,
+        )
+        queued = settings.ADMISSION_SHED_MODE == "reply" and defer_message(
+            payload.phone_number, payload.message, payload.message_id, payload.instance_id
+        )
+        if not queued:
+            await forget_message(payload.instance_id, payload.message_id)
+        raise LoadSheddingError(decision.reason, decision.retry_after, queued=queued)
+
+    admitted = AdmittedMessage(decision)
+    try:
+        yield admitted
+    finally:
+        result = admitted.result
+        admission_controller.release(decision, success=admission_outcome(result))
+        if not is_processed(result):
+            await forget_message(payload.instance_id, payload.message_id)
+
+
 @router.post("/", summary="Recebe mensagem do webhook", status_code=status.HTTP_200_OK)
 async def receive_webhook(
-    payload: WebhookPayload, service: SchedulingService = Depends(get_scheduling_service)
+    payload: WebhookPayload,
+    ingress: IngressDecision = Depends(filter_message),
+    admission: AdmittedMessage = Depends(admit_message),
+    service: SchedulingService = Depends(get_scheduling_service),
 ):
-    logger.info(f"Nova mensagem de '{payload.phone_number}' recebida.")
-    logger.info(f"Conteúdo: '{payload.message}'")
+    logger.debug("Nova mensagem de '%s' recebida.", payload.phone_number)
+
+    if not ingress.accepted:
+        # 200 para o gateway não reenviar
+        return {"status": "ignored", "filter": ingress.filter, "reason": ingress.reason}
 
-    result = await service.handle_incoming_message(
-        payload.phone_number, payload.message, payload.message_id
+    span = tracer.current_span()
+    if span is not None:
+        span.set_attributes(
+            message_id=payload.message_id,
+            thread_id=tenant_thread_id(payload.phone_number, payload.instance_id),
+        )
+
+    admission.result = await service.handle_incoming_message(
+        payload.phone_number, payload.message, payload.message_id, payload.instance_id
     )
+    return admission.result
 
-    return result
 
-@router.post("/debug/truncate-tables")
-async def truncate_langgraph_tables():
-    """🗑️ Limpa todas as tabelas do LangGraph"""
+def parse_batch_body(body: bytes, content_type: str) -> list:
+    """
+    Decodifica o corpo do lote: array JSON ou NDJSON (um payload por linha).
+    """
     try:
-        postgres_uri = (
-            f"postgresql://"
-            f"{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD.get_secret_value()}"
-            f"@db:5432/{settings.POSTGRES_DB}"
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Corpo do lote inválido: {e}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="O lote deve ser um array JSON.")
+    return items
+
+
+@router.post(
+    "/batch",
+    summary="Recebe um lote de mensagens do webhook",
+    status_code=status.HTTP_200_OK,
+)
+async def receive_webhook_batch(
+    request: Request, service: SchedulingService = Depends(get_scheduling_service)
+):
+    """
+    Recebe um array JSON (ou NDJSON) de payloads do webhook.
+
+    As mensagens são validadas em uma única passada, agrupadas por telefone
+    e processadas em paralelo (mantendo a ordem dentro de cada conversa).
+    Os resultados são devolvidos como NDJSON, na ordem em que ficam prontos.
+
+    Cada mensagem passa pelo controle de admissão como no webhook: a
+    rejeitada sai da deduplicação e volta como ``status: "rejected"``; a
+    admitida ocupa uma vaga de concorrência até o seu resultado sair.
+    """
+    items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {settings.BATCH_MAX_ITEMS} mensagens.",
         )
-        
-        connection_kwargs = {
-            "autocommit": True,
-            "prepare_threshold": 0,
-            "row_factory": dict_row,
-        }
-        
-        pool = AsyncConnectionPool(
-            conninfo=postgres_uri,
-            max_size=5,
-            kwargs=connection_kwargs
+
+    valid_messages = []
+    invalid_results = []
+    decisions: Dict[int, AdmissionDecision] = {}
+    for index, item in enumerate(items):
+        try:
+            payload = WebhookPayload.model_validate(item)
+        except ValidationError as e:
+            invalid_results.append(
+                {"index": index, "status": "invalid", "message": e.errors(include_url=False)}
+            )
+            continue
+        ingress = await ingress_pipeline.evaluate(to_ingress_message(payload))
+        if not ingress.accepted:
+            invalid_results.append(
+                {
+                    "index": index,
+                    "message_id": payload.message_id,
+                    "status": "ignored",
+                    "filter": ingress.filter,
+                    "reason": ingress.reason,
+                }
+            )
+            continue
+        if settings.ADMISSION_ENABLED:
+            decision = admission_controller.try_admit(payload.phone_number)
+            if not decision.admitted:
+                await forget_message(payload.instance_id, payload.message_id)
+                invalid_results.append(
+                    {
+                        "index": index,
+                        "message_id": payload.message_id,
+                        "status": "rejected",
+                        "reason": decision.reason,
+                        "retry_after": max(1, math.ceil(min(decision.retry_after, 3600))),
+                    }
+                )
+                continue
+            decisions[index] = decision
+        valid_messages.append(
+            {
+                "index": index,
+                "phone_number": payload.phone_number,
+                "message_text": payload.message,
+                "message_id": payload.message_id,
+                "instance_id": payload.instance_id,
+            }
         )
-        await pool.open()
-        
+
+    async def stream_results():
+        # Mensagens registradas na deduplicação e ainda não processadas
+        pending = {m["index"]: m for m in valid_messages}
         try:
-            async with pool.connection() as conn:
-                # Tabelas do LangGraph
-                tables = ['checkpoints', 'checkpoint_writes', 'store']
-                
-                for table in tables:
-                    try:
-                        async with conn.cursor() as cursor:
-                            await cursor.execute(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE")
-                        logger.info(f"✅ {table} truncada")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro ao truncar {table}: {e}")
-                
-                return {"status": "success", "message": "Tabelas LangGraph limpas"}
+            for result in invalid_results:
+                yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+            async for result in service.handle_incoming_batch(
+                valid_messages, settings.BATCH_MAX_CONCURRENCY
+            ):
+                decision = decisions.pop(result["index"], None)
+                if decision is not None:
+                    admission_controller.release(decision, success=admission_outcome(result))
+                if is_processed(result):
+                    pending.pop(result["index"], None)
+                yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
         finally:
-            await pool.close()
-            
+            # Lote interrompido: as vagas voltam sem ajustar o limite
+            for decision in decisions.values():
+                admission_controller.release(decision, success=None)
+            for message in pending.values():
+                await forget_message(message["instance_id"], message["message_id"])
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@router.get("/debug/admission")
+async def admission_stats():
+    """🚦 Estado do controle de admissão"""
+    return {"enabled": settings.ADMISSION_ENABLED, **admission_controller.stats()}
+
+
+@router.get("/debug/tenants", dependencies=[Depends(require_admin)])
+async def tenant_stats():
+    """🏥 Concorrência, fila, latência e cota do LLM por instância (clínica)"""
+    return {**tenant_scheduler.stats(), "registry": tenant_registry.stats()}
+
+
+@router.get("/debug/model-router")
+async def model_router_stats():
+    """🧭 Roteamento de modelos: escalonamentos, latência e custo por camada"""
+    return model_router.stats()
+
+
+@router.get("/debug/prompt-cache")
+async def prompt_cache_stats():
+    """🧊 Prefixos estáveis do prompt e fração da entrada servida pelo cache"""
+    return {
+        "system_fingerprint": SYSTEM_PROMPT_FINGERPRINT,
+        "tenant_fingerprints": tenant_registry.prompt_fingerprints(),
+        "assembler": prompt_assembler.stats(),
+        "models": {
+            model: {
+                "prompt_tokens": counters["prompt_tokens"],
+                "cached_tokens": counters["cached_tokens"],
+                "cached_input_ratio": counters["cached_input_ratio"],
+            }
+            for model, counters in usage_accountant.stats()["models"].items()
+        },
+    }
+
+
+@router.get("/debug/reminders")
+async def reminders_stats():
+    """⏰ Lembretes de consulta: janela carregada, timer wheel e disparos"""
+    return reminder_scheduler.stats()
+
+
+@router.get("/debug/ingress")
+async def ingress_stats():
+    """🧹 Contadores dos filtros de entrada e da deduplicação"""
+    stats = ingress_pipeline.stats()
+    if message_dedup_index is not None:
+        stats["dedup"] = message_dedup_index.stats()
+    return stats
+
+
+@router.get("/debug/circuit-breakers")
+async def circuit_breaker_stats():
+    """🔌 Estado dos circuit breakers e da fila de mensagens adiadas"""
+    return {"breakers": breakers_stats(), "deferred_messages": deferred_messages.stats()}
+
+
+@router.get("/debug/checkpoint-cache")
+async def checkpoint_cache_stats():
+    """📊 Métricas do cache L1 de checkpoints"""
+    cache = await db_manager.get_checkpoint_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/debug/store-ttl")
+async def store_ttl_stats():
+    """⏳ Políticas de TTL e vazão da varredura do BaseStore"""
+    if settings.STORE_TTL_SWEEP_INTERVAL_SECONDS <= 0:
+        return {"enabled": False}
+    sweeper = await db_manager.get_store_ttl_sweeper()
+    return {"enabled": True, **sweeper.stats()}
+
+
+@router.get("/debug/outbound")
+async def outbound_stats():
+    """📊 Métricas da entrega de mensagens ao gateway"""
+    if not settings.OUTBOUND_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_outbound_dispatcher().stats()}
+
+
+@router.get("/debug/llm-usage", dependencies=[Depends(require_admin)])
+async def llm_usage_stats():
+    """💰 Tokens, custo e latência do LLM por modelo, instância e thread"""
+    return usage_accountant.stats(top_threads=settings.LLM_USAGE_TOP_THREADS)
+
+
+@router.get("/debug/traces", dependencies=[Depends(require_admin)])
+async def list_traces():
+    """🔎 Traces mais recentes (amostrados ou forçados com o cabeçalho X-Trace: 1)"""
+    return {**tracer.stats(), "traces": tracer.recent_traces()}
+
+
+@router.get("/debug/traces/{trace_id}", dependencies=[Depends(require_admin)])
+async def get_trace(trace_id: str, format: Literal["chrome", "otlp"] = "chrome"):
+    """
+    🔥 Um trace completo. O formato "chrome" abre como flame chart no
+    Perfetto (ui.perfetto.dev) ou no speedscope.
+    """
+    spans = tracer.get_trace(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Trace não encontrado")
+    if format == "otlp":
+        return to_otlp_json(spans, settings.TRACE_SERVICE_NAME)
+    return to_chrome_trace(spans)
+
+
+def _profile_response(result: ProfileResult, format: str, name: str):
+    if format == "speedscope":
+        return result.speedscope(name)
+    return PlainTextResponse(result.collapsed())
+
+
+@router.post("/debug/profile", dependencies=[Depends(require_admin)])
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: Optional[float] = Query(None, gt=0),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+):
+    """
+    🔬 Amostra a pilha do event loop deste worker por N segundos.
+
+    "collapsed" gera as pilhas no formato do flamegraph.pl/inferno;
+    "speedscope" abre direto em https://www.speedscope.app.
+    """
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Duração máxima: {settings.PROFILER_MAX_SECONDS} segundos",
+        )
+    try:
+        result = await profiler_registry.profile_loop(
+            seconds, interval_ms / 1000 if interval_ms else None
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _profile_response(result, format, f"event loop ({seconds}s)")
+
+
+@router.get("/debug/profiles", dependencies=[Depends(require_admin)])
+async def list_request_profiles():
+    """🔬 Perfis das requisições enviadas com o cabeçalho X-Profile: 1"""
+    return profiler_registry.recent()
+
+
+@router.get("/debug/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_request_profile(
+    profile_id: str, format: Literal["collapsed", "speedscope"] = "collapsed"
+):
+    """🔬 Perfil de uma requisição (id do cabeçalho X-Profile-Id)"""
+    result = profiler_registry.get(profile_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    return _profile_response(result, format, f"requisição {profile_id}")
+
+
+@router.post("/debug/truncate-tables")
+async def truncate_langgraph_tables():
+    """🗑️ Limpa todas as tabelas do LangGraph"""
+    try:
+        pool = await db_manager.get_pool()
+        async with pool.connection() as conn:
+            # Tabelas do LangGraph
+            tables = ['checkpoints', 'checkpoint_writes', 'store', 'checkpoint_archive', 'thread_activity']
+
+            for table in tables:
+                try:
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE")
+                    logger.info(f"✅ {table} truncada")
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro ao truncar {table}: {e}")
+
+        cache = await db_manager.get_checkpoint_cache()
+        if cache is not None:
+            cache.clear()
+
+        return {"status": "success", "message": "Tabelas LangGraph limpas"}
+
     except Exception as e:
         logger.error(f"❌ Erro: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,20 @@
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException, status
+from app.infrastructure.config.config import settings
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Confere o token de admin. Sem ADMIN_TOKEN configurado, nada é aceito."""
+    if settings.ADMIN_TOKEN is None or not token:
+        return False
+    return secrets.compare_digest(token, settings.ADMIN_TOKEN.get_secret_value())
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Dependência das rotas protegidas pelo cabeçalho ``X-Admin-Token``."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de admin ausente, inválido ou não configurado (ADMIN_TOKEN).",
+        )
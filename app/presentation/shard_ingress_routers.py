@@ -0,0 +1,137 @@
+import json
+import logging
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from app.infrastructure.config.config import settings
+from app.infrastructure.sharding.dispatcher import (
+    NoWorkersAvailableError,
+    ShardDispatcher,
+)
+from app.presentation.dto.message_request_payload import WebhookPayload
+from app.presentation.scheduling_routers import parse_batch_body
+from app.presentation.security import require_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Instância única (Singleton) do dispatcher usada pela ingress
+shard_dispatcher = ShardDispatcher(
+    workers=settings.SHARD_WORKERS,
+    virtual_nodes=settings.SHARD_VIRTUAL_NODES,
+    health_interval_seconds=settings.SHARD_HEALTH_INTERVAL_SECONDS,
+    forward_timeout_seconds=settings.SHARD_FORWARD_TIMEOUT_SECONDS,
+)
+
+
+class WorkerRegistration(BaseModel):
+    url: str
+
+
+@router.post("/message/", summary="Encaminha a mensagem ao worker da conversa")
+async def forward_webhook(request: Request):
+    try:
+        raw_payload = await request.json()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O corpo da requisição não é um JSON válido.",
+        )
+    try:
+        payload = WebhookPayload.model_validate(raw_payload)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False),
+        )
+
+    try:
+        return await shard_dispatcher.forward_message(payload.phone_number, raw_payload)
+    except NoWorkersAvailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except httpx.HTTPStatusError as e:
+        # Respostas 4xx do worker (ex.: 429 do load shedding) chegam ao gateway
+        # como estão; erros do worker viram 502
+        worker_status = e.response.status_code
+        if worker_status >= 500:
+            logger.error(f"Worker respondeu {worker_status} ao encaminhamento: {e.response.text[:500]}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"O worker respondeu com erro {worker_status}.",
+            )
+        try:
+            detail = e.response.json().get("detail", e.response.text)
+        except ValueError:
+            detail = e.response.text
+        retry_after = e.response.headers.get("Retry-After")
+        headers = {"Retry-After": retry_after} if retry_after else None
+        raise HTTPException(status_code=worker_status, detail=detail, headers=headers)
+    except httpx.HTTPError as e:
+        logger.error(f"Falha ao encaminhar a mensagem ao worker: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Falha no worker: {e}"
+        )
+
+
+@router.post("/message/batch", summary="Distribui um lote de mensagens entre os workers")
+async def forward_webhook_batch(request: Request):
+    items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {settings.BATCH_MAX_ITEMS} mensagens.",
+        )
+
+    routed = []
+    invalid_results = []
+    for index, item in enumerate(items):
+        try:
+            payload = WebhookPayload.model_validate(item)
+        except ValidationError as e:
+            invalid_results.append(
+                {"index": index, "status": "invalid", "message": e.errors(include_url=False)}
+            )
+            continue
+        routed.append((index, payload.phone_number, item))
+
+    if routed and not shard_dispatcher.ring.nodes:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Nenhum worker disponível para processar o lote.",
+        )
+
+    async def stream_results():
+        for result in invalid_results:
+            yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+        async for result in shard_dispatcher.forward_batch(routed):
+            yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.get("/shard/workers", summary="Lista os workers do anel")
+async def list_workers():
+    return shard_dispatcher.status()
+
+
+@router.post(
+    "/shard/workers",
+    summary="Registra um worker no anel",
+    dependencies=[Depends(require_admin)],
+)
+async def register_worker(registration: WorkerRegistration):
+    shard_dispatcher.add_worker(registration.url)
+    return shard_dispatcher.status()
+
+
+@router.delete(
+    "/shard/workers",
+    summary="Remove um worker do anel",
+    dependencies=[Depends(require_admin)],
+)
+async def unregister_worker(registration: WorkerRegistration):
+    shard_dispatcher.remove_worker(registration.url)
+    return shard_dispatcher.status()
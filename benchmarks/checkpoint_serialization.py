@@ -0,0 +1,93 @@
+"""
+Benchmark: tamanho e tempo de (de)serialização dos canais do checkpoint.
+
+Compara o ``JsonPlusSerializer`` padrão do LangGraph com o
+``CompressedSerializer`` (msgpack + zstd acima do limiar) em threads
+de conversa realistas, de tamanhos crescentes.
+
+Uso:
+    python -m benchmarks.checkpoint_serialization [--turns 5 20 80] [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # noqa: E402
+
+from app.domain.scheduling_data import SchedulingData  # noqa: E402
+from app.infrastructure.pesistence.compressed_serializer import (  # noqa: E402
+    CompressedSerializer,
+)
+
+
+def _build_channels(turns: int) -> dict:
+    messages = []
+    for i in range(turns):
+        messages.append(
+            HumanMessage(content=f"Oi, gostaria de marcar uma consulta de cardiologia ({i}).")
+        )
+        messages.append(
+            AIMessage(
+                content=(
+                    "Claro! Temos horários disponíveis com a Dra. Ana Souza na quinta-feira "
+                    "pela manhã ou na sexta-feira à tarde. Qual turno fica melhor para você?"
+                )
+            )
+        )
+    return {
+        "messages": messages,
+        "phone_number": "5511999999999",
+        "message_id": "3EB0C767D71D5A0E5C3F",
+        "scheduling_data": SchedulingData(
+            user_name="Maria", specialty="Cardiologia", turn_scheduled="manhã"
+        ),
+    }
+
+
+def _measure(serde, channels: dict, rounds: int):
+    size = 0
+    encode = 0.0
+    decode = 0.0
+    for _ in range(rounds):
+        for value in channels.values():
+            started = time.perf_counter()
+            typed = serde.dumps_typed(value)
+            encode += time.perf_counter() - started
+
+            started = time.perf_counter()
+            serde.loads_typed(typed)
+            decode += time.perf_counter() - started
+    for value in channels.values():
+        size += len(serde.dumps_typed(value)[1])
+    return size, encode / rounds, decode / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[5, 20, 80])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--threshold", type=int, default=1024)
+    args = parser.parse_args()
+
+    serializers = {
+        "default": JsonPlusSerializer(),
+        "compressed": CompressedSerializer(threshold=args.threshold),
+    }
+
+    for turns in args.turns:
+        channels = _build_channels(turns)
+        print(f"--- {turns} turnos ({len(channels['messages'])} mensagens)")
+        for label, serde in serializers.items():
+            size, encode, decode = _measure(serde, channels, args.rounds)
+            print(
+                f"{label:<12} bytes={size:8d} "
+                f"encode={encode * 1e6:8.1f}us decode={decode * 1e6:8.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
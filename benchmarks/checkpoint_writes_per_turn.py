@@ -0,0 +1,144 @@
+"""
+Benchmark: bytes gravados no checkpointer por turno de conversa.
+
+Compara o contrato antigo (o node devolve ``{**state, ...}`` e o serviço
+reenvia um ``SchedulingData()`` vazio a cada turno) com o atual (node
+com delta imposto pelo ``StateContract`` e entrada só com os canais do
+turno). Usa um node sem LLM e um ``InMemorySaver`` que mede o que seria
+serializado: valores dos canais com nova versão e writes pendentes.
+
+Uso:
+    python -m benchmarks.checkpoint_writes_per_turn [--turns 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from app.application.agent.registry.node_registry import NodeRegistry  # noqa: E402
+from app.application.agent.state.sheduling_agent_state import (  # noqa: E402
+    SchedulingAgentState,
+    get_scheduling_data,
+    scheduling_state_contract,
+)
+from app.domain.scheduling_data import SchedulingData  # noqa: E402
+
+PHONE_NUMBER = "5511999999999"
+
+# Dado coletado em cada turno (o resto dos turnos é só conversa)
+COLLECTED = {
+    2: {"specialty": "Cardiologia"},
+    4: {"professional_name": "Dra. Ana Souza"},
+    6: {"date_scheduled": "2025-08-14"},
+    8: {"turn_scheduled": "manhã"},
+}
+
+
+class CountingSaver(InMemorySaver):
+    """InMemorySaver que contabiliza os bytes serializados por gravação."""
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self.blob_bytes_written = 0
+        self.blobs_written = 0
+        self.write_bytes_written = 0
+        self.writes_written = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        for channel in new_versions:
+            value = checkpoint["channel_values"].get(channel)
+            if value is not None:
+                self.blob_bytes_written += len(self.serde.dumps_typed(value)[1])
+                self.blobs_written += 1
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        for _, value in writes:
+            self.write_bytes_written += len(self.serde.dumps_typed(value)[1])
+            self.writes_written += 1
+        return super().put_writes(config, writes, task_id, task_path)
+
+
+def _reply(turn: int) -> AIMessage:
+    return AIMessage(
+        content=(
+            f"Perfeito! Anotei sua preferência ({turn}). Temos horários com a Dra. Ana "
+            "Souza na quinta pela manhã ou na sexta à tarde. Qual fica melhor?"
+        )
+    )
+
+
+def _build(delta_only: bool):
+    registry = NodeRegistry(state_contract=scheduling_state_contract if delta_only else None)
+
+    @registry.register_node(name="ORCHESTRATOR")
+    async def orchestrator(state):
+        turn = sum(isinstance(m, HumanMessage) for m in state["messages"])
+        update = {"messages": [_reply(turn)]}
+        if turn in COLLECTED:
+            data = get_scheduling_data(state).model_copy(update=COLLECTED[turn])
+            update["scheduling_data"] = data
+        # Contrato antigo: ecoa o estado inteiro; o registry com contrato
+        # descarta os canais sem mudança
+        return {**state, **update}
+
+    graph = StateGraph(SchedulingAgentState)
+    graph.add_node("ORCHESTRATOR", registry.get_nodes()["ORCHESTRATOR"])
+    graph.set_entry_point("ORCHESTRATOR")
+    graph.add_edge("ORCHESTRATOR", END)
+    saver = CountingSaver()
+    return graph.compile(checkpointer=saver), saver
+
+
+async def _run(delta_only: bool, turns: int):
+    agent, saver = _build(delta_only)
+    config = {"configurable": {"thread_id": PHONE_NUMBER}}
+    per_turn = []
+    for turn in range(1, turns + 1):
+        saver.reset()
+        state = {
+            "phone_number": PHONE_NUMBER,
+            "message_id": f"MSG{turn:04d}",
+            "messages": [HumanMessage(content=f"Mensagem do paciente número {turn}.")],
+        }
+        if not delta_only:
+            state["scheduling_data"] = SchedulingData()
+        await agent.ainvoke(state, config=config)
+        per_turn.append(
+            (
+                saver.blob_bytes_written,
+                saver.blobs_written,
+                saver.write_bytes_written,
+                saver.writes_written,
+            )
+        )
+
+    final = await agent.aget_state(config)
+    return per_turn, get_scheduling_data(final.values)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'contrato':<10} {'blobs B/turno':>14} {'blobs/turno':>12} {'writes B/turno':>15} {'writes/turno':>13}")
+    for name, delta_only in (("antigo", False), ("delta", True)):
+        per_turn, scheduling_data = asyncio.run(_run(delta_only, args.turns))
+        n = len(per_turn)
+        blob_bytes, blobs, write_bytes, writes = (sum(col) / n for col in zip(*per_turn))
+        print(f"{name:<10} {blob_bytes:>14.0f} {blobs:>12.1f} {write_bytes:>15.0f} {writes:>13.1f}")
+        print(f"{'':<10} scheduling_data final: {scheduling_data.model_dump(exclude_none=True)}")
+
+
+if __name__ == "__main__":
+    main()
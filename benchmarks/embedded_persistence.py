@@ -0,0 +1,143 @@
+"""
+Benchmark: turnos por segundo com o checkpointer SQLite embutido.
+
+Roda conversas concorrentes em um grafo de um node sem LLM e compara o
+``InMemorySaver`` (sem durabilidade, teto do grafo) com o
+``SQLiteCheckpointSaver`` em configurações de group commit: um COMMIT por
+escrita (intervalo 0, ``commit_max_writes=1``), grupos por intervalo com e
+sem espera do fsync. Ao final roda a compactação e mostra o tamanho do
+arquivo antes e depois.
+
+Não precisa de Postgres: o banco fica em um diretório temporário.
+
+Uso:
+    python -m benchmarks.embedded_persistence [--threads 50] [--turns 10] [--interval 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from app.application.agent.state.sheduling_agent_state import SchedulingAgentState  # noqa: E402
+from app.infrastructure.pesistence.sqlite_persistence import (  # noqa: E402
+    SQLiteCheckpointSaver,
+    SQLiteDatabase,
+)
+
+
+def _build(checkpointer):
+    async def orchestrator(state):
+        turn = sum(isinstance(m, HumanMessage) for m in state["messages"])
+        return {"messages": [AIMessage(content=f"Resposta do turno {turn}: qual horário prefere?")]}
+
+    graph = StateGraph(SchedulingAgentState)
+    graph.add_node("ORCHESTRATOR", orchestrator)
+    graph.set_entry_point("ORCHESTRATOR")
+    graph.add_edge("ORCHESTRATOR", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+async def _conversation(agent, phone: str, turns: int, latencies: list):
+    config = {"configurable": {"thread_id": phone}}
+    for turn in range(turns):
+        started = time.perf_counter()
+        await agent.ainvoke(
+            {
+                "phone_number": phone,
+                "message_id": f"{phone}-{turn}",
+                "messages": [HumanMessage(content=f"Mensagem {turn} do paciente.")],
+            },
+            config=config,
+        )
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run(checkpointer, args) -> dict:
+    agent = _build(checkpointer)
+    latencies: list = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _conversation(agent, f"55119{i:08d}", args.turns, latencies)
+            for i in range(args.threads)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "turns_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def _size_on_disk(path: str) -> int:
+    """Arquivo principal + WAL (antes do checkpoint, as páginas estão no WAL)."""
+    return sum(
+        os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p)
+    )
+
+
+async def _run_sqlite(directory: str, name: str, args, **options) -> dict:
+    path = os.path.join(directory, f"{name}.sqlite3")
+    db = SQLiteDatabase(path, **options)
+    await db.open()
+    try:
+        result = await _run(SQLiteCheckpointSaver(db), args)
+        result.update(db.stats())
+        if args.compact:
+            await db.flush()
+            before = _size_on_disk(path)
+            await db.compact(keep_checkpoints=args.keep_checkpoints)
+            result["compaction"] = f"{before / 1024:.0f}KiB -> {_size_on_disk(path) / 1024:.0f}KiB"
+    finally:
+        await db.close()
+    return result
+
+
+async def _main(args):
+    results = {"memória (sem fsync)": await _run(InMemorySaver(), args)}
+    with tempfile.TemporaryDirectory() as directory:
+        results["sqlite commit por escrita"] = await _run_sqlite(
+            directory, "single", args, commit_interval_ms=0, commit_max_writes=1
+        )
+        results[f"sqlite grupo {args.interval:g}ms"] = await _run_sqlite(
+            directory, "group", args, commit_interval_ms=args.interval
+        )
+        results[f"sqlite grupo {args.interval:g}ms sem espera"] = await _run_sqlite(
+            directory, "nowait", args, commit_interval_ms=args.interval, wait_for_commit=False
+        )
+
+    print(f"{args.threads} conversas x {args.turns} turnos")
+    print(f"{'backend':<32} {'turnos/s':>9} {'p50':>9} {'p95':>9} {'escritas/commit':>16}")
+    for name, r in results.items():
+        print(
+            f"{name:<32} {r['turns_per_second']:>9.0f} {r['p50_ms']:>7.1f}ms "
+            f"{r['p95_ms']:>7.1f}ms {r.get('writes_per_commit', 0.0):>16.1f}"
+        )
+        if "compaction" in r:
+            print(f"{'':<32} compactação: {r['compaction']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=50, help="Conversas concorrentes")
+    parser.add_argument("--turns", type=int, default=10, help="Turnos por conversa")
+    parser.add_argument("--interval", type=float, default=10.0, help="Intervalo do group commit (ms)")
+    parser.add_argument("--keep-checkpoints", type=int, default=2)
+    parser.add_argument("--no-compact", dest="compact", action="store_false")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
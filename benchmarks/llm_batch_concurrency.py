@@ -0,0 +1,176 @@
+"""
+Benchmark: concorrência efetiva do lote com o LLM no caminho assíncrono.
+
+Roda ``SchedulingService.handle_incoming_batch`` com conversas distintas
+em um grafo de um node que chama o LLM como o orquestrador (roteador de
+modelos + cadeia de decoradores do ``LLMFactory``). O ``ChatOpenAI`` é
+trocado por um modelo falso com latência fixa, em dois modos:
+
+- ``ainvoke``: a espera é ``asyncio.sleep`` (cliente assíncrono);
+- ``bloqueante``: a espera é ``time.sleep`` dentro do event loop, como
+  era com ``chain.invoke`` no node assíncrono.
+
+A concorrência efetiva é o tempo somado das chamadas dividido pelo tempo
+total; o teto é o menor entre BATCH_MAX_CONCURRENCY, a concorrência da
+instância e o número de conversas.
+
+Uso:
+    python -m benchmarks.llm_batch_concurrency [--threads 50] [--latency 0.2] [--concurrency 8]
+
+A instância padrão limita as conversas simultâneas a
+TENANT_DEFAULT_MAX_CONCURRENCY; aumente-o para medir só o lote.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from app.application.agent.node.orchestrator.prompt_assembler import prompt_assembler  # noqa: E402
+from app.application.agent.state.sheduling_agent_state import (  # noqa: E402
+    SchedulingAgentState,
+    get_scheduling_data,
+)
+from app.application.services.model_router import model_router  # noqa: E402
+from app.application.services.scheduling_service import SchedulingService  # noqa: E402
+from app.infrastructure.config.config import settings  # noqa: E402
+from app.infrastructure.services.llm.openai_service import OpenAIService  # noqa: E402
+from app.infrastructure.tenancy.tenant_registry import tenant_registry  # noqa: E402
+from app.utils.get_last_message import get_last_message  # noqa: E402
+
+
+class FakeChatModel(BaseChatModel):
+    """Modelo com latência fixa que conta as chamadas simultâneas."""
+
+    latency: float = 0.2
+    blocking: bool = False
+    inflight: int = 0
+    max_inflight: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _result(self) -> ChatResult:
+        message = AIMessage(
+            content="Temos horários na quinta pela manhã. Qual prefere?",
+            usage_metadata={"input_tokens": 1200, "output_tokens": 20, "total_tokens": 1220},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            if self.blocking:
+                time.sleep(self.latency)
+            else:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.inflight -= 1
+        return self._result()
+
+
+def _install(fake: FakeChatModel):
+    """Troca o ChatOpenAI de cada serviço do roteador pelo modelo falso."""
+    tenant = tenant_registry.get(None)
+    for tier in ("small", "large"):
+        service = tenant.llm_service_for(model_router.model_for(tier, tenant))
+        while not isinstance(service, OpenAIService):
+            service = service.service
+        service.llm = fake
+
+
+def _build():
+    async def orchestrator(state):
+        tenant = tenant_registry.get(state.get("instance_id"))
+        response = await model_router.invoke(
+            tenant,
+            get_last_message(state),
+            get_scheduling_data(state),
+            prompt_inputs=prompt_assembler.inputs(state),
+        )
+        return {"messages": [AIMessage(content=response.content)]}
+
+    graph = StateGraph(SchedulingAgentState)
+    graph.add_node("ORCHESTRATOR", orchestrator)
+    graph.set_entry_point("ORCHESTRATOR")
+    graph.add_edge("ORCHESTRATOR", END)
+    return graph.compile(checkpointer=InMemorySaver())
+
+
+async def _run(args, blocking: bool) -> dict:
+    fake = FakeChatModel(latency=args.latency, blocking=blocking)
+    _install(fake)
+    service = SchedulingService(scheduling_agent=_build())
+    messages = [
+        {
+            "index": i,
+            "phone_number": f"55119{i:08d}",
+            "message_text": "Quero marcar uma consulta com cardiologista",
+            "message_id": f"bench-{blocking}-{i}",
+            "instance_id": None,
+        }
+        for i in range(args.threads)
+    ]
+    started = time.perf_counter()
+    statuses: dict = {}
+    async for result in service.handle_incoming_batch(messages, args.concurrency):
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "effective_concurrency": fake.calls * args.latency / elapsed,
+        "max_inflight": fake.max_inflight,
+        "statuses": statuses,
+    }
+
+
+async def _main(args):
+    tenant = tenant_registry.get(None)
+    ceiling = min(args.concurrency, tenant.config.max_concurrency or args.threads, args.threads)
+    results = {"ainvoke": await _run(args, blocking=False)}
+    results["bloqueante"] = await _run(args, blocking=True)
+
+    print(
+        f"{args.threads} conversas, LLM de {args.latency * 1000:.0f}ms, "
+        f"concorrência do lote {args.concurrency} (teto {ceiling})"
+    )
+    print(f"{'modo':<12} {'tempo':>8} {'concorrência':>13} {'máx. simultâneas':>17}  status")
+    for name, r in results.items():
+        print(
+            f"{name:<12} {r['seconds']:>7.2f}s {r['effective_concurrency']:>13.1f} "
+            f"{r['max_inflight']:>17}  {r['statuses']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=50, help="Conversas no lote")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latência do LLM (s)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.BATCH_MAX_CONCURRENCY,
+        help="Conversas em paralelo no lote",
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
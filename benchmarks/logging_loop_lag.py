@@ -0,0 +1,145 @@
+"""
+Benchmark: atraso do event loop causado pelo logging no caminho da requisição.
+
+Compara o logging antigo (f-strings formatadas na hora + StreamHandler síncrono,
+com o estado completo da thread no log) com o novo subsistema
+(QueueHandler + eventos estruturados preguiçosos + resumo limitado do estado).
+
+Uso:
+    python -m benchmarks.logging_loop_lag [--requests 2000] [--history 200]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.infrastructure.observability.logging_config import (  # noqa: E402
+    log_event,
+    setup_logging,
+    stop_logging,
+    summarize_state,
+)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+    def __repr__(self):
+        return f"HumanMessage(content={self.content!r})"
+
+
+def _build_state(history: int) -> dict:
+    return {
+        "phone_number": "5511999999999",
+        "message_id": "msg-1",
+        "messages": [
+            _Message(f"mensagem {i} " + "texto da conversa " * 10) for i in range(history)
+        ],
+        "scheduling_data": {"specialty": "Cardiologia", "date_scheduled": "2025-01-18"},
+    }
+
+
+async def _legacy_request(logger: logging.Logger, state: dict):
+    logger.info(f"Serviço de agendamento processando mensagem de {state['phone_number']}.")
+    logger.info(f"Conteúdo para análise: '{state['messages'][-1].content}'")
+    logger.info(f"ID da mensagem: '{state['message_id']}'")
+    logger.info(f"Processamento do agente concluído. Estado final: {state}")
+    await asyncio.sleep(0)
+
+
+async def _structured_request(logger: logging.Logger, state: dict):
+    log_event(
+        logger,
+        logging.INFO,
+        "scheduling.message_received",
+        phone_number=state["phone_number"],
+        message_id=state["message_id"],
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        log_event(logger, logging.DEBUG, "scheduling.agent_completed", **summarize_state(state))
+    await asyncio.sleep(0)
+
+
+async def _measure_lag(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+async def _run(request_fn, logger: logging.Logger, state: dict, requests: int, concurrency: int):
+    samples: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_measure_lag(stop, samples))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await request_fn(logger, state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return elapsed, samples
+
+
+def _report(label: str, elapsed: float, samples: list):
+    samples = sorted(samples) or [0.0]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{label:<12} total={elapsed * 1000:8.1f}ms "
+        f"lag_mean={statistics.mean(samples) * 1000:6.2f}ms "
+        f"lag_p99={p99 * 1000:6.2f}ms lag_max={samples[-1] * 1000:6.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--history", type=int, default=200, help="Mensagens na thread")
+    args = parser.parse_args()
+
+    state = _build_state(args.history)
+    logger = logging.getLogger("benchmark.scheduling")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_stream = open(os.path.join(tmp, "legacy.log"), "w")
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        handler = logging.StreamHandler(legacy_stream)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        elapsed, samples = asyncio.run(
+            _run(_legacy_request, logger, state, args.requests, args.concurrency)
+        )
+        _report("legacy", elapsed, samples)
+        root.removeHandler(handler)
+        legacy_stream.close()
+
+        structured_stream = open(os.path.join(tmp, "structured.log"), "w")
+        setup_logging(level="INFO", json_format=True, stream=structured_stream)
+        elapsed, samples = asyncio.run(
+            _run(_structured_request, logger, state, args.requests, args.concurrency)
+        )
+        stop_logging()
+        _report("structured", elapsed, samples)
+        structured_stream.close()
+
+
+if __name__ == "__main__":
+    main()
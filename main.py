@@ -1,20 +1,51 @@
+import asyncio
 import logging
+import math
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
+from app.infrastructure.config.config import settings
+from app.infrastructure.observability.logging_config import setup_logging, stop_logging
+from app.infrastructure.observability.profiler import ProfilingMiddleware, profiler_registry
+from app.infrastructure.observability.tracing import TracingMiddleware, tracer
+from app.infrastructure.observability.usage_accounting import usage_accountant
+from app.application.services.ingress_pipeline import message_dedup_index
+from app.application.services.reminder_scheduler import reminder_scheduler
+from app.application.services.scheduling_service import replay_deferred_messages
+from app.infrastructure.outbound.delivery import get_outbound_dispatcher
 from app.infrastructure.pesistence.postgres_persistence import db_manager
+from app.infrastructure.resilience.admission_control import LoadSheddingError
+from app.infrastructure.sharding.dispatcher import announce_worker
+from app.presentation.admin_routers import router as admin_routers
 from app.presentation.scheduling_routers import router as message_routers
+from app.presentation.security import is_admin_token
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+setup_logging(
+    level=settings.LOG_LEVEL,
+    json_format=settings.LOG_JSON,
+    sample_rates=settings.LOG_SAMPLE_RATES,
+    max_field_chars=settings.LOG_MAX_FIELD_CHARS,
 )
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def ingress_lifespan(app: FastAPI):
+    from app.presentation.shard_ingress_routers import shard_dispatcher
+
+    logger.info(f"Ingress de sharding iniciada com {len(settings.SHARD_WORKERS)} workers.")
+    await shard_dispatcher.start()
+    tracer.start()
+    yield
+    await shard_dispatcher.stop()
+    tracer.stop()
+    stop_logging()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Executando o setup da aplicação...")
@@ -24,9 +55,79 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Falha crítica durante a inicialização do banco de dados: {e}")
 
+    cold_storage = None
+    if settings.COLD_STORAGE_ARCHIVE_AFTER_DAYS > 0 and db_manager.embedded:
+        logger.warning("Arquivo frio desativado: exige o Postgres (PERSISTENCE_BACKEND=sqlite).")
+    elif settings.COLD_STORAGE_ARCHIVE_AFTER_DAYS > 0:
+        cold_storage = await db_manager.get_cold_storage()
+        cold_storage.start(settings.COLD_STORAGE_SWEEP_INTERVAL_SECONDS)
+
+    store_ttl_sweeper = None
+    if settings.STORE_TTL_SWEEP_INTERVAL_SECONDS > 0:
+        store_ttl_sweeper = await db_manager.get_store_ttl_sweeper()
+        store_ttl_sweeper.start(settings.STORE_TTL_SWEEP_INTERVAL_SECONDS)
+
+    announce = (
+        settings.SHARD_ROLE == "worker"
+        and settings.SHARD_INGRESS_URL
+        and settings.SHARD_WORKER_URL
+    )
+    admin_token = settings.ADMIN_TOKEN.get_secret_value() if settings.ADMIN_TOKEN else None
+    if announce:
+        await announce_worker(
+            settings.SHARD_INGRESS_URL, settings.SHARD_WORKER_URL, admin_token=admin_token
+        )
+
+    if settings.OUTBOUND_ENABLED:
+        get_outbound_dispatcher().start()
+
+    if settings.REMINDERS_ENABLED and db_manager.embedded:
+        logger.warning("Lembretes de consulta desativados: exigem o Postgres (PERSISTENCE_BACKEND=sqlite).")
+    elif settings.REMINDERS_ENABLED and not settings.OUTBOUND_ENABLED:
+        logger.warning("Lembretes de consulta desativados: exigem OUTBOUND_ENABLED.")
+    elif settings.REMINDERS_ENABLED:
+        reminder_scheduler.start()
+
+    # Sem Postgres, os agregados de uso ficam só em memória
+    if not db_manager.embedded:
+        usage_accountant.start()
+    tracer.start()
+    if message_dedup_index is not None:
+        message_dedup_index.start()
+
+    # Sem outbox, nada é adiado: a resposta do reprocessamento não chegaria
+    replay_task = None
+    if settings.OUTBOUND_ENABLED:
+        replay_task = asyncio.create_task(
+            replay_deferred_messages(settings.DEFERRED_REPLAY_INTERVAL_SECONDS)
+        )
+
     logger.info("Setup concluído.")
     yield
 
+    if replay_task is not None:
+        replay_task.cancel()
+    if message_dedup_index is not None:
+        await message_dedup_index.stop()
+    await usage_accountant.stop()
+    tracer.stop()
+    await reminder_scheduler.stop()
+    if settings.OUTBOUND_ENABLED:
+        await get_outbound_dispatcher().stop()
+    if announce:
+        await announce_worker(
+            settings.SHARD_INGRESS_URL,
+            settings.SHARD_WORKER_URL,
+            joining=False,
+            admin_token=admin_token,
+        )
+    if cold_storage is not None:
+        await cold_storage.stop()
+    if store_ttl_sweeper is not None:
+        await store_ttl_sweeper.stop()
+    await db_manager.close()
+    stop_logging()
+
 
 app = FastAPI(
     title="Agendamento API",
@@ -34,10 +135,42 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan,
+    lifespan=ingress_lifespan if settings.SHARD_ROLE == "ingress" else lifespan,
+)
+
+app.add_middleware(
+    TracingMiddleware, tracer=tracer, allow_force=settings.TRACE_ALLOW_FORCE
 )
+# Adicionado por último para ficar por fora: o perfil inclui o tracing
+app.add_middleware(
+    ProfilingMiddleware, registry=profiler_registry, authorize=is_admin_token
+)
+
+if settings.SHARD_ROLE == "ingress":
+    # A ingress apenas roteia cada conversa para o worker dono do telefone
+    from app.presentation.shard_ingress_routers import router as shard_ingress_routers
+
+    app.include_router(shard_ingress_routers, tags=["sharding"])
+else:
+    app.include_router(message_routers, prefix="/message", tags=["message"])
+    app.include_router(admin_routers, prefix="/admin", tags=["admin"])
+
 
-app.include_router(message_routers, prefix="/message", tags=["message"])
+@app.exception_handler(LoadSheddingError)
+async def load_shedding_handler(request: Request, exc: LoadSheddingError):
+    retry_after = str(max(1, math.ceil(min(exc.retry_after, 3600))))
+    # A resposta de espera só é prometida se a mensagem ficou na fila de adiadas
+    if settings.ADMISSION_SHED_MODE == "reply" and exc.queued:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"status": "deferred", "message": settings.ADMISSION_SHED_REPLY},
+            headers={"Retry-After": retry_after},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"status": "rejected", "reason": exc.reason},
+        headers={"Retry-After": retry_after},
+    )
 
 
 @app.get("/", summary="Verifica se o servidor está online")
@@ -0,0 +1,21 @@
+"""
+Configuração comum dos testes: as variáveis obrigatórias das configurações
+recebem valores fictícios antes de qualquer import da aplicação.
+"""
+import os
+
+_REQUIRED_ENV = {
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "postgres",
+    "PGADMIN_DEFAULT_EMAIL": "admin@example.com",
+    "PGADMIN_DEFAULT_PASSWORD": "admin",
+    "OPENAI_API_KEY": "sk-test",
+    "OPENAI_MODEL_NAME": "gpt-4o",
+    "OPENAI_TEMPERATURE": "0",
+    "LANGSMITH_API_KEY": "test",
+    "LANGSMITH_PROJECT": "test",
+}
+
+for _name, _value in _REQUIRED_ENV.items():
+    os.environ.setdefault(_name, _value)
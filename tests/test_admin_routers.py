@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+
+from app.infrastructure.config.config import settings
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("GET", "/admin/conversations/export"),
+        ("DELETE", "/admin/conversations/5511999999999"),
+        ("DELETE", "/admin/conversations"),
+    ],
+)
+def test_admin_routes_require_token(method, path):
+    response = client.request(method, path)
+    assert response.status_code == 403
+
+    response = client.request(method, path, headers={"X-Admin-Token": "errado"})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/message/debug/tenants",
+        "/message/debug/llm-usage",
+        "/message/debug/traces",
+        "/message/debug/traces/abc",
+    ],
+)
+def test_debug_routes_with_identifiers_require_token(path, monkeypatch):
+    assert client.get(path).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", SecretStr("segredo"))
+    assert client.get(path, headers={"X-Admin-Token": "errado"}).status_code == 403
+    assert client.get(path, headers={"X-Admin-Token": "segredo"}).status_code != 403
@@ -0,0 +1,50 @@
+import time
+
+from app.infrastructure.resilience.admission_control import (
+    AdaptiveConcurrencyLimit,
+    TokenBucket,
+)
+from app.presentation.scheduling_routers import admission_outcome
+
+
+def _limit():
+    return AdaptiveConcurrencyLimit(initial=10, minimum=1, maximum=20, target_latency=1.0)
+
+
+def test_failure_backs_off_and_success_grows():
+    limit = _limit()
+    limit.try_acquire()
+    limit.release(0.1, success=False)
+    assert limit.limit == 7.0
+
+    limit.try_acquire()
+    limit.release(0.1, success=True)
+    assert limit.limit > 7.0
+    assert limit.inflight == 0
+
+
+def test_neutral_release_frees_slot_without_adjusting():
+    limit = _limit()
+    limit.try_acquire()
+    limit.release(5.0, success=None)
+
+    assert limit.limit == 10.0
+    assert limit.inflight == 0
+
+
+def test_degraded_and_throttled_results_are_neutral():
+    assert admission_outcome({"status": "degraded", "queued": False}) is None
+    assert admission_outcome({"status": "throttled", "reason": "quota"}) is None
+    assert admission_outcome({"status": "success"}) is True
+    assert admission_outcome({"status": "error"}) is False
+    assert admission_outcome(None) is False
+
+
+def test_token_bucket_reports_wait_until_next_token():
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    assert bucket.try_acquire() == 0.0
+    wait = bucket.try_acquire()
+    assert 0 < wait <= 0.1
+    time.sleep(wait)
+    assert bucket.try_acquire() == 0.0
@@ -0,0 +1,30 @@
+import asyncio
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.infrastructure.pesistence.caching_checkpointer import CachingCheckpointSaver
+
+
+def test_cached_checkpoint_is_isolated_from_caller_mutations():
+    saver = CachingCheckpointSaver(InMemorySaver())
+    config = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": ["oi"]}
+    checkpoint["channel_versions"] = {"messages": 1}
+    metadata = {"step": 0}
+
+    async def run():
+        await saver.aput(config, checkpoint, metadata, {"messages": 1})
+        # O loop do grafo continua alterando os dicts depois do aput
+        checkpoint["channel_values"]["messages"] = ["alterado"]
+        checkpoint["channel_versions"]["messages"] = 2
+        metadata["step"] = 1
+        return await saver.aget_tuple(config)
+
+    cached = asyncio.run(run())
+
+    assert saver.stats()["hits"] == 1
+    assert cached.checkpoint["channel_values"]["messages"] == ["oi"]
+    assert cached.checkpoint["channel_versions"]["messages"] == 1
+    assert cached.metadata["step"] == 0
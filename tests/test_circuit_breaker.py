@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.resilience import circuit_breaker
+from app.infrastructure.resilience.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _breaker(**kwargs):
+    options = dict(
+        window_seconds=10,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_seconds=2,
+        slow_call_rate=0.8,
+        open_seconds=5,
+        half_open_probes=2,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("teste", **options)
+
+
+def _fail(breaker, times=1):
+    for _ in range(times):
+        breaker.record(0.1, failed=True)
+
+
+def _succeed(breaker, times=1):
+    for _ in range(times):
+        breaker.record(0.1, failed=False)
+
+
+def test_opens_on_failure_rate_only_after_min_calls(clock):
+    breaker = _breaker()
+    _fail(breaker, 3)
+    assert breaker.state == CLOSED
+
+    _succeed(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow_request()
+
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(3.0, failed=False)
+
+    assert breaker.state == OPEN
+
+
+def test_old_calls_leave_the_window(clock):
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 11
+    _succeed(breaker, 3)
+    _fail(breaker)
+
+    # As três falhas antigas saíram da janela: 1/4 fica abaixo da taxa
+    assert breaker.state == CLOSED
+    assert breaker.stats()["failures_in_window"] == 1
+    assert breaker.stats()["calls_in_window"] == 4
+
+
+def test_half_open_probes_close_the_circuit(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock.now += 5
+
+    assert not breaker.is_open
+    assert breaker.allow_request() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
+    # Sondas esgotadas: as demais chamadas continuam recusadas
+    with pytest.raises(CircuitOpenError):
+        breaker.allow_request()
+
+    breaker.record(0.1, failed=False, probe=True)
+    assert breaker.state == HALF_OPEN
+    breaker.record(0.1, failed=False, probe=True)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() is False
+    assert breaker.stats()["calls_in_window"] == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock.now += 5
+
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("ainda fora do ar")
+
+    assert breaker.state == OPEN
+    assert breaker.is_open
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = _breaker(half_open_probes=1)
+    _fail(breaker, 4)
+    clock.now += 5
+
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
@@ -0,0 +1,50 @@
+import asyncio
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from app.infrastructure.pesistence.cold_storage import ArchivingPostgresSaver
+
+
+class FakeColdStorage:
+    def __init__(self, archived):
+        self.archived = archived
+        self.rehydrated = []
+
+    async def is_archived(self, thread_id):
+        return thread_id in self.archived
+
+    async def rehydrate_thread(self, thread_id):
+        self.rehydrated.append(thread_id)
+        return True
+
+
+def _saver(cold_storage, monkeypatch, hot=None):
+    async def hot_read(self, config):
+        return (hot or {}).get(config["configurable"]["thread_id"])
+
+    monkeypatch.setattr(AsyncPostgresSaver, "aget_tuple", hot_read)
+    # Sem conexão: só o caminho de leitura é exercitado
+    saver = ArchivingPostgresSaver.__new__(ArchivingPostgresSaver)
+    saver.cold_storage = cold_storage
+    return saver
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def test_new_thread_does_not_take_the_rehydrate_lock(monkeypatch):
+    cold_storage = FakeColdStorage(archived=set())
+    saver = _saver(cold_storage, monkeypatch)
+
+    assert asyncio.run(saver.aget_tuple(_config("nova"))) is None
+    assert cold_storage.rehydrated == []
+
+
+def test_archived_thread_is_rehydrated(monkeypatch):
+    cold_storage = FakeColdStorage(archived={"antiga"})
+    saver = _saver(cold_storage, monkeypatch)
+
+    asyncio.run(saver.aget_tuple(_config("antiga")))
+
+    assert cold_storage.rehydrated == ["antiga"]
@@ -0,0 +1,47 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.infrastructure.pesistence import compressed_serializer
+from app.infrastructure.pesistence.compressed_serializer import (
+    ZSTD_TYPE_PREFIX,
+    CompressedSerializer,
+)
+
+SMALL = {"phone_number": "5511999990000", "step": 1}
+LARGE = {"messages": [HumanMessage(content="Quero marcar uma consulta " * 20)] * 10}
+
+
+def test_reads_rows_written_by_the_default_serializer():
+    for value in (SMALL, LARGE):
+        legacy = JsonPlusSerializer().dumps_typed(value)
+        assert not legacy[0].startswith(ZSTD_TYPE_PREFIX)
+        assert CompressedSerializer().loads_typed(legacy) == value
+
+
+@pytest.mark.parametrize("value, compressed", [(SMALL, False), (LARGE, True)])
+def test_values_round_trip_around_the_threshold(value, compressed):
+    serde = CompressedSerializer(threshold=256)
+
+    type_, data = serde.dumps_typed(value)
+
+    assert type_.startswith(ZSTD_TYPE_PREFIX) is compressed
+    assert serde.loads_typed((type_, data)) == value
+
+
+def test_message_objects_survive_compression():
+    serde = CompressedSerializer(threshold=1)
+    value = {"messages": [AIMessage(content="Temos horários na quinta. " * 50)]}
+
+    assert serde.loads_typed(serde.dumps_typed(value)) == value
+
+
+def test_compressed_row_without_zstandard_raises(monkeypatch):
+    type_, data = CompressedSerializer(threshold=1).dumps_typed(LARGE)
+    monkeypatch.setattr(compressed_serializer, "zstandard", None)
+    serde = CompressedSerializer()
+
+    # Sem o pacote, nada novo é comprimido
+    assert not serde.dumps_typed(LARGE)[0].startswith(ZSTD_TYPE_PREFIX)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        serde.loads_typed((type_, data))
@@ -0,0 +1,31 @@
+from app.application.services.scheduling_service import (
+    SchedulingService,
+    deferred_messages,
+)
+from app.infrastructure.config.config import settings
+
+
+def _degraded(monkeypatch, outbound):
+    monkeypatch.setattr(settings, "OUTBOUND_ENABLED", outbound)
+    deferred_messages.drain()
+    service = SchedulingService(scheduling_agent=None)
+    return service._degraded_reply("5511999990000", "oi", "msg-1"), service._throttled_reply(
+        "5511999990000", "oi", "msg-2", None, "quota"
+    )
+
+
+def test_without_outbound_nothing_is_deferred_or_promised(monkeypatch):
+    degraded, throttled = _degraded(monkeypatch, outbound=False)
+
+    assert degraded["queued"] is False and throttled["queued"] is False
+    assert degraded["message"] == throttled["message"] == settings.DEGRADED_RETRY_REPLY
+    assert len(deferred_messages) == 0
+
+
+def test_with_outbound_messages_are_deferred_for_replay(monkeypatch):
+    degraded, throttled = _degraded(monkeypatch, outbound=True)
+
+    assert degraded["queued"] and throttled["queued"]
+    assert degraded["message"] == settings.DEGRADED_REPLY
+    assert throttled["message"] == settings.TENANT_THROTTLED_REPLY
+    assert [item["message_id"] for item in deferred_messages.drain()] == ["msg-1", "msg-2"]
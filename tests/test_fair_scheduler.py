@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.resilience.admission_control import LoadSheddingError
+from app.infrastructure.tenancy.fair_scheduler import FairTenantScheduler
+
+
+async def _turn(scheduler, tenant, order, limit=8):
+    async with scheduler.slot(tenant, limit):
+        order.append(tenant)
+        await asyncio.sleep(0.001)
+
+
+def test_busy_tenant_does_not_starve_another():
+    scheduler = FairTenantScheduler(max_concurrency=1)
+    order = []
+
+    async def run():
+        busy = [asyncio.create_task(_turn(scheduler, "a", order)) for _ in range(10)]
+        await asyncio.sleep(0)
+        single = asyncio.create_task(_turn(scheduler, "b", order))
+        await asyncio.gather(*busy, single)
+
+    asyncio.run(run())
+
+    # "b" chegou com 9 mensagens de "a" na fila e entra logo na próxima vaga
+    assert order.index("b") <= 2
+    assert scheduler.inflight == 0
+
+
+def test_tenant_limit_leaves_global_slots_to_others():
+    scheduler = FairTenantScheduler(max_concurrency=4)
+    peak = {"a": 0}
+
+    async def limited():
+        async with scheduler.slot("a", 1):
+            peak["a"] = max(peak["a"], scheduler.stats()["tenants"]["a"]["inflight"])
+            await asyncio.sleep(0.01)
+
+    async def run():
+        tasks = [asyncio.create_task(limited()) for _ in range(3)]
+        await asyncio.sleep(0)
+        # Vagas globais livres mesmo com "a" na fila
+        async with scheduler.slot("b", 4):
+            assert scheduler.stats()["tenants"]["a"]["queued"] == 2
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert peak["a"] == 1
+
+
+def test_full_tenant_queue_is_rejected():
+    scheduler = FairTenantScheduler(max_concurrency=1, max_queue=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("a", 1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_turn(scheduler, "a", []))
+        await asyncio.sleep(0)
+        with pytest.raises(LoadSheddingError):
+            async with scheduler.slot("a", 1):
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+    asyncio.run(run())
+
+    assert scheduler.stats()["tenants"]["a"]["rejected"] == 1
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = FairTenantScheduler(max_concurrency=1)
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("a", 1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_turn(scheduler, "b", order))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await holder
+        await _turn(scheduler, "c", order)
+
+    asyncio.run(run())
+
+    assert order == ["c"]
+    assert scheduler.inflight == 0
+    assert scheduler.stats()["tenants"]["b"]["queued"] == 0
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage
+
+from app.application.services.model_router import (
+    LARGE_TIER,
+    ModelRouter,
+    TurnComplexityScorer,
+)
+from app.infrastructure.interfaces.illm_service import ILLMService
+
+
+class FakeLLMService(ILLMService):
+    def __init__(self, content="Temos horários na quinta.", fail=False, latency=0.0):
+        self.content = content
+        self.fail = fail
+        self.latency = latency
+        self.calls = 0
+
+    async def orchestrator_prompt_template(self, user_query, prompt_inputs=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("modelo indisponível")
+        return AIMessage(content=self.content)
+
+
+def _tenant(services):
+    return SimpleNamespace(
+        config=SimpleNamespace(model_name=None),
+        llm_service_for=lambda model: services[model],
+    )
+
+
+def _router(**kwargs):
+    return ModelRouter(
+        TurnComplexityScorer(), small_model="small", large_model="large", **kwargs
+    )
+
+
+def test_small_model_failure_escalates_to_large():
+    services = {"small": FakeLLMService(fail=True), "large": FakeLLMService(content="ok")}
+
+    response = asyncio.run(_router().invoke(_tenant(services), "ok"))
+
+    assert response.content == "ok"
+    assert services["large"].calls == 1
+    assert _router().route("ok").tier != LARGE_TIER
+
+
+def test_tool_call_without_text_is_not_escalated():
+    small = FakeLLMService(content="")
+    small.orchestrator_prompt_template = _tool_call_response
+    services = {"small": small, "large": FakeLLMService()}
+
+    response = asyncio.run(_router().invoke(_tenant(services), "ok"))
+
+    assert response.tool_calls
+    assert services["large"].calls == 0
+
+
+async def _tool_call_response(user_query, prompt_inputs=None):
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": "atualizar_detalhes_agendamento", "args": {}, "id": "c1"}],
+    )
+
+
+def test_concurrent_turns_overlap_on_the_event_loop():
+    services = {"small": FakeLLMService(latency=0.2), "large": FakeLLMService(latency=0.2)}
+    router = _router(enabled=False)
+
+    async def run():
+        await asyncio.gather(*(router.invoke(_tenant(services), "oi") for _ in range(5)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+
+    assert time.perf_counter() - started < 0.6
+
+
+def test_rounds_sharing_a_decision_count_as_one_turn():
+    services = {"small": FakeLLMService(), "large": FakeLLMService()}
+    router = _router()
+    decision = router.route_turn("ok")
+
+    async def run():
+        for _ in range(3):
+            await router.invoke(_tenant(services), "ok", decision=decision)
+
+    asyncio.run(run())
+
+    assert router.stats()["turns"] == 1
+    assert router.stats()["tiers"]["small"]["calls"] == 3
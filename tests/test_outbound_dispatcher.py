@@ -0,0 +1,67 @@
+import asyncio
+
+from app.domain.outbox_models import OutboundMessage
+from app.infrastructure.outbound.outbound_dispatcher import OutboundDispatcher
+
+
+class FakeGateway:
+    supports_batch = False
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, instance_id, phone_number, message):
+        self.sent.append(message)
+
+    async def aclose(self):
+        pass
+
+
+class FlakyRepository:
+    """Perde a conexão ao gravar o primeiro envio."""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.marked = []
+        self.done = asyncio.Event()
+
+    async def claim_due(self, limit, lease_seconds):
+        return self.batches.pop(0) if self.batches else []
+
+    async def mark_sent(self, ids):
+        if not self.marked:
+            self.marked.append(None)
+            raise ConnectionError("conexão encerrada")
+        self.marked.append(ids)
+        self.done.set()
+
+    async def mark_failed(self, ids, error, retry_at):
+        pass
+
+
+def _outbound(outbound_id):
+    return OutboundMessage(
+        outbound_id=outbound_id,
+        instance_id=None,
+        phone_number="5511999990000",
+        message=f"msg-{outbound_id}",
+        attempts=1,
+    )
+
+
+def test_repository_error_does_not_stop_the_delivery_loop():
+    repository = FlakyRepository([[_outbound(1)], [_outbound(2)]])
+    gateway = FakeGateway()
+    dispatcher = OutboundDispatcher(repository, gateway, poll_interval_seconds=0.01)
+
+    async def run():
+        dispatcher.start()
+        try:
+            await asyncio.wait_for(repository.done.wait(), timeout=2)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(run())
+
+    assert gateway.sent == ["msg-1", "msg-2"]
+    assert repository.marked[-1] == [2]
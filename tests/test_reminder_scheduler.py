@@ -0,0 +1,185 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage
+
+from app.application.services import reminder_scheduler as module
+from app.application.services.reminder_scheduler import ReminderScheduler
+from app.domain.reminder_models import AppointmentReminder
+from app.domain.scheduling_data import SchedulingData
+
+PHONE = "5511999990000"
+
+
+class FakeRepository:
+    def __init__(self):
+        self.scheduled = []
+        self.cancelled = []
+        self.marks = []
+        self.claimable = []
+        self._next_id = 0
+
+    async def schedule(self, instance_id, phone_number, appointment_at, due):
+        self.scheduled.append((phone_number, appointment_at, dict(due)))
+        created = []
+        for due_at in due.values():
+            self._next_id += 1
+            created.append((self._next_id, due_at))
+        return created
+
+    async def cancel(self, instance_id, phone_number):
+        self.cancelled.append(phone_number)
+        return 1
+
+    async def claim_due(self, limit, lease_seconds):
+        claimed, self.claimable = self.claimable[:limit], self.claimable[limit:]
+        return claimed
+
+    async def mark_sent(self, ids):
+        if ids:
+            self.marks.append(("sent", list(ids)))
+
+    async def mark_cancelled(self, ids, reason):
+        self.marks.append(("cancelled", list(ids)))
+
+    async def mark_failed(self, ids, detail, retry_at):
+        self.marks.append(("retry" if retry_at else "failed", list(ids)))
+
+
+class FakeAgent:
+    def __init__(self, data):
+        self.values = {"scheduling_data": data, "messages": []}
+        self.updates = []
+
+    async def aget_state(self, config):
+        return SimpleNamespace(values=self.values)
+
+    async def aupdate_state(self, config, values, as_node=None):
+        self.updates.append(values)
+        self.values["messages"] = self.values["messages"] + values["messages"]
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.sent = []
+
+    async def enqueue(self, phone_number, text, instance_id=None, kind=None):
+        self.sent.append((phone_number, text, kind))
+
+
+def _scheduler(repository):
+    return ReminderScheduler(
+        repository,
+        offsets_hours={"reminder": 24, "confirmation": 2},
+        messages={"reminder": "Olá {user_name}! Consulta{specialty} em {date} às {time}."},
+        timezone_name="UTC",
+    )
+
+
+def _data(day: datetime, confirmed=True):
+    return SchedulingData(
+        user_name="Ana",
+        specialty="cardiologia",
+        date_scheduled=day.strftime("%Y-%m-%d"),
+        specific_time=day.strftime("%H:%M"),
+        confirmed=confirmed,
+    )
+
+
+def _in(hours: float) -> datetime:
+    at = datetime.now(timezone.utc) + timedelta(hours=hours)
+    return at.replace(second=0, microsecond=0)
+
+
+def test_schedules_only_future_offsets_and_once_per_appointment():
+    repository = FakeRepository()
+    scheduler = _scheduler(repository)
+    appointment = _in(5)
+
+    assert asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(appointment))) == 1
+    assert repository.scheduled == [
+        (PHONE, appointment, {"confirmation": appointment - timedelta(hours=2)})
+    ]
+    # O mesmo agendamento no turno seguinte não volta ao banco
+    assert asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(appointment))) == 0
+    assert len(repository.scheduled) == 1
+
+
+def test_rescheduling_and_unconfirming():
+    repository = FakeRepository()
+    scheduler = _scheduler(repository)
+
+    asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(_in(48))))
+    moved = _in(72)
+    assert asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(moved))) == 2
+    assert repository.scheduled[-1][1] == moved
+
+    asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(moved, confirmed=False)))
+    assert repository.cancelled == [PHONE]
+
+
+def test_unconfirmed_appointment_is_never_scheduled():
+    repository = FakeRepository()
+    scheduler = _scheduler(repository)
+
+    assert asyncio.run(scheduler.schedule_appointment(PHONE, None, _data(_in(48), False))) == 0
+    assert repository.scheduled == [] and repository.cancelled == []
+
+
+def _reminder(reminder_id, appointment, kind="reminder", attempts=1):
+    return AppointmentReminder(
+        reminder_id=reminder_id,
+        instance_id="",
+        phone_number=PHONE,
+        kind=kind,
+        appointment_at=appointment,
+        due_at=appointment - timedelta(hours=24),
+        status="pending",
+        attempts=attempts,
+    )
+
+
+def test_fire_revalidates_the_appointment_before_sending(monkeypatch):
+    dispatcher = FakeDispatcher()
+    monkeypatch.setattr(module, "get_outbound_dispatcher", lambda: dispatcher)
+    repository = FakeRepository()
+    scheduler = _scheduler(repository)
+    appointment = _in(30)
+    scheduler._agent = FakeAgent(_data(appointment))
+
+    repository.claimable = [
+        _reminder(1, appointment),
+        # Lembrete de uma data que o paciente já remarcou
+        _reminder(2, appointment - timedelta(days=1)),
+        # Tipo sem texto configurado
+        _reminder(3, appointment, kind="confirmation"),
+    ]
+    assert asyncio.run(scheduler._fire_due()) == 3
+
+    text = f"Olá Ana! Consulta de cardiologia em {appointment:%d/%m} às {appointment:%H:%M}."
+    assert dispatcher.sent == [(PHONE, text, "reminder")]
+    assert scheduler._agent.values["messages"] == [AIMessage(content=text)]
+    assert ("sent", [1]) in repository.marks
+    assert sorted(ids for mark, ids in repository.marks if mark == "cancelled") == [[2], [3]]
+
+
+def test_failed_fire_retries_then_gives_up(monkeypatch):
+    class BrokenDispatcher:
+        async def enqueue(self, *args, **kwargs):
+            raise RuntimeError("fora do ar")
+
+    monkeypatch.setattr(module, "get_outbound_dispatcher", lambda: BrokenDispatcher())
+    repository = FakeRepository()
+    scheduler = _scheduler(repository)
+    appointment = _in(30)
+    scheduler._agent = FakeAgent(_data(appointment))
+
+    repository.claimable = [_reminder(1, appointment, attempts=1)]
+    asyncio.run(scheduler._fire_due())
+    repository.claimable = [_reminder(1, appointment, attempts=scheduler.max_attempts)]
+    asyncio.run(scheduler._fire_due())
+
+    assert repository.marks == [("retry", [1]), ("failed", [1])]
+    # A nova tentativa não repete a mensagem no histórico da conversa
+    assert len(scheduler._agent.updates) == 1
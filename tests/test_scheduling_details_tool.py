@@ -0,0 +1,113 @@
+import asyncio
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.application.agent.tools.scheduling_details_tool import (
+    SCHEDULING_DETAILS_TOOL,
+    apply_scheduling_details,
+)
+from app.application.services.model_router import model_router
+from app.application.services.reminder_scheduler import ReminderScheduler
+from app.domain.scheduling_data import SchedulingData
+from app.infrastructure.config.config import settings
+
+import app.application.agent.node.orchestrator.orchestrator_node  # noqa: F401
+
+orchestrator_module = sys.modules["app.application.agent.node.orchestrator.orchestrator_node"]
+
+CONFIRMED = SchedulingData(
+    user_name="Ana",
+    professional_name="Dra. Paula",
+    date_scheduled="2030-03-14",
+    specific_time="09:30",
+    confirmed=True,
+)
+
+
+def test_apply_merges_only_informed_fields():
+    data = apply_scheduling_details(
+        SchedulingData(user_name="Ana"), {"specialty": "cardiologia", "user_name": None}
+    )
+
+    assert data.user_name == "Ana"
+    assert data.specialty == "cardiologia"
+
+
+def test_reschedule_without_new_confirmation_clears_confirmed():
+    assert apply_scheduling_details(CONFIRMED, {"specific_time": "10:00"}).confirmed is None
+    assert apply_scheduling_details(CONFIRMED, {"specific_time": "09:30"}).confirmed is True
+    assert apply_scheduling_details(CONFIRMED, {"user_name": "Ana Souza"}).confirmed is True
+
+
+def test_invalid_arguments_keep_current_data():
+    assert apply_scheduling_details(CONFIRMED, {"confirmed": "talvez"}) == CONFIRMED
+
+
+def test_reminders_require_confirmation():
+    scheduler = ReminderScheduler(repository=None, offsets_hours={}, messages={})
+
+    assert scheduler.appointment_at(CONFIRMED) is not None
+    assert scheduler.appointment_at(CONFIRMED.model_copy(update={"confirmed": None})) is None
+
+
+def test_orchestrator_applies_tool_call_and_returns_scheduling_delta(monkeypatch):
+    responses = [
+        AIMessage(
+            content="",
+            tool_calls=[
+                {"name": SCHEDULING_DETAILS_TOOL, "args": {"user_name": "Ana"}, "id": "c1"}
+            ],
+        ),
+        AIMessage(content="Prazer, Ana! Qual especialidade?"),
+    ]
+    scratchpads = []
+    decisions = []
+    turns = model_router.stats()["turns"]
+
+    async def fake_invoke(tenant, user_query, prompt_inputs=None, decision=None):
+        scratchpads.append(prompt_inputs["agent_scratchpad"])
+        decisions.append(decision)
+        return responses.pop(0)
+
+    async def no_store():
+        raise RuntimeError("sem banco")
+
+    monkeypatch.setattr(model_router, "invoke", fake_invoke)
+    monkeypatch.setattr(orchestrator_module, "get_store", no_store)
+    state = {"messages": [HumanMessage(content="Sou a Ana")], "phone_number": "5511999990000"}
+
+    update = asyncio.run(orchestrator_module.orchestrator_node(state))
+
+    assert update["messages"][0].content == "Prazer, Ana! Qual especialidade?"
+    assert update["scheduling_data"].user_name == "Ana"
+    assert isinstance(scratchpads[1][-1], ToolMessage)
+    # Uma decisão de roteamento para o turno inteiro
+    assert decisions[0] is decisions[1]
+    assert model_router.stats()["turns"] == turns + 1
+
+
+def test_orchestrator_falls_back_when_every_round_calls_tools(monkeypatch):
+    calls = []
+
+    async def always_tools(tenant, user_query, prompt_inputs=None, decision=None):
+        calls.append(user_query)
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": SCHEDULING_DETAILS_TOOL, "args": {"specialty": "cardiologia"}, "id": "c"}
+            ],
+        )
+
+    async def no_store():
+        raise RuntimeError("sem banco")
+
+    monkeypatch.setattr(model_router, "invoke", always_tools)
+    monkeypatch.setattr(orchestrator_module, "get_store", no_store)
+    state = {"messages": [HumanMessage(content="Cardiologia")], "phone_number": "5511999990000"}
+
+    update = asyncio.run(orchestrator_module.orchestrator_node(state))
+
+    assert len(calls) == orchestrator_module.MAX_LLM_ROUNDS
+    assert update["messages"][0].content == settings.AGENT_ERROR_REPLY
+    assert update["scheduling_data"].specialty == "cardiologia"
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure.sharding import dispatcher as dispatcher_module
+from app.presentation import shard_ingress_routers
+
+app = FastAPI()
+app.include_router(shard_ingress_routers.router)
+client = TestClient(app)
+
+PAYLOAD = {"messageId": "m1", "phone": "5511999999999", "text": {"message": "oi"}}
+
+
+def _worker_responds(monkeypatch, status_code, headers=None):
+    async def forward_message(phone_number, payload):
+        request = httpx.Request("POST", "http://worker/message/")
+        response = httpx.Response(
+            status_code, request=request, json={"detail": "worker"}, headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    monkeypatch.setattr(
+        shard_ingress_routers.shard_dispatcher, "forward_message", forward_message
+    )
+
+
+@pytest.mark.parametrize("method", ["POST", "DELETE"])
+def test_worker_registration_requires_admin_token(method):
+    response = client.request(method, "/shard/workers", json={"url": "http://evil:8000"})
+    assert response.status_code == 403
+    assert "http://evil:8000" not in shard_ingress_routers.shard_dispatcher.status()["workers"]
+
+
+def test_invalid_json_is_422():
+    response = client.post(
+        "/message/", content=b"{nao e json", headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+def test_worker_4xx_passes_through_with_retry_after(monkeypatch):
+    _worker_responds(monkeypatch, 429, headers={"Retry-After": "3"})
+    response = client.post("/message/", json=PAYLOAD)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+    assert response.json() == {"detail": "worker"}
+
+
+def test_worker_5xx_is_502(monkeypatch):
+    _worker_responds(monkeypatch, 500)
+    response = client.post("/message/", json=PAYLOAD)
+    assert response.status_code == 502
+
+
+def test_announce_worker_sends_admin_token(monkeypatch):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        dispatcher_module.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    asyncio.run(
+        dispatcher_module.announce_worker(
+            "http://ingress", "http://worker", admin_token="segredo"
+        )
+    )
+    assert seen[0].headers["X-Admin-Token"] == "segredo"
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        ['{"index": 0, "status": "success"}', "{nao e json"],
+        ['{"index": 0, "status": "success"}', '{"status": "success"}'],
+        ['{"index": 0, "status": "success"}', '{"index": 7, "status": "success"}'],
+        ['{"index": 0, "status": "success"}'],
+    ],
+)
+def test_forward_batch_fills_missing_results_on_malformed_worker_output(lines):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content="\n".join(lines).encode())
+
+    dispatcher = dispatcher_module.ShardDispatcher(workers=["http://worker"])
+    dispatcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    items = [(10, "5511999990000", PAYLOAD), (11, "5511999990000", PAYLOAD)]
+
+    async def collect():
+        return [r async for r in dispatcher.forward_batch(items)]
+
+    results = asyncio.run(asyncio.wait_for(collect(), timeout=5))
+
+    assert sorted((r["index"], r["status"]) for r in results) == [
+        (10, "success"),
+        (11, "error"),
+    ]
@@ -0,0 +1,9 @@
+"""
+Smoke test: a aplicação precisa importar sem erro (ex.: imports circulares).
+"""
+import importlib
+
+
+def test_import_main():
+    module = importlib.import_module("main")
+    assert module.app is not None
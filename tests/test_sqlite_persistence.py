@@ -0,0 +1,140 @@
+import asyncio
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from app.infrastructure.pesistence.sqlite_persistence import (
+    SQLiteCheckpointSaver,
+    SQLiteDatabase,
+    SQLiteStore,
+)
+
+
+class CounterState(TypedDict):
+    messages: Annotated[List[str], operator.add]
+
+
+def _graph(saver):
+    async def reply(state):
+        return {"messages": [f"resposta {len(state['messages'])}"]}
+
+    graph = StateGraph(CounterState)
+    graph.add_node("reply", reply)
+    graph.set_entry_point("reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=saver)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _run(tmp_path, scenario, **db_kwargs):
+    async def main():
+        db = SQLiteDatabase(str(tmp_path / "agent.db"), **db_kwargs)
+        await db.open()
+        try:
+            return await scenario(db)
+        finally:
+            await db.close()
+
+    return asyncio.run(main())
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def test_checkpoint_round_trip_and_history(tmp_path):
+    async def scenario(db):
+        graph = _graph(SQLiteCheckpointSaver(db))
+        for text in ("oi", "quero marcar"):
+            await graph.ainvoke({"messages": [text]}, _config("t1"))
+        state = await graph.aget_state(_config("t1"))
+        history = [s async for s in graph.aget_state_history(_config("t1"))]
+        return state, history
+
+    state, history = _run(tmp_path, scenario)
+
+    assert state.values["messages"] == ["oi", "resposta 1", "quero marcar", "resposta 3"]
+    # Entrada + node por turno, mais o checkpoint inicial de cada invocação
+    assert len(history) == 6
+    assert history[0].config == state.config
+
+
+def test_compact_keeps_latest_checkpoints_and_drops_orphans(tmp_path):
+    async def scenario(db):
+        saver = SQLiteCheckpointSaver(db)
+        graph = _graph(saver)
+        for thread_id in ("t1", "t2"):
+            for i in range(3):
+                await graph.ainvoke({"messages": [f"msg {i}"]}, _config(thread_id))
+        stats = await db.compact(keep_checkpoints=1)
+        counts = await db.read(
+            lambda conn: {
+                "checkpoints": _count(conn, "checkpoints"),
+                "orphan_writes": conn.execute(
+                    "SELECT count(*) FROM checkpoint_writes w WHERE NOT EXISTS ("
+                    "SELECT 1 FROM checkpoints c WHERE c.thread_id = w.thread_id "
+                    "AND c.checkpoint_id = w.checkpoint_id)"
+                ).fetchone()[0],
+            }
+        )
+        state = await _graph(saver).aget_state(_config("t1"))
+        return stats, counts, state
+
+    stats, counts, state = _run(tmp_path, scenario)
+
+    assert stats["checkpoints"] > 0 and stats["blobs"] > 0
+    assert counts == {"checkpoints": 2, "orphan_writes": 0}
+    # O estado mais recente continua íntegro depois da remoção dos blobs antigos
+    assert len(state.values["messages"]) == 6
+
+
+def test_failed_write_is_rolled_back_without_losing_its_group(tmp_path):
+    def insert(conn, key, fail=False):
+        conn.execute(
+            "INSERT INTO store (prefix, key, value, created_at, updated_at) "
+            "VALUES ('t', ?, '{}', 0, 0)",
+            (key,),
+        )
+        if fail:
+            raise RuntimeError("falha no meio da escrita")
+
+    async def scenario(db):
+        await db.write(insert, "a", wait=False)
+        with pytest.raises(RuntimeError):
+            await db.write(insert, "b", True, wait=False)
+        await db.write(insert, "c", wait=False)
+        await db.flush()
+        keys = await db.read(
+            lambda conn: [r[0] for r in conn.execute("SELECT key FROM store ORDER BY key")]
+        )
+        return keys, db.stats()
+
+    # Intervalo longo: as três escritas caem no mesmo grupo
+    keys, stats = _run(tmp_path, scenario, commit_interval_ms=60_000)
+
+    assert keys == ["a", "c"]
+    assert stats["commits"] == 1 and stats["commit_errors"] == 0
+
+
+def test_store_items_expire_and_are_swept(tmp_path):
+    async def scenario(db):
+        store = SQLiteStore(db)
+        await store.aput(("users",), "curto", {"v": 1}, ttl=0.001)
+        await store.aput(("users",), "longo", {"v": 2}, ttl=60)
+        await store.aput(("users",), "sem-ttl", {"v": 3})
+        await asyncio.sleep(0.1)
+        expired = await store.aget(("users",), "curto")
+        kept = [item.key for item in await store.asearch(("users",))]
+        swept = await store.sweep_expired()
+        return expired, sorted(kept), swept
+
+    expired, kept, swept = _run(tmp_path, scenario)
+
+    assert expired is None
+    assert kept == ["longo", "sem-ttl"]
+    assert swept == 1
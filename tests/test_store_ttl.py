@@ -0,0 +1,90 @@
+import asyncio
+
+from langgraph.store.base import PutOp
+
+from app.infrastructure.pesistence.store_ttl import (
+    StoreTTLSweeper,
+    TTLPolicyStore,
+    _BACKFILL_TTL,
+    _DELETE_EXPIRED,
+    parse_ttl_policies,
+)
+
+
+class RecordingStore:
+    def __init__(self):
+        self.ops = []
+
+    async def abatch(self, ops):
+        self.ops.extend(ops)
+        return [None for _ in ops]
+
+
+POLICIES = parse_ttl_policies({"users": 60, "users.vip": 600, "memories": 0})
+
+
+def test_parse_skips_disabled_policies():
+    assert POLICIES == {("users",): 60.0, ("users", "vip"): 600.0}
+
+
+def test_longest_matching_prefix_wins():
+    store = TTLPolicyStore(RecordingStore(), POLICIES)
+
+    assert store.ttl_for(("users", "vip", "inst-1")) == 600.0
+    assert store.ttl_for(("users", "inst-1")) == 60.0
+    assert store.ttl_for(("memories",)) is None
+
+
+def test_puts_get_the_policy_ttl_unless_explicit_or_delete():
+    inner = RecordingStore()
+    store = TTLPolicyStore(inner, POLICIES)
+    ops = [
+        PutOp(("users", "inst-1"), "a", {"v": 1}),
+        PutOp(("users", "inst-1"), "b", {"v": 1}, ttl=5),
+        PutOp(("users", "inst-1"), "c", None),
+        PutOp(("other",), "d", {"v": 1}),
+    ]
+
+    asyncio.run(store.abatch(ops))
+
+    assert [op.ttl for op in inner.ops] == [60.0, 5, None, None]
+
+
+def _sweeper(results, **kwargs):
+    sweeper = StoreTTLSweeper(pool=None, policies=POLICIES, **kwargs)
+    calls = []
+
+    async def execute(query, params):
+        calls.append((query, params))
+        return results[query].pop(0) if results[query] else 0
+
+    sweeper._execute = execute
+    return sweeper, calls
+
+
+def test_sweep_deletes_in_bounded_batches():
+    sweeper, calls = _sweeper(
+        {_BACKFILL_TTL: [], _DELETE_EXPIRED: [10, 10, 10, 10]}, batch_size=10, max_batches=3
+    )
+
+    deleted = asyncio.run(sweeper.sweep())
+
+    assert deleted == 30
+    assert sum(query == _DELETE_EXPIRED for query, _ in calls) == 3
+    # Limite de lotes atingido: ainda há itens para a próxima varredura
+    assert sweeper.stats()["last_run"]["exhausted"] is False
+
+
+def test_backfill_runs_until_each_namespace_is_done():
+    sweeper, calls = _sweeper(
+        {_BACKFILL_TTL: [10, 4, 0], _DELETE_EXPIRED: []}, batch_size=10
+    )
+
+    asyncio.run(sweeper.sweep())
+    first = [params["prefix"] for query, params in calls if query == _BACKFILL_TTL]
+    calls.clear()
+    asyncio.run(sweeper.sweep())
+
+    assert first == ["users", "users", "users.vip"]
+    assert not [query for query, _ in calls if query == _BACKFILL_TTL]
+    assert sweeper.stats()["backfilled_total"] == 14
@@ -0,0 +1,23 @@
+from app.infrastructure.config.config import settings
+from app.infrastructure.tenancy.tenant_keys import (
+    split_thread_id,
+    tenant_store_namespace,
+    tenant_thread_id,
+)
+
+
+def test_existing_conversations_keep_their_keys_by_default():
+    assert settings.TENANT_THREAD_NAMESPACING is False
+    assert tenant_thread_id("5511999990000", "inst-1") == "5511999990000"
+    assert tenant_store_namespace("users", "inst-1") == ("users",)
+
+
+def test_namespacing_separates_instances(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_THREAD_NAMESPACING", True)
+
+    thread_id = tenant_thread_id("5511999990000", "inst-1")
+
+    assert thread_id == "inst-1:5511999990000"
+    assert split_thread_id(thread_id) == ("inst-1", "5511999990000")
+    assert tenant_store_namespace("users", "inst-1") == ("users", "inst-1")
+    assert tenant_thread_id("5511999990000", None) == "5511999990000"
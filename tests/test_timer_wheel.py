@@ -0,0 +1,55 @@
+import random
+
+from app.infrastructure.reminders.timer_wheel import HierarchicalTimerWheel
+
+
+def test_every_key_fires_once_and_never_early():
+    rng = random.Random(7)
+    wheel = HierarchicalTimerWheel(tick_seconds=1.0, slots=8, levels=3, now=0)
+    # Faixa da roda: 8**3 = 512 ticks; parte dos vencimentos cai no overflow
+    due = {key: rng.randint(0, 2000) for key in range(500)}
+    for key, at in due.items():
+        wheel.schedule(key, at)
+
+    fired = {}
+    now = 0
+    while now < 2100:
+        now += rng.choice([1, 3, 17, 90])
+        for key in wheel.advance(now):
+            assert key not in fired
+            fired[key] = now
+
+    assert fired.keys() == due.keys()
+    for key, at in due.items():
+        # Dispara no primeiro advance em que o vencimento já passou
+        assert at <= fired[key]
+        assert fired[key] - at < 90 or at <= 0
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    wheel = HierarchicalTimerWheel(tick_seconds=1.0, slots=8, levels=2, now=0)
+    wheel.schedule("a", 10)
+    wheel.schedule("b", 20)
+    wheel.schedule("a", 30)
+
+    assert wheel.cancel("b")
+    assert not wheel.cancel("b")
+    assert wheel.advance(25) == []
+    assert wheel.advance(30) == ["a"]
+
+
+def test_next_deadline_never_skips_a_due_key():
+    wheel = HierarchicalTimerWheel(tick_seconds=1.0, slots=8, levels=3, now=0)
+    assert wheel.next_deadline() is None
+    wheel.schedule("consulta", 300)
+
+    now = 0.0
+    fired = []
+    while not fired:
+        deadline = wheel.next_deadline()
+        assert deadline is not None and deadline <= 300
+        now = deadline
+        fired = wheel.advance(now)
+
+    assert fired == ["consulta"] and now == 300
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.observability import usage_accounting
+from app.infrastructure.observability.usage_accounting import UsageAccountant, usage_scope
+
+PRICING = {"m": {"input": 1.0, "output": 1.0}}
+
+
+def _record(accountant, thread_id, tokens):
+    with usage_scope(thread_id, "inst-1"):
+        accountant.record("m", prompt_tokens=tokens)
+
+
+def test_window_keeps_only_the_most_expensive_threads():
+    accountant = UsageAccountant(pricing=PRICING, max_window_threads=10)
+    for i in range(100):
+        _record(accountant, f"thread-{i}", tokens=i + 1)
+
+    stats = accountant.stats(top_threads=100)
+
+    assert stats["window_threads"] <= 10
+    assert "thread-99" in stats["window_top_threads"]
+    assert "thread-0" not in stats["window_top_threads"]
+    # Totais por instância e modelo não perdem nada
+    assert stats["instances"]["inst-1"]["calls"] == 100
+
+
+def test_failed_flushes_do_not_grow_the_window(monkeypatch):
+    def unavailable():
+        raise ConnectionError("postgres fora do ar")
+
+    monkeypatch.setattr(usage_accounting, "AsyncSessionFactory", unavailable)
+    accountant = UsageAccountant(pricing=PRICING, max_window_threads=10)
+
+    for round_ in range(5):
+        for i in range(10):
+            _record(accountant, f"thread-{round_}-{i}", tokens=1)
+        with pytest.raises(ConnectionError):
+            asyncio.run(accountant.flush())
+
+    assert accountant.stats()["window_threads"] <= 10
+    assert accountant.stats()["flush_errors"] == 5
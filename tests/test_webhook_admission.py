@@ -0,0 +1,151 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.services.ingress_pipeline import message_dedup_index
+from app.application.services.scheduling_service import (
+    deferred_messages,
+    get_scheduling_service,
+)
+from app.infrastructure.config.config import settings
+from app.infrastructure.resilience.admission_control import AdmissionDecision
+from app.presentation.scheduling_routers import admission_controller
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(message_dedup_index, "session_factory", None)
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    deferred_messages.drain()
+    yield TestClient(app, raise_server_exceptions=False)
+    app.dependency_overrides.clear()
+    deferred_messages.drain()
+
+
+def _payload():
+    return {
+        "messageId": uuid.uuid4().hex,
+        "phone": f"55{uuid.uuid4().int % 10**11:011d}",
+        "text": {"message": "Quero marcar uma consulta"},
+    }
+
+
+def _shed(monkeypatch):
+    monkeypatch.setattr(
+        admission_controller,
+        "try_admit",
+        lambda phone: AdmissionDecision(admitted=False, reason="global_rate", retry_after=2),
+    )
+
+
+def test_slot_released_when_service_fails_to_build(client):
+    def broken_service():
+        raise RuntimeError("falha ao construir o agente")
+
+    app.dependency_overrides[get_scheduling_service] = broken_service
+    inflight = admission_controller.concurrency.inflight
+
+    response = client.post("/message/", json=_payload())
+
+    assert response.status_code == 500
+    assert admission_controller.concurrency.inflight == inflight
+
+
+def test_reply_mode_queues_shed_message(client, monkeypatch):
+    _shed(monkeypatch)
+    monkeypatch.setattr(settings, "ADMISSION_SHED_MODE", "reply")
+    monkeypatch.setattr(settings, "OUTBOUND_ENABLED", True)
+    payload = _payload()
+
+    response = client.post("/message/", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "deferred"
+    queued = deferred_messages.drain()
+    assert [item["message_id"] for item in queued] == [payload["messageId"]]
+
+
+def test_reply_mode_without_outbound_rejects(client, monkeypatch):
+    _shed(monkeypatch)
+    monkeypatch.setattr(settings, "ADMISSION_SHED_MODE", "reply")
+    monkeypatch.setattr(settings, "OUTBOUND_ENABLED", False)
+
+    response = client.post("/message/", json=_payload())
+
+    assert response.status_code == 429
+    assert len(deferred_messages) == 0
+
+
+def test_reply_mode_with_full_queue_rejects(client, monkeypatch):
+    _shed(monkeypatch)
+    monkeypatch.setattr(settings, "ADMISSION_SHED_MODE", "reply")
+    monkeypatch.setattr(settings, "OUTBOUND_ENABLED", True)
+    monkeypatch.setattr(deferred_messages, "max_size", 0)
+    payload = _payload()
+
+    response = client.post("/message/", json=payload)
+
+    assert response.status_code == 429
+    assert not message_dedup_index.seen_recently(None, payload["messageId"])
+
+
+def test_reject_mode_keeps_message_retryable(client, monkeypatch):
+    _shed(monkeypatch)
+    monkeypatch.setattr(settings, "ADMISSION_SHED_MODE", "reject")
+    payload = _payload()
+
+    response = client.post("/message/", json=payload)
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+    assert not message_dedup_index.seen_recently(None, payload["messageId"])
+
+
+class BatchService:
+    async def handle_incoming_batch(self, messages, max_concurrency):
+        for message in messages:
+            yield {
+                "index": message["index"],
+                "message_id": message["message_id"],
+                "status": "success",
+            }
+
+
+def _post_batch(client, payloads):
+    app.dependency_overrides[get_scheduling_service] = BatchService
+    response = client.post("/message/batch", json=payloads)
+    return sorted(
+        (json.loads(line) for line in response.text.splitlines()), key=lambda r: r["index"]
+    )
+
+
+def test_batch_items_go_through_admission(client, monkeypatch):
+    _shed(monkeypatch)
+    payload = _payload()
+
+    results = _post_batch(client, [payload])
+
+    assert results == [
+        {
+            "index": 0,
+            "message_id": payload["messageId"],
+            "status": "rejected",
+            "reason": "global_rate",
+            "retry_after": 2,
+        }
+    ]
+    assert not message_dedup_index.seen_recently(None, payload["messageId"])
+
+
+def test_batch_releases_admission_slots(client):
+    inflight = admission_controller.concurrency.inflight
+    admitted = admission_controller.stats()["admitted"]
+
+    results = _post_batch(client, [_payload(), _payload()])
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert admission_controller.stats()["admitted"] == admitted + 2
+    assert admission_controller.concurrency.inflight == inflight
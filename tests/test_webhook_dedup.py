@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.services.ingress_pipeline import message_dedup_index
+from app.application.services.scheduling_service import get_scheduling_service
+from app.infrastructure.resilience.breakers import (
+    any_breaker_open,
+    dedup_breaker,
+    postgres_breaker,
+)
+from main import app
+
+
+class FakeService:
+    def __init__(self, status):
+        self.status = status
+
+    async def handle_incoming_message(self, *args, **kwargs):
+        return {"status": self.status, "message": "resposta"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Deduplicação só no LRU, sem Postgres
+    monkeypatch.setattr(message_dedup_index, "session_factory", None)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _payload():
+    return {
+        "messageId": uuid.uuid4().hex,
+        "phone": f"55{uuid.uuid4().int % 10**11:011d}",
+        "text": {"message": "Quero marcar uma consulta"},
+    }
+
+
+def _use_service(status):
+    app.dependency_overrides[get_scheduling_service] = lambda: FakeService(status)
+
+
+def test_processed_message_is_deduplicated(client):
+    _use_service("success")
+    payload = _payload()
+    assert client.post("/message/", json=payload).json()["status"] == "success"
+    assert client.post("/message/", json=payload).json()["filter"] == "duplicate"
+
+
+def test_agent_error_keeps_message_retryable(client):
+    _use_service("error")
+    payload = _payload()
+    assert client.post("/message/", json=payload).json()["status"] == "error"
+
+    _use_service("success")
+    assert client.post("/message/", json=payload).json()["status"] == "success"
+
+
+def test_dedup_errors_do_not_open_the_postgres_circuit(monkeypatch):
+    def missing_table():
+        raise RuntimeError('relation "ingress_messages" does not exist')
+
+    monkeypatch.setattr(message_dedup_index, "session_factory", missing_table)
+    monkeypatch.setattr(dedup_breaker, "min_calls", 1)
+
+    async def register_many():
+        return [
+            await message_dedup_index.register(None, uuid.uuid4().hex, "5511999990000")
+            for _ in range(5)
+        ]
+
+    try:
+        # Fail-open: toda mensagem é aceita
+        assert all(asyncio.run(register_many()))
+        assert dedup_breaker.is_open
+        assert not postgres_breaker.is_open
+        assert not any_breaker_open()
+    finally:
+        dedup_breaker._close()